@@ -0,0 +1,111 @@
+"""
+帖子搜索延迟基准：全文索引 vs ILIKE '%q%'
+
+在临时 SQLite 数据库中生成帖子并建立索引，分别用两种方式执行
+SqlAlchemyPostDao.find_feed_cards(search_query=...)，输出 p50 / p95 延迟。
+
+用法：python scripts/benchmark_search.py [帖子数量] [每个查询的重复次数]
+"""
+import sys
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from shared.database.core import Base
+from shared.search import search_index_factory
+from shared.search.i_search_index import DOC_TYPE_POST
+from shared.search.search_document_po import SearchDocumentPO
+from app_social.infrastructure.database.persistent_model.post_po import PostPO
+from app_social.infrastructure.database.dao_impl.sqlalchemy_post_dao import SqlAlchemyPostDao
+# 注册其余表，保证外键可解析
+from app_auth.infrastructure.database.persistent_model.user_po import UserPO
+from app_travel.infrastructure.database.persistent_model.trip_po import TripPO
+
+WORDS = [
+    "北京", "上海", "成都", "西安", "杭州", "厦门", "故宫", "长城", "外滩", "西湖", "火锅", "兵马俑",
+    "鼓浪屿", "美食", "徒步", "自驾", "攻略", "周末", "海边", "古镇", "夜景", "博物馆",
+    "hiking", "food", "museum", "beach", "roadtrip", "sunset", "temple", "market",
+]
+# 高频词（命中大量帖子）与低频词（少量命中或不命中）分别统计
+COMMON_QUERIES = ["兵马俑", "鼓浪屿 美食", "museum"]
+RARE_QUERIES = ["稀有词0042", "稀有词1377", "不存在的地名"]
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice(WORDS) for _ in range(n))
+
+
+def seed(session, count: int) -> None:
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    posts, docs = [], []
+    for i in range(count):
+        post_id = str(uuid.uuid4())
+        title = _sentence(rng, 4)
+        text = _sentence(rng, 60) + f"稀有词{i:04d}"
+        posts.append({
+            "id": post_id, "author_id": "bench", "title": title, "text": text,
+            "images_json": "[]", "tags_json": "[]", "visibility": "public",
+            "is_deleted": False, "like_count": 0, "comment_count": 0,
+            "created_at": now - timedelta(seconds=i), "updated_at": now,
+        })
+        docs.append({"doc_type": DOC_TYPE_POST, "doc_id": post_id, "title": title, "body": text})
+    session.execute(insert(PostPO), posts)
+    session.execute(insert(SearchDocumentPO), docs)
+    session.commit()
+
+
+def measure(session, queries: list, repeats: int) -> list:
+    dao = SqlAlchemyPostDao(session)
+    samples = []
+    for _ in range(repeats):
+        for q in queries:
+            start = time.perf_counter()
+            dao.find_feed_cards(limit=20, search_query=q, visibilities=["public"])
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: list) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<13} p50={statistics.median(samples):8.2f} ms  p95={p95:8.2f} ms  (n={len(samples)})")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        print(f"Seeding {count} posts...")
+        seed(session, count)
+
+        report("fts5 common", measure(session, COMMON_QUERIES, repeats))
+        report("fts5 rare", measure(session, RARE_QUERIES, repeats))
+
+        # 暂时移除 SQLite 索引实现，DAO 回退到 ILIKE
+        fts_factory = search_index_factory._registry.pop('sqlite')
+        try:
+            report("ilike common", measure(session, COMMON_QUERIES, repeats))
+            report("ilike rare", measure(session, RARE_QUERIES, repeats))
+        finally:
+            search_index_factory.register_search_index('sqlite', fts_factory)
+
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+旅行保存开销基准：写入量随改动规模变化
+
+在临时 SQLite 数据库中创建一个多日、多活动的旅行，
+每轮修改 k 个活动（k = 1 / 10 / 100 / 全部）后调用 TripRepositoryImpl.save，
+统计写语句（INSERT / UPDATE / DELETE）条数和 save（含 flush，不含 commit）耗时的中位数。
+按差异同步时写入量应与 k 成正比，而与旅行总规模无关。
+
+用法：python scripts/benchmark_trip_save.py [天数] [每天活动数] [每组重复次数]
+"""
+import sys
+import os
+import statistics
+import tempfile
+import time as clock
+from datetime import date, time, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from shared.database.core import Base
+from app_travel.domain.aggregate.trip_aggregate import Trip
+from app_travel.domain.entity.activity import Activity
+from app_travel.domain.value_objects.travel_value_objects import (
+    TripName, TripDescription, DateRange, Money, ActivityType, Location
+)
+from app_travel.infrastructure.database.dao_impl.sqlalchemy_trip_dao import SqlAlchemyTripDao
+from app_travel.infrastructure.database.repository_impl.trip_repository_impl import TripRepositoryImpl
+# 注册其余表，保证外键可解析
+from app_auth.infrastructure.database.persistent_model.user_po import UserPO
+from app_social.infrastructure.database.persistent_model.post_po import PostPO
+
+
+def seed(repo, session, days: int, per_day: int) -> Trip:
+    start = date(2024, 5, 1)
+    trip = Trip.create(
+        name=TripName("Benchmark Trip"),
+        description=TripDescription(""),
+        creator_id="bench",
+        date_range=DateRange(start, start + timedelta(days=days - 1)),
+    )
+    for day_index in range(days):
+        for i in range(per_day):
+            trip.add_activity(day_index, Activity.create(
+                name=f"A{day_index}-{i}",
+                activity_type=ActivityType.SIGHTSEEING,
+                location=Location(name=f"L{day_index}-{i}", latitude=39.9, longitude=116.4),
+                start_time=time(i % 24, 0),
+                end_time=time(i % 24, 30),
+                cost=Money(10, "CNY"),
+            ), "bench")
+    repo.save(trip)
+    session.commit()
+    return trip
+
+
+def measure(repo, session, trip_id, changes: int, repeats: int, round_no: list) -> tuple:
+    writes = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(None, 1)[0].upper() in ("INSERT", "UPDATE", "DELETE"):
+            writes.append(len(parameters) if executemany else 1)
+
+    samples, counts = [], []
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for _ in range(repeats):
+            session.expire_all()
+            trip = repo.find_by_id(trip_id)
+            round_no[0] += 1
+            activities = [a for day in trip.days for a in day.activities][:changes]
+            for activity in activities:
+                activity.notes = f"round {round_no[0]}"
+
+            writes.clear()
+            start = clock.perf_counter()
+            repo.save(trip)
+            samples.append((clock.perf_counter() - start) * 1000)
+            counts.append(sum(writes))
+            session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return statistics.median(counts), statistics.median(samples)
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    total = days * per_day
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        repo = TripRepositoryImpl(SqlAlchemyTripDao(session))
+        print(f"Seeding trip with {days} days x {per_day} activities ({total} rows)...")
+        trip = seed(repo, session, days, per_day)
+
+        round_no = [0]
+        for changes in sorted({0, 1, 10, 100, total}):
+            if changes > total:
+                continue
+            write_count, ms = measure(repo, session, trip.id, changes, repeats, round_no)
+            print(f"changed={changes:<6} writes={write_count:<6.0f} save p50={ms:8.2f} ms")
+
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
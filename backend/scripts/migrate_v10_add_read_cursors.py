@@ -0,0 +1,89 @@
+import sys
+import os
+
+# Add backend directory to path so we can import shared modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import json
+
+from sqlalchemy import text
+from shared.database.core import engine
+
+def _read_by(value):
+    try:
+        return set(json.loads(value or '[]'))
+    except ValueError:
+        return set()
+
+def migrate():
+    print("Starting migration: Move read state to conversation_participants cursors...")
+
+    with engine.connect() as connection:
+        # We wrap in try-except to handle re-running
+
+        try:
+            print("Adding last_read_message_id column...")
+            connection.execute(text("ALTER TABLE conversation_participants ADD COLUMN last_read_message_id VARCHAR(36);"))
+            print("last_read_message_id added.")
+        except Exception as e:
+            print(f"Skipping last_read_message_id (probably exists): {e}")
+
+        try:
+            print("Adding last_read_at column...")
+            connection.execute(text("ALTER TABLE conversation_participants ADD COLUMN last_read_at DATETIME;"))
+            print("last_read_at added.")
+        except Exception as e:
+            print(f"Skipping last_read_at (probably exists): {e}")
+
+        try:
+            print("Adding idx_messages_conversation_sent...")
+            connection.execute(text(
+                "CREATE INDEX idx_messages_conversation_sent ON messages (conversation_id, sent_at, id);"
+            ))
+            print("idx_messages_conversation_sent added.")
+        except Exception as e:
+            print(f"Skipping idx_messages_conversation_sent (probably exists): {e}")
+
+        # The cursor of each participant is the newest message from someone else
+        # whose read_by_json contains them; only participants without a cursor are filled.
+        print("Backfilling read cursors from read_by_json...")
+        participants = connection.execute(text(
+            "SELECT conversation_id, user_id FROM conversation_participants "
+            "WHERE last_read_message_id IS NULL ORDER BY conversation_id;"
+        )).fetchall()
+        by_conversation = {}
+        for row in participants:
+            by_conversation.setdefault(row.conversation_id, []).append(row.user_id)
+
+        updates = []
+        for conversation_id, user_ids in by_conversation.items():
+            messages = connection.execute(text(
+                "SELECT id, sender_id, sent_at, read_by_json FROM messages "
+                "WHERE conversation_id = :cid AND is_deleted = 0 ORDER BY sent_at DESC, id DESC;"
+            ), {"cid": conversation_id}).fetchall()
+            for user_id in user_ids:
+                latest = next(
+                    (m for m in messages if m.sender_id != user_id and user_id in _read_by(m.read_by_json)),
+                    None
+                )
+                if latest:
+                    updates.append({
+                        "cid": conversation_id,
+                        "uid": user_id,
+                        "mid": latest.id,
+                        "at": latest.sent_at
+                    })
+
+        if updates:
+            connection.execute(text(
+                "UPDATE conversation_participants SET last_read_message_id = :mid, last_read_at = :at "
+                "WHERE conversation_id = :cid AND user_id = :uid;"
+            ), updates)
+        print(f"{len(updates)} cursors backfilled.")
+
+        connection.commit()
+
+    print("Migration finished.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,53 @@
+import sys
+import os
+
+# Add backend directory to path so we can import shared modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from sqlalchemy import text
+from shared.database.core import engine
+
+def _drop_index_sql(name, table):
+    if engine.dialect.name == "sqlite":
+        return f"DROP INDEX {name};"
+    return f"DROP INDEX {name} ON {table};"
+
+def migrate():
+    print("Starting migration: Add composite friendship indexes...")
+
+    with engine.connect() as connection:
+        # We wrap in try-except to handle re-running
+
+        try:
+            print("Adding idx_friendship_pair_status...")
+            connection.execute(text(
+                "CREATE INDEX idx_friendship_pair_status ON friendships (requester_id, addressee_id, status);"
+            ))
+            print("idx_friendship_pair_status added.")
+        except Exception as e:
+            print(f"Skipping idx_friendship_pair_status (probably exists): {e}")
+
+        try:
+            print("Adding idx_friendship_reverse_status...")
+            connection.execute(text(
+                "CREATE INDEX idx_friendship_reverse_status ON friendships (addressee_id, requester_id, status);"
+            ))
+            print("idx_friendship_reverse_status added.")
+        except Exception as e:
+            print(f"Skipping idx_friendship_reverse_status (probably exists): {e}")
+
+        # The single-column indexes are prefixes of the new composite ones
+        for name in ("idx_friendship_requester", "idx_friendship_addressee"):
+            try:
+                print(f"Dropping {name}...")
+                connection.execute(text(_drop_index_sql(name, "friendships")))
+                print(f"{name} dropped.")
+            except Exception as e:
+                print(f"Skipping {name} (probably dropped): {e}")
+
+        connection.commit()
+
+    print("Migration finished.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,52 @@
+import sys
+import os
+
+# Add backend directory to path so we can import shared modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from sqlalchemy import text
+from shared.database.core import engine
+
+def _drop_index_sql(name, table):
+    if engine.dialect.name == "sqlite":
+        return f"DROP INDEX {name};"
+    return f"DROP INDEX {name} ON {table};"
+
+def migrate():
+    print("Starting migration: Add trip list indexes...")
+
+    with engine.connect() as connection:
+        # We wrap in try-except to handle re-running
+
+        try:
+            print("Adding idx_trips_visibility_created...")
+            connection.execute(text(
+                "CREATE INDEX idx_trips_visibility_created ON trips (visibility, created_at, id);"
+            ))
+            print("idx_trips_visibility_created added.")
+        except Exception as e:
+            print(f"Skipping idx_trips_visibility_created (probably exists): {e}")
+
+        try:
+            print("Adding idx_trip_members_user_trip...")
+            connection.execute(text(
+                "CREATE INDEX idx_trip_members_user_trip ON trip_members (user_id, trip_id);"
+            ))
+            print("idx_trip_members_user_trip added.")
+        except Exception as e:
+            print(f"Skipping idx_trip_members_user_trip (probably exists): {e}")
+
+        # The single-column user_id index is a prefix of the new composite one
+        try:
+            print("Dropping ix_trip_members_user_id...")
+            connection.execute(text(_drop_index_sql("ix_trip_members_user_id", "trip_members")))
+            print("ix_trip_members_user_id dropped.")
+        except Exception as e:
+            print(f"Skipping ix_trip_members_user_id (probably dropped): {e}")
+
+        connection.commit()
+
+    print("Migration finished.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,36 @@
+import sys
+import os
+
+# Add backend directory to path so we can import shared modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from sqlalchemy import text
+from shared.database.core import engine
+
+def migrate():
+    print("Starting migration: Add keyset pagination indexes to posts table...")
+
+    with engine.connect() as connection:
+        # create_all does not add indexes to existing tables, so create them here.
+        # We wrap in try-except to handle re-running
+
+        try:
+            print("Adding idx_posts_feed...")
+            connection.execute(text("CREATE INDEX idx_posts_feed ON posts (visibility, is_deleted, created_at, id);"))
+            print("idx_posts_feed added.")
+        except Exception as e:
+            print(f"Skipping idx_posts_feed (probably exists): {e}")
+
+        try:
+            print("Adding idx_posts_author_feed...")
+            connection.execute(text("CREATE INDEX idx_posts_author_feed ON posts (author_id, is_deleted, created_at, id);"))
+            print("idx_posts_author_feed added.")
+        except Exception as e:
+            print(f"Skipping idx_posts_author_feed (probably exists): {e}")
+
+        connection.commit()
+
+    print("Migration finished.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,56 @@
+import sys
+import os
+
+# Add backend directory to path so we can import shared modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from sqlalchemy import text
+from shared.database.core import engine
+
+def migrate():
+    print("Starting migration: Add like/comment counters to posts table...")
+
+    with engine.connect() as connection:
+        # We wrap in try-except to handle re-running
+
+        try:
+            print("Adding like_count column...")
+            connection.execute(text("ALTER TABLE posts ADD COLUMN like_count INTEGER NOT NULL DEFAULT 0;"))
+            print("like_count added.")
+        except Exception as e:
+            print(f"Skipping like_count (probably exists): {e}")
+
+        try:
+            print("Adding comment_count column...")
+            connection.execute(text("ALTER TABLE posts ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0;"))
+            print("comment_count added.")
+        except Exception as e:
+            print(f"Skipping comment_count (probably exists): {e}")
+
+        # Duplicate likes must be removed before the unique index can be created
+        print("Removing duplicate likes...")
+        connection.execute(text(
+            "DELETE FROM likes WHERE id NOT IN ("
+            "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM likes GROUP BY post_id, user_id) AS k);"
+        ))
+
+        try:
+            print("Adding uq_likes_post_user...")
+            connection.execute(text("CREATE UNIQUE INDEX uq_likes_post_user ON likes (post_id, user_id);"))
+            print("uq_likes_post_user added.")
+        except Exception as e:
+            print(f"Skipping uq_likes_post_user (probably exists): {e}")
+
+        print("Backfilling counters...")
+        connection.execute(text(
+            "UPDATE posts SET "
+            "like_count = (SELECT COUNT(*) FROM likes WHERE likes.post_id = posts.id), "
+            "comment_count = (SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id AND comments.is_deleted = 0);"
+        ))
+
+        connection.commit()
+
+    print("Migration finished.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,42 @@
+import sys
+import os
+
+# Add backend directory to path so we can import shared modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from sqlalchemy import select
+from shared.database.core import engine, SessionLocal
+from shared.search.search_document_po import SearchDocumentPO
+from shared.search.i_search_index import DOC_TYPE_POST, DOC_TYPE_TRIP
+from shared.event_handler.search_index_sync_handler import SearchIndexSyncHandler
+from app_social.infrastructure.database.persistent_model.post_po import PostPO
+from app_travel.infrastructure.database.persistent_model.trip_po import TripPO
+
+BATCH_SIZE = 500
+
+def migrate():
+    print("Starting migration: Add full-text search index...")
+
+    # Creates search_documents; on SQLite the FTS5 table and sync triggers are
+    # attached to the table's after_create event, on MySQL the FULLTEXT (ngram) index.
+    print("Creating search_documents...")
+    SearchDocumentPO.__table__.create(bind=engine, checkfirst=True)
+
+    session = SessionLocal()
+    try:
+        post_ids = session.execute(select(PostPO.id).where(PostPO.is_deleted == False)).scalars().all()
+        trip_ids = session.execute(select(TripPO.id)).scalars().all()
+    finally:
+        session.close()
+
+    docs = [(DOC_TYPE_POST, pid) for pid in post_ids] + [(DOC_TYPE_TRIP, tid) for tid in trip_ids]
+    print(f"Backfilling {len(post_ids)} posts and {len(trip_ids)} trips...")
+
+    handler = SearchIndexSyncHandler(SessionLocal)
+    for start in range(0, len(docs), BATCH_SIZE):
+        handler.sync(docs[start:start + BATCH_SIZE])
+
+    print("Migration finished.")
+
+if __name__ == "__main__":
+    migrate()
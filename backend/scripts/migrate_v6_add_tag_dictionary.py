@@ -0,0 +1,99 @@
+import sys
+import os
+
+# Add backend directory to path so we can import shared modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from sqlalchemy import MetaData, Table, inspect, text
+from shared.database.core import engine
+from app_social.infrastructure.database.persistent_model.post_po import TagPO
+
+def has_old_tag_column(connection) -> bool:
+    return any(c["name"] == "tag" for c in inspect(connection).get_columns("post_tags"))
+
+def migrate():
+    print("Starting migration: Normalize post_tags into tags dictionary...")
+
+    # Create tags table (and its post_count index) if missing
+    TagPO.__table__.create(bind=engine, checkfirst=True)
+
+    with engine.connect() as connection:
+        # We wrap in try-except to handle re-running
+
+        try:
+            print("Adding tag_id column to post_tags...")
+            connection.execute(text("ALTER TABLE post_tags ADD COLUMN tag_id INTEGER REFERENCES tags(id);"))
+            print("tag_id added.")
+        except Exception as e:
+            print(f"Skipping tag_id (probably exists): {e}")
+
+        try:
+            print("Adding created_at column to post_tags...")
+            connection.execute(text("ALTER TABLE post_tags ADD COLUMN created_at DATETIME;"))
+            print("created_at added.")
+        except Exception as e:
+            print(f"Skipping created_at (probably exists): {e}")
+
+        if has_old_tag_column(connection):
+            print("Filling tags dictionary from post_tags.tag...")
+            connection.execute(text(
+                "INSERT INTO tags (name, post_count, created_at) "
+                "SELECT DISTINCT tag, 0, CURRENT_TIMESTAMP FROM post_tags "
+                "WHERE tag NOT IN (SELECT name FROM tags);"
+            ))
+            connection.execute(text(
+                "UPDATE post_tags SET "
+                "tag_id = (SELECT tags.id FROM tags WHERE tags.name = post_tags.tag), "
+                "created_at = (SELECT posts.created_at FROM posts WHERE posts.id = post_tags.post_id);"
+            ))
+            print("post_tags.tag_id filled.")
+        else:
+            print("Skipping tag backfill (old tag column already dropped)")
+
+        # Duplicate (post_id, tag_id) rows must be removed before the unique index can be created
+        print("Removing duplicate post tags...")
+        connection.execute(text(
+            "DELETE FROM post_tags WHERE id NOT IN ("
+            "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM post_tags GROUP BY post_id, tag_id) AS k);"
+        ))
+
+        try:
+            print("Adding uq_post_tags_post_tag...")
+            connection.execute(text("CREATE UNIQUE INDEX uq_post_tags_post_tag ON post_tags (post_id, tag_id);"))
+            print("uq_post_tags_post_tag added.")
+        except Exception as e:
+            print(f"Skipping uq_post_tags_post_tag (probably exists): {e}")
+
+        try:
+            print("Adding idx_post_tags_tag_created...")
+            connection.execute(text("CREATE INDEX idx_post_tags_tag_created ON post_tags (tag_id, created_at, post_id);"))
+            print("idx_post_tags_tag_created added.")
+        except Exception as e:
+            print(f"Skipping idx_post_tags_tag_created (probably exists): {e}")
+
+        print("Backfilling tag counters...")
+        connection.execute(text(
+            "UPDATE tags SET post_count = ("
+            "SELECT COUNT(*) FROM post_tags JOIN posts ON posts.id = post_tags.post_id "
+            "WHERE post_tags.tag_id = tags.id AND posts.is_deleted = 0 AND posts.visibility = 'public');"
+        ))
+
+        if has_old_tag_column(connection):
+            # SQLite refuses to drop a column that an index still refers to (ix_post_tags_tag)
+            post_tags = Table("post_tags", MetaData(), autoload_with=connection)
+            for index in list(post_tags.indexes):
+                if "tag" in index.columns:
+                    print(f"Dropping index {index.name}...")
+                    index.drop(bind=connection)
+            print("Dropping post_tags.tag column...")
+            connection.execute(text("ALTER TABLE post_tags DROP COLUMN tag;"))
+            print("tag dropped.")
+        else:
+            print("Skipping tag drop (already dropped)")
+
+        connection.commit()
+
+    print("Migration finished.")
+
+if __name__ == "__main__":
+    migrate()
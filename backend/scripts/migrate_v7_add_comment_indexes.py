@@ -0,0 +1,35 @@
+import sys
+import os
+
+# Add backend directory to path so we can import shared modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from sqlalchemy import text
+from shared.database.core import engine
+
+def migrate():
+    print("Starting migration: Add comment pagination indexes...")
+
+    with engine.connect() as connection:
+        # We wrap in try-except to handle re-running
+
+        try:
+            print("Adding idx_comments_post_created...")
+            connection.execute(text("CREATE INDEX idx_comments_post_created ON comments (post_id, created_at, id);"))
+            print("idx_comments_post_created added.")
+        except Exception as e:
+            print(f"Skipping idx_comments_post_created (probably exists): {e}")
+
+        try:
+            print("Adding idx_comments_parent_created...")
+            connection.execute(text("CREATE INDEX idx_comments_parent_created ON comments (parent_id, created_at, id);"))
+            print("idx_comments_parent_created added.")
+        except Exception as e:
+            print(f"Skipping idx_comments_parent_created (probably exists): {e}")
+
+        connection.commit()
+
+    print("Migration finished.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,21 @@
+import sys
+import os
+
+# Add backend directory to path so we can import shared modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from shared.database.core import engine
+from app_social.infrastructure.database.persistent_model.post_po import PostPO
+from app_social.infrastructure.database.persistent_model.timeline_po import TimelineEntryPO
+
+def migrate():
+    print("Starting migration: Add timeline_entries table...")
+
+    # Creates the table together with uq_timeline_owner_post / idx_timeline_owner_created.
+    # Timelines fill up from new posts; older posts are not backfilled.
+    TimelineEntryPO.__table__.create(bind=engine, checkfirst=True)
+
+    print("Migration finished.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,80 @@
+import sys
+import os
+
+# Add backend directory to path so we can import shared modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from datetime import datetime
+
+from sqlalchemy import text
+from shared.database.core import engine
+from app_social.domain.value_objects.hot_score_policy import HotScorePolicy
+
+BATCH_SIZE = 1000
+
+def _parse_datetime(value):
+    # Raw SQL on SQLite returns DATETIME columns as strings
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+def migrate():
+    print("Starting migration: Add share_count/hot_score to posts table...")
+
+    with engine.connect() as connection:
+        # We wrap in try-except to handle re-running
+
+        try:
+            print("Adding share_count column...")
+            connection.execute(text("ALTER TABLE posts ADD COLUMN share_count INTEGER NOT NULL DEFAULT 0;"))
+            print("share_count added.")
+        except Exception as e:
+            print(f"Skipping share_count (probably exists): {e}")
+
+        try:
+            print("Adding hot_score column...")
+            connection.execute(text("ALTER TABLE posts ADD COLUMN hot_score DOUBLE PRECISION NOT NULL DEFAULT 0;"))
+            print("hot_score added.")
+        except Exception as e:
+            print(f"Skipping hot_score (probably exists): {e}")
+
+        try:
+            print("Adding idx_posts_hot...")
+            connection.execute(text(
+                "CREATE INDEX idx_posts_hot ON posts (visibility, is_deleted, hot_score, id);"
+            ))
+            print("idx_posts_hot added.")
+        except Exception as e:
+            print(f"Skipping idx_posts_hot (probably exists): {e}")
+
+        print("Backfilling hot scores...")
+        policy = HotScorePolicy()
+        last_id = ''
+        while True:
+            rows = connection.execute(text(
+                "SELECT id, like_count, comment_count, share_count, created_at FROM posts "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit;"
+            ), {"last_id": last_id, "limit": BATCH_SIZE}).fetchall()
+            if not rows:
+                break
+            connection.execute(
+                text("UPDATE posts SET hot_score = :score WHERE id = :id;"),
+                [
+                    {
+                        "id": row.id,
+                        "score": policy.score(
+                            row.like_count or 0, row.comment_count or 0, row.share_count or 0,
+                            _parse_datetime(row.created_at)
+                        )
+                    }
+                    for row in rows
+                ]
+            )
+            last_id = rows[-1].id
+
+        connection.commit()
+
+    print("Migration finished.")
+
+if __name__ == "__main__":
+    migrate()
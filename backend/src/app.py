@@ -12,14 +12,20 @@ from app_auth.infrastructure.database.persistent_model.user_po import UserPO
 from app_social.infrastructure.database.persistent_model.post_po import PostPO, CommentPO, LikePO
 from app_social.infrastructure.database.persistent_model.conversation_po import ConversationPO
 from app_social.infrastructure.database.persistent_model.message_po import MessagePO
+from app_social.infrastructure.database.persistent_model.timeline_po import TimelineEntryPO
 # Travel
 from app_travel.infrastructure.database.persistent_model.trip_po import TripPO, TripMemberPO, TripDayPO, ActivityPO, TransitPO
+# Search
+from shared.search.search_document_po import SearchDocumentPO
 from app_travel.view.travel_view import travel_bp
 from app_social.view.social_view import social_bp
 from app_auth.view.auth_view import auth_bp
 from app_admin import admin_bp
-from shared.infrastructure.socket import socketio
+from shared.infrastructure.socket import socketio, init_socketio
 from app_social.infrastructure.socket.handlers import register_social_socket_handlers
+from shared.event_handler.search_index_sync_handler import register_search_index_handlers
+from app_social.domain.event_handler.timeline_fanout_handler import register_timeline_handlers
+from app_social.domain.event_handler.hot_score_handler import register_hot_score_handlers
 
 def create_app():
     # 配置静态文件目录
@@ -30,8 +36,11 @@ def create_app():
     CORS(app, supports_credentials=True)
     
     # Initialize SocketIO
-    socketio.init_app(app)
+    init_socketio(app)
     register_social_socket_handlers()
+    register_search_index_handlers()
+    register_timeline_handlers()
+    register_hot_score_handlers()
     
     # 确保上传目录存在
     upload_dir = os.path.join(app.static_folder, 'uploads')
@@ -1,5 +1,5 @@
 from app_auth.infrastructure.database.persistent_model.user_po import UserPO
-from app_social.infrastructure.database.persistent_model.post_po import PostPO, CommentPO, LikePO, PostImagePO, PostTagPO
+from app_social.infrastructure.database.persistent_model.post_po import PostPO, CommentPO, LikePO, PostImagePO, PostTagPO, TagPO
 from app_social.infrastructure.database.persistent_model.conversation_po import ConversationPO
 from app_social.infrastructure.database.persistent_model.message_po import MessagePO
 from app_travel.infrastructure.database.persistent_model.trip_po import TripPO, TripMemberPO, TripDayPO, ActivityPO, TransitPO
@@ -12,6 +12,7 @@ RESOURCE_MAP = {
     'likes': LikePO,
     'post_images': PostImagePO,
     'post_tags': PostTagPO,
+    'tags': TagPO,
     'conversations': ConversationPO,
     'messages': MessagePO,
     'trips': TripPO,
@@ -2,14 +2,16 @@
 Conversation 聚合根 - 会话管理
 
 管理私信对话，包含消息收发、已读状态等。
+已读状态以每位参与者的已读游标（ReadCursor）保存，消息的 read_by 由游标推导。
 """
 from datetime import datetime
 import uuid
 from typing import List, Optional, Set, Dict
 
 from app_social.domain.value_objects.social_value_objects import (
-    ConversationId, MessageContent, ConversationType, ConversationRole
+    ConversationId, MessageContent, ConversationType, ConversationRole, ReadCursor
 )
+from app_social.domain.value_objects.participant_change_set import ParticipantChangeSet
 from app_social.domain.entity.message_entity import Message
 from app_social.domain.domain_event.social_events import (
     DomainEvent, ConversationCreatedEvent, MessageSentEvent,
@@ -43,6 +45,11 @@ class Conversation:
         self._last_message_at = last_message_at
         self._title = title
         self._messages: List[Message] = []
+        self._read_cursors: Dict[str, ReadCursor] = {}
+        self._dirty_read_cursors: Set[str] = set()
+        # 已持久化的参与者快照，用于计算成员变更（新会话为空）
+        self._is_new = True
+        self._persisted_participants: Dict[str, ConversationRole] = {}
         self._domain_events: List[DomainEvent] = []
         
         # 验证群聊必须有群主
@@ -130,9 +137,14 @@ class Conversation:
         conversation_type: ConversationType = ConversationType.PRIVATE,
         created_at: Optional[datetime] = None,
         last_message_at: Optional[datetime] = None,
-        title: Optional[str] = None
+        title: Optional[str] = None,
+        read_cursors: Optional[Dict[str, ReadCursor]] = None
     ) -> 'Conversation':
-        """从持久化数据重建会话"""
+        """从持久化数据重建会话
+        
+        Args:
+            read_cursors: 参与者已读游标，消息的 read_by 据此推导
+        """
         conv = cls(
             conversation_id=conversation_id,
             participants=participants,
@@ -142,6 +154,13 @@ class Conversation:
             title=title
         )
         conv._messages = messages
+        conv._is_new = False
+        conv._persisted_participants = dict(participants)
+        conv._read_cursors = dict(read_cursors or {})
+        for user_id, cursor in conv._read_cursors.items():
+            for message in messages:
+                if cursor.covers(message.sent_at, message.message_id):
+                    message.read_by.add(user_id)
         return conv
     
     # ==================== 属性访问器 ====================
@@ -193,6 +212,10 @@ class Conversation:
     def is_group(self) -> bool:
         return self._conversation_type == ConversationType.GROUP
     
+    def get_read_cursor(self, user_id: str) -> Optional[ReadCursor]:
+        """获取参与者的已读游标，从未读过返回 None"""
+        return self._read_cursors.get(user_id)
+    
     # ==================== 消息管理 ====================
     
     def send_message(self, sender_id: str, content: MessageContent) -> Message:
@@ -267,14 +290,19 @@ class Conversation:
             raise ValueError("User is not a participant")
         
         count = 0
+        last_read = None
         for message in self._messages:
             if message.is_deleted:
                 continue
             if message.mark_read_by(user_id):
                 count += 1
+            last_read = message
             if up_to_message_id and message.message_id == up_to_message_id:
                 break
         
+        if last_read:
+            self._advance_read_cursor(user_id, ReadCursor(last_read.message_id, last_read.sent_at))
+        
         if count > 0:
             self._add_event(MessagesReadEvent(
                 conversation_id=self._id.value,
@@ -284,6 +312,70 @@ class Conversation:
         
         return count
     
+    def mark_read_until(self, user_id: str, message: Message) -> bool:
+        """把用户的已读游标前移到指定消息（消息不必已加载到聚合中）
+        
+        Args:
+            user_id: 用户ID
+            message: 读到的最后一条消息
+            
+        Returns:
+            游标是否前移
+        """
+        if user_id not in self._participants:
+            raise ValueError("User is not a participant")
+        
+        if not self._advance_read_cursor(user_id, ReadCursor(message.message_id, message.sent_at)):
+            return False
+        
+        self._add_event(MessagesReadEvent(
+            conversation_id=self._id.value,
+            user_id=user_id,
+            up_to_message_id=message.message_id
+        ))
+        return True
+    
+    def is_read_by(self, user_id: str, message: Message) -> bool:
+        """按已读游标判断消息是否已被用户读取（发送者总是已读）"""
+        if message.sender_id == user_id or message.is_read_by(user_id):
+            return True
+        cursor = self._read_cursors.get(user_id)
+        return bool(cursor and cursor.covers(message.sent_at, message.message_id))
+    
+    def _advance_read_cursor(self, user_id: str, cursor: ReadCursor) -> bool:
+        """前移已读游标（不会后退），返回是否前移"""
+        current = self._read_cursors.get(user_id)
+        if current and current.covers(cursor.read_at, cursor.message_id):
+            return False
+        self._read_cursors[user_id] = cursor
+        self._dirty_read_cursors.add(user_id)
+        return True
+    
+    def pop_read_cursor_changes(self) -> Dict[str, ReadCursor]:
+        """取出自上次持久化以来前移过的已读游标（供仓储做定向更新）"""
+        changes = {uid: self._read_cursors[uid] for uid in self._dirty_read_cursors if uid in self._read_cursors}
+        self._dirty_read_cursors.clear()
+        return changes
+    
+    def pop_participant_changes(self) -> ParticipantChangeSet:
+        """取出自上次持久化以来的参与者变更并重置快照
+        
+        由仓储在保存时调用；调用后参与者视为已持久化。
+        """
+        old = self._persisted_participants
+        changes = ParticipantChangeSet(
+            is_new=self._is_new,
+            added=tuple((uid, role) for uid, role in self._participants.items() if uid not in old),
+            removed=tuple(uid for uid in old if uid not in self._participants),
+            role_changes=tuple(
+                (uid, role) for uid, role in self._participants.items()
+                if uid in old and old[uid] != role
+            )
+        )
+        self._is_new = False
+        self._persisted_participants = dict(self._participants)
+        return changes
+    
     def get_unread_count(self, user_id: str) -> int:
         """获取未读消息数量"""
         if user_id not in self._participants:
@@ -367,6 +459,8 @@ class Conversation:
         # 用户需求里没强制说不能把群变成1人，通常允许。
         
         del self._participants[user_id]
+        self._read_cursors.pop(user_id, None)
+        self._dirty_read_cursors.discard(user_id)
         
         self._add_event(ParticipantRemovedEvent(
             conversation_id=self._id.value,
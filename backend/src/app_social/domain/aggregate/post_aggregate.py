@@ -4,8 +4,9 @@ Post 聚合根 - 充血模型
 管理帖子及其评论、点赞。
 可关联到旅行(trip_id)作为游记。
 """
+from collections import Counter
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import uuid
 
 from app_social.domain.value_objects.social_value_objects import (
@@ -13,6 +14,7 @@ from app_social.domain.value_objects.social_value_objects import (
 )
 from app_social.domain.entity.comment_entity import Comment
 from app_social.domain.entity.like_entity import Like
+from app_social.domain.value_objects.post_change_set import PostChangeSet
 from app_social.domain.domain_event.social_events import (
     DomainEvent, PostCreatedEvent, PostUpdatedEvent, PostDeletedEvent,
     PostVisibilityChangedEvent, CommentAddedEvent, CommentRemovedEvent,
@@ -24,6 +26,7 @@ class Post:
     """帖子聚合根 - 充血模型
     
     包含帖子及其评论、点赞的所有业务逻辑。
+    同时跟踪子实体的增删（见 pop_changes），供仓储做增量持久化。
     """
     
     def __init__(
@@ -47,7 +50,21 @@ class Post:
         self._is_deleted = is_deleted
         self._comments: List[Comment] = []
         self._likes: List[Like] = []
+        # 反规范化计数器，与 posts.like_count / posts.comment_count 对应
+        self._like_count = 0
+        self._comment_count = 0
         self._domain_events: List[DomainEvent] = []
+        
+        # 变更跟踪：自上次持久化以来的子实体增删
+        self._is_new = True
+        self._persisted_content = content
+        self._persisted_comment_count = 0
+        self._persisted_is_deleted = is_deleted
+        self._persisted_visibility = visibility
+        self._added_comments: Dict[str, Comment] = {}
+        self._updated_comments: Dict[str, Comment] = {}
+        self._added_likes: List[Like] = []
+        self._removed_like_user_ids: List[str] = []
     
     # ==================== 工厂方法 ====================
     
@@ -105,9 +122,15 @@ class Post:
         trip_id: Optional[str] = None,
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None,
-        is_deleted: bool = False
+        is_deleted: bool = False,
+        like_count: Optional[int] = None,
+        comment_count: Optional[int] = None
     ) -> 'Post':
-        """从持久化数据重建帖子"""
+        """从持久化数据重建帖子
+        
+        like_count / comment_count 未提供时由 likes / comments 集合计算。
+        仅加载头信息时（不含子实体），应传入持久化的计数器。
+        """
         post = cls(
             post_id=post_id,
             author_id=author_id,
@@ -120,6 +143,13 @@ class Post:
         )
         post._comments = comments
         post._likes = likes
+        post._like_count = like_count if like_count is not None else len(likes)
+        post._comment_count = (
+            comment_count if comment_count is not None
+            else len([c for c in comments if not c.is_deleted])
+        )
+        post._is_new = False
+        post._persisted_comment_count = post._comment_count
         return post
     
     # ==================== 属性访问器 ====================
@@ -166,11 +196,11 @@ class Post:
     
     @property
     def like_count(self) -> int:
-        return len(self._likes)
+        return self._like_count
     
     @property
     def comment_count(self) -> int:
-        return len([c for c in self._comments if not c.is_deleted])
+        return self._comment_count
     
     @property
     def is_travel_log(self) -> bool:
@@ -230,7 +260,8 @@ class Post:
         self,
         commenter_id: str,
         content: str,
-        parent_comment_id: Optional[str] = None
+        parent_comment_id: Optional[str] = None,
+        parent_comment: Optional[Comment] = None
     ) -> Comment:
         """添加评论
         
@@ -238,6 +269,7 @@ class Post:
             commenter_id: 评论者ID
             content: 评论内容
             parent_comment_id: 回复的评论ID（可选）
+            parent_comment: 单独查询到的父评论（可选，聚合只加载头信息时使用）
             
         Returns:
             创建的评论实体
@@ -248,6 +280,10 @@ class Post:
         # 如果是回复，检查父评论是否存在
         if parent_comment_id:
             parent = self._find_comment(parent_comment_id)
+            if parent is None and parent_comment is not None \
+                    and parent_comment.comment_id == parent_comment_id \
+                    and parent_comment.post_id == self._id.value:
+                parent = parent_comment
             if not parent or parent.is_deleted:
                 raise ValueError("Parent comment not found or deleted")
         
@@ -260,6 +296,8 @@ class Post:
         )
         
         self._comments.append(comment)
+        self._added_comments[comment.comment_id] = comment
+        self._comment_count += 1
         self._updated_at = datetime.now(timezone.utc)
         
         self._add_event(CommentAddedEvent(
@@ -289,7 +327,12 @@ class Post:
         if operator_id not in [comment.author_id, self._author_id]:
             raise ValueError("Not authorized to delete this comment")
         
+        if not comment.is_deleted:
+            self._comment_count = max(0, self._comment_count - 1)
         comment.soft_delete()
+        # 本次新增的评论随插入一并写入删除状态
+        if comment.comment_id not in self._added_comments:
+            self._updated_comments[comment.comment_id] = comment
         self._updated_at = datetime.now(timezone.utc)
         
         self._add_event(CommentRemovedEvent(
@@ -328,14 +371,11 @@ class Post:
             post_id=self._id.value
         )
         self._likes.append(like)
-        
-        # 仅当非自己点赞时发布事件
-        if user_id != self._author_id:
-            self._add_event(PostLikedEvent(
-                post_id=self._id.value,
-                user_id=user_id,
-                post_author_id=self._author_id
-            ))
+        if user_id in self._removed_like_user_ids:
+            self._removed_like_user_ids.remove(user_id)
+        else:
+            self._added_likes.append(like)
+        self.record_like(user_id)
         
         return True
     
@@ -350,13 +390,41 @@ class Post:
             return False
         
         self._likes.remove(like)
+        if like in self._added_likes:
+            self._added_likes.remove(like)
+        else:
+            self._removed_like_user_ids.append(user_id)
+        self.record_unlike(user_id)
+        
+        return True
+    
+    def record_like(self, user_id: str) -> None:
+        """记录一次新点赞（更新计数并发布事件）
+        
+        不依赖点赞集合：仓储已通过唯一约束确认这是一次新点赞时，
+        可在只加载了头信息的帖子上直接调用。
+        """
+        if self._is_deleted:
+            raise ValueError("Cannot like deleted post")
+        
+        self._like_count += 1
+        
+        # 仅当非自己点赞时发布事件
+        if user_id != self._author_id:
+            self._add_event(PostLikedEvent(
+                post_id=self._id.value,
+                user_id=user_id,
+                post_author_id=self._author_id
+            ))
+    
+    def record_unlike(self, user_id: str) -> None:
+        """记录一次取消点赞（更新计数并发布事件）"""
+        self._like_count = max(0, self._like_count - 1)
         
         self._add_event(PostUnlikedEvent(
             post_id=self._id.value,
             user_id=user_id
         ))
-        
-        return True
     
     def is_liked_by(self, user_id: str) -> bool:
         """检查是否被某用户点赞"""
@@ -415,6 +483,56 @@ class Post:
         """检查用户是否可以编辑此帖子"""
         return user_id == self._author_id and not self._is_deleted
     
+    # ==================== 变更跟踪 ====================
+    
+    @property
+    def is_tag_counted(self) -> bool:
+        """是否计入标签计数（热门标签对匿名用户可见，只统计公开且未删除的帖子）"""
+        return self._counts_for_tags(self._visibility, self._is_deleted)
+    
+    @staticmethod
+    def _counts_for_tags(visibility: PostVisibility, is_deleted: bool) -> bool:
+        return visibility == PostVisibility.PUBLIC and not is_deleted
+    
+    def pop_changes(self) -> PostChangeSet:
+        """取出自上次持久化以来的变更集并重置跟踪状态
+        
+        由仓储在保存时调用；调用后聚合视为已持久化。
+        """
+        if self._is_new:
+            changes = PostChangeSet(is_new=True, is_tag_counted=self.is_tag_counted)
+        else:
+            old_images = Counter(enumerate(self._persisted_content.images))
+            new_images = Counter(enumerate(self._content.images))
+            # 标签按集合比较：帖子与标签是 (post_id, tag_id) 唯一关联
+            old_tags = dict.fromkeys(self._persisted_content.tags)
+            new_tags = dict.fromkeys(self._content.tags)
+            changes = PostChangeSet(
+                added_comments=tuple(self._added_comments.values()),
+                updated_comments=tuple(self._updated_comments.values()),
+                added_likes=tuple(self._added_likes),
+                removed_like_user_ids=tuple(self._removed_like_user_ids),
+                added_images=tuple((new_images - old_images).elements()),
+                removed_images=tuple((old_images - new_images).elements()),
+                added_tags=tuple(t for t in new_tags if t not in old_tags),
+                removed_tags=tuple(t for t in old_tags if t not in new_tags),
+                like_delta=len(self._added_likes) - len(self._removed_like_user_ids),
+                comment_delta=self._comment_count - self._persisted_comment_count,
+                was_tag_counted=self._counts_for_tags(self._persisted_visibility, self._persisted_is_deleted),
+                is_tag_counted=self.is_tag_counted
+            )
+        
+        self._is_new = False
+        self._persisted_content = self._content
+        self._persisted_comment_count = self._comment_count
+        self._persisted_is_deleted = self._is_deleted
+        self._persisted_visibility = self._visibility
+        self._added_comments.clear()
+        self._updated_comments.clear()
+        self._added_likes.clear()
+        self._removed_like_user_ids.clear()
+        return changes
+    
     # ==================== 事件管理 ====================
     
     def _add_event(self, event: DomainEvent) -> None:
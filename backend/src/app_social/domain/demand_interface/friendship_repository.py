@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 from app_social.domain.aggregate.friendship_aggregate import Friendship
 from app_social.domain.value_objects.friendship_value_objects import FriendshipId, Relation
 
@@ -17,6 +17,11 @@ class IFriendshipRepository(ABC):
         """Find friendship between two users regardless of who is requester."""
         pass
 
+    @abstractmethod
+    def find_accepted_among(self, user_id: str, candidate_ids: Iterable[str]) -> Set[str]:
+        """Return the candidate ids that are accepted friends of user_id (one query)."""
+        pass
+
     @abstractmethod
     def find_pending_requests(self, user_id: str, type: str = 'incoming') -> List[Friendship]:
         """
@@ -29,3 +34,8 @@ class IFriendshipRepository(ABC):
     def find_friends(self, user_id: str) -> List[str]:
         """Return list of friend user_ids."""
         pass
+
+    @abstractmethod
+    def count_friends(self, user_ids: List[str]) -> Dict[str, int]:
+        """Return {user_id: accepted friend count}; users without friends are omitted."""
+        pass
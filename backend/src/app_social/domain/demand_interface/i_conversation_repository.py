@@ -2,10 +2,13 @@
 会话仓库接口
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from app_social.domain.aggregate.conversation_aggregate import Conversation
+from app_social.domain.entity.message_entity import Message
 from app_social.domain.value_objects.social_value_objects import ConversationId
+from app_social.domain.value_objects.conversation_summary import ConversationSummary
 
 
 class IConversationRepository(ABC):
@@ -16,11 +19,53 @@ class IConversationRepository(ABC):
         """保存会话（新增或更新）"""
         pass
     
+    @abstractmethod
+    def save_read_state(self, conversation: Conversation) -> bool:
+        """只持久化会话中前移过的已读游标（标记已读的快速路径）
+        
+        Returns:
+            是否有游标被更新
+        """
+        pass
+    
     @abstractmethod
     def find_by_id(self, conversation_id: ConversationId) -> Optional[Conversation]:
         """根据ID查找会话"""
         pass
     
+    @abstractmethod
+    def find_header_by_id(self, conversation_id: ConversationId) -> Optional[Conversation]:
+        """查找会话头信息
+        
+        返回的 Conversation 不包含消息集合，只用于校验成员与追加消息。
+        """
+        pass
+    
+    @abstractmethod
+    def append_message(self, conversation: Conversation, message: Message) -> None:
+        """持久化刚追加到会话的一条新消息（发送消息的快速路径）"""
+        pass
+    
+    @abstractmethod
+    def find_messages(
+        self,
+        conversation_id: ConversationId,
+        limit: int = 50,
+        before: Optional[Tuple[datetime, str]] = None,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Message]:
+        """按消息游标分页读取会话消息
+        
+        默认返回最近 limit 条；before / after 为 (sent_at, 消息ID)，
+        分别读取游标之前或之后的一页。结果按发送时间正序。
+        """
+        pass
+    
+    @abstractmethod
+    def find_message(self, conversation_id: ConversationId, message_id: str) -> Optional[Message]:
+        """按ID查找会话内的单条消息（不属于该会话或已删除时返回 None）"""
+        pass
+    
     @abstractmethod
     def find_by_participants(self, user_id1: str, user_id2: str) -> Optional[Conversation]:
         """查找两人之间的私聊
@@ -47,6 +92,19 @@ class IConversationRepository(ABC):
         """
         pass
     
+    @abstractmethod
+    def find_inbox(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[ConversationSummary]:
+        """获取用户收件箱摘要
+        
+        按最后消息时间倒序排列，不加载消息集合。
+        """
+        pass
+    
     @abstractmethod
     def find_by_user_with_unread(self, user_id: str) -> List[Conversation]:
         """获取用户有未读消息的会话"""
@@ -2,10 +2,14 @@
 帖子仓库接口
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple, Dict, Any
+from datetime import datetime
 
 from app_social.domain.aggregate.post_aggregate import Post
+from app_social.domain.entity.comment_entity import Comment
 from app_social.domain.value_objects.social_value_objects import PostId, PostVisibility
+from app_social.domain.value_objects.post_feed_card import PostFeedCard
+from app_social.domain.value_objects.hot_score_policy import HotScorePolicy
 
 
 class IPostRepository(ABC):
@@ -21,13 +25,32 @@ class IPostRepository(ABC):
         """根据ID查找帖子"""
         pass
     
+    @abstractmethod
+    def find_header_by_id(self, post_id: PostId) -> Optional[Post]:
+        """查找帖子头信息
+        
+        返回的 Post 不包含评论/点赞集合，like_count / comment_count 取自持久化计数器。
+        """
+        pass
+    
+    @abstractmethod
+    def add_like(self, post_id: PostId, user_id: str) -> bool:
+        """新增点赞（定向插入 + 原子计数），已点赞返回 False"""
+        pass
+    
+    @abstractmethod
+    def remove_like(self, post_id: PostId, user_id: str) -> bool:
+        """取消点赞（定向删除 + 原子计数），未点赞返回 False"""
+        pass
+    
     @abstractmethod
     def find_by_author(
         self,
         author_id: str,
         include_deleted: bool = False,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        before: Optional[Tuple[datetime, str]] = None
     ) -> List[Post]:
         """查找用户的帖子
         
@@ -35,7 +58,8 @@ class IPostRepository(ABC):
             author_id: 作者ID
             include_deleted: 是否包含已删除的帖子
             limit: 每页数量
-            offset: 偏移量
+            offset: 偏移量（提供 before 时忽略）
+            before: keyset 游标位置 (created_at, id)
         """
         pass
     
@@ -49,14 +73,110 @@ class IPostRepository(ABC):
         self,
         limit: int = 20,
         offset: int = 0,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None
     ) -> List[Post]:
         """获取公开帖子流
         
         Args:
             limit: 每页数量
-            offset: 偏移量
+            offset: 偏移量（提供 before 时忽略）
             tags: 标签筛选（可选）
+            search_query: 搜索关键词（可选）
+            before: keyset 游标位置 (created_at, id)
+        """
+        pass
+    
+    @abstractmethod
+    def find_feed_cards(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        tags: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        viewer_id: Optional[str] = None,
+        author_id: Optional[str] = None,
+        visibilities: Optional[List[str]] = None,
+        author_ids: Optional[List[str]] = None,
+        post_ids: Optional[List[str]] = None,
+        sort: str = 'latest'
+    ) -> List[PostFeedCard]:
+        """获取帖子卡片投影（列表页使用）
+        
+        Args:
+            limit: 每页数量
+            offset: 偏移量（提供 before 时忽略）
+            tags: 标签筛选（可选）
+            search_query: 搜索关键词（可选）
+            before: keyset 游标位置 (created_at, id)
+            viewer_id: 当前用户ID，用于计算是否已点赞
+            author_id: 仅查询该作者的帖子（可选）
+            visibilities: 允许的可见性，None 表示不限
+            author_ids: 仅查询这些作者的帖子（可选）
+            post_ids: 仅查询这些帖子（可选）
+            sort: 'latest' 按发布时间，'hot' 按热度分（before 为 (hot_score, id)）
+        """
+        pass
+    
+    @abstractmethod
+    def find_comments(
+        self,
+        post_id: PostId,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, str]] = None,
+        parent_id: Optional[str] = None
+    ) -> List[Comment]:
+        """分页查询帖子的未删除评论，按时间升序
+        
+        Args:
+            post_id: 帖子ID
+            limit: 每页数量
+            after: keyset 游标位置 (created_at, id)
+            parent_id: 为 None 时查询顶层评论，否则查询该评论的回复
+        """
+        pass
+    
+    @abstractmethod
+    def find_comment(self, post_id: PostId, comment_id: str) -> Optional[Comment]:
+        """查询帖子下的单条评论（含已删除），不存在返回 None"""
+        pass
+    
+    @abstractmethod
+    def count_replies(self, comment_ids: List[str]) -> Dict[str, int]:
+        """批量统计评论的回复数，返回 {评论ID: 回复数}"""
+        pass
+    
+    @abstractmethod
+    def is_liked_by(self, post_id: PostId, user_id: str) -> bool:
+        """检查用户是否已点赞帖子"""
+        pass
+    
+    @abstractmethod
+    def increment_share_count(self, post_id: PostId) -> None:
+        """原子递增分享数"""
+        pass
+    
+    @abstractmethod
+    def refresh_hot_scores(self, post_ids: List[str], policy: HotScorePolicy) -> None:
+        """按当前互动计数重算并写回热度分
+        
+        Args:
+            post_ids: 帖子ID列表
+            policy: 热度分策略
+        """
+        pass
+    
+    @abstractmethod
+    def find_popular_tags(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """获取热门标签
+        
+        Args:
+            limit: 数量限制
+            
+        Returns:
+            [{"name": 标签名, "post_count": 未删除帖子数}]，按 post_count 降序
         """
         pass
     
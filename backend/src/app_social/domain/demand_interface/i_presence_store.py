@@ -0,0 +1,59 @@
+"""
+在线状态存储接口
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+from app_social.domain.value_objects.user_presence import UserPresence
+
+
+class IPresenceStore(ABC):
+    """在线状态存储接口
+
+    按用户记录 socket 连接（连接数、最近在线时间），
+    并为离线用户暂存通知，待其重新连接时投递。
+    多 worker 部署时需使用共享后端，单进程可使用内存实现。
+    """
+
+    @property
+    @abstractmethod
+    def is_shared(self) -> bool:
+        """是否在多个进程之间共享（否则只能看到本进程的连接）"""
+        pass
+
+    @abstractmethod
+    def connect(self, user_id: str, sid: str) -> int:
+        """登记一个连接
+
+        Args:
+            user_id: 用户ID
+            sid: socket 会话ID
+
+        Returns:
+            该用户当前连接数
+        """
+        pass
+
+    @abstractmethod
+    def disconnect(self, user_id: str, sid: str) -> int:
+        """注销一个连接（未登记的 sid 忽略）
+
+        Returns:
+            该用户剩余连接数
+        """
+        pass
+
+    @abstractmethod
+    def get_many(self, user_ids: List[str]) -> Dict[str, UserPresence]:
+        """批量查询在线状态（未知用户返回离线状态）"""
+        pass
+
+    @abstractmethod
+    def push_offline(self, user_id: str, notification: Dict[str, Any]) -> None:
+        """为离线用户暂存一条通知（超出上限时丢弃最旧的）"""
+        pass
+
+    @abstractmethod
+    def pop_offline(self, user_id: str) -> List[Dict[str, Any]]:
+        """取出并清空用户暂存的通知（按暂存顺序）"""
+        pass
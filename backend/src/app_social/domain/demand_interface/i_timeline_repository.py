@@ -0,0 +1,45 @@
+"""
+时间线仓库接口
+"""
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from datetime import datetime
+
+
+class ITimelineRepository(ABC):
+    """时间线仓库接口
+
+    时间线是帖子的读模型：只保存 (用户, 帖子, 帖子创建时间)，
+    帖子内容在读取时按ID批量获取。
+    """
+
+    @abstractmethod
+    def fan_out(self, post_id: str, author_id: str, created_at: datetime, owner_ids: List[str]) -> None:
+        """将帖子写入多位用户的时间线
+
+        Args:
+            post_id: 帖子ID
+            author_id: 作者ID
+            created_at: 帖子创建时间（时间线排序键）
+            owner_ids: 时间线所属用户ID列表
+        """
+        pass
+
+    @abstractmethod
+    def find_entries(
+        self,
+        owner_id: str,
+        limit: int = 20,
+        before: Optional[Tuple[datetime, str]] = None
+    ) -> List[Tuple[datetime, str]]:
+        """分页查询用户时间线
+
+        Args:
+            owner_id: 时间线所属用户ID
+            limit: 每页数量
+            before: keyset 游标位置 (created_at, post_id)
+
+        Returns:
+            按时间降序的 (created_at, post_id) 列表
+        """
+        pass
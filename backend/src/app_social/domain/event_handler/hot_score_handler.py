@@ -0,0 +1,96 @@
+"""
+热度分更新事件处理器
+
+帖子被点赞/评论/分享后，按当前计数器重算其热度分（posts.hot_score）。
+"""
+from typing import Callable, Iterable, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from shared.database.core import SessionLocal
+from shared.event_bus import get_event_bus
+from shared.event_handler.after_commit_handler import AfterCommitHandler
+from app_social.domain.domain_event.social_events import (
+    PostLikedEvent, PostUnlikedEvent, CommentAddedEvent, CommentRemovedEvent, PostSharedEvent
+)
+from app_social.domain.value_objects.hot_score_policy import HotScorePolicy
+from app_social.infrastructure.database.dao_impl.sqlalchemy_post_dao import SqlAlchemyPostDao
+from app_social.infrastructure.database.repository_impl.post_repository_impl import PostRepositoryImpl
+
+
+_ENGAGEMENT_EVENTS = (
+    PostLikedEvent, PostUnlikedEvent, CommentAddedEvent, CommentRemovedEvent, PostSharedEvent
+)
+
+
+class HotScoreHandler(AfterCommitHandler):
+    """热度分更新事件处理器
+
+    处理：
+    - 点赞/取消点赞
+    - 评论添加/删除
+    - 分享
+
+    时间衰减已编码在分数的时间偏移中，没有互动的帖子无需定期重算；
+    只有发生互动的帖子在业务会话提交后按计数器重算一次。
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        policy: Optional[HotScorePolicy] = None
+    ):
+        """
+        Args:
+            session_factory: 创建更新用会话的工厂
+            policy: 热度分策略，默认使用 HotScorePolicy()
+        """
+        super().__init__(session_factory)
+        self._policy = policy or HotScorePolicy()
+
+    def handle_engagement(self, event) -> None:
+        """处理点赞/评论/分享事件"""
+        self._mark(event.post_id)
+
+    def process(self, pending: Set[str]) -> None:
+        """业务会话提交后重算本线程累积的帖子"""
+        self.refresh(pending)
+
+    def refresh(self, post_ids: Iterable[str]) -> None:
+        """按当前计数器重算帖子热度分
+
+        Args:
+            post_ids: 帖子ID列表
+        """
+        session = self.open_session()
+        try:
+            post_repo = PostRepositoryImpl(SqlAlchemyPostDao(session))
+            post_repo.refresh_hot_scores(list(post_ids), self._policy)
+            session.commit()
+        except Exception as e:
+            # 记录错误但不影响已提交的业务事务
+            session.rollback()
+            print(f"Failed to refresh hot scores: {e}")
+        finally:
+            self.close_session(session)
+
+
+def register_hot_score_handlers(
+    session_factory: Callable[[], Session] = SessionLocal,
+    policy: Optional[HotScorePolicy] = None
+) -> HotScoreHandler:
+    """订阅帖子互动事件，并在会话提交后更新热度分"""
+    bus = get_event_bus()
+    handler = HotScoreHandler(session_factory, policy)
+    for event_type in _ENGAGEMENT_EVENTS:
+        bus.subscribe(event_type.__name__, handler.handle_engagement)
+    handler.listen()
+    return handler
+
+
+def unregister_hot_score_handlers(handler: HotScoreHandler) -> None:
+    """取消 register_hot_score_handlers 的订阅（主要用于测试）"""
+    bus = get_event_bus()
+    for event_type in _ENGAGEMENT_EVENTS:
+        bus.unsubscribe(event_type.__name__, handler.handle_engagement)
+    handler.unlisten()
@@ -0,0 +1,104 @@
+"""
+时间线写扩散事件处理器
+
+帖子创建后，将其写入作者及其好友的物化时间线（timeline_entries）。
+"""
+from typing import Callable, Iterable, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from shared.database.core import SessionLocal
+from shared.event_bus import get_event_bus
+from shared.event_handler.after_commit_handler import AfterCommitHandler
+from app_social.domain.domain_event.social_events import PostCreatedEvent
+from app_social.domain.value_objects.social_value_objects import PostId, PostVisibility
+from app_social.domain.value_objects.timeline_policy import TimelinePolicy
+from app_social.infrastructure.database.dao_impl.sqlalchemy_post_dao import SqlAlchemyPostDao
+from app_social.infrastructure.database.dao_impl.sqlalchemy_friendship_dao import SqlAlchemyFriendshipDao
+from app_social.infrastructure.database.dao_impl.sqlalchemy_timeline_dao import SqlAlchemyTimelineDao
+from app_social.infrastructure.database.repository_impl.post_repository_impl import PostRepositoryImpl
+from app_social.infrastructure.database.repository_impl.friendship_repository_impl import FriendshipRepositoryImpl
+from app_social.infrastructure.database.repository_impl.timeline_repository_impl import TimelineRepositoryImpl
+
+
+class TimelineFanoutHandler(AfterCommitHandler):
+    """时间线写扩散事件处理器
+
+    处理：
+    - 帖子创建（仅自己可见的帖子不分发）
+
+    帖子总是写入作者自己的时间线；作者好友数不超过策略阈值时，
+    再写入每位已接受好友的时间线，否则由好友读取时读扩散。
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        policy: Optional[TimelinePolicy] = None
+    ):
+        """
+        Args:
+            session_factory: 创建分发用会话的工厂
+            policy: 分发策略，默认从环境变量读取
+        """
+        super().__init__(session_factory)
+        self._policy = policy or TimelinePolicy.from_env()
+
+    def handle_post_created(self, event: PostCreatedEvent) -> None:
+        """处理帖子创建事件"""
+        if event.visibility == PostVisibility.PRIVATE.value:
+            return
+        self._mark(event.post_id)
+
+    def process(self, pending: Set[str]) -> None:
+        """业务会话提交后分发本线程累积的帖子"""
+        self.fan_out(pending)
+
+    def fan_out(self, post_ids: Iterable[str]) -> None:
+        """将帖子写入作者及其好友的时间线
+
+        Args:
+            post_ids: 帖子ID列表
+        """
+        session = self.open_session()
+        try:
+            post_repo = PostRepositoryImpl(SqlAlchemyPostDao(session))
+            friend_repo = FriendshipRepositoryImpl(SqlAlchemyFriendshipDao(session))
+            timeline_repo = TimelineRepositoryImpl(SqlAlchemyTimelineDao(session))
+            
+            for post_id in post_ids:
+                post = post_repo.find_header_by_id(PostId(post_id))
+                if not post or post.is_deleted:
+                    continue
+                
+                owner_ids = [post.author_id]
+                # 先用计数判断是否大V，避免为大V加载完整好友列表
+                friend_count = friend_repo.count_friends([post.author_id]).get(post.author_id, 0)
+                if friend_count and self._policy.should_fan_out(friend_count):
+                    owner_ids.extend(friend_repo.find_friends(post.author_id))
+                timeline_repo.fan_out(post_id, post.author_id, post.created_at, owner_ids)
+            
+            session.commit()
+        except Exception as e:
+            # 记录错误但不影响已提交的业务事务
+            session.rollback()
+            print(f"Failed to fan out posts to timelines: {e}")
+        finally:
+            self.close_session(session)
+
+
+def register_timeline_handlers(
+    session_factory: Callable[[], Session] = SessionLocal,
+    policy: Optional[TimelinePolicy] = None
+) -> TimelineFanoutHandler:
+    """订阅帖子创建事件，并在会话提交后写扩散到时间线"""
+    handler = TimelineFanoutHandler(session_factory, policy)
+    get_event_bus().subscribe(PostCreatedEvent.__name__, handler.handle_post_created)
+    handler.listen()
+    return handler
+
+
+def unregister_timeline_handlers(handler: TimelineFanoutHandler) -> None:
+    """取消 register_timeline_handlers 的订阅（主要用于测试）"""
+    get_event_bus().unsubscribe(PostCreatedEvent.__name__, handler.handle_post_created)
+    handler.unlisten()
@@ -0,0 +1,44 @@
+"""
+会话摘要值对象
+
+会话列表（收件箱）使用的只读投影，
+不包含消息集合，只携带最后一条消息和当前用户的未读数。
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app_social.domain.value_objects.social_value_objects import ConversationType
+
+
+@dataclass(frozen=True)
+class LastMessagePreview:
+    """最后一条消息预览"""
+    message_id: str
+    sender_id: str
+    text: str
+    message_type: str
+    sent_at: datetime
+
+
+@dataclass(frozen=True)
+class ConversationSummary:
+    """会话摘要值对象
+
+    只保存收件箱展示所需字段：
+    - 会话类型、标题、参与者
+    - 最后一条消息、当前用户的未读数
+    """
+    conversation_id: str
+    conversation_type: str
+    title: Optional[str]
+    created_at: datetime
+    last_message_at: Optional[datetime]
+    participant_ids: Tuple[str, ...]
+    unread_count: int
+    last_message: Optional[LastMessagePreview] = None
+
+    @property
+    def is_group(self) -> bool:
+        """是否为群聊"""
+        return self.conversation_type == ConversationType.GROUP.value
@@ -0,0 +1,46 @@
+"""
+热度分策略值对象
+
+定义帖子热度分（hot score）的计算规则。
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import math
+
+
+@dataclass(frozen=True)
+class HotScorePolicy:
+    """热度分策略
+
+    score = log10(max(加权互动数, 1)) + (发帖时间 - 纪元) / gravity_seconds
+
+    时间衰减以发帖时间偏移的形式编码：每晚发布 gravity_seconds 秒，
+    相当于互动数乘以 10。帖子之间的相对顺序不随当前时间变化，
+    因此分数只需在互动发生时增量更新，无需定期全表重算，
+    且可直接存入带索引的列，按索引倒序读取 top-K。
+    """
+    like_weight: float = 1.0
+    comment_weight: float = 2.0
+    share_weight: float = 3.0
+    gravity_seconds: float = 45000.0
+
+    EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def score(self, like_count: int, comment_count: int, share_count: int, created_at: datetime) -> float:
+        """计算热度分
+
+        Args:
+            like_count: 点赞数
+            comment_count: 评论数
+            share_count: 分享数
+            created_at: 发帖时间（naive 时间视为 UTC）
+        """
+        engagement = (
+            like_count * self.like_weight
+            + comment_count * self.comment_weight
+            + share_count * self.share_weight
+        )
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        age = (created_at - self.EPOCH).total_seconds()
+        return math.log10(max(engagement, 1.0)) + age / self.gravity_seconds
@@ -0,0 +1,29 @@
+"""
+会话参与者变更集值对象
+
+记录 Conversation 聚合自上次持久化以来的成员增删和角色变化，
+仓储据此只写入变化的 conversation_participants 行，而不是整体删除重建。
+"""
+from dataclasses import dataclass
+from typing import Tuple
+
+from app_social.domain.value_objects.social_value_objects import ConversationRole
+
+
+@dataclass(frozen=True)
+class ParticipantChangeSet:
+    """会话参与者变更集
+
+    - is_new: 会话尚未持久化，added 包含全部参与者
+    - added: 需要插入的 (用户ID, 角色)
+    - removed: 需要删除的用户ID
+    - role_changes: 角色发生变化的 (用户ID, 新角色)
+    """
+    is_new: bool = False
+    added: Tuple[Tuple[str, ConversationRole], ...] = ()
+    removed: Tuple[str, ...] = ()
+    role_changes: Tuple[Tuple[str, ConversationRole], ...] = ()
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.role_changes)
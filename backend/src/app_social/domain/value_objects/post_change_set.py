@@ -0,0 +1,37 @@
+"""
+帖子变更集值对象
+
+记录 Post 聚合自上次持久化以来的子实体增删，
+仓储据此只执行必要的批量 INSERT / UPDATE / DELETE，而不是整体重建集合。
+"""
+from dataclasses import dataclass
+from typing import Tuple
+
+from app_social.domain.entity.comment_entity import Comment
+from app_social.domain.entity.like_entity import Like
+
+
+@dataclass(frozen=True)
+class PostChangeSet:
+    """帖子变更集
+
+    - is_new: 聚合尚未持久化，仓储应整体插入
+    - added_* / removed_*: 需要插入 / 删除的子实体
+    - updated_comments: 已持久化但被修改（软删除）的评论
+    - images 以 (display_order, image_url) 标识，tags 以标签文本标识
+    - like_delta / comment_delta: 计数器增量
+    - was_tag_counted / is_tag_counted: 保存前后帖子是否计入标签计数（公开且未删除）
+    """
+    is_new: bool = False
+    added_comments: Tuple[Comment, ...] = ()
+    updated_comments: Tuple[Comment, ...] = ()
+    added_likes: Tuple[Like, ...] = ()
+    removed_like_user_ids: Tuple[str, ...] = ()
+    added_images: Tuple[Tuple[int, str], ...] = ()
+    removed_images: Tuple[Tuple[int, str], ...] = ()
+    added_tags: Tuple[str, ...] = ()
+    removed_tags: Tuple[str, ...] = ()
+    like_delta: int = 0
+    comment_delta: int = 0
+    was_tag_counted: bool = False
+    is_tag_counted: bool = False
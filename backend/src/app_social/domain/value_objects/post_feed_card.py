@@ -0,0 +1,48 @@
+"""
+帖子卡片值对象
+
+帖子列表（公开流、用户主页）使用的只读投影，
+不包含评论/点赞集合，计数由数据库聚合得到。
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PostFeedCard:
+    """帖子卡片值对象
+
+    只保存列表展示所需字段：
+    - 标题、摘要、封面图、标签
+    - 点赞数、评论数、当前用户是否已点赞
+    """
+    post_id: str
+    author_id: str
+    title: str
+    summary: str                      # 正文摘要（与 PostContent.summary 规则一致）
+    cover_image_url: Optional[str]    # 第一张图片
+    image_count: int
+    tags: Tuple[str, ...]
+    visibility: str
+    trip_id: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    like_count: int
+    comment_count: int
+    is_liked_by_viewer: bool = False
+    hot_score: float = 0.0            # 热度分（热门流的游标排序键）
+
+    SUMMARY_LENGTH = 100
+
+    @classmethod
+    def summarize(cls, text: str) -> str:
+        """按 PostContent.summary 的规则截取摘要
+
+        Args:
+            text: 正文（至少需要 SUMMARY_LENGTH + 1 个字符才能判断是否截断）
+        """
+        text = text or ''
+        if len(text) > cls.SUMMARY_LENGTH:
+            return text[:cls.SUMMARY_LENGTH] + "..."
+        return text
@@ -159,6 +159,21 @@ class ConversationRole(Enum):
         return False
 
 
+@dataclass(frozen=True)
+class ReadCursor:
+    """参与者已读游标
+    
+    记录参与者读到的最后一条消息（按 (sent_at, message_id) 排序），
+    该消息及其之前的消息均视为已读。
+    """
+    message_id: str
+    read_at: datetime  # 最后已读消息的发送时间
+    
+    def covers(self, sent_at: datetime, message_id: str) -> bool:
+        """给定位置的消息是否已读"""
+        return (sent_at, message_id) <= (self.read_at, self.message_id)
+
+
 @dataclass(frozen=True)
 class CommentContent:
     """评论内容值对象"""
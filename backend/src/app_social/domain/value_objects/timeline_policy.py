@@ -0,0 +1,27 @@
+"""
+时间线分发策略值对象
+
+决定作者发帖时写扩散（fan-out-on-write）还是由读者读扩散（fan-out-on-read）。
+"""
+from dataclasses import dataclass
+import os
+
+
+@dataclass(frozen=True)
+class TimelinePolicy:
+    """时间线分发策略
+
+    好友数不超过 fanout_max_friends 的作者发帖时，帖子写入每位好友的时间线；
+    超过阈值的作者（大V）只写入自己的时间线，好友读取时间线时再合并其近期帖子，
+    使单次发帖的写放大有上界。
+    """
+    fanout_max_friends: int = 500
+
+    def should_fan_out(self, friend_count: int) -> bool:
+        """作者是否写扩散"""
+        return friend_count <= self.fanout_max_friends
+
+    @classmethod
+    def from_env(cls) -> 'TimelinePolicy':
+        """从环境变量 TIMELINE_FANOUT_MAX_FRIENDS 读取阈值"""
+        return cls(int(os.getenv("TIMELINE_FANOUT_MAX_FRIENDS", cls.fanout_max_friends)))
@@ -0,0 +1,30 @@
+"""
+用户在线状态值对象
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class UserPresence:
+    """用户在线状态
+
+    connections 为该用户当前持有的 socket 连接数（可能分布在多个 worker 上），
+    last_seen 为最近一次建立或断开连接的时间，从未连接过时为 None。
+    """
+    user_id: str
+    connections: int = 0
+    last_seen: Optional[datetime] = None
+
+    @property
+    def is_online(self) -> bool:
+        """是否在线（至少持有一个连接）"""
+        return self.connections > 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "online": self.is_online,
+            "connections": self.connections,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None
+        }
@@ -1,10 +1,12 @@
-from typing import List, Optional, Dict
+from datetime import datetime
+from typing import Any, List, Optional, Dict
 from sqlalchemy.orm import Session
-from sqlalchemy import select, delete, exists, desc, and_, func, insert
+from sqlalchemy import select, delete, exists, desc, and_, or_, func, insert, update, bindparam
 
 from app_social.infrastructure.database.dao_interface.i_conversation_dao import IConversationDao
 from app_social.infrastructure.database.persistent_model.conversation_po import ConversationPO, conversation_participants
 from app_social.infrastructure.database.persistent_model.message_po import MessagePO
+from app_social.infrastructure.database.dao_impl.sqlalchemy_message_dao import after_read_cursor
 
 class SqlAlchemyConversationDao(IConversationDao):
     """基于 SQLAlchemy 的会话 DAO 实现"""
@@ -12,36 +14,98 @@ class SqlAlchemyConversationDao(IConversationDao):
     def __init__(self, session: Session):
         self.session = session
 
-    def get_participants_with_roles(self, conversation_id: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _participant_row(row) -> Dict[str, Any]:
+        return {
+            "user_id": row.user_id,
+            "role": row.role,
+            "last_read_message_id": row.last_read_message_id,
+            "last_read_at": row.last_read_at
+        }
+
+    def get_participants_with_roles(self, conversation_id: str) -> List[Dict[str, Any]]:
         stmt = select(
             conversation_participants.c.user_id,
-            conversation_participants.c.role
+            conversation_participants.c.role,
+            conversation_participants.c.last_read_message_id,
+            conversation_participants.c.last_read_at
         ).where(
             conversation_participants.c.conversation_id == conversation_id
         )
         rows = self.session.execute(stmt).all()
-        return [{"user_id": row.user_id, "role": row.role} for row in rows]
+        return [self._participant_row(row) for row in rows]
+
+    def get_participants_for(self, conversation_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        if not conversation_ids:
+            return {}
+        stmt = select(
+            conversation_participants.c.conversation_id,
+            conversation_participants.c.user_id,
+            conversation_participants.c.role,
+            conversation_participants.c.last_read_message_id,
+            conversation_participants.c.last_read_at
+        ).where(
+            conversation_participants.c.conversation_id.in_(conversation_ids)
+        )
+        result: Dict[str, List[Dict[str, Any]]] = {cid: [] for cid in conversation_ids}
+        for row in self.session.execute(stmt).all():
+            result[row.conversation_id].append(self._participant_row(row))
+        return result
+
+    def update_read_cursor(
+        self,
+        conversation_id: str,
+        user_id: str,
+        last_read_message_id: str,
+        last_read_at: datetime
+    ) -> None:
+        cp = conversation_participants.c
+        stmt = (
+            update(conversation_participants)
+            .where(cp.conversation_id == conversation_id, cp.user_id == user_id)
+            .values(last_read_message_id=last_read_message_id, last_read_at=last_read_at)
+        )
+        self.session.execute(stmt)
+        self.session.flush()
+
+    def add_participants(self, conversation_id: str, participants: List[Dict[str, Any]]) -> None:
+        if not participants:
+            return
+        values = [
+            {
+                "conversation_id": conversation_id,
+                "user_id": p["user_id"],
+                "role": p["role"],
+                "last_read_message_id": p.get("last_read_message_id"),
+                "last_read_at": p.get("last_read_at")
+            }
+            for p in participants
+        ]
+        self.session.execute(insert(conversation_participants).values(values))
+        self.session.flush()
 
-    def update_participants(self, conversation_id: str, participants: List[Dict[str, str]]) -> None:
-        # 1. Delete existing
+    def remove_participants(self, conversation_id: str, user_ids: List[str]) -> None:
+        if not user_ids:
+            return
+        cp = conversation_participants.c
         stmt = delete(conversation_participants).where(
-            conversation_participants.c.conversation_id == conversation_id
+            cp.conversation_id == conversation_id,
+            cp.user_id.in_(user_ids)
         )
         self.session.execute(stmt)
-        
-        # 2. Insert new
-        if participants:
-            values = [
-                {
-                    "conversation_id": conversation_id, 
-                    "user_id": p["user_id"],
-                    "role": p["role"]
-                } 
-                for p in participants
-            ]
-            stmt = insert(conversation_participants).values(values)
-            self.session.execute(stmt)
-            
+        self.session.flush()
+
+    def update_participant_roles(self, conversation_id: str, roles: Dict[str, str]) -> None:
+        if not roles:
+            return
+        cp = conversation_participants.c
+        # executemany：每个变更的成员一行 UPDATE
+        stmt = (
+            update(conversation_participants)
+            .where(cp.conversation_id == conversation_id, cp.user_id == bindparam("uid"))
+            .values(role=bindparam("new_role"))
+        )
+        self.session.execute(stmt, [{"uid": uid, "new_role": role} for uid, role in roles.items()])
         self.session.flush()
 
     def find_by_id(self, conversation_id: str) -> Optional[ConversationPO]:
@@ -84,40 +148,121 @@ class SqlAlchemyConversationDao(IConversationDao):
         )
         return list(self.session.execute(stmt).scalars().all())
 
+    def find_inbox(self, user_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """获取用户收件箱：会话 + 最后一条消息 + 未读数，一条语句完成"""
+        # 当前页会话（走参与者主键），带出当前用户的已读游标
+        page = (
+            select(
+                ConversationPO.id,
+                conversation_participants.c.last_read_at,
+                conversation_participants.c.last_read_message_id
+            )
+            .join(conversation_participants, conversation_participants.c.conversation_id == ConversationPO.id)
+            .where(conversation_participants.c.user_id == user_id)
+            .order_by(desc(ConversationPO.last_message_at), desc(ConversationPO.id))
+            .limit(limit)
+            .offset(offset)
+            .subquery('page')
+        )
+        page_ids = select(page.c.id)
+
+        # 每个会话按发送时间倒序编号，取第 1 条即最后一条消息
+        ranked = (
+            select(
+                MessagePO.conversation_id,
+                MessagePO.id.label('last_message_id'),
+                MessagePO.sender_id.label('last_message_sender_id'),
+                MessagePO.content_text.label('last_message_text'),
+                MessagePO.message_type.label('last_message_type'),
+                MessagePO.sent_at.label('last_message_sent_at'),
+                func.row_number().over(
+                    partition_by=MessagePO.conversation_id,
+                    order_by=(desc(MessagePO.sent_at), desc(MessagePO.id))
+                ).label('rn')
+            )
+            .where(
+                MessagePO.conversation_id.in_(page_ids),
+                MessagePO.is_deleted == False
+            )
+            .subquery('ranked')
+        )
+
+        # 未读数：已读游标之后他人发送的未删除消息
+        unread = (
+            select(
+                MessagePO.conversation_id,
+                func.count().label('unread_count')
+            )
+            .join(page, page.c.id == MessagePO.conversation_id)
+            .where(
+                MessagePO.sender_id != user_id,
+                MessagePO.is_deleted == False,
+                after_read_cursor(page.c.last_read_at, page.c.last_read_message_id)
+            )
+            .group_by(MessagePO.conversation_id)
+            .subquery('unread')
+        )
+
+        stmt = (
+            select(
+                ConversationPO.id,
+                ConversationPO.conversation_type,
+                ConversationPO.title,
+                ConversationPO.created_at,
+                ConversationPO.last_message_at,
+                ranked.c.last_message_id,
+                ranked.c.last_message_sender_id,
+                ranked.c.last_message_text,
+                ranked.c.last_message_type,
+                ranked.c.last_message_sent_at,
+                func.coalesce(unread.c.unread_count, 0).label('unread_count')
+            )
+            .join(page, page.c.id == ConversationPO.id)
+            .outerjoin(ranked, and_(ranked.c.conversation_id == ConversationPO.id, ranked.c.rn == 1))
+            .outerjoin(unread, unread.c.conversation_id == ConversationPO.id)
+            .order_by(desc(ConversationPO.last_message_at), desc(ConversationPO.id))
+        )
+        return [dict(row) for row in self.session.execute(stmt).mappings().all()]
+
     def find_by_user_with_unread(self, user_id: str) -> List[ConversationPO]:
         """获取用户有未读消息的会话"""
-        # 逻辑：
-        # 1. 用户参与的会话
-        # 2. 会话中有消息的 read_by_json 不包含 user_id
-        # 注意：read_by_json 是字符串，使用 LIKE 进行模糊匹配近似判断
-        # JSON 格式为 ["u1", "u2"]，所以匹配 '%"user_id"%'
-        
-        # 子查询：找到有未读消息的会话ID
-        unread_msgs_subquery = (
-            select(MessagePO.conversation_id)
+        # 会话中存在已读游标之后他人发送的消息（沿 (conversation_id, sent_at, id) 索引探测）
+        cp = conversation_participants.c
+        has_unread = (
+            select(MessagePO.id)
             .where(
-                and_(
-                    MessagePO.read_by_json.not_like(f'%"{user_id}"%'),
-                    MessagePO.sender_id != user_id, # 自己发的消息不算未读
-                    MessagePO.is_deleted == False
-                )
+                MessagePO.conversation_id == ConversationPO.id,
+                MessagePO.sender_id != user_id, # 自己发的消息不算未读
+                MessagePO.is_deleted == False,
+                after_read_cursor(cp.last_read_at, cp.last_read_message_id)
             )
-            .distinct()
+            .exists()
         )
 
         stmt = (
             select(ConversationPO)
-            .join(conversation_participants, conversation_participants.c.conversation_id == ConversationPO.id)
+            .join(conversation_participants, cp.conversation_id == ConversationPO.id)
             .where(
                 and_(
-                    conversation_participants.c.user_id == user_id,
-                    ConversationPO.id.in_(unread_msgs_subquery)
+                    cp.user_id == user_id,
+                    has_unread
                 )
             )
             .order_by(desc(ConversationPO.last_message_at))
         )
         return list(self.session.execute(stmt).scalars().all())
 
+    def touch_last_message(self, conversation_id: str, sent_at: datetime) -> None:
+        stmt = (
+            update(ConversationPO)
+            .where(
+                ConversationPO.id == conversation_id,
+                or_(ConversationPO.last_message_at.is_(None), ConversationPO.last_message_at < sent_at)
+            )
+            .values(last_message_at=sent_at)
+        )
+        self.session.execute(stmt)
+
     def add(self, conversation_po: ConversationPO) -> None:
         self.session.add(conversation_po)
         self.session.flush()
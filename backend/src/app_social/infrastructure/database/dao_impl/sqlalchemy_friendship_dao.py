@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, func, select, union_all
 from app_social.infrastructure.database.po.friendship_po import FriendshipPO
 from app_social.domain.value_objects.friendship_value_objects import FriendshipStatus
 
@@ -25,6 +25,29 @@ class SqlAlchemyFriendshipDao:
             )
         ).first()
 
+    def find_accepted_among(self, user_id: str, candidate_ids: Iterable[str]) -> Set[str]:
+        """
+        Return the subset of candidate_ids that are accepted friends of user_id, in one query.
+        Each side of the UNION is served by one of the (a, b, status) composite indexes.
+        """
+        candidate_ids = list(set(candidate_ids))
+        if not candidate_ids:
+            return set()
+        accepted = FriendshipPO.status == FriendshipStatus.ACCEPTED
+        stmt = union_all(
+            select(FriendshipPO.addressee_id).where(
+                FriendshipPO.requester_id == user_id,
+                FriendshipPO.addressee_id.in_(candidate_ids),
+                accepted
+            ),
+            select(FriendshipPO.requester_id).where(
+                FriendshipPO.addressee_id == user_id,
+                FriendshipPO.requester_id.in_(candidate_ids),
+                accepted
+            )
+        )
+        return set(self._session.execute(stmt).scalars().all())
+
     def find_pending_incoming(self, user_id: str) -> List[FriendshipPO]:
         return self._session.query(FriendshipPO).filter(
             FriendshipPO.addressee_id == user_id,
@@ -48,3 +71,22 @@ class SqlAlchemyFriendshipDao:
             ),
             FriendshipPO.status == FriendshipStatus.ACCEPTED
         ).all()
+
+    def count_friends(self, user_ids: List[str]) -> Dict[str, int]:
+        """
+        Count accepted friendships for each user in one query.
+        Users without friends are omitted from the result.
+        """
+        if not user_ids:
+            return {}
+        accepted = FriendshipPO.status == FriendshipStatus.ACCEPTED
+        sides = union_all(
+            select(FriendshipPO.requester_id.label('user_id')).where(
+                accepted, FriendshipPO.requester_id.in_(user_ids)
+            ),
+            select(FriendshipPO.addressee_id.label('user_id')).where(
+                accepted, FriendshipPO.addressee_id.in_(user_ids)
+            )
+        ).subquery()
+        stmt = select(sides.c.user_id, func.count()).group_by(sides.c.user_id)
+        return {user_id: count for user_id, count in self._session.execute(stmt).all()}
@@ -1,11 +1,25 @@
-from typing import List, Optional, Set
-import json
+from datetime import datetime
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select, delete, update, and_, asc
+from sqlalchemy import select, delete, update, and_, or_, asc, desc, func
 
 from app_social.infrastructure.database.dao_interface.i_message_dao import IMessageDao
+from app_social.infrastructure.database.persistent_model.conversation_po import conversation_participants
 from app_social.infrastructure.database.persistent_model.message_po import MessagePO
 
+
+def after_read_cursor(last_read_at, last_read_message_id):
+    """消息位于已读游标之后的条件（游标为空表示从未读过）
+
+    按 (sent_at, id) 比较，可沿 idx_messages_conversation_sent 索引范围扫描。
+    """
+    return or_(
+        last_read_at.is_(None),
+        MessagePO.sent_at > last_read_at,
+        and_(MessagePO.sent_at == last_read_at, MessagePO.id > last_read_message_id)
+    )
+
+
 class SqlAlchemyMessageDao(IMessageDao):
     """基于 SQLAlchemy 的消息 DAO 实现"""
 
@@ -20,21 +34,39 @@ class SqlAlchemyMessageDao(IMessageDao):
         self, 
         conversation_id: str, 
         limit: int = 50, 
-        offset: int = 0
+        offset: int = 0,
+        before: Optional[Tuple[datetime, str]] = None,
+        after: Optional[Tuple[datetime, str]] = None
     ) -> List[MessagePO]:
-        stmt = (
-            select(MessagePO)
-            .where(
-                and_(
-                    MessagePO.conversation_id == conversation_id,
-                    MessagePO.is_deleted == False
+        # 沿 idx_messages_conversation_sent 做一次范围扫描：
+        # after 正向读取游标之后的消息；否则倒序读取最近（或 before 之前）的消息再翻转
+        stmt = select(MessagePO).where(
+            MessagePO.conversation_id == conversation_id,
+            MessagePO.is_deleted == False
+        )
+        if after:
+            after_sent_at, after_id = after
+            stmt = stmt.where(
+                or_(
+                    MessagePO.sent_at > after_sent_at,
+                    and_(MessagePO.sent_at == after_sent_at, MessagePO.id > after_id)
+                )
+            ).order_by(asc(MessagePO.sent_at), asc(MessagePO.id)).limit(limit)
+            return list(self.session.execute(stmt).scalars().all())
+
+        if before:
+            before_sent_at, before_id = before
+            stmt = stmt.where(
+                or_(
+                    MessagePO.sent_at < before_sent_at,
+                    and_(MessagePO.sent_at == before_sent_at, MessagePO.id < before_id)
                 )
             )
-            .order_by(asc(MessagePO.sent_at)) # 消息通常按时间正序显示
-            .limit(limit)
-            .offset(offset)
-        )
-        return list(self.session.execute(stmt).scalars().all())
+        else:
+            stmt = stmt.offset(offset)
+        stmt = stmt.order_by(desc(MessagePO.sent_at), desc(MessagePO.id)).limit(limit)
+        # 消息按时间正序显示
+        return list(reversed(self.session.execute(stmt).scalars().all()))
 
     def add(self, message_po: MessagePO) -> None:
         self.session.add(message_po)
@@ -61,41 +93,77 @@ class SqlAlchemyMessageDao(IMessageDao):
         self.session.flush()
 
     def mark_read(self, message_id: str, user_id: str) -> None:
-        """标记消息为已读"""
-        # 需要先读取，修改 JSON，再保存
-        # 这是一个“读取-修改-写入”的操作，在并发下可能不安全
-        # 但对于已读状态，覆盖是可以接受的，或者使用乐观锁
-        # 这里简单实现：
-        message = self.find_by_id(message_id)
+        """标记消息为已读：把用户的已读游标前移到该消息"""
+        message = self.session.execute(
+            select(MessagePO.conversation_id, MessagePO.sent_at).where(MessagePO.id == message_id)
+        ).first()
         if message:
-            read_by = set(json.loads(message.read_by_json))
-            if user_id not in read_by:
-                read_by.add(user_id)
-                message.read_by_json = json.dumps(list(read_by))
-                self.session.add(message) # Re-add to session to ensure update
-                self.session.flush()
+            self._advance_cursor(message.conversation_id, user_id, message_id, message.sent_at)
 
     def mark_all_read(self, conversation_id: str, user_id: str) -> int:
-        """标记会话中所有消息为已读"""
-        # 找出所有未读消息
-        stmt = select(MessagePO).where(
-            and_(
+        """标记会话中所有消息为已读：一条 UPDATE 把已读游标移到最后一条消息"""
+        count = self.count_unread(conversation_id, user_id)
+        latest = (
+            select(MessagePO.id, MessagePO.sent_at)
+            .where(
                 MessagePO.conversation_id == conversation_id,
-                MessagePO.read_by_json.not_like(f'%"{user_id}"%'),
-                MessagePO.sender_id != user_id,
                 MessagePO.is_deleted == False
             )
+            .order_by(desc(MessagePO.sent_at), desc(MessagePO.id))
+            .limit(1)
+            .subquery()
+        )
+        cp = conversation_participants.c
+        stmt = (
+            update(conversation_participants)
+            .where(
+                cp.conversation_id == conversation_id,
+                cp.user_id == user_id,
+                select(latest.c.id).exists(),
+                or_(cp.last_read_at.is_(None), cp.last_read_at <= select(latest.c.sent_at).scalar_subquery())
+            )
+            .values(
+                last_read_message_id=select(latest.c.id).scalar_subquery(),
+                last_read_at=select(latest.c.sent_at).scalar_subquery()
+            )
         )
-        messages = list(self.session.execute(stmt).scalars().all())
-        
-        count = 0
-        for msg in messages:
-            read_by = set(json.loads(msg.read_by_json))
-            if user_id not in read_by:
-                read_by.add(user_id)
-                msg.read_by_json = json.dumps(list(read_by))
-                self.session.add(msg)
-                count += 1
-        
+        self.session.execute(stmt)
         self.session.flush()
         return count
+
+    def count_unread(self, conversation_id: str, user_id: str) -> int:
+        cp = conversation_participants.c
+        stmt = (
+            select(func.count())
+            .select_from(MessagePO)
+            .join(
+                conversation_participants,
+                and_(cp.conversation_id == MessagePO.conversation_id, cp.user_id == user_id)
+            )
+            .where(
+                MessagePO.conversation_id == conversation_id,
+                MessagePO.sender_id != user_id,
+                MessagePO.is_deleted == False,
+                after_read_cursor(cp.last_read_at, cp.last_read_message_id)
+            )
+        )
+        return self.session.execute(stmt).scalar() or 0
+
+    def _advance_cursor(self, conversation_id: str, user_id: str, message_id: str, sent_at: datetime) -> None:
+        """把已读游标前移到指定消息（游标不会后退）"""
+        cp = conversation_participants.c
+        stmt = (
+            update(conversation_participants)
+            .where(
+                cp.conversation_id == conversation_id,
+                cp.user_id == user_id,
+                or_(
+                    cp.last_read_at.is_(None),
+                    cp.last_read_at < sent_at,
+                    and_(cp.last_read_at == sent_at, cp.last_read_message_id < message_id)
+                )
+            )
+            .values(last_read_message_id=message_id, last_read_at=sent_at)
+        )
+        self.session.execute(stmt)
+        self.session.flush()
@@ -1,10 +1,17 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple, Dict, Any
+from datetime import datetime
 import json
 from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import select, delete, desc, and_, exists, func, or_
+from sqlalchemy import select, delete, desc, and_, exists, func, or_, literal, insert, update
+from sqlalchemy.exc import IntegrityError
 
 from app_social.infrastructure.database.dao_interface.i_post_dao import IPostDao
-from app_social.infrastructure.database.persistent_model.post_po import PostPO, PostTagPO
+from app_social.infrastructure.database.persistent_model.post_po import (
+    PostPO, PostTagPO, TagPO, LikePO, CommentPO, PostImagePO
+)
+from app_social.domain.value_objects.post_feed_card import PostFeedCard
+from shared.search.i_search_index import DOC_TYPE_POST
+from shared.search.search_index_factory import create_search_index
 
 class SqlAlchemyPostDao(IPostDao):
     """基于 SQLAlchemy 的帖子 DAO 实现"""
@@ -17,27 +24,59 @@ class SqlAlchemyPostDao(IPostDao):
         return select(PostPO).options(
             selectinload(PostPO.comments),
             selectinload(PostPO.likes),
-            selectinload(PostPO.images),
-            selectinload(PostPO.tags)
+            selectinload(PostPO.images)
         )
 
+    def _paginate(self, stmt, limit: int, offset: int, before: Optional[Tuple[Any, str]], rank=None, sort: str = 'latest'):
+        """按 (created_at DESC, id DESC) 排序分页
+
+        提供 before 时使用 keyset 条件代替 OFFSET，可命中 (..., created_at, id) 复合索引。
+        sort='hot' 时改按 (hot_score DESC, id DESC) 排序，before 为 (hot_score, id)。
+        提供 rank（全文检索相关度）时按相关度降序排序，只支持 OFFSET 分页。
+        """
+        if rank is not None:
+            return (
+                stmt.order_by(desc(rank), desc(PostPO.created_at), desc(PostPO.id))
+                .limit(limit)
+                .offset(offset)
+            )
+        sort_key = PostPO.hot_score if sort == 'hot' else PostPO.created_at
+        if before:
+            before_key, before_id = before
+            stmt = stmt.where(
+                or_(
+                    sort_key < before_key,
+                    and_(sort_key == before_key, PostPO.id < before_id)
+                )
+            )
+        stmt = stmt.order_by(desc(sort_key), desc(PostPO.id)).limit(limit)
+        if not before:
+            stmt = stmt.offset(offset)
+        return stmt
+
     def find_by_id(self, post_id: str) -> Optional[PostPO]:
         stmt = self._get_base_query().where(PostPO.id == post_id)
         return self.session.execute(stmt).scalars().unique().first()
 
+    def find_header_by_id(self, post_id: str) -> Optional[PostPO]:
+        # 不预加载任何子实体
+        stmt = select(PostPO).where(PostPO.id == post_id)
+        return self.session.execute(stmt).scalars().first()
+
     def find_by_author(
         self,
         author_id: str,
         include_deleted: bool = False,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        before: Optional[Tuple[datetime, str]] = None
     ) -> List[PostPO]:
         stmt = self._get_base_query().where(PostPO.author_id == author_id)
         
         if not include_deleted:
             stmt = stmt.where(PostPO.is_deleted == False)
             
-        stmt = stmt.order_by(desc(PostPO.created_at)).limit(limit).offset(offset)
+        stmt = self._paginate(stmt, limit, offset, before)
         return list(self.session.execute(stmt).scalars().unique().all())
 
     def find_by_trip(self, trip_id: str) -> Optional[PostPO]:
@@ -57,7 +96,8 @@ class SqlAlchemyPostDao(IPostDao):
         limit: int = 20,
         offset: int = 0,
         tags: Optional[List[str]] = None,
-        search_query: Optional[str] = None
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None
     ) -> List[PostPO]:
         stmt = (
             self._get_base_query()
@@ -69,22 +109,97 @@ class SqlAlchemyPostDao(IPostDao):
             )
         )
         
+        stmt, rank = self._apply_feed_filters(stmt, tags, search_query)
+        stmt = self._paginate(stmt, limit, offset, before, rank)
+        return list(self.session.execute(stmt).scalars().unique().all())
+
+    def _apply_feed_filters(self, stmt, tags: Optional[List[str]], search_query: Optional[str]):
+        """标签与关键词过滤
+
+        Returns:
+            (过滤后的语句, 相关度列)；未走全文索引时相关度列为 None
+        """
         if tags:
             # 标签过滤：任一标签匹配即可
-            # 使用 PostPO.tags.any(PostTagPO.tag.in_(tags))
-            stmt = stmt.where(PostPO.tags.any(PostTagPO.tag.in_(tags)))
+            # 经标签字典解析 tag_id 后走 post_tags (tag_id, created_at) 索引做半连接，
+            # 而不是逐行执行关联 EXISTS
+            tagged_post_ids = (
+                select(PostTagPO.post_id)
+                .join(TagPO, TagPO.id == PostTagPO.tag_id)
+                .where(TagPO.name.in_(tags))
+            )
+            stmt = stmt.where(PostPO.id.in_(tagged_post_ids))
 
-        if search_query:
-            search_pattern = f"%{search_query}%"
-            stmt = stmt.where(
-                or_(
-                    PostPO.title.ilike(search_pattern),
-                    PostPO.text.ilike(search_pattern)
-                )
+        if not search_query:
+            return stmt, None
+
+        # 优先走全文索引（与命中子查询 JOIN，按相关度排序）
+        index = create_search_index(self.session)
+        hits = index.match(DOC_TYPE_POST, search_query) if index else None
+        if hits is not None:
+            return stmt.join(hits, hits.c.doc_id == PostPO.id), hits.c.score
+
+        # 索引无法处理（如查询词过短）时回退到 LIKE
+        search_pattern = f"%{search_query}%"
+        stmt = stmt.where(
+            or_(
+                PostPO.title.ilike(search_pattern),
+                PostPO.text.ilike(search_pattern)
             )
-            
-        stmt = stmt.order_by(desc(PostPO.created_at)).limit(limit).offset(offset)
-        return list(self.session.execute(stmt).scalars().unique().all())
+        )
+        return stmt, None
+
+    def find_feed_cards(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        tags: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        viewer_id: Optional[str] = None,
+        author_id: Optional[str] = None,
+        visibilities: Optional[List[str]] = None,
+        author_ids: Optional[List[str]] = None,
+        post_ids: Optional[List[str]] = None,
+        sort: str = 'latest'
+    ) -> List[Dict[str, Any]]:
+        # 计数直接取反规范化计数器列；是否已点赞走 uq_likes_post_user 索引
+        if viewer_id:
+            is_liked = exists().where(
+                and_(LikePO.post_id == PostPO.id, LikePO.user_id == viewer_id)
+            ).correlate(PostPO)
+        else:
+            is_liked = literal(False)
+
+        stmt = select(
+            PostPO.id,
+            PostPO.author_id,
+            PostPO.title,
+            func.substr(PostPO.text, 1, PostFeedCard.SUMMARY_LENGTH + 1).label('text_head'),
+            PostPO.images_json,
+            PostPO.tags_json,
+            PostPO.visibility,
+            PostPO.trip_id,
+            PostPO.created_at,
+            PostPO.updated_at,
+            PostPO.like_count,
+            PostPO.comment_count,
+            PostPO.hot_score,
+            is_liked.label('is_liked_by_viewer')
+        ).where(PostPO.is_deleted == False)
+
+        if author_id:
+            stmt = stmt.where(PostPO.author_id == author_id)
+        if author_ids is not None:
+            stmt = stmt.where(PostPO.author_id.in_(author_ids))
+        if post_ids is not None:
+            stmt = stmt.where(PostPO.id.in_(post_ids))
+        if visibilities is not None:
+            stmt = stmt.where(PostPO.visibility.in_(visibilities))
+
+        stmt, rank = self._apply_feed_filters(stmt, tags, search_query)
+        stmt = self._paginate(stmt, limit, offset, before, rank, sort)
+        return [dict(row) for row in self.session.execute(stmt).mappings().all()]
 
     def find_by_visibility(
         self,
@@ -114,7 +229,251 @@ class SqlAlchemyPostDao(IPostDao):
         self.session.merge(post_po)
         self.session.flush() # Explicit flush to avoid pending state issues
 
+    def update_header(
+        self,
+        post_id: str,
+        values: Dict[str, Any],
+        like_delta: int = 0,
+        comment_delta: int = 0
+    ) -> None:
+        # 主表列与计数器增量合并为一条 UPDATE
+        values = dict(values)
+        if like_delta:
+            values['like_count'] = PostPO.like_count + like_delta
+        if comment_delta:
+            values['comment_count'] = PostPO.comment_count + comment_delta
+        stmt = update(PostPO).where(PostPO.id == post_id).values(**values)
+        self.session.execute(stmt)
+
+    def find_comments(
+        self,
+        post_id: str,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, str]] = None,
+        parent_id: Optional[str] = None
+    ) -> List[CommentPO]:
+        # 按 (created_at, id) 升序 keyset 翻页：
+        # 顶层评论走 (post_id, created_at, id) 索引，回复走 (parent_id, created_at, id) 索引
+        stmt = select(CommentPO).where(
+            and_(CommentPO.post_id == post_id, CommentPO.is_deleted == False)
+        )
+        if parent_id is None:
+            stmt = stmt.where(CommentPO.parent_id.is_(None))
+        else:
+            stmt = stmt.where(CommentPO.parent_id == parent_id)
+        if after:
+            after_created_at, after_id = after
+            stmt = stmt.where(
+                or_(
+                    CommentPO.created_at > after_created_at,
+                    and_(CommentPO.created_at == after_created_at, CommentPO.id > after_id)
+                )
+            )
+        stmt = stmt.order_by(CommentPO.created_at, CommentPO.id).limit(limit)
+        return list(self.session.execute(stmt).scalars().all())
+
+    def find_comment(self, post_id: str, comment_id: str) -> Optional[CommentPO]:
+        stmt = select(CommentPO).where(and_(CommentPO.id == comment_id, CommentPO.post_id == post_id))
+        return self.session.execute(stmt).scalar_one_or_none()
+
+    def count_replies(self, comment_ids: List[str]) -> Dict[str, int]:
+        if not comment_ids:
+            return {}
+        stmt = (
+            select(CommentPO.parent_id, func.count())
+            .where(and_(CommentPO.parent_id.in_(comment_ids), CommentPO.is_deleted == False))
+            .group_by(CommentPO.parent_id)
+        )
+        return {parent_id: count for parent_id, count in self.session.execute(stmt).all()}
+
+    def is_liked_by(self, post_id: str, user_id: str) -> bool:
+        stmt = select(exists().where(and_(LikePO.post_id == post_id, LikePO.user_id == user_id)))
+        return bool(self.session.execute(stmt).scalar())
+
+    def add_comments(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            self.session.execute(insert(CommentPO), rows)
+
+    def update_comments(self, rows: List[Dict[str, Any]]) -> None:
+        # 按主键的批量 UPDATE（rows 需包含 id）
+        if rows:
+            self.session.execute(update(CommentPO), rows)
+
+    def add_likes(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            self.session.execute(insert(LikePO), rows)
+
+    def remove_likes(self, post_id: str, user_ids: List[str]) -> None:
+        if user_ids:
+            stmt = delete(LikePO).where(and_(LikePO.post_id == post_id, LikePO.user_id.in_(user_ids)))
+            self.session.execute(stmt)
+
+    def add_images(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            self.session.execute(insert(PostImagePO), rows)
+
+    def remove_images(self, post_id: str, images: List[Tuple[int, str]]) -> None:
+        if images:
+            stmt = delete(PostImagePO).where(
+                and_(
+                    PostImagePO.post_id == post_id,
+                    or_(*[
+                        and_(PostImagePO.display_order == order, PostImagePO.image_url == url)
+                        for order, url in images
+                    ])
+                )
+            )
+            self.session.execute(stmt)
+
+    def add_tags(self, post_id: str, tags: List[str], created_at: datetime, count: bool = True) -> None:
+        if not tags:
+            return
+        tag_ids = self._ensure_tag_ids(tags)
+        ids = list(dict.fromkeys(tag_ids[t] for t in tags))
+        self.session.execute(
+            insert(PostTagPO),
+            [{'post_id': post_id, 'tag_id': tag_id, 'created_at': created_at} for tag_id in ids]
+        )
+        if count:
+            self._increment_tag_counts(ids, 1)
+
+    def remove_tags(self, post_id: str, tags: List[str], count: bool = True) -> None:
+        if not tags:
+            return
+        stmt = (
+            select(PostTagPO.tag_id)
+            .join(TagPO, TagPO.id == PostTagPO.tag_id)
+            .where(and_(PostTagPO.post_id == post_id, TagPO.name.in_(tags)))
+        )
+        ids = list(self.session.execute(stmt).scalars().all())
+        if not ids:
+            return
+        self.session.execute(
+            delete(PostTagPO).where(and_(PostTagPO.post_id == post_id, PostTagPO.tag_id.in_(ids)))
+        )
+        if count:
+            self._increment_tag_counts(ids, -1)
+
+    def adjust_tag_counts(self, tags: List[str], delta: int) -> None:
+        if tags and delta:
+            stmt = (
+                update(TagPO)
+                .where(TagPO.name.in_(tags))
+                .values(post_count=TagPO.post_count + delta)
+            )
+            self.session.execute(stmt)
+
+    def find_popular_tags(self, limit: int = 20) -> List[Dict[str, Any]]:
+        # 计数器列上有索引，直接按计数倒序取前 N
+        stmt = (
+            select(TagPO.name, TagPO.post_count)
+            .where(TagPO.post_count > 0)
+            .order_by(desc(TagPO.post_count), TagPO.name)
+            .limit(limit)
+        )
+        return [dict(row) for row in self.session.execute(stmt).mappings().all()]
+
+    def _ensure_tag_ids(self, tags: List[str]) -> Dict[str, int]:
+        """解析标签字典ID，不存在的标签即时创建"""
+        names = list(dict.fromkeys(tags))
+        stmt = select(TagPO.name, TagPO.id).where(TagPO.name.in_(names))
+        tag_ids = {name: tag_id for name, tag_id in self.session.execute(stmt).all()}
+        for name in names:
+            if name in tag_ids:
+                continue
+            try:
+                with self.session.begin_nested():
+                    result = self.session.execute(
+                        insert(TagPO).values(name=name, post_count=0, created_at=datetime.utcnow())
+                    )
+                tag_ids[name] = result.inserted_primary_key[0]
+            except IntegrityError:
+                # 并发请求已创建同名标签
+                tag_ids[name] = self.session.execute(
+                    select(TagPO.id).where(TagPO.name == name)
+                ).scalar_one()
+        return tag_ids
+
+    def _increment_tag_counts(self, tag_ids: List[int], delta: int) -> None:
+        stmt = (
+            update(TagPO)
+            .where(TagPO.id.in_(tag_ids))
+            .values(post_count=TagPO.post_count + delta)
+        )
+        self.session.execute(stmt)
+
+    def add_like(self, post_id: str, user_id: str) -> bool:
+        # INSERT ... SELECT ... WHERE NOT EXISTS：已点赞时不插入
+        not_liked = ~exists().where(and_(LikePO.post_id == post_id, LikePO.user_id == user_id))
+        stmt = insert(LikePO).from_select(
+            ['post_id', 'user_id', 'created_at'],
+            select(literal(post_id), literal(user_id), literal(datetime.utcnow())).where(not_liked)
+        )
+        try:
+            # 并发的相同点赞都可能通过 NOT EXISTS，由唯一约束拦下后者；
+            # 放在 SAVEPOINT 中，冲突只回滚这一条插入，不影响外层事务
+            with self.session.begin_nested():
+                inserted = self.session.execute(stmt).rowcount > 0
+        except IntegrityError:
+            return False
+        if inserted:
+            self.increment_counters(post_id, like_delta=1)
+        return inserted
+
+    def remove_like(self, post_id: str, user_id: str) -> bool:
+        stmt = delete(LikePO).where(and_(LikePO.post_id == post_id, LikePO.user_id == user_id))
+        removed = self.session.execute(stmt).rowcount > 0
+        if removed:
+            self.increment_counters(post_id, like_delta=-1)
+        return removed
+
+    def increment_counters(self, post_id: str, like_delta: int = 0, comment_delta: int = 0, share_delta: int = 0) -> None:
+        if not like_delta and not comment_delta and not share_delta:
+            return
+        values = {}
+        if like_delta:
+            values['like_count'] = PostPO.like_count + like_delta
+        if comment_delta:
+            values['comment_count'] = PostPO.comment_count + comment_delta
+        if share_delta:
+            values['share_count'] = PostPO.share_count + share_delta
+        stmt = update(PostPO).where(PostPO.id == post_id).values(**values)
+        self.session.execute(stmt)
+
+    def find_engagement(self, post_ids: List[str]) -> List[Dict[str, Any]]:
+        if not post_ids:
+            return []
+        stmt = select(
+            PostPO.id,
+            PostPO.like_count,
+            PostPO.comment_count,
+            PostPO.share_count,
+            PostPO.created_at
+        ).where(PostPO.id.in_(post_ids))
+        return [dict(row) for row in self.session.execute(stmt).mappings().all()]
+
+    def update_hot_scores(self, scores: Dict[str, float]) -> None:
+        if scores:
+            # 按主键批量 UPDATE
+            self.session.execute(
+                update(PostPO),
+                [{'id': post_id, 'hot_score': score} for post_id, score in scores.items()]
+            )
+
     def delete(self, post_id: str) -> None:
+        # 公开且未软删除的帖子仍计入标签计数，物理删除前先回退
+        live_tag_ids = list(self.session.execute(
+            select(PostTagPO.tag_id)
+            .join(PostPO, PostPO.id == PostTagPO.post_id)
+            .where(and_(
+                PostTagPO.post_id == post_id,
+                PostPO.is_deleted == False,
+                PostPO.visibility == 'public'
+            ))
+        ).scalars().all())
+        if live_tag_ids:
+            self._increment_tag_counts(live_tag_ids, -1)
+        self.session.execute(delete(PostTagPO).where(PostTagPO.post_id == post_id))
         # 物理删除
         stmt = delete(PostPO).where(PostPO.id == post_id)
         self.session.execute(stmt)
@@ -0,0 +1,40 @@
+from typing import List, Optional, Tuple, Dict, Any
+from datetime import datetime
+
+from sqlalchemy import select, insert, desc, and_, or_
+from sqlalchemy.orm import Session
+
+from app_social.infrastructure.database.dao_interface.i_timeline_dao import ITimelineDao
+from app_social.infrastructure.database.persistent_model.timeline_po import TimelineEntryPO
+
+
+class SqlAlchemyTimelineDao(ITimelineDao):
+    """基于 SQLAlchemy 的时间线 DAO 实现"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add_entries(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            self.session.execute(insert(TimelineEntryPO), rows)
+
+    def find_entries(
+        self,
+        owner_id: str,
+        limit: int = 20,
+        before: Optional[Tuple[datetime, str]] = None
+    ) -> List[Tuple[datetime, str]]:
+        # 只扫描 (owner_id, created_at, post_id) 索引
+        stmt = select(TimelineEntryPO.created_at, TimelineEntryPO.post_id).where(
+            TimelineEntryPO.owner_id == owner_id
+        )
+        if before:
+            before_created_at, before_id = before
+            stmt = stmt.where(
+                or_(
+                    TimelineEntryPO.created_at < before_created_at,
+                    and_(TimelineEntryPO.created_at == before_created_at, TimelineEntryPO.post_id < before_id)
+                )
+            )
+        stmt = stmt.order_by(desc(TimelineEntryPO.created_at), desc(TimelineEntryPO.post_id)).limit(limit)
+        return [(created_at, post_id) for created_at, post_id in self.session.execute(stmt).all()]
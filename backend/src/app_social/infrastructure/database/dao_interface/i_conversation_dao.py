@@ -4,7 +4,8 @@
 定义会话持久化对象的数据访问操作。
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict
+from datetime import datetime
+from typing import Any, List, Optional, Dict
 
 from app_social.infrastructure.database.persistent_model.conversation_po import ConversationPO
 
@@ -51,6 +52,21 @@ class IConversationDao(ABC):
         """
         pass
     
+    @abstractmethod
+    def find_inbox(self, user_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """获取用户收件箱（一条查询返回会话、最后一条消息与未读数）
+        
+        Args:
+            user_id: 用户ID
+            limit: 每页数量
+            offset: 偏移量
+            
+        Returns:
+            行字典列表，按最后消息时间倒序；包含会话列、last_message_* 列
+            （无消息时为 None）与 unread_count
+        """
+        pass
+    
     @abstractmethod
     def find_by_user_with_unread(self, user_id: str) -> List[ConversationPO]:
         """获取用户有未读消息的会话
@@ -63,6 +79,16 @@ class IConversationDao(ABC):
         """
         pass
     
+    @abstractmethod
+    def touch_last_message(self, conversation_id: str, sent_at: datetime) -> None:
+        """定向更新会话的最后消息时间（只前移，不加载会话）
+        
+        Args:
+            conversation_id: 会话ID
+            sent_at: 新消息的发送时间
+        """
+        pass
+    
     @abstractmethod
     def add(self, conversation_po: ConversationPO) -> None:
         """添加会话
@@ -103,23 +129,74 @@ class IConversationDao(ABC):
         pass
 
     @abstractmethod
-    def get_participants_with_roles(self, conversation_id: str) -> List[Dict[str, str]]:
+    def get_participants_with_roles(self, conversation_id: str) -> List[Dict[str, Any]]:
         """获取会话参与者及角色
         
         Args:
             conversation_id: 会话ID
             
         Returns:
-            参与者列表 [{"user_id": "...", "role": "..."}]
+            参与者列表 [{"user_id", "role", "last_read_message_id", "last_read_at"}]
+        """
+        pass
+
+    @abstractmethod
+    def get_participants_for(self, conversation_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """批量获取多个会话的参与者及角色（一次 IN 查询）
+        
+        Args:
+            conversation_ids: 会话ID列表
+            
+        Returns:
+            {会话ID: [参与者字典，字段同 get_participants_with_roles]}
+        """
+        pass
+
+    @abstractmethod
+    def update_read_cursor(
+        self,
+        conversation_id: str,
+        user_id: str,
+        last_read_message_id: str,
+        last_read_at: datetime
+    ) -> None:
+        """更新参与者的已读游标（单条 UPDATE）
+        
+        Args:
+            conversation_id: 会话ID
+            user_id: 用户ID
+            last_read_message_id: 最后已读消息ID
+            last_read_at: 最后已读消息的发送时间
+        """
+        pass
+
+    @abstractmethod
+    def add_participants(self, conversation_id: str, participants: List[Dict[str, Any]]) -> None:
+        """插入参与者行（一条多行 INSERT）
+        
+        Args:
+            conversation_id: 会话ID
+            participants: 参与者列表 [{"user_id": "...", "role": "..."}]，
+                可带 last_read_message_id / last_read_at 已读游标
+        """
+        pass
+
+    @abstractmethod
+    def remove_participants(self, conversation_id: str, user_ids: List[str]) -> None:
+        """删除指定参与者行
+        
+        Args:
+            conversation_id: 会话ID
+            user_ids: 要移除的用户ID列表
         """
         pass
 
     @abstractmethod
-    def update_participants(self, conversation_id: str, participants: List[Dict[str, str]]) -> None:
-        """更新会话参与者
+    def update_participant_roles(self, conversation_id: str, roles: Dict[str, str]) -> None:
+        """更新指定参与者的角色
         
         Args:
             conversation_id: 会话ID
-            participants: 参与者列表 [{"user_id": "...", "role": "..."}]
+            roles: {用户ID: 新角色}
         """
         pass
@@ -4,7 +4,8 @@
 定义消息持久化对象的数据访问操作。
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from app_social.infrastructure.database.persistent_model.message_po import MessagePO
 
@@ -29,17 +30,24 @@ class IMessageDao(ABC):
         self, 
         conversation_id: str, 
         limit: int = 50, 
-        offset: int = 0
+        offset: int = 0,
+        before: Optional[Tuple[datetime, str]] = None,
+        after: Optional[Tuple[datetime, str]] = None
     ) -> List[MessagePO]:
         """获取会话中的消息列表
         
+        默认返回最近的 limit 条消息；before / after 为消息游标 (sent_at, id)，
+        分别读取游标之前（向上翻历史）或之后（新消息）的一页。
+        
         Args:
             conversation_id: 会话ID
             limit: 每页数量
-            offset: 偏移量
+            offset: 偏移量（从最新消息起算，仅在未提供游标时使用）
+            before: 读取早于该游标的消息
+            after: 读取晚于该游标的消息
             
         Returns:
-            消息持久化对象列表，按发送时间排序
+            消息持久化对象列表，按发送时间正序排序
         """
         pass
     
@@ -81,7 +89,7 @@ class IMessageDao(ABC):
     
     @abstractmethod
     def mark_read(self, message_id: str, user_id: str) -> None:
-        """标记消息为已读
+        """标记消息为已读（前移用户在该会话的已读游标，游标不会后退）
         
         Args:
             message_id: 消息ID
@@ -91,7 +99,7 @@ class IMessageDao(ABC):
     
     @abstractmethod
     def mark_all_read(self, conversation_id: str, user_id: str) -> int:
-        """标记会话中所有消息为已读
+        """标记会话中所有消息为已读（已读游标移到最后一条消息）
         
         Args:
             conversation_id: 会话ID
@@ -101,3 +109,16 @@ class IMessageDao(ABC):
             标记为已读的消息数量
         """
         pass
+    
+    @abstractmethod
+    def count_unread(self, conversation_id: str, user_id: str) -> int:
+        """统计用户在会话中的未读消息数（已读游标之后他人发送的消息）
+        
+        Args:
+            conversation_id: 会话ID
+            user_id: 用户ID
+            
+        Returns:
+            未读消息数量
+        """
+        pass
@@ -4,9 +4,10 @@
 定义帖子持久化对象的数据访问操作。
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple, Dict, Any
+from datetime import datetime
 
-from app_social.infrastructure.database.persistent_model.post_po import PostPO
+from app_social.infrastructure.database.persistent_model.post_po import PostPO, CommentPO
 
 
 class IPostDao(ABC):
@@ -24,13 +25,26 @@ class IPostDao(ABC):
         """
         pass
     
+    @abstractmethod
+    def find_header_by_id(self, post_id: str) -> Optional[PostPO]:
+        """根据ID查找帖子头信息（不预加载评论/点赞/图片/标签）
+        
+        Args:
+            post_id: 帖子ID
+            
+        Returns:
+            帖子持久化对象，不存在则返回 None
+        """
+        pass
+    
     @abstractmethod
     def find_by_author(
         self,
         author_id: str,
         include_deleted: bool = False,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        before: Optional[Tuple[datetime, str]] = None
     ) -> List[PostPO]:
         """查找用户的帖子
         
@@ -38,7 +52,8 @@ class IPostDao(ABC):
             author_id: 作者ID
             include_deleted: 是否包含已删除的帖子
             limit: 每页数量
-            offset: 偏移量
+            offset: 偏移量（提供 before 时忽略）
+            before: keyset 游标位置 (created_at, id)，只返回严格位于其后的帖子
             
         Returns:
             帖子持久化对象列表
@@ -63,21 +78,60 @@ class IPostDao(ABC):
         limit: int = 20,
         offset: int = 0,
         tags: Optional[List[str]] = None,
-        search_query: Optional[str] = None
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None
     ) -> List[PostPO]:
         """获取公开帖子流
         
         Args:
             limit: 每页数量
-            offset: 偏移量
+            offset: 偏移量（提供 before 时忽略）
             tags: 标签筛选
             search_query: 搜索关键词
+            before: keyset 游标位置 (created_at, id)，只返回严格位于其后的帖子
             
         Returns:
             帖子持久化对象列表
         """
         pass
     
+    @abstractmethod
+    def find_feed_cards(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        tags: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        viewer_id: Optional[str] = None,
+        author_id: Optional[str] = None,
+        visibilities: Optional[List[str]] = None,
+        author_ids: Optional[List[str]] = None,
+        post_ids: Optional[List[str]] = None,
+        sort: str = 'latest'
+    ) -> List[Dict[str, Any]]:
+        """查询帖子卡片投影（不加载评论/点赞/图片/标签子表）
+        
+        Args:
+            limit: 每页数量
+            offset: 偏移量（提供 before 时忽略）
+            tags: 标签筛选
+            search_query: 搜索关键词
+            before: keyset 游标位置 (created_at, id)
+            viewer_id: 当前用户ID，用于计算 is_liked_by_viewer
+            author_id: 仅查询该作者的帖子
+            visibilities: 允许的可见性列表，None 表示不限
+            author_ids: 仅查询这些作者的帖子
+            post_ids: 仅查询这些帖子
+            sort: 'latest' 按发布时间，'hot' 按热度分（before 为 (hot_score, id)）
+            
+        Returns:
+            行字典列表，包含 id, author_id, title, text_head, images_json, tags_json,
+            visibility, trip_id, created_at, updated_at, like_count, comment_count,
+            is_liked_by_viewer
+        """
+        pass
+    
     @abstractmethod
     def find_by_visibility(
         self,
@@ -115,6 +169,223 @@ class IPostDao(ABC):
         """
         pass
     
+    @abstractmethod
+    def update_header(
+        self,
+        post_id: str,
+        values: Dict[str, Any],
+        like_delta: int = 0,
+        comment_delta: int = 0
+    ) -> None:
+        """更新帖子主表列，并原子地应用计数器增量（单条 UPDATE）
+        
+        Args:
+            post_id: 帖子ID
+            values: 列名到新值的映射
+            like_delta: 点赞数增量
+            comment_delta: 评论数增量
+        """
+        pass
+    
+    @abstractmethod
+    def find_comments(
+        self,
+        post_id: str,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, str]] = None,
+        parent_id: Optional[str] = None
+    ) -> List[CommentPO]:
+        """分页查询帖子的未删除评论，按 (created_at, id) 升序
+        
+        Args:
+            post_id: 帖子ID
+            limit: 每页数量
+            after: keyset 游标位置 (created_at, id)，返回其后的评论
+            parent_id: 为 None 时查询顶层评论，否则查询该评论的回复
+        """
+        pass
+    
+    @abstractmethod
+    def find_comment(self, post_id: str, comment_id: str) -> Optional[CommentPO]:
+        """按主键查询帖子下的单条评论（含已删除），不加载帖子其他评论"""
+        pass
+    
+    @abstractmethod
+    def count_replies(self, comment_ids: List[str]) -> Dict[str, int]:
+        """批量统计评论的未删除回复数
+        
+        Args:
+            comment_ids: 评论ID列表
+            
+        Returns:
+            {评论ID: 回复数}，没有回复的评论不出现在结果中
+        """
+        pass
+    
+    @abstractmethod
+    def is_liked_by(self, post_id: str, user_id: str) -> bool:
+        """检查用户是否已点赞帖子"""
+        pass
+    
+    @abstractmethod
+    def add_comments(self, rows: List[Dict[str, Any]]) -> None:
+        """批量插入评论
+        
+        Args:
+            rows: 评论行字典列表
+        """
+        pass
+    
+    @abstractmethod
+    def update_comments(self, rows: List[Dict[str, Any]]) -> None:
+        """按主键批量更新评论
+        
+        Args:
+            rows: 评论行字典列表（需包含 id）
+        """
+        pass
+    
+    @abstractmethod
+    def add_likes(self, rows: List[Dict[str, Any]]) -> None:
+        """批量插入点赞
+        
+        Args:
+            rows: 点赞行字典列表
+        """
+        pass
+    
+    @abstractmethod
+    def remove_likes(self, post_id: str, user_ids: List[str]) -> None:
+        """批量删除点赞
+        
+        Args:
+            post_id: 帖子ID
+            user_ids: 取消点赞的用户ID列表
+        """
+        pass
+    
+    @abstractmethod
+    def add_images(self, rows: List[Dict[str, Any]]) -> None:
+        """批量插入帖子图片
+        
+        Args:
+            rows: 图片行字典列表
+        """
+        pass
+    
+    @abstractmethod
+    def remove_images(self, post_id: str, images: List[Tuple[int, str]]) -> None:
+        """批量删除帖子图片
+        
+        Args:
+            post_id: 帖子ID
+            images: (display_order, image_url) 列表
+        """
+        pass
+    
+    @abstractmethod
+    def add_tags(self, post_id: str, tags: List[str], created_at: datetime, count: bool = True) -> None:
+        """为帖子添加标签，并递增标签计数
+        
+        标签字典中不存在的标签会被创建。
+        
+        Args:
+            post_id: 帖子ID
+            tags: 标签名列表
+            created_at: 帖子创建时间（冗余到 post_tags 供按标签分页）
+            count: 是否递增标签计数（只统计公开且未删除的帖子）
+        """
+        pass
+    
+    @abstractmethod
+    def remove_tags(self, post_id: str, tags: List[str], count: bool = True) -> None:
+        """移除帖子的标签，并递减标签计数
+        
+        Args:
+            post_id: 帖子ID
+            tags: 标签名列表
+            count: 这些标签是否曾计入标签计数（是则递减）
+        """
+        pass
+    
+    @abstractmethod
+    def adjust_tag_counts(self, tags: List[str], delta: int) -> None:
+        """原子调整标签计数（帖子删除或可见性变更时使用）
+        
+        Args:
+            tags: 标签名列表
+            delta: 增量
+        """
+        pass
+    
+    @abstractmethod
+    def find_popular_tags(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """获取热门标签
+        
+        Args:
+            limit: 数量限制
+            
+        Returns:
+            行字典列表，包含 name, post_count，按 post_count 降序
+        """
+        pass
+    
+    @abstractmethod
+    def add_like(self, post_id: str, user_id: str) -> bool:
+        """插入点赞记录，成功时原子递增 like_count
+        
+        Args:
+            post_id: 帖子ID
+            user_id: 点赞用户ID
+            
+        Returns:
+            是否插入了新记录（已点赞返回 False）
+        """
+        pass
+    
+    @abstractmethod
+    def remove_like(self, post_id: str, user_id: str) -> bool:
+        """删除点赞记录，成功时原子递减 like_count
+        
+        Args:
+            post_id: 帖子ID
+            user_id: 点赞用户ID
+            
+        Returns:
+            是否删除了记录（未点赞返回 False）
+        """
+        pass
+    
+    @abstractmethod
+    def increment_counters(self, post_id: str, like_delta: int = 0, comment_delta: int = 0, share_delta: int = 0) -> None:
+        """原子增量更新计数器（UPDATE ... SET x = x + delta）
+        
+        Args:
+            post_id: 帖子ID
+            like_delta: 点赞数增量
+            comment_delta: 评论数增量
+            share_delta: 分享数增量
+        """
+        pass
+    
+    @abstractmethod
+    def find_engagement(self, post_ids: List[str]) -> List[Dict[str, Any]]:
+        """批量读取计算热度分所需的列
+        
+        Returns:
+            行字典列表，包含 id, like_count, comment_count, share_count, created_at
+        """
+        pass
+    
+    @abstractmethod
+    def update_hot_scores(self, scores: Dict[str, float]) -> None:
+        """按主键批量更新热度分
+        
+        Args:
+            scores: {帖子ID: 热度分}
+        """
+        pass
+    
     @abstractmethod
     def delete(self, post_id: str) -> None:
         """删除帖子（物理删除）
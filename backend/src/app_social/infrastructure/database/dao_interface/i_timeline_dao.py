@@ -0,0 +1,40 @@
+"""
+时间线 DAO 接口
+
+定义时间线条目的数据访问操作。
+"""
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple, Dict, Any
+from datetime import datetime
+
+
+class ITimelineDao(ABC):
+    """时间线数据访问对象接口"""
+
+    @abstractmethod
+    def add_entries(self, rows: List[Dict[str, Any]]) -> None:
+        """批量插入时间线条目
+
+        Args:
+            rows: 条目行字典列表（owner_id, post_id, author_id, created_at）
+        """
+        pass
+
+    @abstractmethod
+    def find_entries(
+        self,
+        owner_id: str,
+        limit: int = 20,
+        before: Optional[Tuple[datetime, str]] = None
+    ) -> List[Tuple[datetime, str]]:
+        """分页查询用户时间线，按 (created_at, post_id) 降序
+
+        Args:
+            owner_id: 时间线所属用户ID
+            limit: 每页数量
+            before: keyset 游标位置 (created_at, post_id)
+
+        Returns:
+            (created_at, post_id) 列表
+        """
+        pass
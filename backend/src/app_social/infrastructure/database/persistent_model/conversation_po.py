@@ -13,7 +13,7 @@ from shared.database.core import Base
 from app_social.domain.aggregate.conversation_aggregate import Conversation
 from app_social.domain.entity.message_entity import Message
 from app_social.domain.value_objects.social_value_objects import (
-    ConversationId, ConversationType, MessageContent, ConversationRole
+    ConversationId, ConversationType, MessageContent, ConversationRole, ReadCursor
 )
 
 
@@ -23,7 +23,10 @@ conversation_participants = Table(
     Base.metadata,
     Column('conversation_id', String(36), ForeignKey('conversations.id'), primary_key=True),
     Column('user_id', String(36), primary_key=True),
-    Column('role', String(20), nullable=False, default='member') # owner, admin, member
+    Column('role', String(20), nullable=False, default='member'), # owner, admin, member
+    # 已读游标：最后已读消息及其发送时间，之后他人发送的消息为未读
+    Column('last_read_message_id', String(36), nullable=True),
+    Column('last_read_at', DateTime, nullable=True)
 )
 
 
@@ -44,12 +47,18 @@ class ConversationPO(Base):
     def __repr__(self) -> str:
         return f"ConversationPO(id={self.id}, type={self.conversation_type})"
     
-    def to_domain(self, participants: Dict[str, ConversationRole], messages: List['MessagePO']) -> Conversation:
+    def to_domain(
+        self,
+        participants: Dict[str, ConversationRole],
+        messages: List['MessagePO'],
+        read_cursors: Optional[Dict[str, ReadCursor]] = None
+    ) -> Conversation:
         """将持久化对象转换为领域实体
         
         Args:
             participants: 参与者ID及角色映射
             messages: 消息持久化对象列表
+            read_cursors: 参与者已读游标
             
         Returns:
             Conversation 领域实体
@@ -63,7 +72,8 @@ class ConversationPO(Base):
             conversation_type=ConversationType(self.conversation_type),
             created_at=self.created_at,
             last_message_at=self.last_message_at,
-            title=self.title
+            title=self.title,
+            read_cursors=read_cursors
         )
     
     @classmethod
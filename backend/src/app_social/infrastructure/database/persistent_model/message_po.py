@@ -4,10 +4,9 @@
 用于 SQLAlchemy ORM 映射，与数据库表对应。
 """
 from datetime import datetime
-from typing import Optional, Set
-import json
+from typing import Optional
 
-from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from shared.database.core import Base
 
@@ -19,6 +18,10 @@ class MessagePO(Base):
     """消息持久化对象 - SQLAlchemy 模型"""
     
     __tablename__ = 'messages'
+    __table_args__ = (
+        # 未读数（游标之后的消息）与最后一条消息按 (sent_at, id) 沿索引读取
+        Index('idx_messages_conversation_sent', 'conversation_id', 'sent_at', 'id'),
+    )
     
     id = Column(String(36), primary_key=True)
     conversation_id = Column(String(36), ForeignKey('conversations.id'), nullable=False, index=True)
@@ -33,7 +36,8 @@ class MessagePO(Base):
     # 状态
     sent_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     is_deleted = Column(Boolean, nullable=False, default=False)
-    read_by_json = Column(Text, nullable=False, default='[]')  # JSON 格式存储已读用户ID列表
+    # 已废弃：读状态改由 conversation_participants 的已读游标保存，仅供迁移回填
+    read_by_json = Column(Text, nullable=False, default='[]')
     
     # 关联
     conversation = relationship('ConversationPO', back_populates='messages')
@@ -41,19 +45,11 @@ class MessagePO(Base):
     def __repr__(self) -> str:
         return f"MessagePO(id={self.id}, sender={self.sender_id})"
     
-    @property
-    def read_by(self) -> Set[str]:
-        """获取已读用户ID集合"""
-        return set(json.loads(self.read_by_json))
-    
-    @read_by.setter
-    def read_by(self, value: Set[str]) -> None:
-        """设置已读用户ID集合"""
-        self.read_by_json = json.dumps(list(value))
-    
     def to_domain(self) -> Message:
         """将持久化对象转换为领域实体
         
+        read_by 只含发送者，其他参与者的已读状态由会话的已读游标推导。
+        
         Returns:
             Message 领域实体
         """
@@ -71,7 +67,7 @@ class MessagePO(Base):
             content=content,
             sent_at=self.sent_at,
             is_deleted=self.is_deleted,
-            read_by=self.read_by
+            read_by={self.sender_id}
         )
         
         return message
@@ -86,7 +82,7 @@ class MessagePO(Base):
         Returns:
             MessagePO 持久化对象
         """
-        po = cls(
+        return cls(
             id=message.message_id,
             conversation_id=message.conversation_id,
             sender_id=message.sender_id,
@@ -97,8 +93,6 @@ class MessagePO(Base):
             sent_at=message.sent_at,
             is_deleted=message.is_deleted
         )
-        po.read_by = message.read_by
-        return po
     
     def update_from_domain(self, message: Message) -> None:
         """从领域实体更新持久化对象
@@ -111,4 +105,3 @@ class MessagePO(Base):
         self.media_url = message.content.media_url
         self.reference_id = message.content.reference_id
         self.is_deleted = message.is_deleted
-        self.read_by = message.read_by
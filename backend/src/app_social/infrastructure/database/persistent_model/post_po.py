@@ -2,13 +2,13 @@
 帖子及相关持久化对象 (PO - Persistent Object)
 
 用于 SQLAlchemy ORM 映射，与数据库表对应。
-包含 PostPO, CommentPO, LikePO, PostImagePO, PostTagPO。
+包含 PostPO, CommentPO, LikePO, PostImagePO, TagPO, PostTagPO。
 """
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import json
 
-from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey, Integer, Double, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from shared.database.core import Base
 
@@ -18,6 +18,7 @@ from app_social.domain.entity.like_entity import Like
 from app_social.domain.value_objects.social_value_objects import (
     PostId, PostContent, PostVisibility
 )
+from app_social.domain.value_objects.hot_score_policy import HotScorePolicy
 
 
 class LikePO(Base):
@@ -33,6 +34,11 @@ class LikePO(Base):
     # 关联
     post = relationship('PostPO', back_populates='likes')
     
+    __table_args__ = (
+        # 同一用户对同一帖子只能点赞一次，点赞插入依赖该约束保证幂等
+        UniqueConstraint('post_id', 'user_id', name='uq_likes_post_user'),
+    )
+    
     def to_domain(self) -> Like:
         """转换为领域实体"""
         return Like(
@@ -49,6 +55,15 @@ class LikePO(Base):
             post_id=like.post_id,
             created_at=like.created_at
         )
+    
+    @staticmethod
+    def row_from_domain(like: Like) -> Dict[str, Any]:
+        """生成批量 INSERT 使用的行字典"""
+        return {
+            'user_id': like.user_id,
+            'post_id': like.post_id,
+            'created_at': like.created_at
+        }
 
 
 class CommentPO(Base):
@@ -67,6 +82,13 @@ class CommentPO(Base):
     # 关联
     post = relationship('PostPO', back_populates='comments')
     
+    __table_args__ = (
+        # 评论分页：帖子下按时间顺序翻页
+        Index('idx_comments_post_created', 'post_id', 'created_at', 'id'),
+        # 楼中楼回复分页与回复数统计
+        Index('idx_comments_parent_created', 'parent_id', 'created_at', 'id'),
+    )
+    
     def to_domain(self) -> Comment:
         """转换为领域实体"""
         return Comment(
@@ -96,6 +118,28 @@ class CommentPO(Base):
         """从领域实体更新"""
         self.content = comment.content
         self.is_deleted = comment.is_deleted
+    
+    @staticmethod
+    def row_from_domain(comment: Comment) -> Dict[str, Any]:
+        """生成批量 INSERT 使用的行字典"""
+        return {
+            'id': comment.comment_id,
+            'post_id': comment.post_id,
+            'author_id': comment.author_id,
+            'content': comment.content,
+            'parent_id': comment.parent_id,
+            'created_at': comment.created_at,
+            'is_deleted': comment.is_deleted
+        }
+    
+    @staticmethod
+    def update_row_from_domain(comment: Comment) -> Dict[str, Any]:
+        """生成按主键批量 UPDATE 使用的行字典（仅可变列）"""
+        return {
+            'id': comment.comment_id,
+            'content': comment.content,
+            'is_deleted': comment.is_deleted
+        }
 
 
 class PostImagePO(Base):
@@ -110,15 +154,36 @@ class PostImagePO(Base):
     post = relationship('PostPO', back_populates='images')
 
 
+class TagPO(Base):
+    """标签字典持久化对象
+    
+    post_count 为使用该标签的未删除帖子数，通过原子增量维护。
+    """
+    __tablename__ = 'tags'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(50), nullable=False, unique=True)
+    post_count = Column(Integer, nullable=False, default=0, server_default='0', index=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
 class PostTagPO(Base):
-    """帖子标签持久化对象"""
+    """帖子-标签关联持久化对象"""
     __tablename__ = 'post_tags'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     post_id = Column(String(36), ForeignKey('posts.id'), nullable=False, index=True)
-    tag = Column(String(50), nullable=False, index=True)
+    tag_id = Column(Integer, ForeignKey('tags.id'), nullable=False)
+    # 冗余帖子创建时间，按标签取最新帖子时只扫描 (tag_id, created_at) 索引
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     
     post = relationship('PostPO', back_populates='tags')
+    tag = relationship('TagPO')
+    
+    __table_args__ = (
+        UniqueConstraint('post_id', 'tag_id', name='uq_post_tags_post_tag'),
+        Index('idx_post_tags_tag_created', 'tag_id', 'created_at', 'post_id'),
+    )
 
 
 class PostPO(Base):
@@ -139,6 +204,14 @@ class PostPO(Base):
     visibility = Column(String(20), nullable=False, default='public')
     trip_id = Column(String(36), nullable=True, index=True)  # 关联旅行
     
+    # 反规范化计数器（通过原子 UPDATE 维护）
+    like_count = Column(Integer, nullable=False, default=0, server_default='0')
+    comment_count = Column(Integer, nullable=False, default=0, server_default='0')
+    share_count = Column(Integer, nullable=False, default=0, server_default='0')
+    
+    # 热度分（HotScorePolicy），由互动事件处理器增量刷新
+    hot_score = Column(Double, nullable=False, default=0.0, server_default='0')
+    
     # 状态
     is_deleted = Column(Boolean, nullable=False, default=False)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -150,13 +223,22 @@ class PostPO(Base):
     images = relationship('PostImagePO', back_populates='post', cascade='all, delete-orphan', order_by='PostImagePO.display_order')
     tags = relationship('PostTagPO', back_populates='post', cascade='all, delete-orphan')
     
+    __table_args__ = (
+        # 公开流 / 用户帖子列表的 keyset 分页索引
+        Index('idx_posts_feed', 'visibility', 'is_deleted', 'created_at', 'id'),
+        Index('idx_posts_author_feed', 'author_id', 'is_deleted', 'created_at', 'id'),
+        # 热门流：按热度分倒序扫描索引取 top-K
+        Index('idx_posts_hot', 'visibility', 'is_deleted', 'hot_score', 'id'),
+    )
+    
     def __repr__(self) -> str:
         return f"PostPO(id={self.id}, title={self.title[:20]}...)"
     
     def to_domain(self) -> Post:
         """将持久化对象转换为领域实体"""
         image_urls = tuple(img.image_url for img in self.images)
-        tag_list = tuple(t.tag for t in self.tags)
+        # 标签顺序以 tags_json 为准，post_tags 仅用于按标签查询
+        tag_list = tuple(json.loads(self.tags_json)) if self.tags_json else ()
         
         content = PostContent(
             title=self.title,
@@ -181,6 +263,34 @@ class PostPO(Base):
             is_deleted=self.is_deleted
         )
     
+    def to_domain_header(self) -> Post:
+        """转换为仅含头信息的领域实体
+        
+        不访问 comments / likes / images / tags 关联（图片和标签取自 JSON 列），
+        计数取自反规范化计数器。返回的 Post 的 comments / likes 集合为空。
+        """
+        content = PostContent(
+            title=self.title,
+            text=self.text,
+            images=tuple(json.loads(self.images_json)) if self.images_json else (),
+            tags=tuple(json.loads(self.tags_json)) if self.tags_json else ()
+        )
+        
+        return Post.reconstitute(
+            post_id=PostId(self.id),
+            author_id=self.author_id,
+            content=content,
+            comments=[],
+            likes=[],
+            visibility=PostVisibility.from_string(self.visibility),
+            trip_id=self.trip_id,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            is_deleted=self.is_deleted,
+            like_count=self.like_count or 0,
+            comment_count=self.comment_count or 0
+        )
+    
     @classmethod
     def from_domain(cls, post: Post) -> 'PostPO':
         """从领域实体创建持久化对象"""
@@ -192,6 +302,9 @@ class PostPO(Base):
             visibility=post.visibility.value,
             trip_id=post.trip_id,
             is_deleted=post.is_deleted,
+            like_count=post.like_count,
+            comment_count=post.comment_count,
+            hot_score=HotScorePolicy().score(post.like_count, post.comment_count, 0, post.created_at),
             created_at=post.created_at,
             updated_at=post.updated_at
         )
@@ -203,29 +316,26 @@ class PostPO(Base):
             PostImagePO(image_url=url, display_order=idx) 
             for idx, url in enumerate(post.content.images)
         ]
-        po.tags = [PostTagPO(tag=tag) for tag in post.content.tags]
-        
+        # post_tags 需要先解析标签字典ID，由仓储在插入帖子后写入
         po.comments = [CommentPO.from_domain(c) for c in post.comments]
         po.likes = [LikePO.from_domain(l) for l in post.likes]
         
         return po
     
-    def update_from_domain(self, post: Post) -> None:
-        """从领域实体更新持久化对象"""
-        self.title = post.content.title
-        self.text = post.content.text
-        self.visibility = post.visibility.value
-        self.trip_id = post.trip_id
-        self.is_deleted = post.is_deleted
-        self.updated_at = post.updated_at
-        self.images_json = json.dumps(list(post.content.images)) if post.content.images else '[]'
-        self.tags_json = json.dumps(list(post.content.tags)) if post.content.tags else '[]'
-        
-        # 更新图片：直接替换集合，利用 cascade='all, delete-orphan'
-        self.images = [
-            PostImagePO(image_url=url, display_order=idx) 
-            for idx, url in enumerate(post.content.images)
-        ]
+    @staticmethod
+    def header_values_from_domain(post: Post) -> Dict[str, Any]:
+        """生成帖子主表的可更新列
         
-        # 更新标签：直接替换集合
-        self.tags = [PostTagPO(tag=tag) for tag in post.content.tags]
+        注意：不包含 like_count / comment_count，计数器只通过原子增量更新，
+        避免并发请求互相覆盖；图片/标签子表由仓储按变更集增量维护。
+        """
+        return {
+            'title': post.content.title,
+            'text': post.content.text,
+            'visibility': post.visibility.value,
+            'trip_id': post.trip_id,
+            'is_deleted': post.is_deleted,
+            'updated_at': post.updated_at,
+            'images_json': json.dumps(list(post.content.images)) if post.content.images else '[]',
+            'tags_json': json.dumps(list(post.content.tags)) if post.content.tags else '[]'
+        }
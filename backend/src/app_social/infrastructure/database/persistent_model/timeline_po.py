@@ -0,0 +1,28 @@
+"""
+时间线持久化对象 (PO - Persistent Object)
+
+物化的个人时间线：每行表示某帖子出现在某用户的时间线中。
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Index, UniqueConstraint
+from shared.database.core import Base
+
+
+class TimelineEntryPO(Base):
+    """时间线条目持久化对象
+
+    created_at 冗余帖子的创建时间，按 (owner_id, created_at, post_id) 索引分页。
+    """
+    __tablename__ = 'timeline_entries'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    owner_id = Column(String(36), nullable=False)
+    post_id = Column(String(36), ForeignKey('posts.id'), nullable=False, index=True)
+    author_id = Column(String(36), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('owner_id', 'post_id', name='uq_timeline_owner_post'),
+        Index('idx_timeline_owner_created', 'owner_id', 'created_at', 'post_id'),
+    )
@@ -15,7 +15,9 @@ class FriendshipPO(Base):
 
     __table_args__ = (
         UniqueConstraint('requester_id', 'addressee_id', name='uq_friendship_requester_addressee'),
-        Index('idx_friendship_requester', 'requester_id'),
-        Index('idx_friendship_addressee', 'addressee_id'),
+        # 两个方向的 (一方, 另一方, 状态) 复合索引，供按候选集合批量校验好友关系；
+        # 同时覆盖只按 requester_id / addressee_id 的查询
+        Index('idx_friendship_pair_status', 'requester_id', 'addressee_id', 'status'),
+        Index('idx_friendship_reverse_status', 'addressee_id', 'requester_id', 'status'),
         Index('idx_friendship_status', 'status'),
     )
@@ -4,12 +4,14 @@
 实现 IConversationRepository 接口，包含消息管理（遵循 DDD 一个聚合根一个仓库原则）。
 负责 Conversation 聚合根及其子实体 Message 的持久化。
 """
-from typing import List, Optional, Set, Dict
+from datetime import datetime
+from typing import List, Optional, Set, Dict, Tuple
 
 from app_social.domain.demand_interface.i_conversation_repository import IConversationRepository
 from app_social.domain.aggregate.conversation_aggregate import Conversation
 from app_social.domain.entity.message_entity import Message
-from app_social.domain.value_objects.social_value_objects import ConversationId, ConversationRole
+from app_social.domain.value_objects.social_value_objects import ConversationId, ConversationRole, ReadCursor
+from app_social.domain.value_objects.conversation_summary import ConversationSummary, LastMessagePreview
 from app_social.infrastructure.database.dao_interface.i_conversation_dao import IConversationDao
 from app_social.infrastructure.database.dao_interface.i_message_dao import IMessageDao
 from app_social.infrastructure.database.persistent_model.conversation_po import ConversationPO
@@ -35,7 +37,7 @@ class ConversationRepositoryImpl(IConversationRepository):
     def save(self, conversation: Conversation) -> None:
         """保存会话（新增或更新）
         
-        同时保存会话中的新消息。
+        同时保存会话中的新消息；参与者只按变更集增量写入。
         """
         existing_po = self._conversation_dao.find_by_id(conversation.id.value)
         
@@ -51,18 +53,43 @@ class ConversationRepositoryImpl(IConversationRepository):
         # 保存/更新消息
         self._save_messages(conversation)
         
-        # 保存参与者
-        participants_data = []
-        for uid, role in conversation.participants_with_roles.items():
-            participants_data.append({
-                "user_id": uid,
-                "role": role.value
-            })
-            
-        self._conversation_dao.update_participants(
-            conversation.id.value, 
-            participants_data
-        )
+        # 只写入变化的参与者行：新成员连同已读游标一起插入
+        changes = conversation.pop_participant_changes()
+        added_ids = set()
+        if changes.added:
+            rows = []
+            for uid, role in changes.added:
+                cursor = conversation.get_read_cursor(uid)
+                added_ids.add(uid)
+                rows.append({
+                    "user_id": uid,
+                    "role": role.value,
+                    "last_read_message_id": cursor.message_id if cursor else None,
+                    "last_read_at": cursor.read_at if cursor else None
+                })
+            self._conversation_dao.add_participants(conversation.id.value, rows)
+        if changes.removed:
+            self._conversation_dao.remove_participants(conversation.id.value, list(changes.removed))
+        if changes.role_changes:
+            self._conversation_dao.update_participant_roles(
+                conversation.id.value, {uid: role.value for uid, role in changes.role_changes}
+            )
+        
+        # 其余成员只更新前移过的已读游标
+        for uid, cursor in conversation.pop_read_cursor_changes().items():
+            if uid not in added_ids:
+                self._conversation_dao.update_read_cursor(
+                    conversation.id.value, uid, cursor.message_id, cursor.read_at
+                )
+    
+    def save_read_state(self, conversation: Conversation) -> bool:
+        """只持久化前移过的已读游标（每位用户一条 UPDATE）"""
+        changes = conversation.pop_read_cursor_changes()
+        for uid, cursor in changes.items():
+            self._conversation_dao.update_read_cursor(
+                conversation.id.value, uid, cursor.message_id, cursor.read_at
+            )
+        return bool(changes)
     
     def _save_messages(self, conversation: Conversation) -> None:
         """保存会话中的消息
@@ -88,10 +115,44 @@ class ConversationRepositoryImpl(IConversationRepository):
         # 加载消息
         message_pos = self._message_dao.find_by_conversation(conversation_id.value)
         
-        # 加载参与者和角色
-        participants = self._load_participants(conversation_id.value)
+        # 加载参与者、角色和已读游标
+        participants, read_cursors = self._load_participants(conversation_id.value)
         
-        return conversation_po.to_domain(participants, message_pos)
+        return conversation_po.to_domain(participants, message_pos, read_cursors)
+    
+    def find_header_by_id(self, conversation_id: ConversationId) -> Optional[Conversation]:
+        """查找会话头信息（参与者、角色与已读游标，不加载消息）"""
+        conversation_po = self._conversation_dao.find_by_id(conversation_id.value)
+        if not conversation_po:
+            return None
+        
+        participants, read_cursors = self._load_participants(conversation_id.value)
+        return conversation_po.to_domain(participants, [], read_cursors)
+    
+    def append_message(self, conversation: Conversation, message: Message) -> None:
+        """追加一条新消息：单条 INSERT + 定向更新最后消息时间"""
+        self._message_dao.add(MessagePO.from_domain(message))
+        self._conversation_dao.touch_last_message(conversation.id.value, message.sent_at)
+    
+    def find_messages(
+        self,
+        conversation_id: ConversationId,
+        limit: int = 50,
+        before: Optional[Tuple[datetime, str]] = None,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Message]:
+        """按消息游标分页读取会话消息（按发送时间正序）"""
+        message_pos = self._message_dao.find_by_conversation(
+            conversation_id.value, limit=limit, before=before, after=after
+        )
+        return [po.to_domain() for po in message_pos]
+    
+    def find_message(self, conversation_id: ConversationId, message_id: str) -> Optional[Message]:
+        """按ID查找会话内的单条消息"""
+        message_po = self._message_dao.find_by_id(message_id)
+        if not message_po or message_po.conversation_id != conversation_id.value or message_po.is_deleted:
+            return None
+        return message_po.to_domain()
     
     def find_by_participants(self, user_id1: str, user_id2: str) -> Optional[Conversation]:
         """查找两人之间的私聊"""
@@ -101,10 +162,10 @@ class ConversationRepositoryImpl(IConversationRepository):
         
         message_pos = self._message_dao.find_by_conversation(conversation_po.id)
         
-        # 加载参与者和角色
-        participants = self._load_participants(conversation_po.id)
+        # 加载参与者、角色和已读游标
+        participants, read_cursors = self._load_participants(conversation_po.id)
         
-        return conversation_po.to_domain(participants, message_pos)
+        return conversation_po.to_domain(participants, message_pos, read_cursors)
     
     def find_by_user(
         self,
@@ -118,11 +179,47 @@ class ConversationRepositoryImpl(IConversationRepository):
         conversations = []
         for po in conversation_pos:
             message_pos = self._message_dao.find_by_conversation(po.id, limit=50)
-            participants = self._load_participants(po.id)
-            conversations.append(po.to_domain(participants, message_pos))
+            participants, read_cursors = self._load_participants(po.id)
+            conversations.append(po.to_domain(participants, message_pos, read_cursors))
         
         return conversations
     
+    def find_inbox(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[ConversationSummary]:
+        """获取用户收件箱摘要（会话页一条查询 + 参与者一条 IN 查询）"""
+        rows = self._conversation_dao.find_inbox(user_id, limit, offset)
+        participants = self._conversation_dao.get_participants_for([row['id'] for row in rows])
+        return [
+            self._row_to_summary(row, participants.get(row['id'], []))
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _row_to_summary(row: Dict, participants: List[Dict[str, str]]) -> ConversationSummary:
+        last_message = None
+        if row['last_message_id']:
+            last_message = LastMessagePreview(
+                message_id=row['last_message_id'],
+                sender_id=row['last_message_sender_id'],
+                text=row['last_message_text'],
+                message_type=row['last_message_type'],
+                sent_at=row['last_message_sent_at']
+            )
+        return ConversationSummary(
+            conversation_id=row['id'],
+            conversation_type=row['conversation_type'],
+            title=row['title'],
+            created_at=row['created_at'],
+            last_message_at=row['last_message_at'],
+            participant_ids=tuple(p['user_id'] for p in participants),
+            unread_count=row['unread_count'] or 0,
+            last_message=last_message
+        )
+    
     def find_by_user_with_unread(self, user_id: str) -> List[Conversation]:
         """获取用户有未读消息的会话"""
         conversation_pos = self._conversation_dao.find_by_user_with_unread(user_id)
@@ -130,8 +227,8 @@ class ConversationRepositoryImpl(IConversationRepository):
         conversations = []
         for po in conversation_pos:
             message_pos = self._message_dao.find_by_conversation(po.id, limit=50)
-            participants = self._load_participants(po.id)
-            conversations.append(po.to_domain(participants, message_pos))
+            participants, read_cursors = self._load_participants(po.id)
+            conversations.append(po.to_domain(participants, message_pos, read_cursors))
         
         return conversations
     
@@ -144,14 +241,19 @@ class ConversationRepositoryImpl(IConversationRepository):
         """检查会话是否存在"""
         return self._conversation_dao.exists(conversation_id.value)
     
-    def _load_participants(self, conversation_id: str) -> Dict[str, ConversationRole]:
-        """加载会话参与者及角色"""
+    def _load_participants(
+        self, conversation_id: str
+    ) -> Tuple[Dict[str, ConversationRole], Dict[str, ReadCursor]]:
+        """加载会话参与者、角色及已读游标"""
         rows = self._conversation_dao.get_participants_with_roles(conversation_id)
         result = {}
+        read_cursors = {}
         for row in rows:
             try:
                 role = ConversationRole(row["role"])
             except ValueError:
                 role = ConversationRole.MEMBER # 默认回退
             result[row["user_id"]] = role
-        return result
+            if row.get("last_read_message_id") and row.get("last_read_at"):
+                read_cursors[row["user_id"]] = ReadCursor(row["last_read_message_id"], row["last_read_at"])
+        return result, read_cursors
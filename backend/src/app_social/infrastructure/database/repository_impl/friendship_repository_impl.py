@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 from app_social.domain.demand_interface.friendship_repository import IFriendshipRepository
 from app_social.domain.aggregate.friendship_aggregate import Friendship
 from app_social.domain.value_objects.friendship_value_objects import (
@@ -50,6 +50,9 @@ class FriendshipRepositoryImpl(IFriendshipRepository):
             return self._to_domain(po)
         return None
 
+    def find_accepted_among(self, user_id: str, candidate_ids: Iterable[str]) -> Set[str]:
+        return self._dao.find_accepted_among(user_id, candidate_ids)
+
     def find_pending_requests(self, user_id: str, type: str = 'incoming') -> List[Friendship]:
         if type == 'incoming':
             pos = self._dao.find_pending_incoming(user_id)
@@ -67,6 +70,9 @@ class FriendshipRepositoryImpl(IFriendshipRepository):
                 friend_ids.append(po.requester_id)
         return friend_ids
 
+    def count_friends(self, user_ids: List[str]) -> Dict[str, int]:
+        return self._dao.count_friends(user_ids)
+
     def _to_po(self, friendship: Friendship) -> FriendshipPO:
         return FriendshipPO(
             id=friendship.id.value,
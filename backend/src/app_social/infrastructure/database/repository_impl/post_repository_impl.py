@@ -4,13 +4,19 @@
 实现 IPostRepository 接口。
 负责 Post 聚合根及其子实体（Comment, Like, Image, Tag）的持久化。
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple, Dict, Any
+from datetime import datetime
+import json
 
 from app_social.domain.demand_interface.i_post_repository import IPostRepository
 from app_social.domain.aggregate.post_aggregate import Post
+from app_social.domain.entity.comment_entity import Comment
 from app_social.domain.value_objects.social_value_objects import PostId, PostVisibility
+from app_social.domain.value_objects.post_feed_card import PostFeedCard
+from app_social.domain.value_objects.post_change_set import PostChangeSet
+from app_social.domain.value_objects.hot_score_policy import HotScorePolicy
 from app_social.infrastructure.database.dao_interface.i_post_dao import IPostDao
-from app_social.infrastructure.database.persistent_model.post_po import PostPO, CommentPO, LikePO, PostImagePO, PostTagPO
+from app_social.infrastructure.database.persistent_model.post_po import PostPO, CommentPO, LikePO
 
 
 class PostRepositoryImpl(IPostRepository):
@@ -25,71 +31,81 @@ class PostRepositoryImpl(IPostRepository):
         self._post_dao = post_dao
     
     def save(self, post: Post) -> None:
-        """保存帖子（新增或更新）"""
-        existing_po = self._post_dao.find_by_id(post.id.value)
+        """保存帖子（新增或更新）
         
-        if existing_po:
-            # 更新现有帖子
-            existing_po.update_from_domain(post)
-            # 更新子实体
-            self._sync_comments(existing_po, post)
-            self._sync_likes(existing_po, post)
-            # images 和 tags 已经在 PostPO.update_from_domain 中通过替换列表的方式更新了
-            # 利用 SQLAlchemy 的 cascade='all, delete-orphan' 机制，
-            # 替换列表会自动删除旧的关联对象并插入新的，所以这里不需要额外的 sync 方法。
-            
-            self._post_dao.update(existing_po)
-        else:
-            # 添加新帖子
+        根据聚合的变更集增量持久化：新帖子整体插入；
+        已有帖子只更新主表一行，并对增删的子实体执行批量 INSERT / UPDATE / DELETE。
+        """
+        changes = post.pop_changes()
+        
+        if changes.is_new:
             post_po = PostPO.from_domain(post)
             self._post_dao.add(post_po)
+            self._post_dao.add_tags(
+                post.id.value, list(post.content.tags), post.created_at, count=changes.is_tag_counted
+            )
+            return
+        
+        post_id = post.id.value
+        # 主表列与计数器增量合并为一条 UPDATE，计数器只做原子增量，避免并发覆盖
+        self._post_dao.update_header(
+            post_id,
+            PostPO.header_values_from_domain(post),
+            like_delta=changes.like_delta,
+            comment_delta=changes.comment_delta
+        )
+        self._save_child_changes(post, changes)
     
-    def _sync_comments(self, post_po: PostPO, post: Post) -> None:
-        """同步评论
+    def _save_child_changes(self, post: Post, changes: PostChangeSet) -> None:
+        """按变更集批量写入子实体
         
         Args:
-            post_po: 帖子持久化对象
-            post: Post 领域实体
+            post: 帖子聚合
+            changes: 聚合的变更集
         """
-        # 获取当前评论ID集合
-        existing_comment_ids = {c.id for c in post_po.comments}
-        new_comment_ids = {c.comment_id for c in post.comments}
-        
-        # 删除不再存在的评论
-        # 注意：在 SQLAlchemy 中，对于 cascade='all, delete-orphan'，
-        # 应该从集合中移除对象，而不是重新赋值列表（虽然重新赋值通常也工作，但移除更明确）
-        # 但为了保持代码风格一致性，这里沿用之前的逻辑，
-        # 只要 PostPO.comments 配置了 cascade，SQLAlchemy 会处理孤儿删除。
+        post_id = post.id.value
+        self._post_dao.add_comments([CommentPO.row_from_domain(c) for c in changes.added_comments])
+        self._post_dao.update_comments([CommentPO.update_row_from_domain(c) for c in changes.updated_comments])
         
-        # 这种过滤方式其实是重新创建了一个列表，SQLAlchemy 会比较新旧列表
-        post_po.comments = [c for c in post_po.comments if c.id in new_comment_ids]
+        self._post_dao.remove_likes(post_id, list(changes.removed_like_user_ids))
+        self._post_dao.add_likes([LikePO.row_from_domain(l) for l in changes.added_likes])
         
-        # 更新或添加评论
-        for comment in post.comments:
-            existing = next((c for c in post_po.comments if c.id == comment.comment_id), None)
-            if existing:
-                existing.update_from_domain(comment)
-            else:
-                post_po.comments.append(CommentPO.from_domain(comment))
-    
-    def _sync_likes(self, post_po: PostPO, post: Post) -> None:
-        """同步点赞
+        # 先删后插：同一 display_order 换图时不会短暂出现两行
+        self._post_dao.remove_images(post_id, list(changes.removed_images))
+        self._post_dao.add_images([
+            {'post_id': post_id, 'image_url': url, 'display_order': order}
+            for order, url in changes.added_images
+        ])
         
-        Args:
-            post_po: 帖子持久化对象
-            post: Post 领域实体
-        """
-        # 获取当前点赞用户ID集合
-        existing_like_user_ids = {l.user_id for l in post_po.likes}
-        new_like_user_ids = {l.user_id for l in post.likes}
-        
-        # 删除取消的点赞
-        post_po.likes = [l for l in post_po.likes if l.user_id in new_like_user_ids]
-        
-        # 添加新点赞
-        for like in post.likes:
-            if like.user_id not in existing_like_user_ids:
-                post_po.likes.append(LikePO.from_domain(like))
+        # 移除的标签按保存前的状态回退计数，新增的标签按保存后的状态计数
+        self._post_dao.remove_tags(post_id, list(changes.removed_tags), count=changes.was_tag_counted)
+        self._post_dao.add_tags(post_id, list(changes.added_tags), post.created_at, count=changes.is_tag_counted)
+        # 软删除或可见性变更：保留的标签关联按前后状态差调整计数
+        delta = int(changes.is_tag_counted) - int(changes.was_tag_counted)
+        if delta:
+            kept_tags = [t for t in post.content.tags if t not in changes.added_tags]
+            self._post_dao.adjust_tag_counts(kept_tags, delta)
+    
+    def find_popular_tags(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """获取热门标签（按标签计数降序）"""
+        return self._post_dao.find_popular_tags(limit)
+    
+    def increment_share_count(self, post_id: PostId) -> None:
+        """原子递增分享数"""
+        self._post_dao.increment_counters(post_id.value, share_delta=1)
+    
+    def refresh_hot_scores(self, post_ids: List[str], policy: HotScorePolicy) -> None:
+        """按当前计数器重算并写回热度分"""
+        rows = self._post_dao.find_engagement(post_ids)
+        self._post_dao.update_hot_scores({
+            row['id']: policy.score(
+                row['like_count'] or 0,
+                row['comment_count'] or 0,
+                row['share_count'] or 0,
+                row['created_at']
+            )
+            for row in rows
+        })
     
     def find_by_id(self, post_id: PostId) -> Optional[Post]:
         """根据ID查找帖子"""
@@ -98,19 +114,67 @@ class PostRepositoryImpl(IPostRepository):
             return post_po.to_domain()
         return None
     
+    def find_header_by_id(self, post_id: PostId) -> Optional[Post]:
+        """查找帖子头信息（不加载评论/点赞，计数取自计数器）"""
+        post_po = self._post_dao.find_header_by_id(post_id.value)
+        if post_po:
+            return post_po.to_domain_header()
+        return None
+    
+    def find_comments(
+        self,
+        post_id: PostId,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, str]] = None,
+        parent_id: Optional[str] = None
+    ) -> List[Comment]:
+        """分页查询评论（顶层评论或指定评论的回复）"""
+        comment_pos = self._post_dao.find_comments(
+            post_id.value,
+            limit=limit,
+            after=after,
+            parent_id=parent_id
+        )
+        return [po.to_domain() for po in comment_pos]
+    
+    def find_comment(self, post_id: PostId, comment_id: str) -> Optional[Comment]:
+        """查询帖子下的单条评论（含已删除）"""
+        comment_po = self._post_dao.find_comment(post_id.value, comment_id)
+        if comment_po:
+            return comment_po.to_domain()
+        return None
+    
+    def count_replies(self, comment_ids: List[str]) -> Dict[str, int]:
+        """批量统计评论的回复数"""
+        return self._post_dao.count_replies(comment_ids)
+    
+    def is_liked_by(self, post_id: PostId, user_id: str) -> bool:
+        """检查用户是否已点赞帖子"""
+        return self._post_dao.is_liked_by(post_id.value, user_id)
+    
+    def add_like(self, post_id: PostId, user_id: str) -> bool:
+        """定向插入点赞并原子递增计数，已点赞返回 False"""
+        return self._post_dao.add_like(post_id.value, user_id)
+    
+    def remove_like(self, post_id: PostId, user_id: str) -> bool:
+        """定向删除点赞并原子递减计数，未点赞返回 False"""
+        return self._post_dao.remove_like(post_id.value, user_id)
+    
     def find_by_author(
         self,
         author_id: str,
         include_deleted: bool = False,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        before: Optional[Tuple[datetime, str]] = None
     ) -> List[Post]:
         """查找用户的帖子"""
         post_pos = self._post_dao.find_by_author(
             author_id=author_id,
             include_deleted=include_deleted,
             limit=limit,
-            offset=offset
+            offset=offset,
+            before=before
         )
         return [po.to_domain() for po in post_pos]
     
@@ -126,17 +190,72 @@ class PostRepositoryImpl(IPostRepository):
         limit: int = 20,
         offset: int = 0,
         tags: Optional[List[str]] = None,
-        search_query: Optional[str] = None
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None
     ) -> List[Post]:
         """获取公开帖子流"""
         post_pos = self._post_dao.find_public_feed(
             limit=limit,
             offset=offset,
             tags=tags,
-            search_query=search_query
+            search_query=search_query,
+            before=before
         )
         return [po.to_domain() for po in post_pos]
     
+    def find_feed_cards(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        tags: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        viewer_id: Optional[str] = None,
+        author_id: Optional[str] = None,
+        visibilities: Optional[List[str]] = None,
+        author_ids: Optional[List[str]] = None,
+        post_ids: Optional[List[str]] = None,
+        sort: str = 'latest'
+    ) -> List[PostFeedCard]:
+        """获取帖子卡片投影（列表页使用，不构建完整聚合）"""
+        rows = self._post_dao.find_feed_cards(
+            limit=limit,
+            offset=offset,
+            tags=tags,
+            search_query=search_query,
+            before=before,
+            viewer_id=viewer_id,
+            author_id=author_id,
+            visibilities=visibilities,
+            author_ids=author_ids,
+            post_ids=post_ids,
+            sort=sort
+        )
+        return [self._row_to_card(row) for row in rows]
+    
+    @staticmethod
+    def _row_to_card(row: Dict[str, Any]) -> PostFeedCard:
+        """将卡片查询行转换为 PostFeedCard"""
+        images = json.loads(row['images_json']) if row.get('images_json') else []
+        tags = json.loads(row['tags_json']) if row.get('tags_json') else []
+        return PostFeedCard(
+            post_id=row['id'],
+            author_id=row['author_id'],
+            title=row['title'],
+            summary=PostFeedCard.summarize(row['text_head']),
+            cover_image_url=images[0] if images else None,
+            image_count=len(images),
+            tags=tuple(tags),
+            visibility=row['visibility'],
+            trip_id=row['trip_id'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at'],
+            like_count=int(row['like_count'] or 0),
+            comment_count=int(row['comment_count'] or 0),
+            is_liked_by_viewer=bool(row['is_liked_by_viewer']),
+            hot_score=float(row.get('hot_score') or 0.0)
+        )
+    
     def find_by_visibility(
         self,
         visibility: PostVisibility,
@@ -0,0 +1,38 @@
+"""
+时间线仓库实现
+
+实现 ITimelineRepository 接口。
+"""
+from typing import List, Optional, Tuple
+from datetime import datetime
+
+from app_social.domain.demand_interface.i_timeline_repository import ITimelineRepository
+from app_social.infrastructure.database.dao_interface.i_timeline_dao import ITimelineDao
+
+
+class TimelineRepositoryImpl(ITimelineRepository):
+    """时间线仓库实现"""
+
+    def __init__(self, timeline_dao: ITimelineDao):
+        """初始化仓库
+
+        Args:
+            timeline_dao: 时间线数据访问对象
+        """
+        self._timeline_dao = timeline_dao
+
+    def fan_out(self, post_id: str, author_id: str, created_at: datetime, owner_ids: List[str]) -> None:
+        """将帖子写入多位用户的时间线（单条批量 INSERT）"""
+        self._timeline_dao.add_entries([
+            {'owner_id': owner_id, 'post_id': post_id, 'author_id': author_id, 'created_at': created_at}
+            for owner_id in dict.fromkeys(owner_ids)
+        ])
+
+    def find_entries(
+        self,
+        owner_id: str,
+        limit: int = 20,
+        before: Optional[Tuple[datetime, str]] = None
+    ) -> List[Tuple[datetime, str]]:
+        """分页查询用户时间线"""
+        return self._timeline_dao.find_entries(owner_id, limit=limit, before=before)
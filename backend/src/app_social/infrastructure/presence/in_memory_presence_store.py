@@ -0,0 +1,68 @@
+"""
+内存在线状态存储
+
+只记录本进程内的连接，适用于单 worker 部署和测试。
+"""
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Set
+
+from app_social.domain.demand_interface.i_presence_store import IPresenceStore
+from app_social.domain.value_objects.user_presence import UserPresence
+
+
+class InMemoryPresenceStore(IPresenceStore):
+    """内存在线状态存储"""
+
+    def __init__(self, max_pending: int = 100):
+        """
+        Args:
+            max_pending: 每个用户最多暂存的离线通知数
+        """
+        self._lock = threading.Lock()
+        self._connections: Dict[str, Set[str]] = {}
+        self._last_seen: Dict[str, datetime] = {}
+        self._pending: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._max_pending = max_pending
+
+    @property
+    def is_shared(self) -> bool:
+        return False
+
+    def connect(self, user_id: str, sid: str) -> int:
+        with self._lock:
+            sids = self._connections.setdefault(user_id, set())
+            sids.add(sid)
+            self._last_seen[user_id] = datetime.utcnow()
+            return len(sids)
+
+    def disconnect(self, user_id: str, sid: str) -> int:
+        with self._lock:
+            sids = self._connections.get(user_id, set())
+            if sid in sids:
+                sids.discard(sid)
+                self._last_seen[user_id] = datetime.utcnow()
+            if not sids:
+                self._connections.pop(user_id, None)
+            return len(sids)
+
+    def get_many(self, user_ids: List[str]) -> Dict[str, UserPresence]:
+        with self._lock:
+            return {
+                user_id: UserPresence(
+                    user_id=user_id,
+                    connections=len(self._connections.get(user_id, ())),
+                    last_seen=self._last_seen.get(user_id)
+                )
+                for user_id in user_ids
+            }
+
+    def push_offline(self, user_id: str, notification: Dict[str, Any]) -> None:
+        with self._lock:
+            queue = self._pending.setdefault(user_id, deque(maxlen=self._max_pending))
+            queue.append(notification)
+
+    def pop_offline(self, user_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._pending.pop(user_id, ()))
@@ -0,0 +1,38 @@
+"""
+在线状态存储的全局访问点
+
+PRESENCE_STORE_URL 为空时使用进程内存储；
+设置为 SQLAlchemy URL 时使用数据库存储，供多个 worker 共享。
+"""
+import os
+import threading
+from typing import Optional
+
+from app_social.domain.demand_interface.i_presence_store import IPresenceStore
+from app_social.infrastructure.presence.in_memory_presence_store import InMemoryPresenceStore
+from app_social.infrastructure.presence.sqlalchemy_presence_store import SqlAlchemyPresenceStore
+
+PRESENCE_STORE_URL = os.getenv("PRESENCE_STORE_URL", "")
+
+_lock = threading.Lock()
+_store: Optional[IPresenceStore] = None
+
+
+def get_presence_store() -> IPresenceStore:
+    """获取全局在线状态存储（首次访问时按配置创建）"""
+    global _store
+    if _store is None:
+        with _lock:
+            if _store is None:
+                _store = (
+                    SqlAlchemyPresenceStore.from_url(PRESENCE_STORE_URL)
+                    if PRESENCE_STORE_URL else InMemoryPresenceStore()
+                )
+    return _store
+
+
+def set_presence_store(store: Optional[IPresenceStore]) -> None:
+    """替换全局在线状态存储（None 表示下次访问时按配置重建，主要用于测试）"""
+    global _store
+    with _lock:
+        _store = store
@@ -0,0 +1,165 @@
+"""
+数据库在线状态存储
+
+多个 worker 通过同一个数据库共享连接登记和离线通知队列。
+表使用独立的 MetaData，可以放在主库，也可以放在单独的库（PRESENCE_STORE_URL）。
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import (
+    Column, DateTime, Index, Integer, MetaData, String, Table, Text,
+    create_engine, delete, func, insert, select
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+
+from app_social.domain.demand_interface.i_presence_store import IPresenceStore
+from app_social.domain.value_objects.user_presence import UserPresence
+
+metadata = MetaData()
+
+presence_connections = Table(
+    "presence_connections", metadata,
+    Column("sid", String(64), primary_key=True),
+    Column("user_id", String(36), nullable=False),
+    Column("connected_at", DateTime, nullable=False),
+    Index("idx_presence_connections_user", "user_id"),
+)
+
+presence_last_seen = Table(
+    "presence_last_seen", metadata,
+    Column("user_id", String(36), primary_key=True),
+    Column("last_seen", DateTime, nullable=False),
+)
+
+offline_notifications = Table(
+    "offline_notifications", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("user_id", String(36), nullable=False),
+    Column("payload", Text, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Index("idx_offline_notifications_user", "user_id", "id"),
+)
+
+
+class SqlAlchemyPresenceStore(IPresenceStore):
+    """数据库在线状态存储
+
+    worker 异常退出时其连接记录不会被注销，
+    部署时可在启动前清理 presence_connections。
+    """
+
+    def __init__(self, engine: Engine, max_pending: int = 100):
+        """
+        Args:
+            engine: 共享数据库引擎
+            max_pending: 每个用户最多暂存的离线通知数
+        """
+        self._engine = engine
+        self._max_pending = max_pending
+        metadata.create_all(engine)
+
+    @classmethod
+    def from_url(cls, url: str, max_pending: int = 100) -> "SqlAlchemyPresenceStore":
+        return cls(create_engine(url), max_pending)
+
+    @property
+    def is_shared(self) -> bool:
+        return True
+
+    def _touch(self, conn, user_id: str, now: datetime) -> None:
+        """更新最近在线时间"""
+        if self._engine.dialect.name == "sqlite":
+            stmt = sqlite_insert(presence_last_seen).values(user_id=user_id, last_seen=now)
+            conn.execute(stmt.on_conflict_do_update(
+                index_elements=["user_id"], set_={"last_seen": now}
+            ))
+            return
+        updated = conn.execute(
+            presence_last_seen.update()
+            .where(presence_last_seen.c.user_id == user_id)
+            .values(last_seen=now)
+        ).rowcount
+        if not updated:
+            conn.execute(insert(presence_last_seen).values(user_id=user_id, last_seen=now))
+
+    def _count(self, conn, user_id: str) -> int:
+        return conn.execute(
+            select(func.count()).select_from(presence_connections)
+            .where(presence_connections.c.user_id == user_id)
+        ).scalar_one()
+
+    def connect(self, user_id: str, sid: str) -> int:
+        now = datetime.utcnow()
+        with self._engine.begin() as conn:
+            conn.execute(delete(presence_connections).where(presence_connections.c.sid == sid))
+            conn.execute(insert(presence_connections).values(sid=sid, user_id=user_id, connected_at=now))
+            self._touch(conn, user_id, now)
+            return self._count(conn, user_id)
+
+    def disconnect(self, user_id: str, sid: str) -> int:
+        with self._engine.begin() as conn:
+            removed = conn.execute(
+                delete(presence_connections).where(
+                    presence_connections.c.sid == sid,
+                    presence_connections.c.user_id == user_id
+                )
+            ).rowcount
+            if removed:
+                self._touch(conn, user_id, datetime.utcnow())
+            return self._count(conn, user_id)
+
+    def get_many(self, user_ids: List[str]) -> Dict[str, UserPresence]:
+        if not user_ids:
+            return {}
+        with self._engine.connect() as conn:
+            counts = dict(conn.execute(
+                select(presence_connections.c.user_id, func.count())
+                .where(presence_connections.c.user_id.in_(user_ids))
+                .group_by(presence_connections.c.user_id)
+            ).all())
+            last_seen = dict(conn.execute(
+                select(presence_last_seen.c.user_id, presence_last_seen.c.last_seen)
+                .where(presence_last_seen.c.user_id.in_(user_ids))
+            ).all())
+        return {
+            user_id: UserPresence(user_id, counts.get(user_id, 0), last_seen.get(user_id))
+            for user_id in user_ids
+        }
+
+    def push_offline(self, user_id: str, notification: Dict[str, Any]) -> None:
+        with self._engine.begin() as conn:
+            conn.execute(insert(offline_notifications).values(
+                user_id=user_id,
+                payload=json.dumps(notification),
+                created_at=datetime.utcnow()
+            ))
+            # 只保留最新的 max_pending 条：先查第 max_pending 新的 id 作为下界，再按范围删除
+            # （MySQL 不支持 IN 子查询中的 LIMIT，也不允许 DELETE 查询自身所在的表）
+            cutoff = conn.execute(
+                select(offline_notifications.c.id)
+                .where(offline_notifications.c.user_id == user_id)
+                .order_by(offline_notifications.c.id.desc())
+                .offset(self._max_pending - 1)
+                .limit(1)
+            ).scalar()
+            if cutoff is not None:
+                conn.execute(delete(offline_notifications).where(
+                    offline_notifications.c.user_id == user_id,
+                    offline_notifications.c.id < cutoff
+                ))
+
+    def pop_offline(self, user_id: str) -> List[Dict[str, Any]]:
+        with self._engine.begin() as conn:
+            rows = conn.execute(
+                select(offline_notifications.c.id, offline_notifications.c.payload)
+                .where(offline_notifications.c.user_id == user_id)
+                .order_by(offline_notifications.c.id)
+            ).all()
+            if rows:
+                conn.execute(delete(offline_notifications).where(
+                    offline_notifications.c.id.in_([row.id for row in rows])
+                ))
+        return [json.loads(row.payload) for row in rows]
@@ -1,13 +1,44 @@
-from flask import session
-from flask_socketio import join_room, leave_room, emit
-from shared.infrastructure.socket import socketio
+from flask import session, request
+from flask_socketio import join_room, leave_room, emit, rooms
+from shared.infrastructure.socket import socketio, emit_coalescer, uses_message_queue
+from shared.database.core import SessionLocal
+from shared.event_handler.after_commit_handler import AfterCommitHandler
 from app_social.domain.domain_event.social_events import MessageSentEvent
+from app_social.services.social_service import SocialService
+from app_social.infrastructure.presence.presence_registry import get_presence_store
 from shared.event_bus import get_event_bus
 from datetime import datetime
+import itertools
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Messages that need an upload (images) still go through the HTTP endpoint
+SOCKET_MESSAGE_TYPES = ("text", "share_post")
+
+# A user's "typing" state in a conversation is broadcast at most once per interval
+TYPING_THROTTLE_SECONDS = 2.0
+
+_social_service = None
+_typing_lock = threading.Lock()
+_typing_last_sent = {}
+
+
+def _get_social_service() -> SocialService:
+    global _social_service
+    if _social_service is None:
+        _social_service = SocialService()
+    return _social_service
+
+
+def _as_batch(data):
+    """Socket events accept a single item or a list of items"""
+    if isinstance(data, list):
+        return [item for item in data if isinstance(item, dict)]
+    return [data] if isinstance(data, dict) else []
+
 # ==================== Socket Events ====================
 
 @socketio.on('connect')
@@ -15,15 +46,26 @@ def handle_connect():
     """Handle client connection"""
     user_id = session.get('user_id')
     if user_id:
-        logger.info(f"User {user_id} connected to socket")
+        store = get_presence_store()
+        connections = store.connect(user_id, request.sid)
+        logger.info(f"User {user_id} connected to socket ({connections} connections)")
         join_room(f"user_{user_id}")
+        # Deliver what was queued while the user had no live connection
+        pending = store.pop_offline(user_id)
+        if pending:
+            emit('offline_notifications', pending)
     else:
         logger.info("Anonymous user connected")
 
 @socketio.on('disconnect')
-def handle_disconnect():
+def handle_disconnect(*args):
     """Handle client disconnection"""
-    logger.info("Client disconnected")
+    user_id = session.get('user_id')
+    if user_id:
+        connections = get_presence_store().disconnect(user_id, request.sid)
+        logger.info(f"User {user_id} disconnected ({connections} connections left)")
+    else:
+        logger.info("Client disconnected")
 
 @socketio.on('join')
 def on_join(data):
@@ -46,14 +88,141 @@ def on_leave(data):
     leave_room(room)
     logger.info(f"Socket: Left room {room}")
 
+@socketio.on('send_message')
+def on_send_message(data):
+    """
+    Send a chat message over the socket.
+    The return value is the ack: {"id", "sent_at", "client_id"} or {"error"}.
+    The message itself reaches the room through MessageSentEvent -> 'new_message'.
+    """
+    user_id = session.get('user_id')
+    if not user_id:
+        return {"error": "Unauthorized"}
+    if not isinstance(data, dict):
+        return {"error": "Invalid payload"}
+
+    conversation_id = data.get('conversation_id')
+    message_type = data.get('type', 'text')
+    if not conversation_id:
+        return {"error": "conversation_id is required"}
+    if message_type not in SOCKET_MESSAGE_TYPES:
+        return {"error": f"Message type {message_type} must be sent over HTTP"}
+
+    try:
+        result = _get_social_service().send_message(
+            conversation_id=conversation_id,
+            sender_id=user_id,
+            content=data.get('content', ''),
+            message_type=message_type,
+            reference_id=data.get('reference_id')
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception:
+        logger.exception("Socket send_message failed")
+        return {"error": "Internal server error"}
+
+    return {
+        "id": result["message_id"],
+        "sent_at": result["sent_at"],
+        "client_id": data.get('client_id')
+    }
+
+@socketio.on('typing')
+def on_typing(data):
+    """
+    Broadcast typing state to the other members of joined rooms.
+    Accepts {"conversation_id", "is_typing"} or a list of them; repeated
+    "is typing" updates are throttled per user and conversation.
+    """
+    user_id = session.get('user_id')
+    if not user_id:
+        return
+
+    joined = set(rooms())
+    now = time.monotonic()
+    for item in _as_batch(data):
+        conversation_id = item.get('conversation_id')
+        if conversation_id not in joined:
+            continue
+        is_typing = bool(item.get('is_typing', True))
+        key = (user_id, conversation_id)
+        with _typing_lock:
+            if is_typing:
+                last = _typing_last_sent.get(key)
+                if last is not None and now - last < TYPING_THROTTLE_SECONDS:
+                    continue
+                _typing_last_sent[key] = now
+            else:
+                _typing_last_sent.pop(key, None)
+        emit_coalescer.emit('typing', {
+            "conversation_id": conversation_id,
+            "user_id": user_id,
+            "is_typing": is_typing
+        }, room=conversation_id, skip_sid=request.sid)
+
+@socketio.on('read')
+def on_read(data):
+    """
+    Advance read cursors for one or more conversations in a single transaction.
+    Accepts {"conversation_id", "message_id"?} or a list of them; the ack is
+    the list of cursors that moved, each also broadcast to its room as 'read'.
+    """
+    user_id = session.get('user_id')
+    if not user_id:
+        return {"error": "Unauthorized"}
+
+    reads = [
+        (item['conversation_id'], item.get('message_id'))
+        for item in _as_batch(data) if item.get('conversation_id')
+    ]
+    if not reads:
+        return []
+
+    try:
+        results = _get_social_service().mark_conversations_read(user_id, reads)
+    except Exception:
+        logger.exception("Socket read failed")
+        return {"error": "Internal server error"}
+
+    for result in results:
+        emit_coalescer.emit('read', {**result, "user_id": user_id}, room=result["conversation_id"])
+    return results
+
 # ==================== Domain Event Handlers ====================
 
-def handle_message_sent(event: MessageSentEvent):
+class MessagePushHandler(AfterCommitHandler):
     """
-    Push new message to conversation room participants
+    Pushes sent messages once the business transaction has committed,
+    so a rolled-back message is never delivered or queued.
+    The push itself needs no database session.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        super().__init__(session_factory)
+        # Pending items are a set; the sequence keeps messages in send order
+        self._sequence = itertools.count()
+
+    def handle_message_sent(self, event: MessageSentEvent):
+        self._mark((next(self._sequence), event))
+
+    def process(self, pending):
+        for _, event in sorted(pending, key=lambda item: item[0]):
+            try:
+                push_message(event)
+            except Exception:
+                # The message is already committed; a failed push must not surface
+                logger.exception(f"Failed to push message {event.message_id}")
+
+
+def push_message(event: MessageSentEvent):
+    """
+    Push new message to conversation room participants.
+    When the presence store sees every connection (single process, or a store
+    shared by all workers), the room is only emitted to when a participant holds
+    a live connection and offline recipients get a queued notification delivered
+    on reconnect. Otherwise presence is unknown: always emit, queue nothing.
     """
-    logger.info(f"Pushing message {event.message_id} to room {event.conversation_id}")
-    
     payload = {
         "id": event.message_id,
         "conversation_id": event.conversation_id,
@@ -62,12 +231,48 @@ def handle_message_sent(event: MessageSentEvent):
         "type": event.message_type,
         "created_at": datetime.utcnow().isoformat()
     }
-    
-    socketio.emit('new_message', payload, room=event.conversation_id)
+
+    store = get_presence_store()
+    if store.is_shared or not uses_message_queue():
+        presence = store.get_many([event.sender_id, *event.recipient_ids])
+        for recipient_id in event.recipient_ids:
+            if presence[recipient_id].is_online:
+                continue
+            try:
+                store.push_offline(recipient_id, {
+                    "type": "new_message",
+                    "conversation_id": event.conversation_id,
+                    "message_id": event.message_id,
+                    "sender_id": event.sender_id,
+                    "created_at": payload["created_at"]
+                })
+            except Exception:
+                # A failed queue write must not stop the live push to online participants
+                logger.exception(f"Failed to queue offline notification for {recipient_id}")
+
+        if not any(p.is_online for p in presence.values()):
+            logger.info(f"No live subscribers for room {event.conversation_id}, skipping push")
+            return
+
+    logger.info(f"Pushing message {event.message_id} to room {event.conversation_id}")
+    emit_coalescer.emit('new_message', payload, room=event.conversation_id)
+
+
+_message_push_handler = None
+
 
 def register_social_socket_handlers():
     """Register domain event listeners and ensure socket events are loaded"""
-    event_bus = get_event_bus()
-    # Subscribe using the class name string, which is what event.event_type returns
-    event_bus.subscribe(MessageSentEvent.__name__, handle_message_sent)
+    global _message_push_handler
+    if uses_message_queue() and not get_presence_store().is_shared:
+        logger.warning(
+            "SOCKETIO_MESSAGE_QUEUE is set but the presence store is per-process; "
+            "set PRESENCE_STORE_URL to skip pushes to offline rooms and queue offline notifications"
+        )
+    if _message_push_handler is None:
+        # create_app may run more than once per process; keep a single listener
+        _message_push_handler = MessagePushHandler()
+        # Subscribe using the class name string, which is what event.event_type returns
+        get_event_bus().subscribe(MessageSentEvent.__name__, _message_push_handler.handle_message_sent)
+        _message_push_handler.listen()
     logger.info("Social socket handlers registered")
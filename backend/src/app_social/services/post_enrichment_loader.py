@@ -0,0 +1,102 @@
+"""
+帖子 DTO 富化加载器
+
+请求级（DataLoader 风格）的批量加载器：先收集一整页帖子涉及的
+作者、评论作者和关联旅行 ID，再在调用方的 session 上各用一次查询解析，
+之后 DTO 渲染全部走内存，查询次数与页大小无关。
+"""
+from typing import Any, Dict, Iterable, Optional, Set, Union
+
+from sqlalchemy.orm import Session
+
+from app_social.domain.aggregate.post_aggregate import Post
+from app_social.domain.entity.comment_entity import Comment
+from app_social.domain.value_objects.post_feed_card import PostFeedCard
+from app_auth.infrastructure.database.repository_impl.user_repository_impl import UserRepositoryImpl
+from app_auth.infrastructure.database.dao_impl.sqlalchemy_user_dao import SqlAlchemyUserDao
+from app_auth.domain.value_objects.user_value_objects import UserId
+from app_travel.infrastructure.database.dao_impl.sqlalchemy_trip_dao import SqlAlchemyTripDao
+
+
+class PostEnrichmentLoader:
+    """帖子富化加载器
+
+    用法：
+        loader = PostEnrichmentLoader(session)
+        loader.load(posts)
+        loader.get_user_info(user_id) / loader.get_trip_info(trip_id)
+
+    实例只应在单个请求（单个 session）内使用。
+    """
+
+    def __init__(self, session: Session):
+        self._session = session
+        self._user_ids: Set[str] = set()
+        self._trip_ids: Set[str] = set()
+        self._user_info: Dict[str, Dict[str, Any]] = {}
+        self._trip_info: Dict[str, Dict[str, Any]] = {}
+
+    def collect(self, posts: Iterable[Union[Post, PostFeedCard]]) -> 'PostEnrichmentLoader':
+        """收集待解析的用户ID与旅行ID
+
+        接受完整的 Post 聚合或 PostFeedCard 卡片（卡片不含评论）。
+        """
+        for post in posts:
+            self._user_ids.add(post.author_id)
+            if isinstance(post, Post):
+                self._user_ids.update(c.author_id for c in post.comments)
+            if post.trip_id:
+                self._trip_ids.add(post.trip_id)
+        return self
+
+    def collect_comments(self, comments: Iterable[Comment]) -> 'PostEnrichmentLoader':
+        """收集分页加载的评论的作者ID"""
+        self._user_ids.update(c.author_id for c in comments)
+        return self
+
+    def load(self, posts: Optional[Iterable[Union[Post, PostFeedCard]]] = None) -> 'PostEnrichmentLoader':
+        """解析已收集的ID：用户一次查询，旅行一次查询
+
+        已解析过的ID不会重复查询。
+        """
+        if posts is not None:
+            self.collect(posts)
+
+        pending_users = [uid for uid in self._user_ids if uid not in self._user_info]
+        if pending_users:
+            try:
+                user_repo = UserRepositoryImpl(SqlAlchemyUserDao(self._session))
+                for u in user_repo.find_by_ids([UserId(uid) for uid in pending_users]):
+                    self._user_info[u.id.value] = {
+                        "name": u.username.value,
+                        "avatar": u.profile.avatar_url
+                    }
+            except Exception as e:
+                print(f"Error fetching users: {e}")
+
+        pending_trips = [tid for tid in self._trip_ids if tid not in self._trip_info]
+        if pending_trips:
+            try:
+                # 只读取 trips 主表列，不触发成员/日程的懒加载
+                trip_dao = SqlAlchemyTripDao(self._session)
+                for trip_po in trip_dao.find_by_ids(pending_trips):
+                    self._trip_info[trip_po.id] = {
+                        "id": trip_po.id,
+                        "title": trip_po.name,
+                        "is_public": trip_po.visibility == 'public',
+                        "cover_image_url": trip_po.cover_image_url
+                    }
+            except Exception as e:
+                print(f"Error fetching trip info: {e}")
+
+        return self
+
+    def get_user_info(self, user_id: str) -> Dict[str, Any]:
+        """获取用户展示信息，未找到时返回空字典"""
+        return self._user_info.get(user_id, {})
+
+    def get_trip_info(self, trip_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """获取旅行摘要信息"""
+        if not trip_id:
+            return None
+        return self._trip_info.get(trip_id)
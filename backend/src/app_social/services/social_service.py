@@ -4,49 +4,59 @@ Social 应用层服务
 负责协调领域对象、仓储和基础设施，处理应用逻辑。
 管理事务边界和生命周期。
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 import traceback
 
 from app_social.domain.aggregate.post_aggregate import Post
 from app_social.domain.aggregate.conversation_aggregate import Conversation
+from app_social.domain.entity.comment_entity import Comment
 from app_social.domain.value_objects.social_value_objects import (
     PostContent, PostId, PostVisibility, MessageContent, ConversationId, ConversationType, ConversationRole
 )
+from app_social.domain.value_objects.post_feed_card import PostFeedCard
+from app_social.domain.value_objects.timeline_policy import TimelinePolicy
 from app_social.infrastructure.database.repository_impl.post_repository_impl import PostRepositoryImpl
 from app_social.infrastructure.database.repository_impl.conversation_repository_impl import ConversationRepositoryImpl
-from app_travel.infrastructure.database.dao_impl.sqlalchemy_trip_dao import SqlAlchemyTripDao
-from app_travel.infrastructure.database.repository_impl.trip_repository_impl import TripRepositoryImpl
-from app_travel.domain.value_objects.travel_value_objects import TripId
 from app_social.infrastructure.database.dao_impl.sqlalchemy_post_dao import SqlAlchemyPostDao
 from app_social.infrastructure.database.dao_impl.sqlalchemy_conversation_dao import SqlAlchemyConversationDao
 from app_social.infrastructure.database.dao_impl.sqlalchemy_message_dao import SqlAlchemyMessageDao
+from app_social.infrastructure.database.dao_impl.sqlalchemy_friendship_dao import SqlAlchemyFriendshipDao
+from app_social.infrastructure.database.dao_impl.sqlalchemy_timeline_dao import SqlAlchemyTimelineDao
+from app_social.infrastructure.database.repository_impl.friendship_repository_impl import FriendshipRepositoryImpl
+from app_social.infrastructure.database.repository_impl.timeline_repository_impl import TimelineRepositoryImpl
+from app_social.services.post_enrichment_loader import PostEnrichmentLoader
+from app_social.infrastructure.presence.presence_registry import get_presence_store
 from app_auth.infrastructure.database.repository_impl.user_repository_impl import UserRepositoryImpl
 from app_auth.infrastructure.database.dao_impl.sqlalchemy_user_dao import SqlAlchemyUserDao
 from app_auth.domain.value_objects.user_value_objects import UserId
 from shared.database.core import SessionLocal
 from shared.event_bus import get_event_bus
+from shared.pagination import (
+    encode_cursor, decode_cursor, encode_offset_cursor, decode_offset_cursor,
+    encode_score_cursor, decode_score_cursor
+)
 from shared.storage.local_file_storage import LocalFileStorageService
 
 class SocialService:
     """社交模块应用服务"""
     
+    # 帖子详情内联的顶层评论数，以及评论分页的默认页大小
+    COMMENT_PAGE_SIZE = 20
+    
+    # 单次在线状态查询的最大用户数
+    PRESENCE_QUERY_LIMIT = 200
+    
     def __init__(self):
         self._event_bus = get_event_bus()
         self._storage_service = LocalFileStorageService()
+        self._timeline_policy = TimelinePolicy.from_env()
     
     def are_friends(self, user_id_1: str, user_id_2: str) -> bool:
         """检查两人是否为好友"""
         session = SessionLocal()
         try:
-            from app_social.infrastructure.database.dao_impl.sqlalchemy_friendship_dao import SqlAlchemyFriendshipDao
-            from app_social.infrastructure.database.repository_impl.friendship_repository_impl import FriendshipRepositoryImpl
-            from app_social.domain.value_objects.friendship_value_objects import FriendshipStatus
-            
-            friend_dao = SqlAlchemyFriendshipDao(session)
-            friend_repo = FriendshipRepositoryImpl(friend_dao)
-            
-            friendship = friend_repo.find_by_users(user_id_1, user_id_2)
-            return friendship is not None and friendship.status == FriendshipStatus.ACCEPTED
+            friend_repo = FriendshipRepositoryImpl(SqlAlchemyFriendshipDao(session))
+            return user_id_2 in friend_repo.find_accepted_among(user_id_1, [user_id_2])
         finally:
             session.close()
 
@@ -204,23 +214,26 @@ class SocialService:
             post_dao = SqlAlchemyPostDao(session)
             post_repo = PostRepositoryImpl(post_dao)
             
-            post = post_repo.find_by_id(PostId(post_id))
+            # 只加载帖子头信息，不水合点赞/评论集合
+            post = post_repo.find_header_by_id(PostId(post_id))
             if not post:
                 raise ValueError("Post not found")
             
-            if post.is_liked_by(user_id):
-                result = post.unlike(user_id)
-                action = "unliked"
+            # 先尝试定向删除：删到记录即为取消点赞，否则定向插入
+            if post_repo.remove_like(post.id, user_id):
+                post.record_unlike(user_id)
+                is_liked = False
             else:
-                result = post.like(user_id)
-                action = "liked"
+                post.record_like(user_id)
+                if not post_repo.add_like(post.id, user_id):
+                    # 并发请求已插入同一点赞，视为已点赞且不重复发布事件
+                    post.pop_events()
+                is_liked = True
             
-            if result:
-                post_repo.save(post)
-                self._event_bus.publish_all(post.pop_events())
-                session.commit()
+            self._event_bus.publish_all(post.pop_events())
+            session.commit()
             
-            return action == "liked"
+            return is_liked
             
         except Exception as e:
             session.rollback()
@@ -235,20 +248,29 @@ class SocialService:
         content: str,
         parent_comment_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """发表评论"""
+        """发表评论
+        
+        只加载帖子头信息，回复时单独查询父评论，
+        新评论单条插入、评论数原子递增，查询数与帖子已有评论数无关。
+        """
         session = SessionLocal()
         try:
             post_dao = SqlAlchemyPostDao(session)
             post_repo = PostRepositoryImpl(post_dao)
             
-            post = post_repo.find_by_id(PostId(post_id))
+            post = post_repo.find_header_by_id(PostId(post_id))
             if not post:
                 raise ValueError("Post not found")
             
+            parent_comment = None
+            if parent_comment_id:
+                parent_comment = post_repo.find_comment(post.id, parent_comment_id)
+            
             comment = post.add_comment(
                 commenter_id=user_id,
                 content=content,
-                parent_comment_id=parent_comment_id
+                parent_comment_id=parent_comment_id,
+                parent_comment=parent_comment
             )
             
             post_repo.save(post)
@@ -266,43 +288,91 @@ class SocialService:
         finally:
             session.close()
 
-    def get_public_feed(self, limit: int = 20, offset: int = 0, tags: List[str] = None, viewer_id: Optional[str] = None, search_query: Optional[str] = None) -> List[Dict[str, Any]]:
-        """获取公开帖子流"""
+    def get_public_feed(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        tags: List[str] = None,
+        viewer_id: Optional[str] = None,
+        search_query: Optional[str] = None,
+        cursor: Optional[str] = None,
+        sort: str = 'latest'
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """获取公开帖子流
+        
+        cursor 为 None 时使用 offset 分页并返回帖子列表；
+        cursor 不为 None 时（空字符串表示第一页）使用 keyset 分页，
+        返回 {"posts": [...], "next_cursor": str | None}。
+        带 search_query 时结果按相关度排序，游标内部编码偏移量。
+        sort='hot' 时按热度分降序（沿 idx_posts_hot 索引读取前 K 条），游标编码 (热度分, ID)。
+        """
+        if sort not in ('latest', 'hot'):
+            raise ValueError("Invalid sort")
+        hot = sort == 'hot' and not search_query
+        
+        before = None
+        if cursor is not None:
+            if search_query:
+                offset = decode_offset_cursor(cursor)
+            elif hot:
+                before = decode_score_cursor(cursor)
+            else:
+                before = decode_cursor(cursor)
+        
         session = SessionLocal()
         try:
             post_dao = SqlAlchemyPostDao(session)
             post_repo = PostRepositoryImpl(post_dao)
             
-            posts = post_repo.find_public_feed(limit, offset, tags, search_query)
-            
-            # Batch fetch authors
-            author_ids = list(set(p.author_id for p in posts))
-            author_info_map = {}
-            if author_ids:
-                try:
-                    user_dao = SqlAlchemyUserDao(session)
-                    user_repo = UserRepositoryImpl(user_dao)
-                    users = user_repo.find_by_ids([UserId(uid) for uid in author_ids])
-                    for u in users:
-                        author_info_map[u.id.value] = {
-                            "name": u.username.value,
-                            "avatar": u.profile.avatar_url
-                        }
-                except Exception as e:
-                    print(f"Error fetching authors: {e}")
+            # 列表页只需卡片投影，不构建完整聚合
+            cards = post_repo.find_feed_cards(
+                limit=limit,
+                offset=offset,
+                tags=tags,
+                search_query=search_query,
+                before=before,
+                viewer_id=viewer_id,
+                visibilities=[PostVisibility.PUBLIC.value],
+                sort='hot' if hot else 'latest'
+            )
             
-            return [self._post_to_dto(p, viewer_id=viewer_id, author_info=author_info_map.get(p.author_id)) for p in posts]
+            # 整页批量解析作者/旅行信息
+            loader = PostEnrichmentLoader(session).load(cards)
+            items = [self._card_to_dto(c, loader) for c in cards]
+            
+            if cursor is None:
+                return items
+            if search_query:
+                next_cursor = encode_offset_cursor(offset + limit) if len(cards) == limit else None
+            elif hot:
+                next_cursor = (
+                    encode_score_cursor(cards[-1].hot_score, cards[-1].post_id)
+                    if len(cards) == limit else None
+                )
+            else:
+                next_cursor = self._next_post_cursor(cards, limit)
+            return {"posts": items, "next_cursor": next_cursor}
         finally:
             session.close()
             
-    def get_post_detail(self, post_id: str, viewer_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        """获取帖子详情"""
+    def get_post_detail(
+        self,
+        post_id: str,
+        viewer_id: Optional[str] = None,
+        comment_limit: int = COMMENT_PAGE_SIZE
+    ) -> Optional[Dict[str, Any]]:
+        """获取帖子详情
+        
+        只内联第一页顶层评论（附回复数），其余评论与回复通过
+        get_post_comments 按游标分页获取，详情页开销与评论总数无关。
+        """
         session = SessionLocal()
         try:
             post_dao = SqlAlchemyPostDao(session)
             post_repo = PostRepositoryImpl(post_dao)
             
-            post = post_repo.find_by_id(PostId(post_id))
+            # 只加载帖子头信息，计数取自计数器
+            post = post_repo.find_header_by_id(PostId(post_id))
             if not post:
                 return None
             
@@ -310,132 +380,260 @@ class SocialService:
                 # TODO: 更好的权限处理，也许应该区分 not found 和 permission denied
                  raise ValueError("Permission denied")
 
-            return self._post_to_dto(post, viewer_id)
+            comments = post_repo.find_comments(post.id, limit=comment_limit)
+            reply_counts = post_repo.count_replies([c.comment_id for c in comments])
+            is_liked = post_repo.is_liked_by(post.id, viewer_id) if viewer_id else False
+
+            loader = PostEnrichmentLoader(session).collect([post]).collect_comments(comments).load()
+            dto = self._post_to_dto(post, loader, is_liked)
+            dto["comments"] = [
+                self._comment_to_dto(c, loader, reply_counts.get(c.comment_id, 0)) for c in comments
+            ]
+            dto["comments_next_cursor"] = self._next_comment_cursor(comments, comment_limit)
+            return dto
         finally:
             session.close()
 
-    def get_user_posts(self, user_id: str, viewer_id: Optional[str] = None, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
-        """获取用户的帖子"""
+    def get_post_comments(
+        self,
+        post_id: str,
+        viewer_id: Optional[str] = None,
+        limit: int = COMMENT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        parent_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """按游标分页获取评论
+        
+        parent_id 为 None 时返回顶层评论，否则返回该评论的回复。
+        返回 {"comments": [...], "next_cursor": str | None}，评论按时间升序。
+        """
+        after = decode_cursor(cursor)
+        
         session = SessionLocal()
         try:
-            post_dao = SqlAlchemyPostDao(session)
-            post_repo = PostRepositoryImpl(post_dao)
+            post_repo = PostRepositoryImpl(SqlAlchemyPostDao(session))
             
-            # 这里简化处理，全部查出来再过滤可见性，实际应该在数据库层过滤
-            posts = post_repo.find_by_author(user_id, limit=limit, offset=offset)
+            post = post_repo.find_header_by_id(PostId(post_id))
+            if not post:
+                raise ValueError("Post not found")
+            if not post.can_be_viewed_by(viewer_id or ""):
+                raise ValueError("Permission denied")
             
-            visible_posts = []
-            for p in posts:
-                if p.can_be_viewed_by(viewer_id or ""):
-                    visible_posts.append(p)
+            comments = post_repo.find_comments(post.id, limit=limit, after=after, parent_id=parent_id)
+            reply_counts = post_repo.count_replies([c.comment_id for c in comments])
             
-            # Batch fetch authors (usually just one, but good for consistency)
-            author_ids = list(set(p.author_id for p in visible_posts))
-            author_info_map = {}
-            if author_ids:
-                try:
-                    user_dao = SqlAlchemyUserDao(session)
-                    user_repo = UserRepositoryImpl(user_dao)
-                    users = user_repo.find_by_ids([UserId(uid) for uid in author_ids])
-                    for u in users:
-                        author_info_map[u.id.value] = {
-                            "name": u.username.value,
-                            "avatar": u.profile.avatar_url
-                        }
-                except Exception as e:
-                    print(f"Error fetching authors: {e}")
+            loader = PostEnrichmentLoader(session).collect_comments(comments).load()
+            return {
+                "comments": [
+                    self._comment_to_dto(c, loader, reply_counts.get(c.comment_id, 0)) for c in comments
+                ],
+                "next_cursor": self._next_comment_cursor(comments, limit)
+            }
+        finally:
+            session.close()
 
-            return [self._post_to_dto(p, viewer_id, author_info=author_info_map.get(p.author_id)) for p in visible_posts]
+    def get_timeline(
+        self,
+        user_id: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """获取好友时间线（自己与已接受好友的帖子）
+        
+        普通好友的帖子在发帖时已写入物化时间线；大V好友（好友数超过策略阈值）
+        不写扩散，这里按同一游标位置读取其近期帖子并与时间线合并。
+        返回 {"posts": [...], "next_cursor": str | None}。
+        """
+        before = decode_cursor(cursor)
+        visibilities = [PostVisibility.PUBLIC.value, PostVisibility.FRIENDS.value]
+        
+        session = SessionLocal()
+        try:
+            post_repo = PostRepositoryImpl(SqlAlchemyPostDao(session))
+            friend_repo = FriendshipRepositoryImpl(SqlAlchemyFriendshipDao(session))
+            timeline_repo = TimelineRepositoryImpl(SqlAlchemyTimelineDao(session))
+            
+            entries = timeline_repo.find_entries(user_id, limit=limit, before=before)
+            
+            # 读扩散部分：一次查询统计所有好友的好友数，找出大V
+            friend_ids = friend_repo.find_friends(user_id)
+            friend_counts = friend_repo.count_friends(friend_ids)
+            celebrity_ids = [
+                fid for fid in friend_ids
+                if not self._timeline_policy.should_fan_out(friend_counts.get(fid, 0))
+            ]
+            celebrity_cards = post_repo.find_feed_cards(
+                limit=limit,
+                before=before,
+                viewer_id=user_id,
+                author_ids=celebrity_ids,
+                visibilities=visibilities
+            ) if celebrity_ids else []
+            
+            # 按 (created_at, post_id) 合并两路结果，游标基于合并后的排序键，
+            # 因此被删除或改为私密的帖子只会让本页变短，不会截断翻页
+            keys = sorted(
+                set(entries) | {(c.created_at, c.post_id) for c in celebrity_cards},
+                reverse=True
+            )[:limit]
+            page_ids = [post_id for _, post_id in keys]
+            
+            cards_by_id = {c.post_id: c for c in celebrity_cards}
+            fanout_ids = [pid for pid in page_ids if pid not in cards_by_id]
+            if fanout_ids:
+                # 解除好友时不清理已写扩散的时间线条目，仅好友可见的帖子按当前好友关系过滤
+                allowed_authors = set(friend_ids) | {user_id}
+                for card in post_repo.find_feed_cards(
+                    limit=len(fanout_ids),
+                    viewer_id=user_id,
+                    post_ids=fanout_ids,
+                    visibilities=visibilities
+                ):
+                    if card.visibility == PostVisibility.FRIENDS.value and card.author_id not in allowed_authors:
+                        continue
+                    cards_by_id[card.post_id] = card
+            cards = [cards_by_id[pid] for pid in page_ids if pid in cards_by_id]
+            
+            loader = PostEnrichmentLoader(session).load(cards)
+            next_cursor = encode_cursor(*keys[-1]) if len(keys) == limit else None
+            return {
+                "posts": [self._card_to_dto(c, loader) for c in cards],
+                "next_cursor": next_cursor
+            }
         finally:
             session.close()
 
-    def _post_to_dto(self, post: Post, viewer_id: Optional[str] = None, author_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """将 Post 聚合根转换为 DTO"""
-        # 获取作者信息
-        author_name = "Unknown"
-        author_avatar = None
+    def get_user_posts(
+        self,
+        user_id: str,
+        viewer_id: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """获取用户的帖子
         
+        cursor 语义同 get_public_feed。
+        """
         session = SessionLocal()
         try:
-            user_dao = SqlAlchemyUserDao(session)
-            user_repo = UserRepositoryImpl(user_dao)
+            post_dao = SqlAlchemyPostDao(session)
+            post_repo = PostRepositoryImpl(post_dao)
             
-            # Post author
-            if author_info:
-                author_name = author_info.get("name", "Unknown")
-                author_avatar = author_info.get("avatar")
-            else:
-                try:
-                    author = user_repo.find_by_id(UserId(post.author_id))
-                    if author:
-                        author_name = author.username.value
-                        author_avatar = author.profile.avatar_url
-                except Exception as e:
-                    print(f"Error fetching author info: {e}")
-
-            # Comment authors
-            comment_authors = {}
-            comment_author_ids = list(set(c.author_id for c in post.comments))
-            if comment_author_ids:
-                try:
-                    users = user_repo.find_by_ids([UserId(uid) for uid in comment_author_ids])
-                    for u in users:
-                        comment_authors[u.id.value] = {
-                            "name": u.username.value,
-                            "avatar": u.profile.avatar_url
-                        }
-                except Exception as e:
-                    print(f"Error fetching comment authors: {e}")
-
-            # Trip Info
-            trip_info = None
-            if post.trip_id:
-                try:
-                    trip_dao = SqlAlchemyTripDao(session)
-                    trip_repo = TripRepositoryImpl(trip_dao)
-                    trip = trip_repo.find_by_id(TripId(post.trip_id))
-                    if trip:
-                        trip_info = {
-                            "id": trip.id.value,
-                            "title": trip.name.value,
-                            "is_public": trip.visibility.value == 'public',
-                            "cover_image_url": trip.cover_image_url
-                        }
-                except Exception as e:
-                    print(f"Error fetching trip info: {e}")
+            # 非作者本人只能看到公开帖子（好友可见暂不区分，同 Post.can_be_viewed_by 默认行为）
+            visibilities = None if viewer_id and viewer_id == user_id else [PostVisibility.PUBLIC.value]
+            cards = post_repo.find_feed_cards(
+                limit=limit,
+                offset=offset,
+                before=decode_cursor(cursor),
+                viewer_id=viewer_id,
+                author_id=user_id,
+                visibilities=visibilities
+            )
+            
+            loader = PostEnrichmentLoader(session).load(cards)
+            items = [self._card_to_dto(c, loader) for c in cards]
+            
+            if cursor is None:
+                return items
+            return {"posts": items, "next_cursor": self._next_post_cursor(cards, limit)}
+        finally:
+            session.close()
 
-            return {
-                "id": post.id.value,
-                "author_id": post.author_id,
-                "author_name": author_name,
-                "author_avatar": author_avatar,
-                "title": post.content.title,
-                "content": post.content.text,
-                "media_urls": post.content.images,
-                "tags": post.content.tags,
-                "visibility": post.visibility.value,
-                "trip_id": post.trip_id,
-                "trip": trip_info,
-                "created_at": post.created_at.isoformat(),
-                "updated_at": post.updated_at.isoformat(),
-                "like_count": post.like_count,
-                "comment_count": post.comment_count,
-                "is_liked": post.is_liked_by(viewer_id) if viewer_id else False,
-                "comments": [
-                    {
-                        "id": c.comment_id,
-                        "author_id": c.author_id,
-                        "author_name": comment_authors.get(c.author_id, {}).get("name", "Unknown"),
-                        "author_avatar": comment_authors.get(c.author_id, {}).get("avatar"),
-                        "content": c.content,
-                        "created_at": c.created_at.isoformat(),
-                        "parent_id": c.parent_id
-                    } for c in post.comments
-                ]
-            }
+    def get_popular_tags(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """获取热门标签
+        
+        直接读取标签字典上维护的计数，不扫描帖子表。
+        """
+        session = SessionLocal()
+        try:
+            post_repo = PostRepositoryImpl(SqlAlchemyPostDao(session))
+            return post_repo.find_popular_tags(limit)
         finally:
             session.close()
 
+    @staticmethod
+    def _next_post_cursor(cards: List[PostFeedCard], limit: int) -> Optional[str]:
+        """根据本页最后一张卡片生成下一页游标，不足一页时返回 None"""
+        if not cards or len(cards) < limit:
+            return None
+        last = cards[-1]
+        return encode_cursor(last.created_at, last.post_id)
+
+    def _card_to_dto(self, card: PostFeedCard, loader: PostEnrichmentLoader) -> Dict[str, Any]:
+        """将帖子卡片转换为列表 DTO（不含评论，content 为摘要）"""
+        author_info = loader.get_user_info(card.author_id)
+        
+        return {
+            "id": card.post_id,
+            "author_id": card.author_id,
+            "author_name": author_info.get("name", "Unknown"),
+            "author_avatar": author_info.get("avatar"),
+            "title": card.title,
+            "content": card.summary,
+            "summary": card.summary,
+            "cover_image_url": card.cover_image_url,
+            "image_count": card.image_count,
+            "media_urls": [card.cover_image_url] if card.cover_image_url else [],
+            "tags": card.tags,
+            "visibility": card.visibility,
+            "trip_id": card.trip_id,
+            "trip": loader.get_trip_info(card.trip_id),
+            "created_at": card.created_at.isoformat(),
+            "updated_at": card.updated_at.isoformat(),
+            "like_count": card.like_count,
+            "comment_count": card.comment_count,
+            "is_liked": card.is_liked_by_viewer
+        }
+
+    @staticmethod
+    def _next_comment_cursor(comments: List[Comment], limit: int) -> Optional[str]:
+        """根据本页最后一条评论生成下一页游标，不足一页时返回 None"""
+        if not comments or len(comments) < limit:
+            return None
+        last = comments[-1]
+        return encode_cursor(last.created_at, last.comment_id)
+
+    def _comment_to_dto(self, comment: Comment, loader: PostEnrichmentLoader, reply_count: int = 0) -> Dict[str, Any]:
+        """将评论转换为 DTO"""
+        author_info = loader.get_user_info(comment.author_id)
+        return {
+            "id": comment.comment_id,
+            "author_id": comment.author_id,
+            "author_name": author_info.get("name", "Unknown"),
+            "author_avatar": author_info.get("avatar"),
+            "content": comment.content,
+            "created_at": comment.created_at.isoformat(),
+            "parent_id": comment.parent_id,
+            "reply_count": reply_count
+        }
+
+    def _post_to_dto(self, post: Post, loader: PostEnrichmentLoader, is_liked: bool = False) -> Dict[str, Any]:
+        """将 Post 聚合根转换为 DTO（不含评论）
+        
+        作者和旅行信息均从已 load 的 loader 中读取，不再访问数据库。
+        """
+        author_info = loader.get_user_info(post.author_id)
+        
+        return {
+            "id": post.id.value,
+            "author_id": post.author_id,
+            "author_name": author_info.get("name", "Unknown"),
+            "author_avatar": author_info.get("avatar"),
+            "title": post.content.title,
+            "content": post.content.text,
+            "media_urls": post.content.images,
+            "tags": post.content.tags,
+            "visibility": post.visibility.value,
+            "trip_id": post.trip_id,
+            "trip": loader.get_trip_info(post.trip_id),
+            "created_at": post.created_at.isoformat(),
+            "updated_at": post.updated_at.isoformat(),
+            "like_count": post.like_count,
+            "comment_count": post.comment_count,
+            "is_liked": is_liked
+        }
+
     # ==================== 会话管理 ====================
     
     def create_group_chat(
@@ -451,20 +649,15 @@ class SocialService:
             msg_dao = SqlAlchemyMessageDao(session)
             conv_repo = ConversationRepositoryImpl(conv_dao, msg_dao)
             
-            # 1. 检查好友关系：所有被拉的人必须是创建者的好友
-            from app_social.infrastructure.database.dao_impl.sqlalchemy_friendship_dao import SqlAlchemyFriendshipDao
-            from app_social.infrastructure.database.repository_impl.friendship_repository_impl import FriendshipRepositoryImpl
-            from app_social.domain.value_objects.friendship_value_objects import FriendshipStatus
-            
-            friend_dao = SqlAlchemyFriendshipDao(session)
-            friend_repo = FriendshipRepositoryImpl(friend_dao)
+            # 1. 检查好友关系：所有被拉的人必须是创建者的好友（一次集合查询）
+            friend_repo = FriendshipRepositoryImpl(SqlAlchemyFriendshipDao(session))
             
             # 排除自己
             targets = [uid for uid in participant_ids if uid != creator_id]
+            friend_ids = friend_repo.find_accepted_among(creator_id, targets)
             for target_id in targets:
-                 friendship = friend_repo.find_by_users(creator_id, target_id)
-                 if not friendship or friendship.status != FriendshipStatus.ACCEPTED:
-                     raise ValueError(f"User {target_id} is not your friend")
+                if target_id not in friend_ids:
+                    raise ValueError(f"User {target_id} is not your friend")
             
             # 2. 创建群聊
             conv = Conversation.create_group(creator_id, participant_ids, title)
@@ -493,21 +686,15 @@ class SocialService:
             msg_dao = SqlAlchemyMessageDao(session)
             conv_repo = ConversationRepositoryImpl(conv_dao, msg_dao)
             
-            conv = conv_repo.find_by_id(ConversationId(conversation_id))
+            # 成员变更只需会话头信息（参与者），保存时只写入变化的成员行
+            conv = conv_repo.find_header_by_id(ConversationId(conversation_id))
             if not conv:
                 raise ValueError("Conversation not found")
             
             # 1. 检查好友关系
-            from app_social.infrastructure.database.dao_impl.sqlalchemy_friendship_dao import SqlAlchemyFriendshipDao
-            from app_social.infrastructure.database.repository_impl.friendship_repository_impl import FriendshipRepositoryImpl
-            from app_social.domain.value_objects.friendship_value_objects import FriendshipStatus
-            
-            friend_dao = SqlAlchemyFriendshipDao(session)
-            friend_repo = FriendshipRepositoryImpl(friend_dao)
-            
-            friendship = friend_repo.find_by_users(operator_id, new_member_id)
-            if not friendship or friendship.status != FriendshipStatus.ACCEPTED:
-                 raise ValueError(f"User {new_member_id} is not your friend")
+            friend_repo = FriendshipRepositoryImpl(SqlAlchemyFriendshipDao(session))
+            if new_member_id not in friend_repo.find_accepted_among(operator_id, [new_member_id]):
+                raise ValueError(f"User {new_member_id} is not your friend")
             
             # 2. 调用聚合根方法
             conv.add_participant(new_member_id, operator_id)
@@ -534,7 +721,8 @@ class SocialService:
             msg_dao = SqlAlchemyMessageDao(session)
             conv_repo = ConversationRepositoryImpl(conv_dao, msg_dao)
             
-            conv = conv_repo.find_by_id(ConversationId(conversation_id))
+            # 成员变更只需会话头信息（参与者），保存时只写入变化的成员行
+            conv = conv_repo.find_header_by_id(ConversationId(conversation_id))
             if not conv:
                 raise ValueError("Conversation not found")
             
@@ -563,7 +751,8 @@ class SocialService:
             msg_dao = SqlAlchemyMessageDao(session)
             conv_repo = ConversationRepositoryImpl(conv_dao, msg_dao)
             
-            conv = conv_repo.find_by_id(ConversationId(conversation_id))
+            # 成员变更只需会话头信息（参与者），保存时只写入变化的成员行
+            conv = conv_repo.find_header_by_id(ConversationId(conversation_id))
             if not conv:
                 raise ValueError("Conversation not found")
             
@@ -636,14 +825,18 @@ class SocialService:
         media_file: Any = None,
         reference_id: str = None
     ) -> Dict[str, Any]:
-        """发送消息"""
+        """发送消息
+        
+        只加载会话头信息（参与者）校验成员，新消息单条插入，
+        每次发送的查询数与会话历史长度无关。
+        """
         session = SessionLocal()
         try:
             conv_dao = SqlAlchemyConversationDao(session)
             msg_dao = SqlAlchemyMessageDao(session)
             conv_repo = ConversationRepositoryImpl(conv_dao, msg_dao)
             
-            conv = conv_repo.find_by_id(ConversationId(conversation_id))
+            conv = conv_repo.find_header_by_id(ConversationId(conversation_id))
             if not conv:
                 raise ValueError("Conversation not found")
             
@@ -658,12 +851,19 @@ class SocialService:
                 if not reference_id:
                     raise ValueError("Share post message requires reference_id")
                 
-                # 校验帖子是否存在
+                # 校验帖子是否存在（只需头信息），并记录分享
                 post_dao = SqlAlchemyPostDao(session)
                 post_repo = PostRepositoryImpl(post_dao)
-                if not post_repo.find_by_id(PostId(reference_id)):
+                post = post_repo.find_header_by_id(PostId(reference_id))
+                if not post:
                     raise ValueError("Post not found")
                 
+                recipient_ids = [pid for pid in conv.participant_ids if pid != sender_id]
+                if recipient_ids:
+                    post.share_to(sender_id, recipient_ids)
+                    post_repo.increment_share_count(post.id)
+                    self._event_bus.publish_all(post.pop_events())
+                
                 msg_content = MessageContent.share_post_message(reference_id, content)
             
             else:
@@ -672,7 +872,7 @@ class SocialService:
 
             message = conv.send_message(sender_id, msg_content)
             
-            conv_repo.save(conv)
+            conv_repo.append_message(conv, message)
             self._event_bus.publish_all(conv.pop_events())
             session.commit()
             
@@ -689,19 +889,25 @@ class SocialService:
             session.close()
 
     def get_user_conversations(self, user_id: str) -> List[Dict[str, Any]]:
-        """获取用户的会话列表"""
+        """获取用户的会话列表
+        
+        基于收件箱摘要渲染（最后一条消息与未读数由数据库计算），
+        不构建完整的 Conversation 聚合。
+        """
         session = SessionLocal()
         try:
             conv_dao = SqlAlchemyConversationDao(session)
             msg_dao = SqlAlchemyMessageDao(session)
             conv_repo = ConversationRepositoryImpl(conv_dao, msg_dao)
             
-            convs = conv_repo.find_by_user(user_id)
+            convs = conv_repo.find_inbox(user_id)
             
             # Batch fetch participants info to enrich title/avatar for private chats
+            # 只有私聊需要对方的名称/头像，群聊展示标题
             all_participant_ids = set()
             for c in convs:
-                all_participant_ids.update(c.participant_ids)
+                if not c.is_group:
+                    all_participant_ids.update(pid for pid in c.participant_ids if pid != user_id)
             
             user_info_map = {}
             if all_participant_ids:
@@ -719,14 +925,14 @@ class SocialService:
 
             results = []
             for conv in convs:
-                last_msg = conv.messages[-1] if conv.messages else None
+                last_msg = conv.last_message
                 
                 # Determine display name and avatar
                 other_user_name = None
                 other_user_avatar = None
                 other_user_id = None
                 
-                if conv.conversation_type.value == "private":
+                if not conv.is_group:
                     other_id = next((pid for pid in conv.participant_ids if pid != user_id), None)
                     if other_id:
                         other_user_id = other_id
@@ -738,17 +944,17 @@ class SocialService:
                 name = conv.title if conv.is_group else other_user_name
 
                 results.append({
-                    "id": conv.id.value,
-                    "type": conv.conversation_type.value,
+                    "id": conv.conversation_id,
+                    "type": conv.conversation_type,
                     "name": name,
                     "title": conv.title, # Group title or None
                     "other_user_id": other_user_id,
                     "other_user_name": other_user_name,
                     "other_user_avatar": other_user_avatar,
-                    "unread_count": conv.get_unread_count(user_id),
+                    "unread_count": conv.unread_count,
                     "last_message": {
-                        "content": last_msg.content.text if last_msg else None,
-                        "type": last_msg.content.message_type if last_msg else None,
+                        "content": last_msg.text if last_msg else None,
+                        "type": last_msg.message_type if last_msg else None,
                         "sent_at": last_msg.sent_at.isoformat() if last_msg else None,
                         "sender_id": last_msg.sender_id if last_msg else None
                     } if last_msg else None,
@@ -762,32 +968,47 @@ class SocialService:
         self,
         conversation_id: str,
         user_id: str,
-        limit: int = 50
-    ) -> List[Dict[str, Any]]:
-        """获取会话消息"""
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """获取会话消息
+        
+        before / after 均为 None 时返回最近 limit 条消息列表；
+        任一不为 None 时（空字符串表示最近一页）按消息游标分页，返回
+        {"messages": [...], "prev_cursor": str | None, "next_cursor": str | None}：
+        prev_cursor 作为 before 继续向上翻历史（没有更早消息时为 None），
+        next_cursor 作为 after 拉取之后的新消息。
+        读取最近一页或新消息时，已读游标前移到本页最后一条消息。
+        """
+        if before and after:
+            raise ValueError("Only one of before/after can be specified")
+        before_key = decode_cursor(before) if before else None
+        after_key = decode_cursor(after) if after else None
+        
         session = SessionLocal()
         try:
             conv_dao = SqlAlchemyConversationDao(session)
             msg_dao = SqlAlchemyMessageDao(session)
             conv_repo = ConversationRepositoryImpl(conv_dao, msg_dao)
             
-            conv = conv_repo.find_by_id(ConversationId(conversation_id))
+            # 只加载会话头信息，消息按游标沿 (conversation_id, sent_at, id) 索引读取一页
+            conv = conv_repo.find_header_by_id(ConversationId(conversation_id))
             if not conv:
                 raise ValueError("Conversation not found")
             
             if not conv.is_participant(user_id):
                 raise ValueError("Permission denied")
             
-            # 标记已读
-            # 注意：这里可能会有副作用，改变状态，所以需要 commit
-            read_count = conv.mark_as_read(user_id)
-            if read_count > 0:
-                conv_repo.save(conv)
+            messages = conv_repo.find_messages(conv.id, limit=limit, before=before_key, after=after_key)
+            
+            # 标记已读：只前移已读游标（一条 UPDATE），不重写消息；翻历史不改变已读状态
+            if messages and not before_key and conv.mark_read_until(user_id, messages[-1]):
+                conv_repo.save_read_state(conv)
                 self._event_bus.publish_all(conv.pop_events())
                 session.commit()
             
-            messages = conv.get_recent_messages(limit)
-            return [{
+            items = [{
                 "id": m.message_id,
                 "sender_id": m.sender_id,
                 "content": m.content.text,
@@ -795,11 +1016,86 @@ class SocialService:
                 "media_url": m.content.media_url,
                 "reference_id": m.content.reference_id,
                 "sent_at": m.sent_at.isoformat(),
-                "is_read_by_me": m.is_read_by(user_id) # 应该是 True
+                "is_read_by_me": conv.is_read_by(user_id, m)
             } for m in messages]
             
+            if before is None and after is None:
+                return items
+            
+            prev_cursor = None
+            if messages and not after_key and len(messages) == limit:
+                prev_cursor = encode_cursor(messages[0].sent_at, messages[0].message_id)
+            if messages:
+                next_cursor = encode_cursor(messages[-1].sent_at, messages[-1].message_id)
+            else:
+                next_cursor = after or None
+            return {"messages": items, "prev_cursor": prev_cursor, "next_cursor": next_cursor}
+            
         except Exception as e:
             session.rollback()
             raise e
         finally:
             session.close()
+
+    def mark_conversations_read(
+        self,
+        user_id: str,
+        reads: List[Tuple[str, Optional[str]]]
+    ) -> List[Dict[str, Any]]:
+        """批量前移多个会话的已读游标（一个会话、一次提交）
+        
+        Args:
+            user_id: 用户ID
+            reads: (会话ID, 读到的消息ID) 列表，消息ID为 None 时读到最新一条
+            
+        Returns:
+            游标实际前移的会话列表：
+            [{"conversation_id", "message_id", "read_at"}]；
+            不存在、无权限或游标未前移的会话被跳过
+        """
+        session = SessionLocal()
+        try:
+            conv_dao = SqlAlchemyConversationDao(session)
+            msg_dao = SqlAlchemyMessageDao(session)
+            conv_repo = ConversationRepositoryImpl(conv_dao, msg_dao)
+            
+            results = []
+            for conversation_id, message_id in reads:
+                conv = conv_repo.find_header_by_id(ConversationId(conversation_id))
+                if not conv or not conv.is_participant(user_id):
+                    continue
+                
+                if message_id:
+                    message = conv_repo.find_message(conv.id, message_id)
+                else:
+                    latest = conv_repo.find_messages(conv.id, limit=1)
+                    message = latest[0] if latest else None
+                
+                if message and conv.mark_read_until(user_id, message):
+                    conv_repo.save_read_state(conv)
+                    self._event_bus.publish_all(conv.pop_events())
+                    results.append({
+                        "conversation_id": conversation_id,
+                        "message_id": message.message_id,
+                        "read_at": message.sent_at.isoformat()
+                    })
+            
+            session.commit()
+            return results
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def get_presence(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """批量查询用户在线状态
+        
+        Returns:
+            {user_id: {"online", "connections", "last_seen"}}
+        """
+        user_ids = list(dict.fromkeys(uid for uid in user_ids if uid))
+        if len(user_ids) > self.PRESENCE_QUERY_LIMIT:
+            raise ValueError(f"At most {self.PRESENCE_QUERY_LIMIT} ids per query")
+        presence = get_presence_store().get_many(user_ids)
+        return {user_id: p.to_dict() for user_id, p in presence.items()}
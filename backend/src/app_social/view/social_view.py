@@ -4,7 +4,7 @@ Social 接口层
 提供 RESTful API，处理 HTTP 请求，调用应用服务。
 """
 from flask import Blueprint, request, jsonify, g, session
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 
 from app_social.services.social_service import SocialService
@@ -47,6 +47,24 @@ def _handle_error(e: Exception):
         return jsonify({"error": str(e)}), 400
     return jsonify({"error": "Internal Server Error"}), 500
 
+def _get_comment_page(post_id: str, parent_id: Optional[str]):
+    """评论分页公共处理：parent_id 为 None 时为顶层评论"""
+    try:
+        try:
+            user_id = _get_current_user_id()
+        except ValueError:
+            user_id = None
+        
+        limit = int(request.args.get('limit', SocialService.COMMENT_PAGE_SIZE))
+        cursor = request.args.get('cursor')
+        
+        result = social_service.get_post_comments(
+            post_id, user_id, limit=limit, cursor=cursor, parent_id=parent_id
+        )
+        return jsonify(result), 200
+    except Exception as e:
+        return _handle_error(e)
+
 # ==================== 帖子 API ====================
 
 @social_bp.route('/posts', methods=['POST'])
@@ -179,6 +197,16 @@ def add_comment(post_id):
     except Exception as e:
         return _handle_error(e)
 
+@social_bp.route('/posts/<post_id>/comments', methods=['GET'])
+def get_post_comments(post_id):
+    """分页获取帖子的顶层评论"""
+    return _get_comment_page(post_id, parent_id=None)
+
+@social_bp.route('/posts/<post_id>/comments/<comment_id>/replies', methods=['GET'])
+def get_comment_replies(post_id, comment_id):
+    """分页获取评论的回复"""
+    return _get_comment_page(post_id, parent_id=comment_id)
+
 @social_bp.route('/feed', methods=['GET'])
 def get_feed():
     """获取公开流"""
@@ -193,12 +221,40 @@ def get_feed():
         offset = int(request.args.get('offset', 0))
         tags = request.args.getlist('tags')
         search_query = request.args.get('search') or request.args.get('q')
+        # 传入 cursor 参数（可为空）即切换为游标分页，返回 {"posts", "next_cursor"}
+        cursor = request.args.get('cursor')
+        # sort=hot 按热度分排序，默认按发布时间
+        sort = request.args.get('sort', 'latest')
+        
+        result = social_service.get_public_feed(
+            limit, offset, tags, viewer_id=user_id, search_query=search_query, cursor=cursor, sort=sort
+        )
+        return jsonify(result), 200
+    except Exception as e:
+        return _handle_error(e)
+
+@social_bp.route('/timeline', methods=['GET'])
+def get_timeline():
+    """获取好友时间线（游标分页）"""
+    try:
+        user_id = _get_current_user_id()
+        limit = int(request.args.get('limit', 20))
+        cursor = request.args.get('cursor')
         
-        result = social_service.get_public_feed(limit, offset, tags, viewer_id=user_id, search_query=search_query)
+        result = social_service.get_timeline(user_id, limit, cursor=cursor)
         return jsonify(result), 200
     except Exception as e:
         return _handle_error(e)
 
+@social_bp.route('/tags/popular', methods=['GET'])
+def get_popular_tags():
+    """获取热门标签"""
+    try:
+        limit = int(request.args.get('limit', 20))
+        return jsonify(social_service.get_popular_tags(limit)), 200
+    except Exception as e:
+        return _handle_error(e)
+
 @social_bp.route('/users/<user_id>/posts', methods=['GET'])
 def get_user_posts(user_id):
     """获取用户帖子列表"""
@@ -210,8 +266,9 @@ def get_user_posts(user_id):
             
         limit = int(request.args.get('limit', 20))
         offset = int(request.args.get('offset', 0))
+        cursor = request.args.get('cursor')
         
-        result = social_service.get_user_posts(user_id, viewer_id, limit, offset)
+        result = social_service.get_user_posts(user_id, viewer_id, limit, offset, cursor=cursor)
         return jsonify(result), 200
     except Exception as e:
         return _handle_error(e)
@@ -285,8 +342,11 @@ def get_messages(conv_id):
     try:
         user_id = _get_current_user_id()
         limit = int(request.args.get('limit', 50))
+        # 传入 before / after 参数（可为空）即切换为游标分页，返回 {"messages", "prev_cursor", "next_cursor"}
+        before = request.args.get('before')
+        after = request.args.get('after')
         
-        result = social_service.get_conversation_messages(conv_id, user_id, limit)
+        result = social_service.get_conversation_messages(conv_id, user_id, limit, before=before, after=after)
         return jsonify(result), 200
     except Exception as e:
         return _handle_error(e)
@@ -425,6 +485,16 @@ def get_friends():
     except Exception as e:
         return _handle_error(e)
 
+@social_bp.route('/presence', methods=['GET'])
+def get_presence():
+    """批量查询用户在线状态：?ids=u1,u2"""
+    try:
+        _get_current_user_id()
+        ids = [i.strip() for i in request.args.get('ids', '').split(',') if i.strip()]
+        return jsonify({"presence": social_service.get_presence(ids)}), 200
+    except Exception as e:
+        return _handle_error(e)
+
 @social_bp.route('/friends/<target_id>/status', methods=['GET'])
 def get_friendship_status(target_id):
     """获取与某人的好友状态"""
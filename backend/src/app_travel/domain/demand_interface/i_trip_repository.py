@@ -2,10 +2,12 @@
 旅行仓库接口
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import date, datetime
+from typing import List, Optional, Tuple
 
 from app_travel.domain.aggregate.trip_aggregate import Trip
 from app_travel.domain.value_objects.travel_value_objects import TripId, TripStatus
+from app_travel.domain.value_objects.trip_summary import TripSummary
 
 
 class ITripRepository(ABC):
@@ -33,18 +35,59 @@ class ITripRepository(ABC):
         pass
     
     @abstractmethod
-    def find_by_member(self, user_id: str, status: Optional[TripStatus] = None) -> List[Trip]:
-        """查找用户参与的旅行
+    def find_by_member(
+        self,
+        user_id: str,
+        status: Optional[TripStatus] = None,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[date, str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[Trip]:
+        """查找用户参与的旅行，按 (start_date DESC, id DESC) 排序
         
         Args:
             user_id: 用户ID
             status: 可选的状态筛选
+            limit: 最多返回条数，None 表示不限
+            before: keyset 游标 (start_date, trip_id)
+            date_from: 旅行结束日期不早于该日期
+            date_to: 旅行开始日期不晚于该日期
+            destination: 目的地关键词
             
         Returns:
             旅行列表
         """
         pass
     
+    @abstractmethod
+    def find_member_summaries(
+        self,
+        user_id: str,
+        status: Optional[TripStatus] = None,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[date, str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[TripSummary]:
+        """查找用户参与的旅行摘要（不加载成员和日程）
+        
+        Args:
+            user_id: 用户ID
+            status: 可选的状态筛选
+            limit: 最多返回条数，None 表示不限
+            before: keyset 游标 (start_date, trip_id)
+            date_from: 旅行结束日期不早于该日期
+            date_to: 旅行开始日期不晚于该日期
+            destination: 目的地关键词
+            
+        Returns:
+            旅行摘要列表
+        """
+        pass
+    
     @abstractmethod
     def find_by_creator(self, creator_id: str) -> List[Trip]:
         """查找用户创建的旅行
@@ -58,18 +101,63 @@ class ITripRepository(ABC):
         pass
     
     @abstractmethod
-    def find_public(self, limit: int = 20, offset: int = 0) -> List[Trip]:
-        """查找公开的旅行
+    def find_public(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        status: Optional[TripStatus] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[Trip]:
+        """查找公开的旅行，按 (created_at DESC, id DESC) 排序
         
         Args:
             limit: 每页数量
             offset: 偏移量
+            search_query: 搜索关键词
+            before: keyset 游标 (created_at, trip_id)
+            status: 可选的状态筛选
+            date_from: 旅行结束日期不早于该日期
+            date_to: 旅行开始日期不晚于该日期
+            destination: 目的地关键词
             
         Returns:
             旅行列表
         """
         pass
     
+    @abstractmethod
+    def find_public_summaries(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        status: Optional[TripStatus] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[TripSummary]:
+        """查找公开旅行摘要（不加载成员和日程）
+        
+        Args:
+            limit: 每页数量
+            offset: 偏移量
+            search_query: 搜索关键词
+            before: keyset 游标 (created_at, trip_id)
+            status: 可选的状态筛选
+            date_from: 旅行结束日期不早于该日期
+            date_to: 旅行开始日期不晚于该日期
+            destination: 目的地关键词
+            
+        Returns:
+            旅行摘要列表
+        """
+        pass
+    
     @abstractmethod
     def delete(self, trip_id: TripId) -> None:
         """删除旅行
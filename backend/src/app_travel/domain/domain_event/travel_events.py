@@ -52,6 +52,12 @@ class TripUpdatedEvent(DomainEvent):
     updated_fields: Tuple[str, ...] = ()
 
 
+@dataclass(frozen=True)
+class TripDeletedEvent(DomainEvent):
+    """旅行删除事件（物理删除）"""
+    trip_id: str = ""
+
+
 # ==================== 成员管理事件 ====================
 
 @dataclass(frozen=True)
@@ -0,0 +1,40 @@
+"""
+旅行摘要值对象
+
+旅行列表（公开旅行、用户旅行）使用的只读投影，
+不包含成员、日程、活动集合，计数由数据库聚合得到。
+"""
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+
+from app_travel.domain.value_objects.travel_value_objects import Money
+
+
+@dataclass(frozen=True)
+class TripSummary:
+    """旅行摘要值对象
+
+    只保存旅行卡片展示所需字段：
+    - 名称、描述、日期、封面、状态
+    - 成员数、活动数
+    """
+    trip_id: str
+    name: str
+    description: str
+    creator_id: str
+    start_date: date
+    end_date: date
+    budget: Optional[Money]
+    visibility: str
+    status: str
+    cover_image_url: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    member_count: int
+    activity_count: int
+
+    @property
+    def days_count(self) -> int:
+        """旅行天数"""
+        return (self.end_date - self.start_date).days + 1
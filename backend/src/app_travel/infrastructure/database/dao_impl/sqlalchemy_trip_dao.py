@@ -1,9 +1,19 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import select, delete, desc, and_, or_, exists
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select, delete, desc, and_, or_, exists, func
 
 from app_travel.infrastructure.database.dao_interface.i_trip_dao import ITripDao
-from app_travel.infrastructure.database.persistent_model.trip_po import TripPO, TripMemberPO
+from app_travel.infrastructure.database.persistent_model.trip_po import TripPO, TripMemberPO, TripDayPO, ActivityPO
+from shared.search.i_search_index import DOC_TYPE_TRIP
+from shared.search.search_index_factory import create_search_index
+
+# 加载完整聚合所需的子集合：每层各一条 SELECT ... IN，查询数与旅行数量无关
+TRIP_AGGREGATE_LOADERS = (
+    selectinload(TripPO.members),
+    selectinload(TripPO.days).selectinload(TripDayPO.activities),
+    selectinload(TripPO.days).selectinload(TripDayPO.transits),
+)
 
 class SqlAlchemyTripDao(ITripDao):
     """基于 SQLAlchemy 的旅行 DAO 实现"""
@@ -12,49 +22,201 @@ class SqlAlchemyTripDao(ITripDao):
         self.session = session
 
     def find_by_id(self, trip_id: str) -> Optional[TripPO]:
-        stmt = select(TripPO).where(TripPO.id == trip_id)
+        stmt = select(TripPO).options(*TRIP_AGGREGATE_LOADERS).where(TripPO.id == trip_id)
         return self.session.execute(stmt).scalars().first()
 
-    def find_by_member(self, user_id: str, status: Optional[str] = None) -> List[TripPO]:
+    def find_by_ids(self, trip_ids: List[str]) -> List[TripPO]:
+        if not trip_ids:
+            return []
+        stmt = select(TripPO).where(TripPO.id.in_(trip_ids))
+        return list(self.session.execute(stmt).scalars().all())
+
+    def find_by_member(
+        self,
+        user_id: str,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[date, str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[TripPO]:
         """查找用户参与的旅行"""
+        stmt = self._member_filter(
+            select(TripPO).options(*TRIP_AGGREGATE_LOADERS),
+            user_id, status, limit, before, date_from, date_to, destination
+        )
+        return list(self.session.execute(stmt).scalars().all())
+
+    def find_member_summaries(
+        self,
+        user_id: str,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[date, str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        stmt = self._member_filter(
+            self._summary_select(),
+            user_id, status, limit, before, date_from, date_to, destination
+        )
+        return [dict(row) for row in self.session.execute(stmt).mappings().all()]
+
+    def _member_filter(self, stmt, user_id, status, limit, before, date_from, date_to, destination):
+        # 走 idx_trip_members_user_trip 取出成员的旅行，按 (start_date DESC, id DESC) 翻页
         stmt = (
-            select(TripPO)
-            .join(TripMemberPO, TripMemberPO.trip_id == TripPO.id)
+            stmt.join(TripMemberPO, TripMemberPO.trip_id == TripPO.id)
             .where(TripMemberPO.user_id == user_id)
         )
-        
+        stmt = self._apply_filters(stmt, status, date_from, date_to, destination)
+        if before:
+            stmt = stmt.where(self._before(TripPO.start_date, before))
+            
+        stmt = stmt.order_by(desc(TripPO.start_date), desc(TripPO.id))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    @staticmethod
+    def _apply_filters(stmt, status: Optional[str], date_from: Optional[date],
+                       date_to: Optional[date], destination: Optional[str]):
+        """状态 / 日期区间（与旅行日期有交集）/ 目的地（活动地点名称或地址）筛选"""
         if status:
             stmt = stmt.where(TripPO.status == status)
-            
-        stmt = stmt.order_by(desc(TripPO.start_date))
-        return list(self.session.execute(stmt).scalars().all())
+        if date_from:
+            stmt = stmt.where(TripPO.end_date >= date_from)
+        if date_to:
+            stmt = stmt.where(TripPO.start_date <= date_to)
+        if destination:
+            pattern = f"%{destination}%"
+            stmt = stmt.where(
+                exists()
+                .where(
+                    TripDayPO.trip_id == TripPO.id,
+                    ActivityPO.trip_day_id == TripDayPO.id,
+                    or_(
+                        ActivityPO.location_name.ilike(pattern),
+                        ActivityPO.location_address.ilike(pattern)
+                    )
+                )
+                .correlate(TripPO)
+            )
+        return stmt
+
+    @staticmethod
+    def _before(column, before: Tuple[Any, str]):
+        """keyset 条件：(column, id) 严格小于游标位置"""
+        key, trip_id = before
+        return or_(column < key, and_(column == key, TripPO.id < trip_id))
 
     def find_by_creator(self, creator_id: str) -> List[TripPO]:
         stmt = (
             select(TripPO)
+            .options(*TRIP_AGGREGATE_LOADERS)
             .where(TripPO.creator_id == creator_id)
             .order_by(desc(TripPO.created_at))
         )
         return list(self.session.execute(stmt).scalars().all())
 
-    def find_public(self, limit: int = 20, offset: int = 0, search_query: Optional[str] = None) -> List[TripPO]:
-        stmt = select(TripPO).where(TripPO.visibility == 'public')
+    def find_public(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[TripPO]:
+        stmt = self._public_filter(
+            select(TripPO).options(*TRIP_AGGREGATE_LOADERS),
+            limit, offset, search_query, before, status, date_from, date_to, destination
+        )
+        return list(self.session.execute(stmt).scalars().all())
+
+    def find_public_summaries(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        stmt = self._public_filter(
+            self._summary_select(),
+            limit, offset, search_query, before, status, date_from, date_to, destination
+        )
+        return [dict(row) for row in self.session.execute(stmt).mappings().all()]
+
+    def _public_filter(self, stmt, limit, offset, search_query, before, status, date_from, date_to, destination):
+        # 无搜索词时沿 idx_trips_visibility_created 按 (created_at DESC, id DESC) 读取
+        stmt = stmt.where(TripPO.visibility == 'public')
+        stmt = self._apply_filters(stmt, status, date_from, date_to, destination)
+        order_by = [desc(TripPO.created_at), desc(TripPO.id)]
         
         if search_query:
-            search_pattern = f"%{search_query}%"
-            stmt = stmt.where(
-                or_(
-                    TripPO.name.ilike(search_pattern),
-                    TripPO.description.ilike(search_pattern)
+            # 优先走全文索引并按相关度排序，索引无法处理时回退到 LIKE
+            index = create_search_index(self.session)
+            hits = index.match(DOC_TYPE_TRIP, search_query) if index else None
+            if hits is not None:
+                stmt = stmt.join(hits, hits.c.doc_id == TripPO.id)
+                order_by.insert(0, desc(hits.c.score))
+            else:
+                search_pattern = f"%{search_query}%"
+                stmt = stmt.where(
+                    or_(
+                        TripPO.name.ilike(search_pattern),
+                        TripPO.description.ilike(search_pattern)
+                    )
                 )
-            )
+        if before:
+            stmt = stmt.where(self._before(TripPO.created_at, before))
             
-        stmt = (
-            stmt.order_by(desc(TripPO.created_at))
+        return (
+            stmt.order_by(*order_by)
             .limit(limit)
             .offset(offset)
         )
-        return list(self.session.execute(stmt).scalars().all())
+
+    @staticmethod
+    def _summary_select():
+        """旅行摘要列：trips 主表列 + 成员数、活动数（相关子查询，只对结果行计算）"""
+        member_count = (
+            select(func.count(TripMemberPO.id))
+            .where(TripMemberPO.trip_id == TripPO.id)
+            .correlate(TripPO)
+            .scalar_subquery()
+        )
+        activity_count = (
+            select(func.count(ActivityPO.id))
+            .join(TripDayPO, TripDayPO.id == ActivityPO.trip_day_id)
+            .where(TripDayPO.trip_id == TripPO.id)
+            .correlate(TripPO)
+            .scalar_subquery()
+        )
+        return select(
+            TripPO.id,
+            TripPO.name,
+            TripPO.description,
+            TripPO.creator_id,
+            TripPO.start_date,
+            TripPO.end_date,
+            TripPO.budget_amount,
+            TripPO.budget_currency,
+            TripPO.visibility,
+            TripPO.status,
+            TripPO.cover_image_url,
+            TripPO.created_at,
+            TripPO.updated_at,
+            member_count.label('member_count'),
+            activity_count.label('activity_count')
+        )
 
     def add(self, trip_po: TripPO) -> None:
         self.session.add(trip_po)
@@ -4,7 +4,8 @@
 定义旅行持久化对象的数据访问操作。
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 from app_travel.infrastructure.database.persistent_model.trip_po import TripPO
 
@@ -25,18 +26,71 @@ class ITripDao(ABC):
         pass
     
     @abstractmethod
-    def find_by_member(self, user_id: str, status: Optional[str] = None) -> List[TripPO]:
-        """查找用户参与的旅行
+    def find_by_ids(self, trip_ids: List[str]) -> List[TripPO]:
+        """根据ID列表批量查找旅行（仅主表，不预加载子实体）
+        
+        Args:
+            trip_ids: 旅行ID列表
+            
+        Returns:
+            旅行持久化对象列表
+        """
+        pass
+    
+    @abstractmethod
+    def find_by_member(
+        self,
+        user_id: str,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[date, str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[TripPO]:
+        """查找用户参与的旅行，按 (start_date DESC, id DESC) 排序
         
         Args:
             user_id: 用户ID
             status: 可选的状态筛选
+            limit: 最多返回条数，None 表示不限
+            before: keyset 游标 (start_date, trip_id)，只返回排在其后的旅行
+            date_from: 旅行结束日期不早于该日期
+            date_to: 旅行开始日期不晚于该日期
+            destination: 目的地关键词（匹配活动地点名称或地址）
             
         Returns:
             旅行持久化对象列表
         """
         pass
     
+    @abstractmethod
+    def find_member_summaries(
+        self,
+        user_id: str,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[date, str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """查找用户参与的旅行摘要（一条查询，含 member_count / activity_count）
+        
+        Args:
+            user_id: 用户ID
+            status: 可选的状态筛选
+            limit: 最多返回条数，None 表示不限
+            before: keyset 游标 (start_date, trip_id)，只返回排在其后的旅行
+            date_from: 旅行结束日期不早于该日期
+            date_to: 旅行开始日期不晚于该日期
+            destination: 目的地关键词（匹配活动地点名称或地址）
+            
+        Returns:
+            摘要行字典列表，顺序与 find_by_member 一致
+        """
+        pass
+    
     @abstractmethod
     def find_by_creator(self, creator_id: str) -> List[TripPO]:
         """查找用户创建的旅行
@@ -50,19 +104,63 @@ class ITripDao(ABC):
         pass
     
     @abstractmethod
-    def find_public(self, limit: int = 20, offset: int = 0, search_query: Optional[str] = None) -> List[TripPO]:
-        """查找公开的旅行
+    def find_public(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[TripPO]:
+        """查找公开的旅行，按 (created_at DESC, id DESC) 排序（有搜索词时相关度优先）
         
         Args:
             limit: 每页数量
             offset: 偏移量
             search_query: 搜索关键词
+            before: keyset 游标 (created_at, trip_id)，只返回排在其后的旅行
+            status: 可选的状态筛选
+            date_from: 旅行结束日期不早于该日期
+            date_to: 旅行开始日期不晚于该日期
+            destination: 目的地关键词（匹配活动地点名称或地址）
             
         Returns:
             旅行持久化对象列表
         """
         pass
     
+    @abstractmethod
+    def find_public_summaries(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """查找公开旅行摘要（一条查询，含 member_count / activity_count）
+        
+        Args:
+            limit: 每页数量
+            offset: 偏移量
+            search_query: 搜索关键词
+            before: keyset 游标 (created_at, trip_id)，只返回排在其后的旅行
+            status: 可选的状态筛选
+            date_from: 旅行结束日期不早于该日期
+            date_to: 旅行开始日期不晚于该日期
+            destination: 目的地关键词（匹配活动地点名称或地址）
+            
+        Returns:
+            摘要行字典列表，顺序与 find_public 一致
+        """
+        pass
+    
     @abstractmethod
     def add(self, trip_po: TripPO) -> None:
         """添加旅行
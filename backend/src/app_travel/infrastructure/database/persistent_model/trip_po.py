@@ -9,7 +9,7 @@ from decimal import Decimal
 from typing import List, Optional
 import json
 
-from sqlalchemy import Column, String, DateTime, Date, Time, Text, Boolean, ForeignKey, Integer, Numeric
+from sqlalchemy import Column, String, DateTime, Date, Time, Text, Boolean, ForeignKey, Integer, Numeric, Index
 from sqlalchemy.orm import relationship
 from shared.database.core import Base
 
@@ -86,22 +86,25 @@ class ActivityPO(Base):
     @classmethod
     def from_domain(cls, activity: Activity, trip_day_id: int) -> 'ActivityPO':
         """从领域实体创建"""
-        return cls(
-            id=activity.id,
-            trip_day_id=trip_day_id,
-            name=activity.name,
-            activity_type=activity.activity_type.value,
-            location_name=activity.location.name,
-            location_latitude=Decimal(str(activity.location.latitude)) if activity.location.latitude else None,
-            location_longitude=Decimal(str(activity.location.longitude)) if activity.location.longitude else None,
-            location_address=activity.location.address,
-            start_time=activity.start_time,
-            end_time=activity.end_time,
-            cost_amount=activity.cost.amount if activity.cost else None,
-            cost_currency=activity.cost.currency if activity.cost else None,
-            notes=activity.notes,
-            booking_reference=activity.booking_reference
-        )
+        po = cls(id=activity.id, trip_day_id=trip_day_id)
+        po.update_from_domain(activity)
+        return po
+    
+    def update_from_domain(self, activity: Activity) -> None:
+        """从领域实体更新字段（值未变化的字段在 flush 时不会产生 UPDATE）"""
+        self.name = activity.name
+        self.activity_type = activity.activity_type.value
+        self.location_name = activity.location.name
+        self.location_latitude = Decimal(str(activity.location.latitude)) if activity.location.latitude else None
+        self.location_longitude = Decimal(str(activity.location.longitude)) if activity.location.longitude else None
+        self.location_address = activity.location.address
+        self.start_time = activity.start_time
+        self.end_time = activity.end_time
+        self.cost_amount = activity.cost.amount if activity.cost else None
+        # 无费用时写回列默认值，与重新插入该行的结果一致
+        self.cost_currency = activity.cost.currency if activity.cost else 'CNY'
+        self.notes = activity.notes
+        self.booking_reference = activity.booking_reference
 
 
 class TransitPO(Base):
@@ -174,6 +177,12 @@ class TransitPO(Base):
     @classmethod
     def from_domain(cls, transit: Transit, trip_day_id: int) -> 'TransitPO':
         """从领域实体创建"""
+        po = cls(id=transit.id, trip_day_id=trip_day_id)
+        po.update_from_domain(transit)
+        return po
+    
+    def update_from_domain(self, transit: Transit) -> None:
+        """从领域实体更新字段（值未变化的字段在 flush 时不会产生 UPDATE）"""
         cost_amount = None
         fuel_cost = None
         toll_cost = None
@@ -188,24 +197,20 @@ class TransitPO(Base):
             if transit.estimated_cost.ticket_cost:
                 ticket_cost = transit.estimated_cost.ticket_cost.amount
         
-        return cls(
-            id=transit.id,
-            trip_day_id=trip_day_id,
-            from_activity_id=transit.from_activity_id,
-            to_activity_id=transit.to_activity_id,
-            transport_mode=transit.transport_mode.value,
-            distance_meters=Decimal(str(transit.route_info.distance_meters)),
-            duration_seconds=transit.route_info.duration_seconds,
-            polyline=transit.route_info.polyline,
-            departure_time=transit.departure_time,
-            arrival_time=transit.arrival_time,
-            cost_amount=cost_amount,
-            cost_currency='CNY',
-            fuel_cost=fuel_cost,
-            toll_cost=toll_cost,
-            ticket_cost=ticket_cost,
-            notes=transit.notes
-        )
+        self.from_activity_id = transit.from_activity_id
+        self.to_activity_id = transit.to_activity_id
+        self.transport_mode = transit.transport_mode.value
+        self.distance_meters = Decimal(str(transit.route_info.distance_meters))
+        self.duration_seconds = transit.route_info.duration_seconds
+        self.polyline = transit.route_info.polyline
+        self.departure_time = transit.departure_time
+        self.arrival_time = transit.arrival_time
+        self.cost_amount = cost_amount
+        self.cost_currency = 'CNY'
+        self.fuel_cost = fuel_cost
+        self.toll_cost = toll_cost
+        self.ticket_cost = ticket_cost
+        self.notes = transit.notes
 
 
 class TripDayPO(Base):
@@ -257,16 +262,26 @@ class TripDayPO(Base):
             notes=trip_day.notes
         )
         return po
+    
+    def update_from_domain(self, trip_day: TripDay) -> None:
+        """从领域实体更新日程字段（不含活动和交通）"""
+        self.date = trip_day.date
+        self.theme = trip_day.theme
+        self.notes = trip_day.notes
 
 
 class TripMemberPO(Base):
     """旅行成员持久化对象"""
     
     __tablename__ = 'trip_members'
+    __table_args__ = (
+        # 按成员查旅行（用户旅行列表）；同时覆盖只按 user_id 的查询
+        Index('idx_trip_members_user_trip', 'user_id', 'trip_id'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     trip_id = Column(String(36), ForeignKey('trips.id'), nullable=False, index=True)
-    user_id = Column(String(36), nullable=False, index=True)
+    user_id = Column(String(36), nullable=False)
     
     role = Column(String(20), nullable=False, default='member')
     nickname = Column(String(50), nullable=True)
@@ -300,6 +315,10 @@ class TripPO(Base):
     """旅行持久化对象 - SQLAlchemy 模型"""
     
     __tablename__ = 'trips'
+    __table_args__ = (
+        # 公开旅行列表按 (created_at DESC, id DESC) 做 keyset 分页
+        Index('idx_trips_visibility_created', 'visibility', 'created_at', 'id'),
+    )
     
     id = Column(String(36), primary_key=True)
     name = Column(String(100), nullable=False)
@@ -398,8 +417,12 @@ class TripPO(Base):
         self.description = trip.description.value
         self.start_date = trip.date_range.start_date
         self.end_date = trip.date_range.end_date
+        if trip.budget:
+            self.budget_currency = trip.budget.currency
+        elif self.budget_amount is not None:
+            # 预算被移除时清空币种；从未设置预算的行保留插入时的列默认值，避免无变化的保存产生 UPDATE
+            self.budget_currency = None
         self.budget_amount = trip.budget.amount if trip.budget else None
-        self.budget_currency = trip.budget.currency if trip.budget else None
         self.visibility = trip.visibility.value
         self.status = trip.status.value
         self.cover_image_url = trip.cover_image_url
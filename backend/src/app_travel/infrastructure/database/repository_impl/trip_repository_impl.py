@@ -4,11 +4,13 @@
 实现 ITripRepository 接口。
 负责 Trip 聚合根及其子实体（TripMember, TripDay, Activity, Transit）的持久化。
 """
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 from app_travel.domain.demand_interface.i_trip_repository import ITripRepository
 from app_travel.domain.aggregate.trip_aggregate import Trip
-from app_travel.domain.value_objects.travel_value_objects import TripId, TripStatus
+from app_travel.domain.value_objects.travel_value_objects import TripId, TripStatus, Money
+from app_travel.domain.value_objects.trip_summary import TripSummary
 from app_travel.infrastructure.database.dao_interface.i_trip_dao import ITripDao
 from app_travel.infrastructure.database.persistent_model.trip_po import (
     TripPO, TripMemberPO, TripDayPO, ActivityPO, TransitPO
@@ -70,25 +72,54 @@ class TripRepositoryImpl(ITripRepository):
                 trip_po.members.append(TripMemberPO.from_domain(member, trip.id.value))
     
     def _sync_days(self, trip_po: TripPO, trip: Trip) -> None:
-        """同步日程
+        """按差异同步日程
+        
+        日程按 day_number 匹配，活动和交通按 UUID 匹配：
+        - 已存在的行原地更新，值未变化的行在 flush 时不产生 UPDATE
+        - 新增的行追加到所属日程，缺失的行由 delete-orphan 级联删除
+        - 换到其他日程的活动/交通只改写 trip_day_id，不删除重建
         
         Args:
             trip_po: 旅行持久化对象
             trip: Trip 领域实体
         """
-        # 简化处理：清空并重新创建日程
-        # 生产环境中应该做更精细的同步
-        trip_po.days.clear()
+        day_pos = {d.day_number: d for d in trip_po.days}
+        activity_pos = {a.id: a for d in trip_po.days for a in d.activities}
+        transit_pos = {t.id: t for d in trip_po.days for t in d.transits}
         
         for day in trip.days:
-            day_po = TripDayPO.from_domain(day, trip.id.value)
-            # 添加活动
+            day_po = day_pos.pop(day.day_number, None)
+            if day_po is None:
+                day_po = TripDayPO.from_domain(day, trip.id.value)
+                trip_po.days.append(day_po)
+            else:
+                day_po.update_from_domain(day)
+            
             for activity in day.activities:
-                day_po.activities.append(ActivityPO.from_domain(activity, 0))  # ID 将由数据库生成
-            # 添加交通
+                activity_po = activity_pos.pop(activity.id, None)
+                if activity_po is None:
+                    day_po.activities.append(ActivityPO.from_domain(activity, day_po.id))
+                    continue
+                if activity_po.trip_day is not day_po:
+                    activity_po.trip_day = day_po
+                activity_po.update_from_domain(activity)
+            
             for transit in day.transits:
-                day_po.transits.append(TransitPO.from_domain(transit, 0))  # ID 将由数据库生成
-            trip_po.days.append(day_po)
+                transit_po = transit_pos.pop(transit.id, None)
+                if transit_po is None:
+                    day_po.transits.append(TransitPO.from_domain(transit, day_po.id))
+                    continue
+                if transit_po.trip_day is not day_po:
+                    transit_po.trip_day = day_po
+                transit_po.update_from_domain(transit)
+        
+        # 剩余的活动/交通已从聚合中移除；先处理完迁移再删除多余日程，避免误删迁走的行
+        for activity_po in activity_pos.values():
+            activity_po.trip_day.activities.remove(activity_po)
+        for transit_po in transit_pos.values():
+            transit_po.trip_day.transits.remove(transit_po)
+        for day_po in day_pos.values():
+            trip_po.days.remove(day_po)
     
     def find_by_id(self, trip_id: TripId) -> Optional[Trip]:
         """根据ID查找旅行
@@ -104,20 +135,55 @@ class TripRepositoryImpl(ITripRepository):
             return trip_po.to_domain()
         return None
     
-    def find_by_member(self, user_id: str, status: Optional[TripStatus] = None) -> List[Trip]:
+    def find_by_member(
+        self,
+        user_id: str,
+        status: Optional[TripStatus] = None,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[date, str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[Trip]:
         """查找用户参与的旅行
         
         Args:
             user_id: 用户ID
             status: 可选的状态筛选
+            limit: 最多返回条数，None 表示不限
+            before: keyset 游标 (start_date, trip_id)
+            date_from: 旅行结束日期不早于该日期
+            date_to: 旅行开始日期不晚于该日期
+            destination: 目的地关键词
             
         Returns:
             旅行列表
         """
         status_value = status.value if status else None
-        trip_pos = self._trip_dao.find_by_member(user_id, status_value)
+        trip_pos = self._trip_dao.find_by_member(
+            user_id, status_value, limit=limit, before=before,
+            date_from=date_from, date_to=date_to, destination=destination
+        )
         return [po.to_domain() for po in trip_pos]
     
+    def find_member_summaries(
+        self,
+        user_id: str,
+        status: Optional[TripStatus] = None,
+        limit: Optional[int] = None,
+        before: Optional[Tuple[date, str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[TripSummary]:
+        """查找用户参与的旅行摘要（一条查询）"""
+        status_value = status.value if status else None
+        rows = self._trip_dao.find_member_summaries(
+            user_id, status_value, limit=limit, before=before,
+            date_from=date_from, date_to=date_to, destination=destination
+        )
+        return [self._row_to_summary(row) for row in rows]
+    
     def find_by_creator(self, creator_id: str) -> List[Trip]:
         """查找用户创建的旅行
         
@@ -130,20 +196,78 @@ class TripRepositoryImpl(ITripRepository):
         trip_pos = self._trip_dao.find_by_creator(creator_id)
         return [po.to_domain() for po in trip_pos]
     
-    def find_public(self, limit: int = 20, offset: int = 0, search_query: Optional[str] = None) -> List[Trip]:
+    def find_public(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        status: Optional[TripStatus] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[Trip]:
         """查找公开的旅行
         
         Args:
             limit: 每页数量
             offset: 偏移量
             search_query: 搜索关键词
+            before: keyset 游标 (created_at, trip_id)
+            status: 可选的状态筛选
+            date_from: 旅行结束日期不早于该日期
+            date_to: 旅行开始日期不晚于该日期
+            destination: 目的地关键词
             
         Returns:
             旅行列表
         """
-        trip_pos = self._trip_dao.find_public(limit, offset, search_query)
+        trip_pos = self._trip_dao.find_public(
+            limit, offset, search_query, before=before, status=status.value if status else None,
+            date_from=date_from, date_to=date_to, destination=destination
+        )
         return [po.to_domain() for po in trip_pos]
     
+    def find_public_summaries(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        search_query: Optional[str] = None,
+        before: Optional[Tuple[datetime, str]] = None,
+        status: Optional[TripStatus] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> List[TripSummary]:
+        """查找公开旅行摘要（一条查询）"""
+        rows = self._trip_dao.find_public_summaries(
+            limit, offset, search_query, before=before, status=status.value if status else None,
+            date_from=date_from, date_to=date_to, destination=destination
+        )
+        return [self._row_to_summary(row) for row in rows]
+    
+    @staticmethod
+    def _row_to_summary(row: Dict[str, Any]) -> TripSummary:
+        budget = None
+        if row['budget_amount'] is not None:
+            budget = Money(amount=row['budget_amount'], currency=row['budget_currency'] or 'CNY')
+        return TripSummary(
+            trip_id=row['id'],
+            name=row['name'],
+            description=row['description'] or '',
+            creator_id=row['creator_id'],
+            start_date=row['start_date'],
+            end_date=row['end_date'],
+            budget=budget,
+            visibility=row['visibility'],
+            status=row['status'],
+            cover_image_url=row['cover_image_url'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at'],
+            member_count=row['member_count'] or 0,
+            activity_count=row['activity_count'] or 0
+        )
+    
     def delete(self, trip_id: TripId) -> None:
         """删除旅行
         
@@ -0,0 +1,267 @@
+"""
+带缓存的地理服务装饰器
+
+包装任意 IGeoService，缓存地理编码、逆地理编码、直线距离和路线结果：
+- 内存层：按 LRU 淘汰、按 TTL 过期，进程内共享
+- 持久层（可选）：SqlAlchemyGeoCacheStore，进程重启后和多个 worker 之间共享
+
+缓存键：
+- geocode: 规范化后的地址（去首尾空白、合并连续空白、大小写折叠）
+- reverse_geocode / calculate_distance / get_route: 保留 6 位小数的坐标（对），路线另含出行方式
+
+失败结果（None / 0.0 / {}）可能来自网络异常，不写入缓存。
+缺少坐标的地点先经过本装饰器的 geocode（走缓存）补全坐标，再交给被包装的服务。
+"""
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app_travel.domain.demand_interface.i_geo_service import IGeoService
+from app_travel.domain.value_objects.travel_value_objects import Location
+from app_travel.infrastructure.external_service.geo_cache_store import SqlAlchemyGeoCacheStore
+
+# 同一条路线的不同写法
+_MODE_ALIASES = {"bicycling": "cycling"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class GeoCacheStats:
+    """缓存命中统计（按操作分别计数）"""
+    hits: Dict[str, int] = field(default_factory=dict)              # 内存层命中
+    persistent_hits: Dict[str, int] = field(default_factory=dict)   # 持久层命中
+    misses: Dict[str, int] = field(default_factory=dict)            # 调用被包装的服务
+
+    def record(self, counter: Dict[str, int], operation: str) -> None:
+        counter[operation] = counter.get(operation, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        hits = sum(self.hits.values())
+        persistent_hits = sum(self.persistent_hits.values())
+        misses = sum(self.misses.values())
+        total = hits + persistent_hits + misses
+        operations = sorted(set(self.hits) | set(self.persistent_hits) | set(self.misses))
+        return {
+            "hits": hits,
+            "persistent_hits": persistent_hits,
+            "misses": misses,
+            "hit_rate": (hits + persistent_hits) / total if total else 0.0,
+            "operations": {
+                op: {
+                    "hits": self.hits.get(op, 0),
+                    "persistent_hits": self.persistent_hits.get(op, 0),
+                    "misses": self.misses.get(op, 0),
+                }
+                for op in operations
+            },
+        }
+
+
+class _LruTtlCache:
+    """容量有界、带过期时间的内存缓存"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Callable[[], float]):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any, expires_at: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        if expires_at is None:
+            expires_at = self._clock() + self.ttl_seconds
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachingGeoService(IGeoService):
+    """带缓存的地理服务装饰器"""
+
+    def __init__(
+        self,
+        inner: IGeoService,
+        max_entries: int = 2048,
+        ttl_seconds: float = 7 * 24 * 3600,
+        store: Optional[SqlAlchemyGeoCacheStore] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            inner: 被包装的地理服务
+            max_entries: 内存层最多缓存的条目数
+            ttl_seconds: 缓存有效期（秒），内存层和持久层共用
+            store: 可选的持久层
+            clock: 时间来源（Unix 时间戳），便于测试
+        """
+        self._inner = inner
+        self._store = store
+        self._clock = clock
+        self._ttl_seconds = ttl_seconds
+        self._memory = _LruTtlCache(max_entries, ttl_seconds, clock)
+        self._lock = threading.Lock()
+        self._stats = GeoCacheStats()
+
+    # ==================== IGeoService ====================
+
+    def geocode(self, address: str) -> Optional[Location]:
+        """地址转坐标（按规范化地址缓存）"""
+        key = f"geocode:{self._normalize_address(address)}"
+        location = self._cached(
+            "geocode", key,
+            lambda: self._inner.geocode(address),
+            encode=self._encode_location,
+            decode=self._decode_location
+        )
+        # 缓存的结果可能来自同一地址的其他写法，name 保持为调用方传入的地址
+        return replace(location, name=address) if location else None
+
+    def reverse_geocode(self, latitude: float, longitude: float) -> Optional[str]:
+        """坐标转地址（按坐标缓存）"""
+        key = f"regeo:{self._coord(latitude, longitude)}"
+        return self._cached("reverse_geocode", key, lambda: self._inner.reverse_geocode(latitude, longitude))
+
+    def calculate_distance(self, origin: Location, destination: Location) -> float:
+        """直线距离（按坐标对缓存）"""
+        origin = self._with_coordinates(origin)
+        destination = self._with_coordinates(destination)
+        if origin is None or destination is None:
+            return 0.0
+        key = f"distance:{self._coord_of(origin)}|{self._coord_of(destination)}"
+        distance = self._cached("calculate_distance", key, lambda: self._inner.calculate_distance(origin, destination))
+        return distance or 0.0
+
+    def get_route(self, origin: Location, destination: Location, mode: str = "driving") -> Dict[str, Any]:
+        """路线信息（按坐标对和出行方式缓存）
+
+        公交路线的城市信息由被包装的服务在未命中时查询，命中时一并省去。
+        """
+        origin = self._with_coordinates(origin)
+        destination = self._with_coordinates(destination)
+        if origin is None or destination is None:
+            return {}
+        normalized_mode = _MODE_ALIASES.get(mode, mode)
+        key = f"route:{normalized_mode}:{self._coord_of(origin)}|{self._coord_of(destination)}"
+        route = self._cached("get_route", key, lambda: self._inner.get_route(origin, destination, mode))
+        # 路线是可变字典，返回副本避免调用方修改缓存内容
+        return copy.deepcopy(route) if route else {}
+
+    def search_places(
+        self,
+        keyword: str,
+        location: Optional[Location] = None,
+        radius: int = 5000
+    ) -> List[Location]:
+        """POI 搜索结果随时间变化，不缓存"""
+        return self._inner.search_places(keyword, location, radius)
+
+    # ==================== 统计与维护 ====================
+
+    def stats(self) -> Dict[str, Any]:
+        """命中统计：hits（内存）/ persistent_hits（持久层）/ misses，以及按操作的明细"""
+        with self._lock:
+            result = self._stats.to_dict()
+            result["size"] = len(self._memory)
+        return result
+
+    def clear(self) -> None:
+        """清空内存层和统计（持久层不受影响）"""
+        with self._lock:
+            self._memory.clear()
+            self._stats = GeoCacheStats()
+
+    # ==================== 内部实现 ====================
+
+    def _cached(
+        self,
+        operation: str,
+        key: str,
+        loader: Callable[[], Any],
+        encode: Callable[[Any], Any] = lambda v: v,
+        decode: Callable[[Any], Any] = lambda v: v
+    ) -> Any:
+        """依次查内存层、持久层，都未命中时调用被包装的服务并回填"""
+        with self._lock:
+            found, value = self._memory.get(key)
+            if found:
+                self._stats.record(self._stats.hits, operation)
+                return value
+
+        if self._store is not None:
+            stored = self._store.get(key, now=self._clock())
+            if stored is not None:
+                value = decode(stored)
+                with self._lock:
+                    self._memory.set(key, value)
+                    self._stats.record(self._stats.persistent_hits, operation)
+                return value
+
+        # 网络调用不持锁，同一键的并发未命中可能各调用一次
+        value = loader()
+        with self._lock:
+            self._stats.record(self._stats.misses, operation)
+            if value:
+                self._memory.set(key, value)
+        if value and self._store is not None:
+            self._store.set(key, encode(value), self._clock() + self._ttl_seconds)
+        return value
+
+    def _with_coordinates(self, location: Location) -> Optional[Location]:
+        """缺少坐标时经缓存的 geocode 补全，无法解析返回 None"""
+        if location.has_coordinates():
+            return location
+        return self.geocode(location.name)
+
+    @staticmethod
+    def _normalize_address(address: str) -> str:
+        return _WHITESPACE.sub(" ", (address or "").strip()).casefold()
+
+    @staticmethod
+    def _coord(latitude: float, longitude: float) -> str:
+        return f"{float(latitude):.6f},{float(longitude):.6f}"
+
+    @classmethod
+    def _coord_of(cls, location: Location) -> str:
+        return cls._coord(location.latitude, location.longitude)
+
+    @staticmethod
+    def _encode_location(location: Location) -> Dict[str, Any]:
+        return {
+            "name": location.name,
+            "latitude": location.latitude,
+            "longitude": location.longitude,
+            "address": location.address,
+        }
+
+    @staticmethod
+    def _decode_location(data: Dict[str, Any]) -> Location:
+        return Location(
+            name=data["name"],
+            latitude=data["latitude"],
+            longitude=data["longitude"],
+            address=data["address"],
+        )
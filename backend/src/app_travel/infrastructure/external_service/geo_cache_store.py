@@ -0,0 +1,76 @@
+"""
+地理服务结果的持久化缓存
+
+CachingGeoService 的持久层：进程重启或多个 worker 之间共享地理编码和路线结果。
+表使用独立的 MetaData，通常放在单独的 SQLite 文件（GEO_CACHE_URL），也可以放在主库。
+"""
+import json
+import time
+from typing import Any, Optional
+
+from sqlalchemy import Column, Float, Index, MetaData, String, Table, Text, create_engine, delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+
+metadata = MetaData()
+
+geo_cache = Table(
+    "geo_cache", metadata,
+    Column("cache_key", String(255), primary_key=True),
+    Column("value", Text, nullable=False),
+    Column("expires_at", Float, nullable=False),   # Unix 时间戳（秒）
+    Index("idx_geo_cache_expires", "expires_at"),
+)
+
+
+class SqlAlchemyGeoCacheStore:
+    """数据库地理缓存存储
+
+    值以 JSON 文本保存，过期的行在读取时视为未命中，由 purge_expired 清理。
+    """
+
+    def __init__(self, engine: Engine):
+        """
+        Args:
+            engine: 数据库引擎
+        """
+        self._engine = engine
+        metadata.create_all(engine)
+
+    @classmethod
+    def from_url(cls, url: str) -> "SqlAlchemyGeoCacheStore":
+        return cls(create_engine(url))
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Any]:
+        """读取未过期的值，不存在或已过期返回 None"""
+        now = time.time() if now is None else now
+        with self._engine.connect() as conn:
+            row = conn.execute(
+                select(geo_cache.c.value)
+                .where(geo_cache.c.cache_key == key, geo_cache.c.expires_at > now)
+            ).first()
+        return json.loads(row.value) if row else None
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        """写入（覆盖）一个值"""
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._engine.begin() as conn:
+            if self._engine.dialect.name == "sqlite":
+                stmt = sqlite_insert(geo_cache).values(cache_key=key, value=payload, expires_at=expires_at)
+                conn.execute(stmt.on_conflict_do_update(
+                    index_elements=["cache_key"], set_={"value": payload, "expires_at": expires_at}
+                ))
+                return
+            conn.execute(delete(geo_cache).where(geo_cache.c.cache_key == key))
+            conn.execute(geo_cache.insert().values(cache_key=key, value=payload, expires_at=expires_at))
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """删除已过期的行，返回删除数量"""
+        now = time.time() if now is None else now
+        with self._engine.begin() as conn:
+            return conn.execute(delete(geo_cache).where(geo_cache.c.expires_at <= now)).rowcount
+
+    def clear(self) -> None:
+        """清空缓存（主要用于测试）"""
+        with self._engine.begin() as conn:
+            conn.execute(delete(geo_cache))
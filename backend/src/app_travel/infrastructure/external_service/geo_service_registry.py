@@ -0,0 +1,49 @@
+"""
+地理服务的全局访问点
+
+进程内共享一个 CachingGeoService（包装高德地图服务），
+使缓存跨请求生效。
+
+配置：
+- GEO_CACHE_MAX_ENTRIES: 内存层条目上限（默认 2048）
+- GEO_CACHE_TTL_SECONDS: 缓存有效期（默认 7 天）
+- GEO_CACHE_URL: 持久层的 SQLAlchemy URL（如 sqlite:///geo_cache.db），为空时只用内存层
+"""
+import os
+import threading
+from typing import Optional
+
+from app_travel.domain.demand_interface.i_geo_service import IGeoService
+from app_travel.infrastructure.external_service.caching_geo_service import CachingGeoService
+from app_travel.infrastructure.external_service.gaode_geo_service_impl import GaodeGeoServiceImpl
+from app_travel.infrastructure.external_service.geo_cache_store import SqlAlchemyGeoCacheStore
+
+GEO_CACHE_MAX_ENTRIES = int(os.getenv("GEO_CACHE_MAX_ENTRIES", "2048"))
+GEO_CACHE_TTL_SECONDS = float(os.getenv("GEO_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+GEO_CACHE_URL = os.getenv("GEO_CACHE_URL", "")
+
+_lock = threading.Lock()
+_service: Optional[IGeoService] = None
+
+
+def get_geo_service() -> IGeoService:
+    """获取全局地理服务（首次访问时按配置创建）"""
+    global _service
+    if _service is None:
+        with _lock:
+            if _service is None:
+                store = SqlAlchemyGeoCacheStore.from_url(GEO_CACHE_URL) if GEO_CACHE_URL else None
+                _service = CachingGeoService(
+                    GaodeGeoServiceImpl(),
+                    max_entries=GEO_CACHE_MAX_ENTRIES,
+                    ttl_seconds=GEO_CACHE_TTL_SECONDS,
+                    store=store
+                )
+    return _service
+
+
+def set_geo_service(service: Optional[IGeoService]) -> None:
+    """替换全局地理服务（None 表示下次访问时按配置重建，主要用于测试）"""
+    global _service
+    with _lock:
+        _service = service
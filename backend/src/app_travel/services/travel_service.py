@@ -5,8 +5,8 @@
 遵循 DDD 原则：应用层保持无状态，尽可能薄。
 复杂业务逻辑由领域层（聚合根、领域服务）处理。
 """
-from datetime import date, time
-from typing import List, Optional, Dict, Any
+from datetime import date, datetime, time
+from typing import List, Optional, Dict, Any, Union
 from decimal import Decimal
 
 from app_travel.domain.aggregate.trip_aggregate import Trip
@@ -20,7 +20,13 @@ from app_travel.domain.value_objects.travel_value_objects import (
 )
 from app_travel.domain.value_objects.itinerary_value_objects import TransitCalculationResult
 from app_travel.domain.value_objects.trip_statistics import TripStatistics
+from app_travel.domain.value_objects.trip_summary import TripSummary
+from app_travel.domain.domain_event.travel_events import TripDeletedEvent
+from app_social.domain.demand_interface.friendship_repository import IFriendshipRepository
 from shared.event_bus import EventBus
+from shared.pagination import (
+    encode_cursor, decode_cursor, encode_offset_cursor, decode_offset_cursor
+)
 
 
 class TravelService:
@@ -37,11 +43,15 @@ class TravelService:
     - 编排者：负责调用顺序和事件发布，不包含业务逻辑
     """
     
+    # 游标分页时未指定 limit 的默认页大小
+    DEFAULT_PAGE_SIZE = 20
+    
     def __init__(
         self,
         trip_repository: ITripRepository,
         geo_service: IGeoService,
-        event_bus: Optional[EventBus] = None
+        event_bus: Optional[EventBus] = None,
+        friendship_repository: Optional[IFriendshipRepository] = None
     ):
         """初始化应用服务
         
@@ -49,9 +59,11 @@ class TravelService:
             trip_repository: 旅行仓库
             geo_service: 地理服务（用于创建 ItineraryService）
             event_bus: 事件总线（可选，默认使用全局实例）
+            friendship_repository: 好友关系仓库（添加成员时校验好友关系，应与旅行仓库共用会话）
         """
         self._trip_repository = trip_repository
         self._geo_service = geo_service
+        self._friendship_repository = friendship_repository
         self._event_bus = event_bus or EventBus.get_instance()
     
     def _create_itinerary_service(self) -> ItineraryService:
@@ -211,32 +223,173 @@ class TravelService:
             return False
         
         self._trip_repository.delete(tid)
+        # 物理删除没有聚合可累积事件，直接发布
+        self._event_bus.publish(TripDeletedEvent(trip_id=trip_id))
         return True
     
     def list_user_trips(
         self, 
         user_id: str, 
-        status: Optional[str] = None
-    ) -> List[Trip]:
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> Union[List[Trip], Dict[str, Any]]:
         """获取用户参与的旅行列表
         
+        cursor 为 None 时返回旅行列表（limit 为 None 表示不限条数）；
+        cursor 不为 None 时（空字符串表示第一页）按 (start_date, id) 做 keyset 分页，
+        返回 {"trips": [...], "next_cursor": str | None}。
+        
         Args:
             user_id: 用户ID
             status: 状态筛选（可选）
+            limit: 每页数量
+            cursor: 分页游标
+            date_from: 旅行结束日期不早于该日期
+            date_to: 旅行开始日期不晚于该日期
+            destination: 目的地关键词
             
         Returns:
-            旅行列表
+            旅行列表或分页结果
         """
-        trip_status = TripStatus.from_string(status) if status else None
-        return self._trip_repository.find_by_member(user_id, trip_status)
+        return self._page_member_trips(
+            self._trip_repository.find_by_member,
+            user_id, status, limit, cursor, date_from, date_to, destination
+        )
+    
+    def list_user_trip_summaries(
+        self,
+        user_id: str,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> Union[List[TripSummary], Dict[str, Any]]:
+        """获取用户参与的旅行摘要列表（列表页使用，不加载日程）
+        
+        参数和返回值语义同 list_user_trips，元素为 TripSummary。
+        """
+        return self._page_member_trips(
+            self._trip_repository.find_member_summaries,
+            user_id, status, limit, cursor, date_from, date_to, destination
+        )
     
     def list_created_trips(self, creator_id: str) -> List[Trip]:
         """获取用户创建的旅行列表"""
         return self._trip_repository.find_by_creator(creator_id)
     
-    def list_public_trips(self, limit: int = 20, offset: int = 0, search_query: Optional[str] = None) -> List[Trip]:
-        """获取公开的旅行列表"""
-        return self._trip_repository.find_public(limit, offset, search_query)
+    def list_public_trips(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        search_query: Optional[str] = None,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> Union[List[Trip], Dict[str, Any]]:
+        """获取公开的旅行列表
+        
+        cursor 为 None 时使用 offset 分页并返回旅行列表；
+        cursor 不为 None 时（空字符串表示第一页）按 (created_at, id) 做 keyset 分页，
+        返回 {"trips": [...], "next_cursor": str | None}。
+        带 search_query 时结果按相关度排序，游标内部编码偏移量。
+        """
+        return self._page_public_trips(
+            self._trip_repository.find_public,
+            limit, offset, search_query, cursor, status, date_from, date_to, destination
+        )
+    
+    def list_public_trip_summaries(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        search_query: Optional[str] = None,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        destination: Optional[str] = None
+    ) -> Union[List[TripSummary], Dict[str, Any]]:
+        """获取公开旅行摘要列表（列表页使用，不加载日程）
+        
+        参数和返回值语义同 list_public_trips，元素为 TripSummary。
+        """
+        return self._page_public_trips(
+            self._trip_repository.find_public_summaries,
+            limit, offset, search_query, cursor, status, date_from, date_to, destination
+        )
+    
+    def _page_member_trips(self, finder, user_id, status, limit, cursor, date_from, date_to, destination):
+        """按成员查询旅行或摘要，cursor 不为 None 时返回分页结果"""
+        self._check_date_range(date_from, date_to)
+        trip_status = TripStatus.from_string(status) if status else None
+        before = None
+        if cursor is not None:
+            limit = limit or self.DEFAULT_PAGE_SIZE
+            key = decode_cursor(cursor)
+            # 游标统一编码为 datetime，成员列表的排序键是 start_date
+            before = (key[0].date(), key[1]) if key else None
+        
+        items = finder(
+            user_id, trip_status, limit=limit, before=before,
+            date_from=date_from, date_to=date_to, destination=destination
+        )
+        if cursor is None:
+            return items
+        
+        next_cursor = None
+        if items and len(items) == limit:
+            trip_id, start_date, _ = self._list_keys(items[-1])
+            next_cursor = encode_cursor(datetime.combine(start_date, time.min), trip_id)
+        return {"trips": items, "next_cursor": next_cursor}
+    
+    def _page_public_trips(self, finder, limit, offset, search_query, cursor,
+                           status, date_from, date_to, destination):
+        """查询公开旅行或摘要，cursor 不为 None 时返回分页结果"""
+        self._check_date_range(date_from, date_to)
+        trip_status = TripStatus.from_string(status) if status else None
+        before = None
+        if cursor is not None:
+            if search_query:
+                offset = decode_offset_cursor(cursor)
+            else:
+                before = decode_cursor(cursor)
+                offset = 0
+        
+        items = finder(
+            limit, offset, search_query, before=before, status=trip_status,
+            date_from=date_from, date_to=date_to, destination=destination
+        )
+        if cursor is None:
+            return items
+        
+        next_cursor = None
+        if items and len(items) == limit:
+            if search_query:
+                next_cursor = encode_offset_cursor(offset + limit)
+            else:
+                trip_id, _, created_at = self._list_keys(items[-1])
+                next_cursor = encode_cursor(created_at, trip_id)
+        return {"trips": items, "next_cursor": next_cursor}
+    
+    @staticmethod
+    def _list_keys(item: Union[Trip, TripSummary]):
+        """列表元素的排序键 (trip_id, start_date, created_at)"""
+        if isinstance(item, TripSummary):
+            return item.trip_id, item.start_date, item.created_at
+        return item.id.value, item.date_range.start_date, item.created_at
+    
+    @staticmethod
+    def _check_date_range(date_from: Optional[date], date_to: Optional[date]) -> None:
+        if date_from and date_to and date_from > date_to:
+            raise ValueError("date_from must not be after date_to")
     
     # ==================== 成员管理 ====================
     
@@ -259,19 +412,12 @@ class TravelService:
         if not trip:
             return None
         
-        # 检查是否为好友
+        # 检查是否为好友（在同一会话内一次查询）
         if added_by and added_by != user_id:
-            try:
-                from app_social.services.social_service import SocialService
-                social_service = SocialService()
-                if not social_service.are_friends(added_by, user_id):
-                    raise ValueError(f"User {user_id} is not your friend")
-            except ImportError:
-                # 忽略循环依赖或模块未找到，降级处理
-                pass
-            except Exception as e:
-                # 重新抛出业务异常
-                raise e
+            if self._friendship_repository is None:
+                raise RuntimeError("TravelService requires a friendship repository to add members")
+            if user_id not in self._friendship_repository.find_accepted_among(added_by, [user_id]):
+                raise ValueError(f"User {user_id} is not your friend")
 
         # 委托给聚合根（业务规则在聚合根中）
         trip.add_member(
@@ -7,9 +7,12 @@ from shared.database.core import SessionLocal
 from shared.storage.local_file_storage import LocalFileStorageService
 from app_travel.infrastructure.database.dao_impl.sqlalchemy_trip_dao import SqlAlchemyTripDao
 from app_travel.infrastructure.database.repository_impl.trip_repository_impl import TripRepositoryImpl
-from app_travel.infrastructure.external_service.gaode_geo_service_impl import GaodeGeoServiceImpl
+from app_travel.infrastructure.external_service.geo_service_registry import get_geo_service
 from app_travel.services.travel_service import TravelService
+from app_social.infrastructure.database.dao_impl.sqlalchemy_friendship_dao import SqlAlchemyFriendshipDao
+from app_social.infrastructure.database.repository_impl.friendship_repository_impl import FriendshipRepositoryImpl
 from app_travel.domain.aggregate.trip_aggregate import Trip
+from app_travel.domain.value_objects.trip_summary import TripSummary
 from app_travel.domain.value_objects.itinerary_value_objects import TransitCalculationResult
 
 # 创建蓝图
@@ -33,14 +36,15 @@ def get_travel_service() -> TravelService:
     
     组装依赖：
     TravelService -> TripRepositoryImpl -> SqlAlchemyTripDao -> Session
-                  -> GaodeGeoServiceImpl
+                  -> CachingGeoService -> GaodeGeoServiceImpl（进程内共享，缓存跨请求生效）
+                  -> FriendshipRepositoryImpl -> SqlAlchemyFriendshipDao -> Session
     """
     trip_dao = SqlAlchemyTripDao(g.session)
     trip_repo = TripRepositoryImpl(trip_dao)
-    # 这里可以从配置获取 API Key，暂使用默认值
-    geo_service = GaodeGeoServiceImpl()
+    geo_service = get_geo_service()
+    friendship_repo = FriendshipRepositoryImpl(SqlAlchemyFriendshipDao(g.session))
     
-    return TravelService(trip_repo, geo_service)
+    return TravelService(trip_repo, geo_service, friendship_repository=friendship_repo)
 
 from app_auth.infrastructure.database.persistent_model.user_po import UserPO
 
@@ -98,6 +102,53 @@ def serialize_trip(trip: Trip) -> dict:
         ]
     }
 
+def load_user_map(user_ids) -> dict:
+    """一条查询批量获取用户展示信息（列表页整页共用）"""
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return {}
+    try:
+        users = g.session.query(UserPO).filter(UserPO.id.in_(user_ids)).all()
+    except Exception:
+        # 如果查询失败，降级处理
+        return {}
+    return {u.id: u for u in users}
+
+def serialize_trip_summary(summary: TripSummary, user_map: dict) -> dict:
+    """将旅行摘要序列化为字典（列表页卡片，不含成员和日程明细）"""
+    creator = user_map.get(summary.creator_id)
+    return {
+        'id': summary.trip_id,
+        'name': summary.name,
+        'description': summary.description,
+        'creator_id': summary.creator_id,
+        'creator': {
+            'user_id': summary.creator_id,
+            'username': creator.username if creator else 'Unknown',
+            'avatar_url': creator.avatar_url if creator else None
+        },
+        'start_date': summary.start_date.isoformat(),
+        'end_date': summary.end_date.isoformat(),
+        'days_count': summary.days_count,
+        'budget': {
+            'amount': float(summary.budget.amount),
+            'currency': summary.budget.currency
+        } if summary.budget else None,
+        'budget_amount': float(summary.budget.amount) if summary.budget else 0,
+        'visibility': summary.visibility,
+        'status': summary.status,
+        'cover_image_url': summary.cover_image_url,
+        'created_at': summary.created_at.isoformat(),
+        'updated_at': summary.updated_at.isoformat(),
+        'member_count': summary.member_count,
+        'activity_count': summary.activity_count
+    }
+
+def serialize_trip_summaries(summaries) -> list:
+    """序列化一页旅行摘要，创建者信息整页一次查询"""
+    user_map = load_user_map(s.creator_id for s in summaries)
+    return [serialize_trip_summary(s, user_map) for s in summaries]
+
 def serialize_trip_day(day) -> dict:
     """序列化 TripDay"""
     return {
@@ -301,25 +352,63 @@ def add_member(trip_id):
         traceback.print_exc()
         return jsonify({'error': 'Internal server error'}), 500
 
+def parse_trip_list_filters() -> dict:
+    """解析列表筛选参数：status / date_from / date_to（YYYY-MM-DD）/ destination"""
+    date_from = request.args.get('date_from')
+    date_to = request.args.get('date_to')
+    return {
+        'status': request.args.get('status') or None,
+        'date_from': date.fromisoformat(date_from) if date_from else None,
+        'date_to': date.fromisoformat(date_to) if date_to else None,
+        'destination': request.args.get('destination') or None
+    }
+
+def serialize_trip_page(result):
+    """序列化列表结果：游标分页时为 {"trips", "next_cursor"}，否则为列表"""
+    if isinstance(result, dict):
+        return {
+            'trips': serialize_trip_summaries(result['trips']),
+            'next_cursor': result['next_cursor']
+        }
+    return serialize_trip_summaries(result)
+
 @travel_bp.route('/users/<user_id>/trips', methods=['GET'])
 def list_user_trips(user_id):
-    """获取用户参与的旅行"""
-    status = request.args.get('status')
-    service = get_travel_service()
+    """获取用户参与的旅行
     
-    trips = service.list_user_trips(user_id, status)
-    return jsonify([serialize_trip(t) for t in trips])
+    传入 cursor 参数（可为空）即切换为游标分页，返回 {"trips", "next_cursor"}。
+    """
+    try:
+        filters = parse_trip_list_filters()
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        service = get_travel_service()
+        
+        result = service.list_user_trip_summaries(user_id, limit=limit, cursor=cursor, **filters)
+        return jsonify(serialize_trip_page(result))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @travel_bp.route('/trips/public', methods=['GET'])
 def list_public_trips():
-    """获取公开旅行"""
-    limit = int(request.args.get('limit', 20))
-    offset = int(request.args.get('offset', 0))
-    search_query = request.args.get('search') or request.args.get('q')
-    service = get_travel_service()
+    """获取公开旅行
     
-    trips = service.list_public_trips(limit, offset, search_query)
-    return jsonify([serialize_trip(t) for t in trips])
+    传入 cursor 参数（可为空）即切换为游标分页，返回 {"trips", "next_cursor"}。
+    """
+    try:
+        filters = parse_trip_list_filters()
+        limit = int(request.args.get('limit', 20))
+        offset = int(request.args.get('offset', 0))
+        cursor = request.args.get('cursor')
+        search_query = request.args.get('search') or request.args.get('q')
+        service = get_travel_service()
+        
+        result = service.list_public_trip_summaries(
+            limit, offset, search_query, cursor=cursor, **filters
+        )
+        return jsonify(serialize_trip_page(result))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @travel_bp.route('/trips/<trip_id>/members/<user_id>', methods=['DELETE'])
 def remove_member(trip_id, user_id):
@@ -0,0 +1,77 @@
+"""
+提交后处理的事件处理器基类
+
+领域事件在业务事务提交前发布，此时源数据对其他连接不可见，
+需要写库的派生处理（搜索索引、时间线分发等）不能在事件回调中直接执行。
+"""
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Hashable, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class AfterCommitHandler(ABC):
+    """提交后处理的事件处理器基类
+
+    事件回调只调用 _mark 记录待处理项；同一线程的业务会话提交后，
+    在 after_commit 回调中把累积的待处理项交给子类的 process，
+    子类使用 open_session() 打开的独立会话写库。
+    """
+
+    # 处理器自身会话的标记，避免其提交再次触发处理
+    _SESSION_FLAG = 'after_commit_handler'
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        """
+        Args:
+            session_factory: 创建处理用会话的工厂
+        """
+        self._session_factory = session_factory
+        self._local = threading.local()
+
+    @abstractmethod
+    def process(self, pending: Set[Hashable]) -> None:
+        """处理本线程累积的待处理项（由子类实现）"""
+        pass
+
+    def listen(self) -> None:
+        """挂接 Session 的 after_commit 事件"""
+        event.listen(Session, 'after_commit', self.after_commit)
+
+    def unlisten(self) -> None:
+        """取消 listen 的挂接"""
+        event.remove(Session, 'after_commit', self.after_commit)
+
+    def after_commit(self, session: Session) -> None:
+        """会话提交后的回调：处理本线程累积的待处理项"""
+        if session.info.get(self._SESSION_FLAG):
+            return
+        pending = self._take_pending()
+        if pending:
+            self.process(pending)
+
+    def open_session(self) -> Session:
+        """打开处理用会话，其提交不会再次触发 after_commit 处理"""
+        session = self._session_factory()
+        session.info[self._SESSION_FLAG] = True
+        return session
+
+    def close_session(self, session: Session) -> None:
+        """关闭 open_session 打开的会话"""
+        session.info.pop(self._SESSION_FLAG, None)
+        session.close()
+
+    def _mark(self, item: Hashable) -> None:
+        self._pending().add(item)
+
+    def _pending(self) -> Set[Hashable]:
+        if not hasattr(self._local, 'pending'):
+            self._local.pending = set()
+        return self._local.pending
+
+    def _take_pending(self) -> Set[Hashable]:
+        pending = self._pending()
+        self._local.pending = set()
+        return pending
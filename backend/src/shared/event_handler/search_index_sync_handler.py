@@ -0,0 +1,121 @@
+"""
+搜索索引同步事件处理器
+
+根据帖子/旅行的领域事件维护全文搜索索引（search_documents）。
+"""
+from typing import Callable, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from shared.database.core import SessionLocal
+from shared.event_bus import get_event_bus
+from shared.event_handler.after_commit_handler import AfterCommitHandler
+from shared.search.i_search_index import DOC_TYPE_POST, DOC_TYPE_TRIP
+from shared.search.search_index_factory import create_search_index
+from app_social.domain.domain_event.social_events import (
+    PostCreatedEvent, PostUpdatedEvent, PostDeletedEvent
+)
+from app_social.infrastructure.database.persistent_model.post_po import PostPO
+from app_travel.domain.domain_event.travel_events import (
+    TripCreatedEvent, TripUpdatedEvent, TripDeletedEvent
+)
+from app_travel.infrastructure.database.persistent_model.trip_po import TripPO
+
+
+class SearchIndexSyncHandler(AfterCommitHandler):
+    """搜索索引同步事件处理器
+
+    处理：
+    - 帖子创建/更新/删除
+    - 旅行创建/更新/删除
+
+    事件回调只记录待同步的文档；业务会话提交后，
+    再按源表当前状态刷新索引（存在则写入，不存在或已删除则移除）。
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        """
+        Args:
+            session_factory: 创建同步用会话的工厂
+        """
+        super().__init__(session_factory)
+
+    # ==================== 事件处理 ====================
+
+    def handle_post_changed(self, event) -> None:
+        """处理帖子创建/更新/删除事件"""
+        self._mark((DOC_TYPE_POST, event.post_id))
+
+    def handle_trip_changed(self, event) -> None:
+        """处理旅行创建/更新/删除事件"""
+        self._mark((DOC_TYPE_TRIP, event.trip_id))
+
+    def process(self, pending: Set[Tuple[str, str]]) -> None:
+        """业务会话提交后同步本线程累积的待同步文档"""
+        self.sync(pending)
+
+    # ==================== 同步 ====================
+
+    def sync(self, docs: Iterable[Tuple[str, str]]) -> None:
+        """按源表当前状态刷新索引中的文档
+
+        Args:
+            docs: (doc_type, doc_id) 列表
+        """
+        session = self.open_session()
+        try:
+            index = create_search_index(session)
+            if index is None:
+                return
+            for doc_type, doc_id in docs:
+                source = self._load_source(session, doc_type, doc_id)
+                if source:
+                    index.upsert(doc_type, doc_id, *source)
+                else:
+                    index.remove(doc_type, doc_id)
+            session.commit()
+        except Exception as e:
+            # 记录错误但不影响已提交的业务事务
+            session.rollback()
+            print(f"Failed to sync search index: {e}")
+        finally:
+            self.close_session(session)
+
+    @staticmethod
+    def _load_source(session: Session, doc_type: str, doc_id: str) -> Optional[Tuple[str, str]]:
+        """读取源实体的 (标题, 正文)，不存在或已删除返回 None"""
+        if doc_type == DOC_TYPE_POST:
+            stmt = select(PostPO.title, PostPO.text).where(
+                PostPO.id == doc_id, PostPO.is_deleted == False
+            )
+        elif doc_type == DOC_TYPE_TRIP:
+            stmt = select(TripPO.name, TripPO.description).where(TripPO.id == doc_id)
+        else:
+            return None
+        row = session.execute(stmt).first()
+        return (row[0], row[1] or '') if row else None
+
+
+def register_search_index_handlers(
+    session_factory: Callable[[], Session] = SessionLocal
+) -> SearchIndexSyncHandler:
+    """订阅帖子/旅行事件，并在会话提交后同步搜索索引"""
+    bus = get_event_bus()
+    handler = SearchIndexSyncHandler(session_factory)
+    for event_type in (PostCreatedEvent, PostUpdatedEvent, PostDeletedEvent):
+        bus.subscribe(event_type.__name__, handler.handle_post_changed)
+    for event_type in (TripCreatedEvent, TripUpdatedEvent, TripDeletedEvent):
+        bus.subscribe(event_type.__name__, handler.handle_trip_changed)
+    handler.listen()
+    return handler
+
+
+def unregister_search_index_handlers(handler: SearchIndexSyncHandler) -> None:
+    """取消 register_search_index_handlers 的订阅（主要用于测试）"""
+    bus = get_event_bus()
+    for event_type in (PostCreatedEvent, PostUpdatedEvent, PostDeletedEvent):
+        bus.unsubscribe(event_type.__name__, handler.handle_post_changed)
+    for event_type in (TripCreatedEvent, TripUpdatedEvent, TripDeletedEvent):
+        bus.unsubscribe(event_type.__name__, handler.handle_trip_changed)
+    handler.unlisten()
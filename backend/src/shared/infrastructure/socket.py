@@ -1,5 +1,60 @@
+import os
+from typing import Optional
+
 from flask_socketio import SocketIO
 
+from shared.infrastructure.socket_coalescer import EmitCoalescer
+from shared.infrastructure.socket_message_queue import create_client_manager
+
 # Initialize SocketIO
 # Shared instance to be used across modules
 socketio = SocketIO(cors_allowed_origins="*")
+
+# 跨进程推送使用的消息队列 URL（为空则只在本进程内推送）
+SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE", "")
+SOCKETIO_CHANNEL = os.getenv("SOCKETIO_CHANNEL", "flask-socketio")
+
+# 房间推送的合并窗口（毫秒，0 表示逐条推送）和单帧上限
+SOCKETIO_COALESCE_MS = float(os.getenv("SOCKETIO_COALESCE_MS", "5"))
+SOCKETIO_COALESCE_MAX_BATCH = int(os.getenv("SOCKETIO_COALESCE_MAX_BATCH", "100"))
+
+# 推送到会话房间的事件统一经过合并器，保证同一房间内的顺序
+emit_coalescer = EmitCoalescer(socketio, SOCKETIO_COALESCE_MS, SOCKETIO_COALESCE_MAX_BATCH)
+
+# init_socketio 最近一次挂载的消息队列 URL
+_mounted_message_queue = ""
+
+
+def uses_message_queue() -> bool:
+    """是否挂载了跨进程消息队列（即存在多个 worker 共同推送）"""
+    return bool(_mounted_message_queue)
+
+
+def init_socketio(app, message_queue: Optional[str] = None, channel: Optional[str] = None) -> SocketIO:
+    """初始化共享 SocketIO 实例，并按配置挂载跨进程消息队列
+
+    Args:
+        app: Flask 应用
+        message_queue: 消息队列 URL，默认读取 SOCKETIO_MESSAGE_QUEUE
+        channel: 频道名，默认读取 SOCKETIO_CHANNEL
+
+    Returns:
+        共享的 socketio 实例
+    """
+    global _mounted_message_queue
+    url = SOCKETIO_MESSAGE_QUEUE if message_queue is None else message_queue
+    channel = channel or SOCKETIO_CHANNEL
+    # init_app 会保留上一次的选项，这里总是显式覆盖 client_manager / message_queue，
+    # 避免沿用旧应用的管理器
+    if not url:
+        options = {"client_manager": None, "message_queue": None}
+    else:
+        manager = create_client_manager(url, channel=channel)
+        if manager is not None:
+            options = {"client_manager": manager, "message_queue": None}
+        else:
+            # Redis / AMQP / Kafka / ZeroMQ 由 Flask-SocketIO 创建对应管理器
+            options = {"message_queue": url, "channel": channel}
+    socketio.init_app(app, **options)
+    _mounted_message_queue = url
+    return socketio
@@ -0,0 +1,101 @@
+"""
+Socket 推送合并器
+
+群聊中的消息、已读回执、输入状态往往成批到达，逐条 emit 会产生大量帧。
+合并器按房间缓冲一个很短的时间窗口，窗口结束时把缓冲的事件合并为一帧：
+- 窗口内只有一个事件时按原事件名推送，客户端无需改动
+- 多个事件时推送 'batch'，数据为 [{"event": 事件名, "data": 数据}, ...]，顺序与 emit 顺序一致
+
+window_ms 为 0 时不做缓冲，直接推送。
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+BATCH_EVENT = 'batch'
+
+# 缓冲项：(事件名, 数据, 跳过的 sid)
+_Buffered = Tuple[str, Any, Optional[str]]
+
+
+class EmitCoalescer:
+    """按房间合并的 socket 推送器"""
+
+    def __init__(self, socketio, window_ms: float = 0, max_batch: int = 100):
+        """
+        Args:
+            socketio: Flask-SocketIO 实例（使用其 emit / start_background_task / sleep）
+            window_ms: 缓冲窗口（毫秒），0 表示不合并
+            max_batch: 单帧最多合并的事件数，达到后立即推送
+        """
+        self._socketio = socketio
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, List[_Buffered]] = {}
+
+    def configure(self, window_ms: Optional[float] = None, max_batch: Optional[int] = None) -> None:
+        """调整窗口和单帧上限（会先推送已缓冲的事件）"""
+        self.flush()
+        if window_ms is not None:
+            self.window_ms = window_ms
+        if max_batch is not None:
+            self.max_batch = max_batch
+
+    def emit(self, event: str, data: Any, room: str, skip_sid: Optional[str] = None) -> None:
+        """推送到房间（可能延迟到窗口结束）
+
+        Args:
+            event: 事件名
+            data: 事件数据
+            room: 房间
+            skip_sid: 不推送给该连接（通常是发起者自己）
+        """
+        if self.window_ms <= 0:
+            self._socketio.emit(event, data, room=room, skip_sid=skip_sid)
+            return
+
+        with self._lock:
+            buffer = self._buffers.get(room)
+            schedule = buffer is None
+            if schedule:
+                buffer = self._buffers[room] = []
+            buffer.append((event, data, skip_sid))
+            full = len(buffer) >= self.max_batch
+
+        if full:
+            self.flush_room(room)
+        elif schedule:
+            self._socketio.start_background_task(self._flush_later, room)
+
+    def _flush_later(self, room: str) -> None:
+        self._socketio.sleep(self.window_ms / 1000.0)
+        self.flush_room(room)
+
+    def flush(self) -> None:
+        """立即推送所有房间的缓冲事件"""
+        with self._lock:
+            rooms = list(self._buffers)
+        for room in rooms:
+            self.flush_room(room)
+
+    def flush_room(self, room: str) -> None:
+        """立即推送一个房间的缓冲事件"""
+        with self._lock:
+            buffer = self._buffers.pop(room, None)
+        if not buffer:
+            return
+        # 只有 skip_sid 相同的连续事件可以放进同一帧，逐段推送以保持顺序
+        start = 0
+        for end in range(1, len(buffer) + 1):
+            if end == len(buffer) or buffer[end][2] != buffer[start][2]:
+                self._emit_run(room, buffer[start:end])
+                start = end
+
+    def _emit_run(self, room: str, run: List[_Buffered]) -> None:
+        skip_sid = run[0][2]
+        if len(run) == 1:
+            event, data, _ = run[0]
+            self._socketio.emit(event, data, room=room, skip_sid=skip_sid)
+            return
+        frame = [{"event": event, "data": data} for event, data, _ in run]
+        self._socketio.emit(BATCH_EVENT, frame, room=room, skip_sid=skip_sid)
@@ -0,0 +1,157 @@
+"""
+Socket.IO 跨进程消息队列
+
+多个 worker 同时运行时，每个进程只持有连接到自己的客户端；
+socketio.emit 需要经由发布/订阅后端广播到所有进程，才能推送给连接在其他进程上的客户端。
+
+支持的 SOCKETIO_MESSAGE_QUEUE：
+- redis:// / rediss:// / amqp:// / kafka:// / zmq+tcp://：交给 python-socketio 自带的管理器
+- memory://<channel>：进程内队列，用于测试（同一进程内的多个 SocketIO 服务器互相广播）
+- file:///path/to/queue.log：追加写文件 + 轮询读取，用于单机多 worker 的开发环境，无需额外服务
+"""
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+import socketio
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+LOCAL_QUEUE_SCHEMES = ("memory://", "file://")
+
+
+class InMemoryPubSubManager(socketio.PubSubManager):
+    """进程内发布/订阅管理器
+
+    同一 channel 的所有管理器共享订阅者列表，
+    每个非只写的管理器拥有一个自己的接收队列。
+    """
+    name = 'memory'
+
+    _lock = threading.Lock()
+    _subscribers: Dict[str, List[queue.Queue]] = {}
+
+    def __init__(self, url: str = 'memory://', channel: str = 'socketio',
+                 write_only: bool = False, logger=None, json=None):
+        name = url[len('memory://'):]
+        super().__init__(channel=name or channel, write_only=write_only,
+                         logger=logger, json=json)
+        self._queue: Optional[queue.Queue] = None
+        if not write_only:
+            self._queue = queue.Queue()
+            with self._lock:
+                self._subscribers.setdefault(self.channel, []).append(self._queue)
+
+    def _publish(self, data):
+        # 序列化一次，保证与真实传输一样只传递 JSON 可表示的数据
+        message = self.json.dumps(data)
+        with self._lock:
+            subscribers = list(self._subscribers.get(self.channel, []))
+        for subscriber in subscribers:
+            subscriber.put(message)
+
+    def _listen(self):
+        while True:
+            try:
+                yield self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def close(self) -> None:
+        """取消订阅（主要用于测试）"""
+        with self._lock:
+            subscribers = self._subscribers.get(self.channel, [])
+            if self._queue in subscribers:
+                subscribers.remove(self._queue)
+
+    @classmethod
+    def reset(cls) -> None:
+        """清空所有 channel 的订阅者（主要用于测试）"""
+        with cls._lock:
+            cls._subscribers.clear()
+
+
+class FilePubSubManager(socketio.PubSubManager):
+    """基于追加写文件的发布/订阅管理器
+
+    每条消息以一行 JSON 追加到文件末尾（带文件锁），
+    订阅者从启动时的文件末尾开始轮询读取新行。
+    文件不会自动截断，仅适用于开发环境和测试。
+    """
+    name = 'file'
+
+    def __init__(self, url: str, channel: str = 'socketio',
+                 write_only: bool = False, logger=None, json=None,
+                 poll_interval: float = 0.05):
+        super().__init__(channel=channel, write_only=write_only,
+                         logger=logger, json=json)
+        self.path = url[len('file://'):]
+        self.poll_interval = poll_interval
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 'a' 模式保证文件存在；订阅者从当前末尾开始读取，不重放历史消息
+        with open(self.path, 'a'):
+            pass
+        self._offset = os.path.getsize(self.path)
+
+    def _publish(self, data):
+        line = self.json.dumps({'channel': self.channel, 'data': data}) + '\n'
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(line)
+                f.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_new_lines(self) -> List[str]:
+        """读取上次偏移之后的完整行"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        # 只消费完整的行，写了一半的行留到下一次读取
+        end = chunk.rfind('\n') + 1
+        self._offset += len(chunk[:end].encode('utf-8'))
+        return chunk[:end].splitlines()
+
+    def _listen(self):
+        while True:
+            lines = self._read_new_lines()
+            if not lines:
+                time.sleep(self.poll_interval)
+                continue
+            for line in lines:
+                try:
+                    envelope = json.loads(line)
+                except ValueError:
+                    continue
+                if envelope.get('channel') == self.channel:
+                    yield envelope.get('data')
+
+
+def create_client_manager(url: str, channel: str = 'socketio',
+                          write_only: bool = False) -> Optional[socketio.PubSubManager]:
+    """按 URL 创建本地实现的发布/订阅管理器
+
+    Args:
+        url: 消息队列 URL
+        channel: 频道名
+        write_only: 只写模式（外部进程只发送、不接收）
+
+    Returns:
+        memory:// 和 file:// 返回对应管理器；其他 URL 返回 None，交给 Flask-SocketIO 处理
+    """
+    if url.startswith('memory://'):
+        return InMemoryPubSubManager(url, channel=channel, write_only=write_only)
+    if url.startswith('file://'):
+        return FilePubSubManager(url, channel=channel, write_only=write_only)
+    return None
@@ -0,0 +1,99 @@
+"""
+游标分页（Keyset Pagination）工具
+
+游标对调用方是不透明字符串，内部编码排序键 (时间戳, ID)。
+按 (时间戳 DESC, ID DESC) 翻页时，下一页条件为严格小于游标位置，
+因此翻页期间的新插入不会导致重复或遗漏。
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+def encode_cursor(timestamp: datetime, entity_id: str) -> str:
+    """将排序键编码为不透明游标
+
+    Args:
+        timestamp: 排序时间戳
+        entity_id: 实体ID（时间戳相同时的决胜键）
+
+    Returns:
+        URL 安全的游标字符串
+    """
+    payload = json.dumps([timestamp.isoformat(), entity_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    """解码游标
+
+    Args:
+        cursor: 游标字符串，空字符串或 None 表示第一页
+
+    Returns:
+        (时间戳, 实体ID)，第一页返回 None
+
+    Raises:
+        ValueError: 游标格式非法
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp_str, entity_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(timestamp_str), str(entity_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """将偏移量编码为不透明游标
+
+    用于按相关度排序的结果（如全文检索），其排序键不适合 keyset 分页。
+    """
+    payload = json.dumps({"offset": offset}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_offset_cursor(cursor: Optional[str]) -> int:
+    """解码偏移量游标，空字符串或 None 表示第一页（偏移 0）
+
+    Raises:
+        ValueError: 游标格式非法
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))["offset"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
+
+
+def encode_score_cursor(score: float, entity_id: str) -> str:
+    """将 (分数, ID) 排序键编码为不透明游标
+
+    用于按数值分数（如热度分）降序的 keyset 分页。
+    """
+    payload = json.dumps({"score": score, "id": entity_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_score_cursor(cursor: Optional[str]) -> Optional[Tuple[float, str]]:
+    """解码分数游标，空字符串或 None 表示第一页
+
+    Raises:
+        ValueError: 游标格式非法
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return float(payload["score"]), str(payload["id"])
+    except Exception:
+        raise ValueError("Invalid cursor")
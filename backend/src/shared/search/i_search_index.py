@@ -0,0 +1,49 @@
+"""
+搜索索引接口
+
+可插拔的全文检索抽象：按数据库方言选择实现（见 search_index_factory）。
+"""
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from sqlalchemy.sql import Subquery
+
+
+DOC_TYPE_POST = 'post'
+DOC_TYPE_TRIP = 'trip'
+
+
+class ISearchIndex(ABC):
+    """搜索索引接口"""
+
+    @abstractmethod
+    def upsert(self, doc_type: str, doc_id: str, title: str, body: str) -> None:
+        """写入或更新一个文档
+
+        Args:
+            doc_type: 文档类型（post / trip）
+            doc_id: 源实体ID
+            title: 标题
+            body: 正文
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, doc_type: str, doc_id: str) -> None:
+        """从索引中移除文档"""
+        pass
+
+    @abstractmethod
+    def match(self, doc_type: str, query: str) -> Optional[Subquery]:
+        """构造命中文档的子查询
+
+        Args:
+            doc_type: 文档类型
+            query: 用户输入的查询串
+
+        Returns:
+            含 doc_id、score（越大越相关）两列的子查询，
+            供 DAO 与源表 JOIN 后按相关度排序；
+            索引无法处理该查询（如查询词过短）时返回 None，调用方应回退到 LIKE。
+        """
+        pass
@@ -0,0 +1,51 @@
+"""
+MySQL FULLTEXT 搜索索引实现
+
+search_documents 表上的 FULLTEXT(title, body) 索引使用 ngram 分词器，
+中文无需空格切词；相关度取 MATCH ... AGAINST 的自然语言模式得分。
+"""
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.mysql import insert, match
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Subquery
+
+from shared.search.i_search_index import ISearchIndex
+from shared.search.search_document_po import SearchDocumentPO
+
+
+class MySqlFulltextSearchIndex(ISearchIndex):
+    """基于 MySQL FULLTEXT (ngram) 的搜索索引"""
+
+    # 与 MySQL 默认 ngram_token_size 一致
+    MIN_TERM_LENGTH = 2
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def upsert(self, doc_type: str, doc_id: str, title: str, body: str) -> None:
+        stmt = insert(SearchDocumentPO).values(
+            doc_type=doc_type, doc_id=doc_id, title=title or '', body=body or ''
+        )
+        stmt = stmt.on_duplicate_key_update(title=stmt.inserted.title, body=stmt.inserted.body)
+        self.session.execute(stmt)
+
+    def remove(self, doc_type: str, doc_id: str) -> None:
+        stmt = delete(SearchDocumentPO).where(
+            SearchDocumentPO.doc_type == doc_type,
+            SearchDocumentPO.doc_id == doc_id
+        )
+        self.session.execute(stmt)
+
+    def match(self, doc_type: str, query: str) -> Optional[Subquery]:
+        query = (query or '').strip()
+        if len(query) < self.MIN_TERM_LENGTH:
+            return None
+
+        score = match(SearchDocumentPO.title, SearchDocumentPO.body, against=query).in_natural_language_mode()
+        stmt = (
+            select(SearchDocumentPO.doc_id.label('doc_id'), score.label('score'))
+            .where(SearchDocumentPO.doc_type == doc_type, score > 0)
+        )
+        return stmt.subquery('search_hits')
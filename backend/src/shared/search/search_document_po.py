@@ -0,0 +1,64 @@
+"""
+搜索文档持久化对象
+
+帖子、旅行等可搜索实体的标题/正文副本，由搜索索引同步处理器维护。
+- SQLite：另建 FTS5 外部内容表 search_documents_fts，通过触发器与本表同步
+- MySQL：本表上建 FULLTEXT 索引（ngram 分词器，支持中文）
+"""
+from datetime import datetime
+
+from sqlalchemy import DDL, Column, DateTime, Index, Integer, String, Text, UniqueConstraint, event
+from shared.database.core import Base
+
+
+class SearchDocumentPO(Base):
+    """搜索文档持久化对象"""
+
+    __tablename__ = 'search_documents'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    doc_type = Column(String(20), nullable=False)   # post / trip
+    doc_id = Column(String(36), nullable=False)
+    title = Column(String(200), nullable=False, default='')
+    body = Column(Text, nullable=False, default='')
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('doc_type', 'doc_id', name='uq_search_documents_doc'),
+        Index(
+            'ft_search_documents', 'title', 'body',
+            mysql_prefix='FULLTEXT', mysql_with_parser='ngram'
+        ).ddl_if(dialect='mysql'),
+    )
+
+    def __repr__(self) -> str:
+        return f"SearchDocumentPO(doc_type={self.doc_type}, doc_id={self.doc_id})"
+
+
+# ==================== SQLite FTS5 ====================
+# trigram 分词器不依赖空格切词，中文与英文子串都能命中（查询词至少 3 个字符）
+
+FTS_TABLE = 'search_documents_fts'
+
+_SQLITE_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, body, content='search_documents', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+)
+
+for _statement in _SQLITE_FTS_DDL:
+    event.listen(
+        SearchDocumentPO.__table__, 'after_create',
+        DDL(_statement).execute_if(dialect='sqlite')
+    )
+
+event.listen(
+    SearchDocumentPO.__table__, 'before_drop',
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect='sqlite')
+)
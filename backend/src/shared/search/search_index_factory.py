@@ -0,0 +1,35 @@
+"""
+搜索索引工厂
+
+按会话绑定的数据库方言选择搜索索引实现；
+其他数据库可通过 register_search_index 接入自己的实现。
+"""
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from shared.search.i_search_index import ISearchIndex
+from shared.search.sqlite_fts_search_index import SqliteFtsSearchIndex
+from shared.search.mysql_fulltext_search_index import MySqlFulltextSearchIndex
+
+
+_registry: Dict[str, Callable[[Session], ISearchIndex]] = {
+    'sqlite': SqliteFtsSearchIndex,
+    'mysql': MySqlFulltextSearchIndex,
+}
+
+
+def register_search_index(dialect_name: str, factory: Callable[[Session], ISearchIndex]) -> None:
+    """注册某数据库方言的搜索索引实现
+
+    Args:
+        dialect_name: SQLAlchemy 方言名（如 'postgresql'）
+        factory: 接收 Session、返回 ISearchIndex 的可调用对象
+    """
+    _registry[dialect_name] = factory
+
+
+def create_search_index(session: Session) -> Optional[ISearchIndex]:
+    """为会话创建搜索索引，当前方言没有实现时返回 None（调用方回退到 LIKE）"""
+    factory = _registry.get(session.get_bind().dialect.name)
+    return factory(session) if factory else None
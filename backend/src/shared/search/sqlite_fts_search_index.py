@@ -0,0 +1,59 @@
+"""
+SQLite FTS5 搜索索引实现
+
+search_documents 为内容表，search_documents_fts 为 FTS5 外部内容表（trigram 分词），
+两者通过触发器同步；相关度使用 bm25，标题权重高于正文。
+"""
+from typing import Optional
+
+from sqlalchemy import Float, String, delete, text
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Subquery
+
+from shared.search.i_search_index import ISearchIndex
+from shared.search.search_document_po import FTS_TABLE, SearchDocumentPO
+
+
+class SqliteFtsSearchIndex(ISearchIndex):
+    """基于 SQLite FTS5 的搜索索引"""
+
+    # trigram 分词器要求每个查询词至少 3 个字符
+    MIN_TERM_LENGTH = 3
+    TITLE_WEIGHT = 10.0
+    BODY_WEIGHT = 1.0
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def upsert(self, doc_type: str, doc_id: str, title: str, body: str) -> None:
+        stmt = insert(SearchDocumentPO).values(
+            doc_type=doc_type, doc_id=doc_id, title=title or '', body=body or ''
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['doc_type', 'doc_id'],
+            set_={'title': stmt.excluded.title, 'body': stmt.excluded.body}
+        )
+        self.session.execute(stmt)
+
+    def remove(self, doc_type: str, doc_id: str) -> None:
+        stmt = delete(SearchDocumentPO).where(
+            SearchDocumentPO.doc_type == doc_type,
+            SearchDocumentPO.doc_id == doc_id
+        )
+        self.session.execute(stmt)
+
+    def match(self, doc_type: str, query: str) -> Optional[Subquery]:
+        terms = (query or '').split()
+        if not terms or any(len(t) < self.MIN_TERM_LENGTH for t in terms):
+            return None
+
+        # 每个词作为短语加引号，词间隐式 AND；转义双引号避免 FTS5 语法错误
+        fts_query = ' '.join('"' + t.replace('"', '""') + '"' for t in terms)
+        stmt = text(
+            f"SELECT d.doc_id AS doc_id, "
+            f"-bm25({FTS_TABLE}, {self.TITLE_WEIGHT}, {self.BODY_WEIGHT}) AS score "
+            f"FROM {FTS_TABLE} JOIN search_documents d ON d.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :search_query AND d.doc_type = :search_doc_type"
+        ).bindparams(search_query=fts_query, search_doc_type=doc_type)
+        return stmt.columns(doc_id=String, score=Float).subquery('search_hits')
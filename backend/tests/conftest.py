@@ -14,8 +14,10 @@ from app_auth.infrastructure.database.persistent_model.user_po import UserPO
 from app_social.infrastructure.database.persistent_model.post_po import PostPO, CommentPO, LikePO
 from app_social.infrastructure.database.persistent_model.conversation_po import ConversationPO
 from app_social.infrastructure.database.persistent_model.message_po import MessagePO
+from app_social.infrastructure.database.persistent_model.timeline_po import TimelineEntryPO
 from app_social.infrastructure.database.po.friendship_po import FriendshipPO
 from app_travel.infrastructure.database.persistent_model.trip_po import TripPO, TripMemberPO, TripDayPO, ActivityPO
+from shared.search.search_document_po import SearchDocumentPO
 
 @pytest.fixture(scope="session")
 def engine():
@@ -44,3 +46,33 @@ def db_session(engine, tables):
     # roll back the broader transaction
     transaction.rollback()
     connection.close()
+
+@pytest.fixture
+def search_index_sync(db_session):
+    """注册搜索索引同步处理器，同步会话与 db_session 共用同一连接"""
+    from shared.event_handler.search_index_sync_handler import (
+        register_search_index_handlers, unregister_search_index_handlers
+    )
+    handler = register_search_index_handlers(sessionmaker(bind=db_session.get_bind()))
+    yield handler
+    unregister_search_index_handlers(handler)
+
+@pytest.fixture
+def timeline_fanout(db_session):
+    """注册时间线写扩散处理器，分发会话与 db_session 共用同一连接"""
+    from app_social.domain.event_handler.timeline_fanout_handler import (
+        register_timeline_handlers, unregister_timeline_handlers
+    )
+    handler = register_timeline_handlers(sessionmaker(bind=db_session.get_bind()))
+    yield handler
+    unregister_timeline_handlers(handler)
+
+@pytest.fixture
+def hot_score_sync(db_session):
+    """注册热度分更新处理器，更新会话与 db_session 共用同一连接"""
+    from app_social.domain.event_handler.hot_score_handler import (
+        register_hot_score_handlers, unregister_hot_score_handlers
+    )
+    handler = register_hot_score_handlers(sessionmaker(bind=db_session.get_bind()))
+    yield handler
+    unregister_hot_score_handlers(handler)
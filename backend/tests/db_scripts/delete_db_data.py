@@ -46,9 +46,8 @@ def delete_data():
             # The DAO's delete method deletes the conversation
             # Participants are in a separate table. If mapped via relationship/secondary, SQLAlchemy handles it.
             # If manual table, we might need to clean up.
-            # SqlAlchemyConversationDao.update_participants does delete/insert.
             # Let's try to clear participants first.
-            conv_dao.update_participants(CONV_ID, [])
+            conv_dao.remove_participants(CONV_ID, [USER1_ID, USER2_ID])
             
             conv_dao.delete(CONV_ID)
             print(f"Deleted Conversation: {CONV_ID}")
@@ -137,7 +137,10 @@ def init_data():
             )
             conv_dao.add(conv)
             # Add participants
-            conv_dao.update_participants(CONV_ID, [USER1_ID, USER2_ID])
+            conv_dao.add_participants(CONV_ID, [
+                {"user_id": USER1_ID, "role": "member"},
+                {"user_id": USER2_ID, "role": "member"}
+            ])
             print(f"Added Conversation: {CONV_ID}")
             
             # Message
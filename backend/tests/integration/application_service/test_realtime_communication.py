@@ -1,5 +1,6 @@
 import pytest
 import time
+from unittest.mock import patch
 from flask_socketio import SocketIOTestClient
 from app import create_app
 from shared.infrastructure.socket import socketio
@@ -16,6 +17,15 @@ from app_social.domain.aggregate.conversation_aggregate import Conversation
 from shared.event_bus import get_event_bus
 from app_social.domain.domain_event.social_events import MessageSentEvent
 
+@pytest.fixture(autouse=True)
+def immediate_emits():
+    """Emit without the coalescing window so tests can read events right away"""
+    from shared.infrastructure.socket import emit_coalescer
+    window_ms = emit_coalescer.window_ms
+    emit_coalescer.configure(window_ms=0)
+    yield emit_coalescer
+    emit_coalescer.configure(window_ms=window_ms)
+
 @pytest.fixture
 def app():
     app = create_app()
@@ -143,3 +153,330 @@ def test_realtime_message_push(app, client, social_service):
     
     assert len(message_events_after) == 0, "Client received message after leaving the room"
 
+
+
+def test_memory_message_queue_fans_out_between_workers(app):
+    """
+    init_socketio mounts the configured queue, and packets emitted by
+    another worker reach this worker's listener.
+    (The Flask-SocketIO test client refuses to run with a queue, so the
+    listener is read directly.)
+    """
+    from shared.infrastructure.socket import init_socketio
+    from shared.infrastructure.socket_message_queue import InMemoryPubSubManager
+
+    init_socketio(app, message_queue="memory://test-fanout")
+    try:
+        manager = socketio.server.manager
+        assert isinstance(manager, InMemoryPubSubManager)
+
+        # Simulates a second worker that only emits
+        other_worker = InMemoryPubSubManager("memory://test-fanout", write_only=True)
+        other_worker.emit('new_message', {'id': 'm1'}, room='conv_fanout')
+
+        message = manager.json.loads(next(manager._listen()))
+        assert message['method'] == 'emit'
+        assert message['event'] == 'new_message'
+        assert message['room'] == 'conv_fanout'
+        assert message['data'] == [{'id': 'm1'}]
+        assert message['host_id'] == other_worker.host_id
+    finally:
+        manager.close()
+        init_socketio(app, message_queue="")
+    assert not isinstance(socketio.server.manager, InMemoryPubSubManager)
+
+
+def test_file_message_queue_delivers_between_managers(tmp_path):
+    """The file backend forwards published packets to other managers on the same file"""
+    from shared.infrastructure.socket_message_queue import FilePubSubManager
+
+    url = f"file://{tmp_path / 'socketio.log'}"
+    receiver = FilePubSubManager(url, channel="chat")
+    other_channel = FilePubSubManager(url, channel="other", write_only=True)
+    publisher = FilePubSubManager(url, channel="chat", write_only=True)
+
+    other_channel._publish({'method': 'emit', 'event': 'ignored'})
+    publisher._publish({'method': 'emit', 'event': 'new_message', 'room': 'r1'})
+
+    message = next(receiver._listen())
+    assert message == {'method': 'emit', 'event': 'new_message', 'room': 'r1'}
+
+
+def _create_private_conversation(user1_id, user2_id):
+    session = SessionLocal()
+    try:
+        conv = Conversation.create_private(user1_id, user2_id)
+        conv_repo = ConversationRepositoryImpl(
+            SqlAlchemyConversationDao(session), SqlAlchemyMessageDao(session)
+        )
+        conv_repo.save(conv)
+        session.commit()
+        return conv.id.value
+    finally:
+        session.close()
+
+
+def _connect(app, user_id):
+    flask_client = app.test_client()
+    with flask_client.session_transaction() as sess:
+        sess['user_id'] = user_id
+    return socketio.test_client(app, flask_test_client=flask_client)
+
+
+def test_send_message_over_socket_acks_and_pushes(app):
+    """send_message acks with id/sent_at and the room receives 'new_message'"""
+    conv_id = _create_private_conversation("socket_sender", "socket_receiver")
+    sender = _connect(app, "socket_sender")
+    receiver = _connect(app, "socket_receiver")
+    receiver.emit('join', {'room': conv_id})
+    receiver.get_received()
+
+    ack = sender.emit('send_message', {
+        'conversation_id': conv_id, 'content': 'over the socket', 'client_id': 'tmp-1'
+    }, callback=True)
+
+    assert ack['id'] and ack['sent_at']
+    assert ack['client_id'] == 'tmp-1'
+    pushed = [e for e in receiver.get_received() if e['name'] == 'new_message']
+    assert [e['args'][0]['id'] for e in pushed] == [ack['id']]
+    assert pushed[0]['args'][0]['content'] == 'over the socket'
+
+    # Errors come back in the ack instead of raising
+    assert sender.emit('send_message', {'conversation_id': 'missing', 'content': 'x'},
+                       callback=True) == {'error': 'Conversation not found'}
+    assert 'error' in sender.emit('send_message', {'conversation_id': conv_id, 'type': 'image'},
+                                  callback=True)
+
+    anonymous = socketio.test_client(app, flask_test_client=app.test_client())
+    assert anonymous.emit('send_message', {'conversation_id': conv_id, 'content': 'x'},
+                          callback=True) == {'error': 'Unauthorized'}
+
+
+def test_typing_is_throttled_and_read_is_batched(app):
+    """typing bursts collapse into one broadcast; read advances several cursors at once"""
+    conv_a = _create_private_conversation("typing_user", "typing_peer")
+    conv_b = _create_private_conversation("typing_user", "typing_peer_2")
+    user = _connect(app, "typing_user")
+    peer = _connect(app, "typing_peer")
+    for client_, room in ((user, conv_a), (user, conv_b), (peer, conv_a)):
+        client_.emit('join', {'room': room})
+    peer.get_received()
+
+    for _ in range(5):
+        user.emit('typing', {'conversation_id': conv_a, 'is_typing': True})
+    user.emit('typing', [{'conversation_id': conv_a, 'is_typing': False}])
+
+    typing = [e['args'][0] for e in peer.get_received() if e['name'] == 'typing']
+    assert [t['is_typing'] for t in typing] == [True, False]
+    assert all(t['user_id'] == 'typing_user' for t in typing)
+    assert not [e for e in user.get_received() if e['name'] == 'typing']
+
+    peer_ack = peer.emit('send_message', {'conversation_id': conv_a, 'content': 'a'}, callback=True)
+    service = SocialService()
+    service.send_message(conv_b, "typing_peer_2", "b")
+    user.get_received()
+    peer.get_received()
+
+    results = user.emit('read', [
+        {'conversation_id': conv_a, 'message_id': peer_ack['id']},
+        {'conversation_id': conv_b},
+        {'conversation_id': 'missing'}
+    ], callback=True)
+
+    assert [r['conversation_id'] for r in results] == [conv_a, conv_b]
+    assert results[0]['message_id'] == peer_ack['id']
+    read_events = [e['args'][0] for e in peer.get_received() if e['name'] == 'read']
+    assert read_events == [{**results[0], 'user_id': 'typing_user'}]
+
+    # Reading again does not move the cursor
+    assert user.emit('read', {'conversation_id': conv_b}, callback=True) == []
+
+
+@pytest.fixture
+def presence_store():
+    from app_social.infrastructure.presence.in_memory_presence_store import InMemoryPresenceStore
+    from app_social.infrastructure.presence.presence_registry import set_presence_store
+
+    store = InMemoryPresenceStore()
+    set_presence_store(store)
+    yield store
+    set_presence_store(None)
+
+
+def test_offline_recipients_get_queued_notifications(app, presence_store):
+    """
+    Pushes are skipped when nobody in the conversation is connected;
+    offline recipients receive the queued notifications on connect.
+    """
+    conv_id = _create_private_conversation("presence_sender", "presence_receiver")
+    service = SocialService()
+
+    with patch.object(socketio, 'emit') as socket_emit:
+        sent = service.send_message(conv_id, "presence_sender", "while you were away")
+    socket_emit.assert_not_called()
+
+    sender = _connect(app, "presence_sender")
+    sender.emit('join', {'room': conv_id})
+    assert presence_store.get_many(["presence_sender"])["presence_sender"].connections == 1
+
+    # The sender is live, so the room is pushed to; the receiver is still queued
+    second = service.send_message(conv_id, "presence_sender", "second")
+    assert [e['args'][0]['id'] for e in sender.get_received() if e['name'] == 'new_message'] == [second['message_id']]
+
+    receiver = _connect(app, "presence_receiver")
+    queued = [e['args'][0] for e in receiver.get_received() if e['name'] == 'offline_notifications']
+    assert [[n['message_id'] for n in batch] for batch in queued] == [[sent['message_id'], second['message_id']]]
+    assert presence_store.pop_offline("presence_receiver") == []
+
+    receiver.disconnect()
+    presence = presence_store.get_many(["presence_receiver"])["presence_receiver"]
+    assert not presence.is_online and presence.last_seen is not None
+
+
+def test_per_process_presence_is_not_trusted_with_a_message_queue(app, presence_store):
+    """
+    With a message queue, users may be connected to other workers that the
+    in-memory store cannot see: the room is always pushed and nobody is
+    queued as offline.
+    """
+    conv_id = _create_private_conversation("mq_sender", "mq_receiver")
+
+    with patch('app_social.infrastructure.socket.handlers.uses_message_queue', return_value=True), \
+            patch.object(socketio, 'emit') as socket_emit:
+        sent = SocialService().send_message(conv_id, "mq_sender", "hello from another worker")
+
+    socket_emit.assert_called_once()
+    assert socket_emit.call_args.args[1]['id'] == sent['message_id']
+    assert presence_store.pop_offline("mq_receiver") == []
+
+
+def test_messages_are_pushed_only_after_commit(app, presence_store):
+    """Offline notifications and room pushes wait for the business transaction to commit"""
+    presence_store.connect("commit_receiver", "sid-1")
+    event = MessageSentEvent(
+        conversation_id="conv_commit", message_id="m-commit",
+        sender_id="commit_sender", recipient_ids=("commit_receiver", "commit_offline")
+    )
+
+    session = SessionLocal()
+    try:
+        with patch.object(socketio, 'emit') as socket_emit:
+            get_event_bus().publish(event)
+            socket_emit.assert_not_called()
+            assert presence_store.pop_offline("commit_offline") == []
+
+            session.commit()
+            socket_emit.assert_called_once()
+    finally:
+        session.close()
+    assert [n['message_id'] for n in presence_store.pop_offline("commit_offline")] == ["m-commit"]
+    assert presence_store.pop_offline("commit_receiver") == []
+
+
+def test_failed_offline_queue_write_does_not_block_the_room_push(app, presence_store):
+    presence_store.connect("queue_sender", "sid-1")
+    event = MessageSentEvent(
+        conversation_id="conv_queue", message_id="m-queue",
+        sender_id="queue_sender", recipient_ids=("queue_offline",)
+    )
+
+    session = SessionLocal()
+    try:
+        with patch.object(presence_store, 'push_offline', side_effect=RuntimeError("db down")), \
+                patch.object(socketio, 'emit') as socket_emit:
+            get_event_bus().publish(event)
+            session.commit()
+    finally:
+        session.close()
+
+    socket_emit.assert_called_once()
+    assert socket_emit.call_args.args[1]['id'] == "m-queue"
+
+
+def test_presence_endpoint(app, client, presence_store):
+    presence_store.connect("online_user", "sid-1")
+    presence_store.connect("online_user", "sid-2")
+
+    response = client.get('/api/social/presence?ids=online_user,offline_user',
+                          headers={'X-User-Id': 'viewer'})
+
+    assert response.status_code == 200
+    presence = response.get_json()['presence']
+    assert presence['online_user']['online'] is True
+    assert presence['online_user']['connections'] == 2
+    assert presence['offline_user'] == {'online': False, 'connections': 0, 'last_seen': None}
+
+    assert client.get('/api/social/presence?ids=a').status_code == 400
+
+
+def _wait_for(client_, name, timeout=1.0):
+    events = []
+    deadline = time.time() + timeout
+    while time.time() < deadline and not events:
+        events = [e for e in client_.get_received() if e['name'] == name]
+        time.sleep(0.01)
+    return events
+
+
+def test_bursts_are_coalesced_into_one_ordered_frame(app, immediate_emits):
+    """Events for one room inside the window arrive as a single 'batch' frame, in order"""
+    conv_id = _create_private_conversation("burst_sender", "burst_receiver")
+    receiver = _connect(app, "burst_receiver")
+    receiver.emit('join', {'room': conv_id})
+    receiver.get_received()
+
+    # A long window; the test flushes explicitly instead of waiting for the timer
+    immediate_emits.configure(window_ms=60000)
+    service = SocialService()
+    sent = [service.send_message(conv_id, "burst_sender", f"msg {i}")['message_id'] for i in range(3)]
+    assert receiver.get_received() == []
+    immediate_emits.flush()
+
+    received = receiver.get_received()
+    batches = [e for e in received if e['name'] == 'batch']
+    assert len(batches) == 1
+    frame = batches[0]['args'][0]
+    assert [item['event'] for item in frame] == ['new_message'] * 3
+    assert [item['data']['id'] for item in frame] == sent
+    assert not [e for e in received if e['name'] == 'new_message']
+
+    # A lone event in the window keeps its own event name, and the timer flushes it
+    immediate_emits.configure(window_ms=10)
+    single = service.send_message(conv_id, "burst_sender", "alone")['message_id']
+    assert [e['args'][0]['id'] for e in _wait_for(receiver, 'new_message')] == [single]
+
+
+def test_coalescer_splits_runs_and_caps_batch_size():
+    """Runs with different skip_sid are emitted separately in order; max_batch flushes early"""
+    from shared.infrastructure.socket_coalescer import EmitCoalescer
+
+    class FakeSocketIO:
+        def __init__(self):
+            self.emitted = []
+            self.tasks = []
+
+        def emit(self, event, data, room=None, skip_sid=None):
+            self.emitted.append((event, data, room, skip_sid))
+
+        def start_background_task(self, target, *args):
+            self.tasks.append((target, args))
+
+        def sleep(self, seconds):
+            pass
+
+    fake = FakeSocketIO()
+    coalescer = EmitCoalescer(fake, window_ms=10, max_batch=3)
+    coalescer.emit('new_message', 1, room='r1')
+    coalescer.emit('typing', 2, room='r1', skip_sid='sid-a')
+    coalescer.emit('typing', 3, room='r1', skip_sid='sid-a')
+    assert fake.emitted == [
+        ('new_message', 1, 'r1', None),
+        ('batch', [{'event': 'typing', 'data': 2}, {'event': 'typing', 'data': 3}], 'r1', 'sid-a')
+    ]
+
+    fake.emitted.clear()
+    coalescer.emit('new_message', 4, room='r2')
+    assert fake.emitted == []
+    for target, args in fake.tasks:
+        target(*args)
+    assert fake.emitted == [('new_message', 4, 'r2', None)]
@@ -22,7 +22,7 @@ class TestSearchIntegration:
         geo_service = GaodeGeoServiceImpl() 
         return TravelService(trip_repository=trip_repo, geo_service=geo_service)
 
-    def test_trip_search(self, travel_service, db_session):
+    def test_trip_search(self, travel_service, db_session, search_index_sync):
         """Test Trip Search Functionality"""
         creator_id = f"user_{uuid.uuid4()}"
         
@@ -70,8 +70,29 @@ class TestSearchIntegration:
         # Ensure trip3 is NOT in results
         found_ids = [t.id.value for t in results]
         assert trip3.id.value not in found_ids
-        
-    def test_post_search(self, db_session):
+
+    def test_deleted_trip_is_removed_from_index(self, travel_service, db_session, search_index_sync):
+        from shared.search.search_document_po import SearchDocumentPO
+
+        trip = travel_service.create_trip(
+            name="Lisbon Tram Tour",
+            description="Yellow trams",
+            creator_id=f"user_{uuid.uuid4()}",
+            start_date=date.today(),
+            end_date=date.today(),
+            visibility="public"
+        )
+        db_session.commit()
+        indexed = db_session.query(SearchDocumentPO).filter_by(doc_type="trip", doc_id=trip.id.value)
+        assert indexed.count() == 1
+
+        assert travel_service.delete_trip(trip.id.value) is True
+        db_session.commit()
+
+        assert indexed.count() == 0
+        assert travel_service.list_public_trips(search_query="Lisbon") == []
+
+    def test_post_search(self, db_session, search_index_sync):
         """Test Post Search Functionality"""
         service = SocialService()
         
@@ -105,3 +126,28 @@ class TestSearchIntegration:
              results = service.get_public_feed(search_query="Secret")
              # Ensure Private Diary is NOT in results
              assert not any(p['title'] == "Private Diary" for p in results)
+
+    def test_post_search_ranked_and_synced(self, db_session, search_index_sync):
+        """全文检索按相关度排序，并随帖子更新/删除同步"""
+        service = SocialService()
+        session_proxy = MagicMock(wraps=db_session)
+        session_proxy.close = MagicMock()
+
+        with patch('app_social.services.social_service.SessionLocal', return_value=session_proxy):
+            author_id = f"author_{uuid.uuid4()}"
+            body_hit = service.create_post(author_id, "周末随笔", "顺路去看了兵马俑博物馆")["post_id"]
+            title_hit = service.create_post(author_id, "兵马俑一日游攻略", "西安行程")["post_id"]
+            service.create_post(author_id, "成都火锅", "麻辣鲜香")
+
+            results = service.get_public_feed(search_query="兵马俑")
+            assert [p["id"] for p in results] == [title_hit, body_hit]
+
+            page = service.get_public_feed(limit=1, search_query="兵马俑", cursor="")
+            assert [p["id"] for p in page["posts"]] == [title_hit]
+            page = service.get_public_feed(limit=1, search_query="兵马俑", cursor=page["next_cursor"])
+            assert [p["id"] for p in page["posts"]] == [body_hit]
+
+            service.update_post(title_hit, author_id, title="西安一日游攻略", content="城墙")
+            service.delete_post(body_hit, author_id)
+            assert service.get_public_feed(search_query="兵马俑") == []
+            assert [p["id"] for p in service.get_public_feed(search_query="西安一日游")] == [title_hit]
@@ -139,6 +139,18 @@ class TestSocialServiceIntegration:
         assert dto["like_count"] == 0
         assert dto["is_liked"] is False
 
+    def test_like_updates_feed_counters(self, social_service):
+        author_id = str(uuid.uuid4())
+        post_id = social_service.create_post(author_id, "Counter", "...")["post_id"]
+        social_service.like_post(post_id, str(uuid.uuid4()))
+        social_service.like_post(post_id, author_id)
+        social_service.add_comment(post_id, author_id, "first")
+        
+        card = next(p for p in social_service.get_user_posts(author_id, viewer_id=author_id) if p["id"] == post_id)
+        assert card["like_count"] == 2
+        assert card["comment_count"] == 1
+        assert card["is_liked"] is True
+
     def test_comment_post(self, social_service):
         author_id = str(uuid.uuid4())
         commenter_id = str(uuid.uuid4())
@@ -172,6 +184,133 @@ class TestSocialServiceIntegration:
         assert "P3" in titles_a
         assert "P2" not in titles_a
 
+    def test_public_feed_hot(self, social_service, hot_score_sync):
+        u1 = str(uuid.uuid4())
+        quiet = social_service.create_post(u1, "Quiet", "...")["post_id"]
+        liked = social_service.create_post(u1, "Liked", "...")["post_id"]
+        discussed = social_service.create_post(u1, "Discussed", "...")["post_id"]
+        social_service.create_post(u1, "Newest", "...")
+
+        for _ in range(3):
+            social_service.like_post(liked, str(uuid.uuid4()))
+        for i in range(3):
+            social_service.add_comment(discussed, str(uuid.uuid4()), f"c{i}")
+
+        page1 = social_service.get_public_feed(limit=2, cursor="", sort="hot")
+        assert [p["title"] for p in page1["posts"]] == ["Discussed", "Liked"]
+        page2 = social_service.get_public_feed(limit=2, cursor=page1["next_cursor"], sort="hot")
+        assert [p["title"] for p in page2["posts"]] == ["Newest", "Quiet"]
+        assert quiet in [p["id"] for p in page2["posts"]]
+
+        with pytest.raises(ValueError):
+            social_service.get_public_feed(sort="random")
+
+    def test_popular_tags(self, social_service):
+        u1 = str(uuid.uuid4())
+        social_service.create_post(u1, "T1", "...", tags=["pop-a", "pop-b"])
+        social_service.create_post(u1, "T2", "...", tags=["pop-a"])
+        post_id = social_service.create_post(u1, "T3", "...", tags=["pop-b", "pop-c"])["post_id"]
+        social_service.update_post(post_id, u1, tags=["pop-a"])
+        social_service.delete_post(social_service.create_post(u1, "T4", "...", tags=["pop-b"])["post_id"], u1)
+
+        social_service.create_post(u1, "T5", "...", tags=["pop-secret"], visibility="private")
+        social_service.create_post(u1, "T6", "...", tags=["pop-secret", "pop-a"], visibility="friends")
+
+        counts = {t["name"]: t["post_count"] for t in social_service.get_popular_tags(limit=50)}
+        assert counts["pop-a"] == 3
+        assert counts["pop-b"] == 1
+        assert "pop-c" not in counts
+        # tags used only on private / friends-only posts are not shown anonymously
+        assert "pop-secret" not in counts
+
+        feed = social_service.get_public_feed(tags=["pop-a"])
+        assert sorted(p["title"] for p in feed) == ["T1", "T2", "T3"]
+
+    def test_popular_tags_follow_visibility_changes(self, social_service, db_session):
+        from app_social.domain.value_objects.social_value_objects import PostId, PostVisibility
+        from app_social.infrastructure.database.dao_impl.sqlalchemy_post_dao import SqlAlchemyPostDao
+        from app_social.infrastructure.database.repository_impl.post_repository_impl import PostRepositoryImpl
+
+        u1 = str(uuid.uuid4())
+        post_id = social_service.create_post(u1, "V1", "...", tags=["vis-tag"])["post_id"]
+        repo = PostRepositoryImpl(SqlAlchemyPostDao(db_session))
+
+        def _count():
+            counts = {t["name"]: t["post_count"] for t in social_service.get_popular_tags(limit=50)}
+            return counts.get("vis-tag", 0)
+
+        assert _count() == 1
+        for visibility, expected in ((PostVisibility.PRIVATE, 0), (PostVisibility.FRIENDS, 0), (PostVisibility.PUBLIC, 1)):
+            post = repo.find_header_by_id(PostId(post_id))
+            post.change_visibility(visibility)
+            repo.save(post)
+            db_session.commit()
+            assert _count() == expected
+
+    def _befriend(self, db_session, *pairs):
+        from app_social.infrastructure.database.po.friendship_po import FriendshipPO
+        from app_social.domain.value_objects.friendship_value_objects import FriendshipStatus
+        for a, b in pairs:
+            db_session.add(FriendshipPO(id=str(uuid.uuid4()), requester_id=a, addressee_id=b, status=FriendshipStatus.ACCEPTED))
+        db_session.commit()
+
+    def test_timeline_fan_out_on_write(self, social_service, db_session, timeline_fanout):
+        me, friend, stranger = (str(uuid.uuid4()) for _ in range(3))
+        self._befriend(db_session, (me, friend))
+
+        social_service.create_post(friend, "F1", "...", visibility="friends")
+        social_service.create_post(friend, "F2", "...", visibility="private")
+        social_service.create_post(stranger, "S1", "...")
+        social_service.create_post(me, "M1", "...")
+        social_service.create_post(friend, "F3", "...")
+
+        page1 = social_service.get_timeline(me, limit=2)
+        assert [p["title"] for p in page1["posts"]] == ["F3", "M1"]
+        page2 = social_service.get_timeline(me, limit=2, cursor=page1["next_cursor"])
+        assert [p["title"] for p in page2["posts"]] == ["F1"]
+        assert page2["next_cursor"] is None
+
+        assert [p["title"] for p in social_service.get_timeline(stranger)["posts"]] == ["S1"]
+
+    def test_timeline_hides_friends_only_posts_after_unfriending(self, social_service, db_session, timeline_fanout):
+        from app_social.infrastructure.database.po.friendship_po import FriendshipPO
+
+        me, friend = (str(uuid.uuid4()) for _ in range(2))
+        self._befriend(db_session, (me, friend))
+        social_service.create_post(friend, "Friends only", "...", visibility="friends")
+        social_service.create_post(friend, "Public", "...")
+        social_service.create_post(me, "Mine", "...", visibility="friends")
+        assert [p["title"] for p in social_service.get_timeline(me)["posts"]] == ["Mine", "Public", "Friends only"]
+
+        # the fanned-out timeline entries outlive the friendship
+        db_session.query(FriendshipPO).filter_by(requester_id=me, addressee_id=friend).delete()
+        db_session.commit()
+
+        assert [p["title"] for p in social_service.get_timeline(me)["posts"]] == ["Mine", "Public"]
+
+    def test_timeline_celebrity_fan_out_on_read(self, social_service, db_session, timeline_fanout):
+        from app_social.domain.value_objects.timeline_policy import TimelinePolicy
+        from app_social.infrastructure.database.persistent_model.timeline_po import TimelineEntryPO
+
+        policy = TimelinePolicy(fanout_max_friends=1)
+        timeline_fanout._policy = policy
+        social_service._timeline_policy = policy
+
+        celebrity, fan1, fan2 = (str(uuid.uuid4()) for _ in range(3))
+        self._befriend(db_session, (celebrity, fan1), (fan2, celebrity))
+
+        post_id = social_service.create_post(celebrity, "Big news", "...")["post_id"]
+        social_service.create_post(fan1, "Fan post", "...")
+
+        # 大V的帖子只写入自己的时间线
+        owners = db_session.query(TimelineEntryPO.owner_id).filter(TimelineEntryPO.post_id == post_id).all()
+        assert owners == [(celebrity,)]
+
+        titles = [p["title"] for p in social_service.get_timeline(fan1)["posts"]]
+        assert titles == ["Fan post", "Big news"]
+        # fan1 只有一位好友，不是大V，帖子写扩散到 celebrity 的时间线
+        assert [p["title"] for p in social_service.get_timeline(celebrity)["posts"]] == ["Fan post", "Big news"]
+
     def test_user_posts(self, social_service):
         u1 = str(uuid.uuid4())
         u2 = str(uuid.uuid4())
@@ -186,6 +325,106 @@ class TestSocialServiceIntegration:
         assert len(posts_u2) == 1
         assert posts_u2[0]["title"] == "U1 P1"
 
+    def test_public_feed_query_count_constant(self, social_service, db_session):
+        from sqlalchemy import event
+
+        author_id = str(uuid.uuid4())
+        for i in range(6):
+            post_id = social_service.create_post(author_id, f"QC{i}", "...", trip_id=str(uuid.uuid4()))["post_id"]
+            social_service.add_comment(post_id, str(uuid.uuid4()), "c")
+
+        engine = db_session.get_bind().engine
+        statements = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        def _feed_query_count(limit):
+            statements.clear()
+            event.listen(engine, "before_cursor_execute", _count)
+            try:
+                feed = social_service.get_public_feed(limit=limit)
+            finally:
+                event.remove(engine, "before_cursor_execute", _count)
+            assert len(feed) == limit
+            return len(statements)
+
+        assert _feed_query_count(1) == _feed_query_count(6)
+
+    def test_inbox_query_count_constant(self, social_service, db_session):
+        from sqlalchemy import event
+
+        me = str(uuid.uuid4())
+        for i in range(5):
+            other = str(uuid.uuid4())
+            conv_id = social_service.create_private_chat(me, other)["conversation_id"]
+            social_service.send_message(conv_id, other, f"hi {i}")
+            social_service.send_message(conv_id, me, f"re {i}")
+
+        engine = db_session.get_bind().engine
+        statements = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            convs = social_service.get_user_conversations(me)
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+
+        assert len(convs) == 5
+        assert all(c["last_message"]["content"].startswith("re") for c in convs)
+        assert all(c["unread_count"] == 1 for c in convs)
+        # 收件箱 + 参与者 + 用户信息，与会话数无关
+        assert len(statements) <= 3
+
+    def test_add_comment_writes_incrementally(self, social_service, db_session):
+        from sqlalchemy import event
+
+        author_id = str(uuid.uuid4())
+        post_id = social_service.create_post(author_id, "Busy", "...", tags=["a", "b"])["post_id"]
+        for i in range(20):
+            social_service.add_comment(post_id, str(uuid.uuid4()), f"c{i}")
+
+        engine = db_session.get_bind().engine
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.lstrip().split()[0].upper() + " " + statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            social_service.add_comment(post_id, author_id, "one more")
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        writes = [s for s in statements if not s.startswith("SELECT")]
+        assert len([s for s in writes if s.startswith("INSERT")]) == 1
+        assert "comments" in next(s for s in writes if s.startswith("INSERT"))
+        assert not any(s.startswith("DELETE") for s in writes)
+        # only the post header is read; existing comments and likes are not hydrated
+        reads = [s for s in statements if s.startswith("SELECT")]
+        assert len(reads) == 1
+        assert "FROM comments" not in reads[0] and "FROM likes" not in reads[0]
+
+        dto = social_service.get_post_detail(post_id)
+        assert dto["comment_count"] == 21
+        assert dto["tags"] == ("a", "b")
+
+    def test_reply_looks_up_only_the_parent_comment(self, social_service):
+        author_id = str(uuid.uuid4())
+        post_id = social_service.create_post(author_id, "Thread", "...")["post_id"]
+        parent_id = social_service.add_comment(post_id, str(uuid.uuid4()), "parent")["comment_id"]
+
+        reply = social_service.add_comment(post_id, author_id, "reply", parent_comment_id=parent_id)
+        assert reply["comment_id"]
+        assert social_service.get_post_detail(post_id)["comment_count"] == 2
+
+        # a failure rolls back the shared test session, so it comes last
+        with pytest.raises(ValueError):
+            social_service.add_comment(post_id, author_id, "lost", parent_comment_id="missing")
+
     def test_conversation_flow(self, social_service):
         u1 = str(uuid.uuid4())
         u2 = str(uuid.uuid4())
@@ -209,3 +448,171 @@ class TestSocialServiceIntegration:
         social_service.get_conversation_messages(conv_id, u2)
         convs_u2_after = social_service.get_user_conversations(u2)
         assert convs_u2_after[0]["unread_count"] == 0
+
+    def test_send_message_query_count_constant(self, social_service, db_session):
+        from sqlalchemy import event
+
+        u1, u2 = str(uuid.uuid4()), str(uuid.uuid4())
+        conv_id = social_service.create_private_chat(u1, u2)["conversation_id"]
+
+        engine = db_session.get_bind().engine
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.strip())
+
+        def _send(text):
+            statements.clear()
+            event.listen(engine, "before_cursor_execute", _record)
+            try:
+                social_service.send_message(conv_id, u1, text)
+            finally:
+                event.remove(engine, "before_cursor_execute", _record)
+            return list(statements)
+
+        first = _send("first")
+        for i in range(20):
+            social_service.send_message(conv_id, u2, f"m{i}")
+        later = _send("later")
+
+        assert len(first) == len(later)
+        writes = [s for s in later if not s.startswith("SELECT")]
+        assert len(writes) == 2
+        assert writes[0].startswith("INSERT INTO messages")
+        assert writes[1].startswith("UPDATE conversations")
+
+        convs = social_service.get_user_conversations(u2)
+        assert convs[0]["last_message"]["content"] == "later"
+        assert convs[0]["unread_count"] == 2
+
+    def test_create_group_chat_checks_friendships_in_one_query(self, social_service, db_session):
+        from sqlalchemy import event
+        from app_social.infrastructure.database.po.friendship_po import FriendshipPO
+        from app_social.domain.value_objects.friendship_value_objects import FriendshipStatus
+
+        owner = str(uuid.uuid4())
+        outgoing = [str(uuid.uuid4()) for _ in range(10)]
+        incoming = [str(uuid.uuid4()) for _ in range(10)]
+        pending, stranger = str(uuid.uuid4()), str(uuid.uuid4())
+        self._befriend(db_session, *[(owner, f) for f in outgoing], *[(f, owner) for f in incoming])
+        db_session.add(FriendshipPO(id=str(uuid.uuid4()), requester_id=owner, addressee_id=pending,
+                                    status=FriendshipStatus.PENDING))
+        db_session.commit()
+
+        engine = db_session.get_bind().engine
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            conv_id = social_service.create_group_chat(owner, outgoing + incoming, "Friends")["conversation_id"]
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        assert len([s for s in statements if "FROM friendships" in s]) == 1
+        assert social_service.get_user_conversations(incoming[0])[0]["id"] == conv_id
+
+        assert social_service.are_friends(incoming[0], owner)
+        assert not social_service.are_friends(owner, pending)
+
+        for not_friend in (pending, stranger):
+            with pytest.raises(ValueError, match="not your friend"):
+                social_service.create_group_chat(owner, outgoing[:2] + [not_friend], "Nope")
+
+    def test_group_membership_changes_touch_only_changed_rows(self, social_service, db_session):
+        from sqlalchemy import event
+
+        owner = str(uuid.uuid4())
+        members = [str(uuid.uuid4()) for _ in range(30)]
+        newcomer = str(uuid.uuid4())
+        self._befriend(db_session, *[(owner, m) for m in members + [newcomer]])
+        conv_id = social_service.create_group_chat(owner, members, "Big group")["conversation_id"]
+        social_service.send_message(conv_id, members[0], "hello")
+
+        engine = db_session.get_bind().engine
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.strip())
+
+        def _writes(action, *args):
+            statements.clear()
+            event.listen(engine, "before_cursor_execute", _record)
+            try:
+                action(conv_id, *args)
+            finally:
+                event.remove(engine, "before_cursor_execute", _record)
+            return [s.split(" WHERE")[0] for s in statements if not s.startswith("SELECT")]
+
+        writes = _writes(social_service.add_group_member, newcomer, owner)
+        assert [w.split(" (")[0] for w in writes if "conversation_participants" in w] == [
+            "INSERT INTO conversation_participants"
+        ]
+        writes = _writes(social_service.change_group_role, members[1], "admin", owner)
+        assert [w for w in writes if "conversation_participants" in w] == [
+            "UPDATE conversation_participants SET role=?"
+        ]
+        writes = _writes(social_service.remove_group_member, members[2], owner)
+        assert [w for w in writes if "conversation_participants" in w] == [
+            "DELETE FROM conversation_participants"
+        ]
+        assert not [w for w in writes if "messages" in w]
+
+        conv = social_service.get_user_conversations(owner)[0]
+        assert set(conv["participants"]) == {owner, newcomer, *members} - {members[2]}
+        messages = social_service.get_conversation_messages(conv_id, members[1])
+        assert [m["content"] for m in messages] == ["hello"]
+        assert messages[0]["is_read_by_me"]
+
+    def test_conversation_messages_cursor_paging(self, social_service):
+        u1, u2 = str(uuid.uuid4()), str(uuid.uuid4())
+        conv_id = social_service.create_private_chat(u1, u2)["conversation_id"]
+        for i in range(5):
+            social_service.send_message(conv_id, u1, f"m{i}")
+
+        page = social_service.get_conversation_messages(conv_id, u2, limit=2, before="")
+        assert [m["content"] for m in page["messages"]] == ["m3", "m4"]
+        assert social_service.get_user_conversations(u2)[0]["unread_count"] == 0
+
+        older = social_service.get_conversation_messages(conv_id, u2, limit=2, before=page["prev_cursor"])
+        assert [m["content"] for m in older["messages"]] == ["m1", "m2"]
+        assert all(m["is_read_by_me"] for m in older["messages"])
+        oldest = social_service.get_conversation_messages(conv_id, u2, limit=2, before=older["prev_cursor"])
+        assert [m["content"] for m in oldest["messages"]] == ["m0"]
+        assert oldest["prev_cursor"] is None
+
+        social_service.send_message(conv_id, u1, "m5")
+        assert social_service.get_user_conversations(u2)[0]["unread_count"] == 1
+        newer = social_service.get_conversation_messages(conv_id, u2, limit=2, after=page["next_cursor"])
+        assert [m["content"] for m in newer["messages"]] == ["m5"]
+        assert social_service.get_user_conversations(u2)[0]["unread_count"] == 0
+
+        idle = social_service.get_conversation_messages(conv_id, u2, limit=2, after=newer["next_cursor"])
+        assert idle == {"messages": [], "prev_cursor": None, "next_cursor": newer["next_cursor"]}
+
+    def test_mark_read_is_single_update(self, social_service, db_session):
+        from sqlalchemy import event
+
+        u1, u2 = str(uuid.uuid4()), str(uuid.uuid4())
+        conv_id = social_service.create_private_chat(u1, u2)["conversation_id"]
+        for i in range(5):
+            social_service.send_message(conv_id, u1, f"m{i}")
+
+        engine = db_session.get_bind().engine
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.strip())
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            msgs = social_service.get_conversation_messages(conv_id, u2)
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert all(m["is_read_by_me"] for m in msgs)
+        writes = [s for s in statements if not s.startswith("SELECT")]
+        assert len(writes) == 1
+        assert writes[0].startswith("UPDATE conversation_participants")
+        assert social_service.get_user_conversations(u2)[0]["unread_count"] == 0
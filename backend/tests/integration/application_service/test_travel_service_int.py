@@ -15,6 +15,8 @@ from app_travel.domain.value_objects.travel_value_objects import (
 )
 from app_travel.domain.aggregate.trip_aggregate import Trip
 from app_social.infrastructure.database.po.friendship_po import FriendshipPO
+from app_social.infrastructure.database.dao_impl.sqlalchemy_friendship_dao import SqlAlchemyFriendshipDao
+from app_social.infrastructure.database.repository_impl.friendship_repository_impl import FriendshipRepositoryImpl
 from app_social.domain.value_objects.friendship_value_objects import FriendshipStatus
 from unittest.mock import MagicMock, patch
 
@@ -33,7 +35,8 @@ class TestTravelServiceIntegration:
         # 2. Service Initialization
         service = TravelService(
             trip_repository=trip_repo,
-            geo_service=geo_service
+            geo_service=geo_service,
+            friendship_repository=FriendshipRepositoryImpl(SqlAlchemyFriendshipDao(db_session))
         )
         return service
 
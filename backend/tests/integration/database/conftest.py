@@ -16,7 +16,9 @@ from app_auth.infrastructure.database.persistent_model.user_po import UserPO
 from app_social.infrastructure.database.persistent_model.post_po import PostPO, CommentPO, LikePO
 from app_social.infrastructure.database.persistent_model.conversation_po import ConversationPO
 from app_social.infrastructure.database.persistent_model.message_po import MessagePO
+from app_social.infrastructure.database.persistent_model.timeline_po import TimelineEntryPO
 from app_travel.infrastructure.database.persistent_model.trip_po import TripPO, TripMemberPO, TripDayPO, ActivityPO
+from shared.search.search_document_po import SearchDocumentPO
 
 # Load environment variables (to get DATABASE_URL)
 load_dotenv(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../.env')))
@@ -0,0 +1,183 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../src')))
+from app_travel.domain.demand_interface.i_geo_service import IGeoService
+from app_travel.domain.value_objects.travel_value_objects import Location
+from app_travel.infrastructure.external_service.caching_geo_service import CachingGeoService
+from app_travel.infrastructure.external_service.geo_cache_store import SqlAlchemyGeoCacheStore
+
+
+class FakeGeoService(IGeoService):
+    """Counts calls instead of hitting the network."""
+
+    POINTS = {
+        "故宫": (39.916345, 116.397155),
+        "天坛": (39.882171, 116.406605),
+    }
+
+    def __init__(self):
+        self.calls = []
+
+    def geocode(self, address):
+        self.calls.append(("geocode", address))
+        point = self.POINTS.get(address.strip())
+        if not point:
+            return None
+        return Location(name=address, latitude=point[0], longitude=point[1], address=f"北京市{address.strip()}")
+
+    def reverse_geocode(self, latitude, longitude):
+        self.calls.append(("reverse_geocode", latitude, longitude))
+        return "北京市东城区"
+
+    def calculate_distance(self, origin, destination):
+        self.calls.append(("calculate_distance", origin.name, destination.name))
+        return 3800.0
+
+    def get_route(self, origin, destination, mode="driving"):
+        self.calls.append(("get_route", mode))
+        return {"origin": "o", "destination": "d", "paths": [{"distance": 4200.0, "duration": 900.0, "steps": 7}]}
+
+    def search_places(self, keyword, location=None, radius=5000):
+        self.calls.append(("search_places", keyword))
+        return []
+
+    def count(self, operation):
+        return sum(1 for call in self.calls if call[0] == operation)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def inner():
+    return FakeGeoService()
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def store():
+    return SqlAlchemyGeoCacheStore.from_url("sqlite:///:memory:")
+
+
+class TestCachingGeoService:
+
+    def test_geocode_is_cached_by_normalized_address(self, inner, clock):
+        geo = CachingGeoService(inner, clock=clock)
+
+        first = geo.geocode("故宫")
+        second = geo.geocode("  故宫 ")
+
+        assert inner.count("geocode") == 1
+        assert second.name == "  故宫 "
+        assert (second.latitude, second.longitude) == (first.latitude, first.longitude)
+        stats = geo.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert stats["operations"]["geocode"] == {"hits": 1, "persistent_hits": 0, "misses": 1}
+
+    def test_failed_lookups_are_not_cached(self, inner, clock):
+        geo = CachingGeoService(inner, clock=clock)
+
+        assert geo.geocode("不存在的地方") is None
+        assert geo.geocode("不存在的地方") is None
+
+        assert inner.count("geocode") == 2
+
+    def test_route_cached_by_coordinates_and_mode(self, inner, clock):
+        geo = CachingGeoService(inner, clock=clock)
+        palace = Location(name="故宫", latitude=39.916345, longitude=116.397155)
+        temple = Location(name="天坛")  # no coordinates: resolved through the cached geocode
+
+        route = geo.get_route(palace, temple, "walking")
+        route["paths"].clear()  # callers cannot corrupt the cached value
+        again = geo.get_route(Location(name="Forbidden City", latitude=39.916345, longitude=116.397155), temple, "walking")
+        geo.get_route(palace, temple, "driving")
+        geo.get_route(palace, temple, "cycling")
+        geo.get_route(palace, temple, "bicycling")
+
+        assert again["paths"][0]["distance"] == 4200.0
+        assert inner.count("get_route") == 3   # walking, driving, cycling
+        assert inner.count("geocode") == 1     # 天坛 resolved once
+
+    def test_distance_and_reverse_geocode_are_cached(self, inner, clock):
+        geo = CachingGeoService(inner, clock=clock)
+        a = Location(name="A", latitude=39.9, longitude=116.4)
+        b = Location(name="B", latitude=39.8, longitude=116.3)
+
+        assert geo.calculate_distance(a, b) == geo.calculate_distance(a, b) == 3800.0
+        geo.reverse_geocode(39.9, 116.4)
+        geo.reverse_geocode(39.9000001, 116.4000001)
+
+        assert inner.count("calculate_distance") == 1
+        assert inner.count("reverse_geocode") == 1
+        # reversed direction is a different key
+        geo.calculate_distance(b, a)
+        assert inner.count("calculate_distance") == 2
+
+    def test_entries_expire_after_ttl(self, inner, clock):
+        geo = CachingGeoService(inner, ttl_seconds=60, clock=clock)
+
+        geo.geocode("故宫")
+        clock.now += 59
+        geo.geocode("故宫")
+        clock.now += 2
+        geo.geocode("故宫")
+
+        assert inner.count("geocode") == 2
+
+    def test_lru_evicts_least_recently_used(self, inner, clock):
+        geo = CachingGeoService(inner, max_entries=2, clock=clock)
+
+        geo.reverse_geocode(1, 1)
+        geo.reverse_geocode(2, 2)
+        geo.reverse_geocode(1, 1)   # refresh 1
+        geo.reverse_geocode(3, 3)   # evicts 2
+        geo.reverse_geocode(1, 1)
+        geo.reverse_geocode(2, 2)
+
+        assert inner.count("reverse_geocode") == 4
+        assert geo.stats()["size"] == 2
+
+    def test_persistent_tier_survives_a_new_instance(self, inner, clock, store):
+        CachingGeoService(inner, store=store, clock=clock).geocode("故宫")
+
+        fresh_inner = FakeGeoService()
+        geo = CachingGeoService(fresh_inner, store=store, clock=clock)
+        location = geo.geocode("故宫")
+        geo.geocode("故宫")
+
+        assert fresh_inner.calls == []
+        assert location.address == "北京市故宫"
+        stats = geo.stats()
+        assert (stats["persistent_hits"], stats["hits"], stats["misses"]) == (1, 1, 0)
+
+    def test_persistent_entries_expire(self, inner, clock, store):
+        CachingGeoService(inner, ttl_seconds=60, store=store, clock=clock).get_route(
+            Location(name="A", latitude=1, longitude=1), Location(name="B", latitude=2, longitude=2)
+        )
+        clock.now += 61
+
+        fresh_inner = FakeGeoService()
+        CachingGeoService(fresh_inner, ttl_seconds=60, store=store, clock=clock).get_route(
+            Location(name="A", latitude=1, longitude=1), Location(name="B", latitude=2, longitude=2)
+        )
+
+        assert fresh_inner.count("get_route") == 1
+        assert store.purge_expired(now=clock.now + 120) == 1
+
+    def test_search_places_is_not_cached(self, inner, clock):
+        geo = CachingGeoService(inner, clock=clock)
+
+        geo.search_places("咖啡")
+        geo.search_places("咖啡")
+
+        assert inner.count("search_places") == 2
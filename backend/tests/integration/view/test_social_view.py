@@ -140,6 +140,43 @@ class TestSocialViewIntegration:
         assert res.status_code == 201
         assert "comment_id" in res.get_json()
 
+    def test_comment_pagination_and_replies(self, client, auth_header, mock_db_session):
+        create_res = client.post('/api/social/posts', json={"title": "Thread", "content": "Content"}, headers=auth_header)
+        post_id = create_res.get_json()["post_id"]
+        comment_ids = [
+            client.post(f'/api/social/posts/{post_id}/comments', json={"content": f"c{i}"}, headers=auth_header).get_json()["comment_id"]
+            for i in range(3)
+        ]
+        for i in range(2):
+            client.post(
+                f'/api/social/posts/{post_id}/comments',
+                json={"content": f"r{i}", "parent_comment_id": comment_ids[0]},
+                headers=auth_header
+            )
+
+        res = client.get(f'/api/social/posts/{post_id}/comments?limit=2', headers=auth_header)
+        assert res.status_code == 200
+        page1 = res.get_json()
+        assert [c["content"] for c in page1["comments"]] == ["c0", "c1"]
+        assert page1["comments"][0]["reply_count"] == 2
+        assert page1["next_cursor"]
+
+        res = client.get(f'/api/social/posts/{post_id}/comments?limit=2&cursor={page1["next_cursor"]}', headers=auth_header)
+        page2 = res.get_json()
+        assert [c["content"] for c in page2["comments"]] == ["c2"]
+        assert page2["next_cursor"] is None
+
+        res = client.get(f'/api/social/posts/{post_id}/comments/{comment_ids[0]}/replies', headers=auth_header)
+        replies = res.get_json()["comments"]
+        assert [r["content"] for r in replies] == ["r0", "r1"]
+        assert all(r["parent_id"] == comment_ids[0] for r in replies)
+
+        # 详情只内联第一页顶层评论，计数仍为全部评论
+        detail = client.get(f'/api/social/posts/{post_id}', headers=auth_header).get_json()
+        assert [c["content"] for c in detail["comments"]] == ["c0", "c1", "c2"]
+        assert detail["comment_count"] == 5
+        assert detail["comments_next_cursor"] is None
+
     def test_feed(self, client, auth_header, mock_db_session):
         client.post('/api/social/posts', json={"title": "P1", "content": "C1", "tags": ["A"], "visibility": "public"}, headers=auth_header)
         client.post('/api/social/posts', json={"title": "P2", "content": "C2", "tags": ["B"], "visibility": "public"}, headers=auth_header)
@@ -159,6 +196,28 @@ class TestSocialViewIntegration:
         assert res.status_code == 200
         assert len(res.get_json()) >= 1
 
+    def test_user_posts_cursor(self, client, auth_header, mock_db_session, user_id):
+        for i in range(3):
+            client.post('/api/social/posts', json={"title": f"Cursor P{i}", "content": "C"}, headers=auth_header)
+
+        res = client.get(f'/api/social/users/{user_id}/posts?limit=2&cursor=', headers=auth_header)
+        assert res.status_code == 200
+        page1 = res.get_json()
+        assert len(page1["posts"]) == 2
+        assert page1["next_cursor"]
+
+        res = client.get(f'/api/social/users/{user_id}/posts?limit=2&cursor={page1["next_cursor"]}', headers=auth_header)
+        page2 = res.get_json()
+        assert len(page2["posts"]) == 1
+        assert page2["next_cursor"] is None
+
+        ids = [p["id"] for p in page1["posts"] + page2["posts"]]
+        assert len(set(ids)) == 3
+
+    def test_feed_invalid_cursor(self, client, auth_header, mock_db_session):
+        res = client.get('/api/social/feed?cursor=not-a-cursor', headers=auth_header)
+        assert res.status_code == 400
+
     def test_create_conversation(self, client, auth_header, mock_db_session):
         other_id = str(uuid.uuid4())
         res = client.post('/api/social/conversations', json={"target_id": other_id}, headers=auth_header)
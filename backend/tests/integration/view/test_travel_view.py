@@ -9,6 +9,7 @@ from unittest.mock import patch
 
 from app_travel.view.travel_view import travel_bp
 from app_travel.domain.value_objects.travel_value_objects import TripStatus
+from app_travel.infrastructure.database.persistent_model.trip_po import TripDayPO, ActivityPO
 
 # ==================== Fixtures ====================
 
@@ -200,6 +201,57 @@ class TestTravelViewIntegration:
         trips_completed = res_completed.get_json()
         assert len(trips_completed) == 0
 
+    def test_public_trips_list_returns_summaries(self, client, mock_db_session):
+        trip_res = client.post('/api/travel/trips', json={
+            "name": "Public Summary", "creator_id": "u1", "visibility": "public",
+            "start_date": "2023-01-01", "end_date": "2023-01-03", "budget_amount": 800
+        })
+        trip_id = trip_res.get_json()['id']
+        day = mock_db_session.query(TripDayPO).filter_by(trip_id=trip_id, day_number=1).one()
+        mock_db_session.add(ActivityPO(
+            id="act-1", trip_day_id=day.id, name="Museum", activity_type="sightseeing",
+            location_name="Museum", start_time=time(9), end_time=time(11)
+        ))
+        mock_db_session.flush()
+
+        res = client.get('/api/travel/trips/public')
+        assert res.status_code == 200
+        card = next(t for t in res.get_json() if t['id'] == trip_id)
+        # card fields only: no member or itinerary details
+        assert 'days' not in card and 'members' not in card
+        assert card['member_count'] == 1
+        assert card['activity_count'] == 1
+        assert card['days_count'] == 3
+        assert card['budget_amount'] == 800
+        assert card['creator']['user_id'] == "u1"
+
+    def test_trip_lists_page_with_cursor_and_filters(self, client, mock_db_session):
+        for n, start in enumerate(["2023-01-01", "2023-02-01", "2023-03-01"]):
+            client.post('/api/travel/trips', json={
+                "name": f"Paged {n}", "creator_id": "pager", "visibility": "public",
+                "start_date": start, "end_date": start
+            })
+
+        first = client.get('/api/travel/users/pager/trips?cursor=&limit=2').get_json()
+        assert [t['name'] for t in first['trips']] == ["Paged 2", "Paged 1"]
+        second = client.get(f"/api/travel/users/pager/trips?cursor={first['next_cursor']}&limit=2").get_json()
+        assert [t['name'] for t in second['trips']] == ["Paged 0"]
+        assert second['next_cursor'] is None
+
+        # without cursor the endpoint still returns a plain list
+        assert len(client.get('/api/travel/users/pager/trips').get_json()) == 3
+        filtered = client.get('/api/travel/users/pager/trips?date_from=2023-01-15&date_to=2023-02-15').get_json()
+        assert [t['name'] for t in filtered] == ["Paged 1"]
+
+        public = client.get('/api/travel/trips/public?cursor=&limit=2&date_to=2023-02-28').get_json()
+        assert {t['name'] for t in public['trips']} == {"Paged 0", "Paged 1"}
+        rest = client.get(f"/api/travel/trips/public?cursor={public['next_cursor']}&limit=2&date_to=2023-02-28")
+        assert rest.get_json() == {'trips': [], 'next_cursor': None}
+
+        assert client.get('/api/travel/trips/public?date_from=not-a-date').status_code == 400
+        assert client.get('/api/travel/users/pager/trips?cursor=bogus').status_code == 400
+        assert client.get('/api/travel/users/pager/trips?date_from=2023-03-01&date_to=2023-01-01').status_code == 400
+
     def test_delete_trip(self, client, mock_db_session):
         create_res = client.post('/api/travel/trips', json={"name": "Del", "creator_id": "u", "start_date": "2023-01-01", "end_date": "2023-01-01"})
         trip_id = create_res.get_json()['id']
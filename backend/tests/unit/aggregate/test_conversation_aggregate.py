@@ -7,7 +7,7 @@ import uuid
 
 from app_social.domain.aggregate.conversation_aggregate import Conversation
 from app_social.domain.value_objects.social_value_objects import (
-    ConversationId, MessageContent, ConversationType
+    ConversationId, MessageContent, ConversationType, ConversationRole
 )
 from app_social.domain.domain_event.social_events import (
     ConversationCreatedEvent, MessageSentEvent, MessageDeletedEvent,
@@ -142,6 +142,29 @@ class TestConversationAggregate:
         assert count == 1
         assert conv.get_unread_count(user2) == 1
 
+    def test_read_cursor(self, user1, user2):
+        conv = Conversation.create_private(user1, user2)
+        msg1 = conv.send_message(user1, MessageContent(text="Hi"))
+        msg2 = conv.send_message(user1, MessageContent(text="How are you"))
+        
+        conv.mark_as_read(user2, up_to_message_id=msg1.message_id)
+        assert conv.pop_read_cursor_changes()[user2].message_id == msg1.message_id
+        conv.mark_as_read(user2)
+        cursor = conv.get_read_cursor(user2)
+        assert cursor.message_id == msg2.message_id
+        assert conv.pop_read_cursor_changes() == {user2: cursor}
+        
+        # 重建时由游标推导消息的已读状态
+        msg1.read_by.discard(user2)
+        msg2.read_by.discard(user2)
+        restored = Conversation.reconstitute(
+            conv.id, conv.participants_with_roles, [msg1, msg2],
+            read_cursors={user2: cursor}
+        )
+        assert restored.get_unread_count(user2) == 0
+        assert restored.mark_as_read(user2) == 0
+        assert restored.pop_read_cursor_changes() == {}
+
     def test_mark_as_read_not_participant(self, user1, user2, user3):
         conv = Conversation.create_private(user1, user2)
         with pytest.raises(ValueError, match="User is not a participant"):
@@ -157,6 +180,29 @@ class TestConversationAggregate:
         events = conv.pop_events()
         assert isinstance(events[1], ParticipantAddedEvent)
 
+    def test_participant_changes(self, user1, user2, user3):
+        conv = Conversation.create_group(user1, [user2, user3], title="Group")
+        changes = conv.pop_participant_changes()
+        assert changes.is_new
+        assert {uid for uid, _ in changes.added} == {user1, user2, user3}
+        assert conv.pop_participant_changes().is_empty
+
+        restored = Conversation.reconstitute(
+            conv.id, conv.participants_with_roles, [],
+            conversation_type=ConversationType.GROUP, title="Group"
+        )
+        assert restored.pop_participant_changes().is_empty
+
+        restored.add_participant("user_4", added_by=user1)
+        restored.change_role(user2, ConversationRole.ADMIN, operator_id=user1)
+        restored.remove_participant(user3, removed_by=user1)
+        changes = restored.pop_participant_changes()
+        assert not changes.is_new
+        assert changes.added == (("user_4", ConversationRole.MEMBER),)
+        assert changes.removed == (user3,)
+        assert changes.role_changes == ((user2, ConversationRole.ADMIN),)
+        assert restored.pop_participant_changes().is_empty
+
     def test_add_participant_private_error(self, user1, user2, user3):
         conv = Conversation.create_private(user1, user2)
         with pytest.raises(ValueError, match="Cannot add participants to private conversation"):
@@ -161,6 +161,20 @@ class TestPostAggregate:
         with pytest.raises(ValueError, match="Parent comment not found or deleted"):
             post.add_comment("user_2", "text", parent_comment_id="fake_id")
 
+    def test_add_reply_with_separately_loaded_parent(self, post):
+        # header-only aggregates do not hold their comments; the parent is passed in
+        parent = Comment.create(comment_id="c-1", post_id=post.id.value, author_id="user_2", content="Parent")
+        reply = post.add_comment("user_3", "Reply", parent_comment_id="c-1", parent_comment=parent)
+        assert reply.parent_id == "c-1"
+
+        foreign = Comment.create(comment_id="c-2", post_id="other_post", author_id="user_2", content="Elsewhere")
+        with pytest.raises(ValueError, match="Parent comment not found or deleted"):
+            post.add_comment("user_3", "Reply", parent_comment_id="c-2", parent_comment=foreign)
+
+        parent.soft_delete()
+        with pytest.raises(ValueError, match="Parent comment not found or deleted"):
+            post.add_comment("user_3", "Reply", parent_comment_id="c-1", parent_comment=parent)
+
     def test_remove_comment(self, post):
         comment = post.add_comment("user_2", "text")
         post.remove_comment(comment.comment_id, "user_2")
@@ -265,3 +279,35 @@ class TestPostAggregate:
         
         other_post = Post.create("u2", post.content)
         assert post != other_post
+
+    def test_pop_changes(self, post):
+        assert post.pop_changes().is_new is True
+        assert post.pop_changes().is_new is False
+        
+        comment = post.add_comment("user_2", "hi")
+        post.like("user_2")
+        changes = post.pop_changes()
+        assert changes.added_comments == (comment,)
+        assert changes.comment_delta == 1
+        assert [l.user_id for l in changes.added_likes] == ["user_2"]
+        assert changes.like_delta == 1
+        
+        # 已持久化后跟踪状态被清空
+        empty = post.pop_changes()
+        assert empty.added_comments == () and empty.added_likes == ()
+        
+        post.remove_comment(comment.comment_id, "user_2")
+        post.unlike("user_2")
+        changes = post.pop_changes()
+        assert changes.updated_comments == (comment,)
+        assert changes.comment_delta == -1
+        assert changes.removed_like_user_ids == ("user_2",)
+        assert changes.like_delta == -1
+
+    def test_pop_changes_content_diff(self, post):
+        post.pop_changes()
+        post.update_content(PostContent("T", "Text", images=("/a.jpg",), tags=("x",)))
+        changes = post.pop_changes()
+        assert changes.added_images == ((0, "/a.jpg"),)
+        assert changes.added_tags == ("x",)
+        assert changes.removed_images == () and changes.removed_tags == ()
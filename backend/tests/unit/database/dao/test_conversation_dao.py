@@ -3,7 +3,6 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../src')))
 from datetime import datetime, timedelta
-import json
 from sqlalchemy import insert
 
 from app_social.infrastructure.database.persistent_model.conversation_po import ConversationPO, conversation_participants
@@ -64,43 +63,42 @@ class TestConversationDao:
         assert results[1].id == "c2"
 
     def test_find_by_user_with_unread(self, conversation_dao, db_session):
+        now = datetime.utcnow()
         # Case 1: Unread message for me
-        c1 = ConversationPO(id="c1", last_message_at=datetime.utcnow())
+        c1 = ConversationPO(id="c1", last_message_at=now)
         conversation_dao.add(c1)
         self._add_participant(db_session, "c1", "me")
         
         msg1 = MessagePO(
             id="m1", conversation_id="c1", sender_id="other", 
-            content_text="hi", is_deleted=False, 
-            read_by_json=json.dumps(["other"]) # I haven't read it
+            content_text="hi", is_deleted=False, sent_at=now # I haven't read it
         )
         db_session.add(msg1)
         
         # Case 2: I sent the message (should not count as unread for me)
-        c2 = ConversationPO(id="c2", last_message_at=datetime.utcnow())
+        c2 = ConversationPO(id="c2", last_message_at=now)
         conversation_dao.add(c2)
         self._add_participant(db_session, "c2", "me")
         
         msg2 = MessagePO(
             id="m2", conversation_id="c2", sender_id="me", 
-            content_text="hello", is_deleted=False,
-            read_by_json=json.dumps(["me"])
+            content_text="hello", is_deleted=False, sent_at=now
         )
         db_session.add(msg2)
         
         # Case 3: I read the message
-        c3 = ConversationPO(id="c3", last_message_at=datetime.utcnow())
+        c3 = ConversationPO(id="c3", last_message_at=now)
         conversation_dao.add(c3)
         self._add_participant(db_session, "c3", "me")
         
         msg3 = MessagePO(
             id="m3", conversation_id="c3", sender_id="other", 
-            content_text="read", is_deleted=False,
-            read_by_json=json.dumps(["other", "me"])
+            content_text="read", is_deleted=False, sent_at=now
         )
         db_session.add(msg3)
         
         db_session.flush()
+        conversation_dao.update_read_cursor("c3", "me", "m3", now)
 
         # Act
         unread_convs = conversation_dao.find_by_user_with_unread("me")
@@ -109,6 +107,42 @@ class TestConversationDao:
         assert len(unread_convs) == 1
         assert unread_convs[0].id == "c1"
 
+    def test_find_inbox(self, conversation_dao, db_session):
+        now = datetime.utcnow()
+        c1 = ConversationPO(id="c1", last_message_at=now, conversation_type="private")
+        c2 = ConversationPO(id="c2", last_message_at=now - timedelta(hours=1), conversation_type="group", title="G")
+        c3 = ConversationPO(id="c3", last_message_at=None, conversation_type="private")
+        for c in (c1, c2, c3):
+            conversation_dao.add(c)
+        for cid, uid in (("c1", "me"), ("c1", "u2"), ("c2", "me"), ("c2", "u2"), ("c2", "u3"), ("c3", "me")):
+            self._add_participant(db_session, cid, uid)
+
+        db_session.add_all([
+            MessagePO(id="m0", conversation_id="c1", sender_id="u2", content_text="seen",
+                      sent_at=now - timedelta(minutes=3)),
+            MessagePO(id="m1", conversation_id="c1", sender_id="u2", content_text="first",
+                      sent_at=now - timedelta(minutes=2)),
+            MessagePO(id="m2", conversation_id="c1", sender_id="u2", content_text="second",
+                      sent_at=now - timedelta(minutes=1)),
+            MessagePO(id="m3", conversation_id="c1", sender_id="u2", content_text="deleted",
+                      sent_at=now, is_deleted=True),
+            MessagePO(id="m4", conversation_id="c2", sender_id="me", content_text="mine",
+                      sent_at=now - timedelta(hours=1)),
+        ])
+        db_session.flush()
+        conversation_dao.update_read_cursor("c1", "me", "m0", now - timedelta(minutes=3))
+
+        rows = conversation_dao.find_inbox("me")
+        assert [r["id"] for r in rows] == ["c1", "c2", "c3"]
+        assert rows[0]["last_message_text"] == "second"
+        assert rows[0]["unread_count"] == 2
+        assert rows[1]["last_message_sender_id"] == "me"
+        assert rows[1]["unread_count"] == 0
+        assert rows[2]["last_message_id"] is None
+
+        participants = conversation_dao.get_participants_for(["c1", "c2"])
+        assert sorted(p["user_id"] for p in participants["c2"]) == ["me", "u2", "u3"]
+
     def test_crud_operations(self, conversation_dao, db_session):
         c = ConversationPO(id="new", title="Initial", conversation_type="group")
         conversation_dao.add(c)
@@ -2,8 +2,9 @@ import pytest
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../src')))
-import json
 from datetime import datetime, timedelta
+from sqlalchemy import insert, select
+from app_social.infrastructure.database.persistent_model.conversation_po import ConversationPO, conversation_participants
 from app_social.infrastructure.database.persistent_model.message_po import MessagePO
 from app_social.infrastructure.database.dao_impl.sqlalchemy_message_dao import SqlAlchemyMessageDao
 
@@ -43,37 +44,77 @@ class TestMessageDao:
         assert msgs[0].id == "m1" # Ordered by sent_at asc
         assert msgs[1].id == "m2"
 
+    def test_find_by_conversation_cursors(self, message_dao, db_session):
+        base = datetime.utcnow()
+        db_session.add_all([
+            MessagePO(id=f"m{i:02d}", conversation_id="c1", sender_id="u1", content_text=str(i),
+                      sent_at=base + timedelta(seconds=i))
+            for i in range(7)
+        ])
+        db_session.flush()
+
+        # 默认返回最近一页（而不是最早的）
+        latest = message_dao.find_by_conversation("c1", limit=3)
+        assert [m.id for m in latest] == ["m04", "m05", "m06"]
+
+        older = message_dao.find_by_conversation("c1", limit=3, before=(latest[0].sent_at, latest[0].id))
+        assert [m.id for m in older] == ["m01", "m02", "m03"]
+
+        newer = message_dao.find_by_conversation("c1", limit=3, after=(older[-1].sent_at, older[-1].id))
+        assert [m.id for m in newer] == ["m04", "m05", "m06"]
+        assert message_dao.find_by_conversation("c1", limit=3, after=(latest[-1].sent_at, latest[-1].id)) == []
+
+    def _add_conversation(self, db_session, conversation_id, *user_ids):
+        db_session.add(ConversationPO(id=conversation_id, conversation_type="private"))
+        db_session.flush()
+        for uid in user_ids:
+            db_session.execute(insert(conversation_participants).values(conversation_id=conversation_id, user_id=uid))
+        db_session.flush()
+
+    def _cursor(self, db_session, conversation_id, user_id):
+        cp = conversation_participants.c
+        return db_session.execute(
+            select(cp.last_read_message_id, cp.last_read_at)
+            .where(cp.conversation_id == conversation_id, cp.user_id == user_id)
+        ).one()
+
     def test_mark_read(self, message_dao, db_session):
-        m = MessagePO(
-            id="m_read", conversation_id="c", sender_id="u1", 
-            content_text="txt", read_by_json=json.dumps(["u1"])
-        )
-        message_dao.add(m)
+        self._add_conversation(db_session, "c", "u1", "u2")
+        now = datetime.utcnow()
+        old = MessagePO(id="m_old", conversation_id="c", sender_id="u1", content_text="txt", sent_at=now - timedelta(minutes=1))
+        m = MessagePO(id="m_read", conversation_id="c", sender_id="u1", content_text="txt", sent_at=now)
+        db_session.add_all([old, m])
+        db_session.flush()
         
         message_dao.mark_read("m_read", "u2")
+        assert self._cursor(db_session, "c", "u2") == ("m_read", now)
         
-        db_session.refresh(m)
-        read_by = set(json.loads(m.read_by_json))
-        assert "u2" in read_by
-        assert "u1" in read_by
+        # 游标不会后退
+        message_dao.mark_read("m_old", "u2")
+        assert self._cursor(db_session, "c", "u2").last_read_message_id == "m_read"
+        assert message_dao.count_unread("c", "u2") == 0
 
     def test_mark_all_read(self, message_dao, db_session):
-        # m1: unread by u2
-        m1 = MessagePO(id="m1", conversation_id="c1", sender_id="u1", content_text="txt", read_by_json='["u1"]')
-        # m2: already read by u2
-        m2 = MessagePO(id="m2", conversation_id="c1", sender_id="u1", content_text="txt", read_by_json='["u1", "u2"]')
+        self._add_conversation(db_session, "c1", "u1", "u2")
+        now = datetime.utcnow()
+        # m1: read by u2 (cursor)
+        m1 = MessagePO(id="m1", conversation_id="c1", sender_id="u1", content_text="txt", sent_at=now - timedelta(minutes=3))
+        # m2: unread by u2
+        m2 = MessagePO(id="m2", conversation_id="c1", sender_id="u1", content_text="txt", sent_at=now - timedelta(minutes=2))
         # m3: sent by u2 (should be ignored)
-        m3 = MessagePO(id="m3", conversation_id="c1", sender_id="u2", content_text="txt", read_by_json='["u2"]')
+        m3 = MessagePO(id="m3", conversation_id="c1", sender_id="u2", content_text="txt", sent_at=now - timedelta(minutes=1))
         
         db_session.add_all([m1, m2, m3])
         db_session.flush()
+        message_dao.mark_read("m1", "u2")
+        assert message_dao.count_unread("c1", "u2") == 1
+        assert message_dao.count_unread("c1", "u1") == 1
         
         count = message_dao.mark_all_read("c1", "u2")
         
-        assert count == 1 # Only m1 needed update
-        
-        db_session.refresh(m1)
-        assert "u2" in json.loads(m1.read_by_json)
+        assert count == 1 # Only m2 was unread
+        assert self._cursor(db_session, "c1", "u2").last_read_message_id == "m3"
+        assert message_dao.count_unread("c1", "u2") == 0
 
     def test_delete_logical(self, message_dao, db_session):
         m = MessagePO(id="m_del", conversation_id="c", sender_id="u", content_text="hi", is_deleted=False)
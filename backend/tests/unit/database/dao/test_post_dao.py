@@ -7,7 +7,7 @@ from datetime import datetime
 from sqlalchemy.exc import IntegrityError
 
 from app_social.infrastructure.database.persistent_model.post_po import (
-    PostPO, CommentPO, LikePO, PostImagePO, PostTagPO
+    PostPO, CommentPO, LikePO, PostImagePO, TagPO
 )
 from app_social.infrastructure.database.dao_impl.sqlalchemy_post_dao import SqlAlchemyPostDao
 
@@ -38,10 +38,11 @@ class TestPostDao:
         post.comments.append(CommentPO(id=str(uuid.uuid4()), post_id=post_id, author_id="u2", content="c1"))
         post.likes.append(LikePO(user_id="u3", post_id=post_id))
         post.images.append(PostImagePO(image_url="/img/1.jpg", display_order=0))
-        post.tags.append(PostTagPO(tag="travel"))
         
         post_dao.add(post)
         db_session.flush() # Manually flush as DAO doesn't do it anymore
+        post_dao.add_tags(post_id, ["travel"], post.created_at)
+        db_session.expire_all()
         
         # Test find_by_id
         found = post_dao.find_by_id(post_id)
@@ -52,7 +53,7 @@ class TestPostDao:
         assert len(found.likes) == 1
         assert len(found.images) == 1
         assert len(found.tags) == 1
-        assert found.tags[0].tag == "travel"
+        assert found.tags[0].tag.name == "travel"
 
     def test_find_by_author(self, post_dao, db_session):
         u1 = "user_author_1"
@@ -103,21 +104,21 @@ class TestPostDao:
     def test_find_public_feed(self, post_dao, db_session):
         # Public post with tag A
         p1 = self._create_post(str(uuid.uuid4()), "u1", visibility="public")
-        p1.tags.append(PostTagPO(tag="A"))
         
         # Public post with tag B
         p2 = self._create_post(str(uuid.uuid4()), "u1", visibility="public")
-        p2.tags.append(PostTagPO(tag="B"))
         
         # Private post with tag A
         p3 = self._create_post(str(uuid.uuid4()), "u1", visibility="private")
-        p3.tags.append(PostTagPO(tag="A"))
         
         # Public post with no tags
         p4 = self._create_post(str(uuid.uuid4()), "u1", visibility="public")
         
         db_session.add_all([p1, p2, p3, p4])
         db_session.flush()
+        post_dao.add_tags(p1.id, ["A"], p1.created_at)
+        post_dao.add_tags(p2.id, ["B"], p2.created_at)
+        post_dao.add_tags(p3.id, ["A"], p3.created_at)
         
         # All public
         feed = post_dao.find_public_feed()
@@ -143,6 +144,168 @@ class TestPostDao:
         assert p1.id in feed_ab_ids
         assert p2.id in feed_ab_ids
 
+    def test_find_by_author_keyset(self, post_dao, db_session):
+        author = str(uuid.uuid4())
+        same_time = datetime(2024, 1, 1, 12, 0, 0)
+        posts = [self._create_post(f"kp-{i}", author) for i in range(5)]
+        for p in posts:
+            p.created_at = same_time  # 时间戳相同时由 id 决胜
+        db_session.add_all(posts)
+        db_session.flush()
+
+        page1 = post_dao.find_by_author(author, limit=2)
+        assert [p.id for p in page1] == ["kp-4", "kp-3"]
+
+        # 翻页期间插入更新的帖子，不应影响后续页
+        newer = self._create_post("kp-new", author)
+        newer.created_at = datetime(2024, 1, 2)
+        db_session.add(newer)
+        db_session.flush()
+
+        last = page1[-1]
+        page2 = post_dao.find_by_author(author, limit=2, before=(last.created_at, last.id))
+        assert [p.id for p in page2] == ["kp-2", "kp-1"]
+
+        last = page2[-1]
+        page3 = post_dao.find_by_author(author, limit=2, before=(last.created_at, last.id))
+        assert [p.id for p in page3] == ["kp-0"]
+
+    def test_find_feed_cards(self, post_dao, db_session):
+        author = str(uuid.uuid4())
+        post = self._create_post(str(uuid.uuid4()), author)
+        post.text = "x" * 300
+        post.images_json = '["/img/a.jpg", "/img/b.jpg"]'
+        post.tags_json = '["sea"]'
+        post.likes.append(LikePO(user_id="viewer", post_id=post.id))
+        post.likes.append(LikePO(user_id="other", post_id=post.id))
+        post.comments.append(CommentPO(id=str(uuid.uuid4()), post_id=post.id, author_id="u2", content="c1"))
+        post.comments.append(CommentPO(id=str(uuid.uuid4()), post_id=post.id, author_id="u2", content="c2", is_deleted=True))
+        # 计数取自反规范化计数器
+        post.like_count = 2
+        post.comment_count = 1
+        private = self._create_post(str(uuid.uuid4()), author, visibility="private")
+        db_session.add_all([post, private])
+        db_session.flush()
+
+        rows = post_dao.find_feed_cards(author_id=author, viewer_id="viewer", visibilities=["public"])
+        assert len(rows) == 1
+        row = rows[0]
+        assert row["id"] == post.id
+        assert row["like_count"] == 2
+        assert row["comment_count"] == 1
+        assert bool(row["is_liked_by_viewer"]) is True
+        assert len(row["text_head"]) == 101
+        assert row["images_json"] == '["/img/a.jpg", "/img/b.jpg"]'
+
+        rows_all = post_dao.find_feed_cards(author_id=author, viewer_id="nobody")
+        assert len(rows_all) == 2
+        assert not any(bool(r["is_liked_by_viewer"]) for r in rows_all)
+
+    def test_find_feed_cards_hot_keyset(self, post_dao, db_session):
+        author = str(uuid.uuid4())
+        posts = [self._create_post(str(uuid.uuid4()), author) for _ in range(3)]
+        for post, score in zip(posts, (1.5, 3.0, 2.0)):
+            post.hot_score = score
+        db_session.add_all(posts)
+        db_session.flush()
+
+        rows = post_dao.find_feed_cards(author_id=author, limit=2, sort='hot')
+        assert [r["id"] for r in rows] == [posts[1].id, posts[2].id]
+        last = rows[-1]
+        rest = post_dao.find_feed_cards(author_id=author, limit=2, sort='hot', before=(last["hot_score"], last["id"]))
+        assert [r["id"] for r in rest] == [posts[0].id]
+
+        post_dao.increment_counters(posts[0].id, share_delta=2)
+        post_dao.update_hot_scores({posts[0].id: 9.0})
+        engagement = post_dao.find_engagement([posts[0].id])
+        assert engagement[0]["share_count"] == 2
+        assert post_dao.find_feed_cards(author_id=author, limit=1, sort='hot')[0]["id"] == posts[0].id
+
+    def test_tag_dictionary_counts(self, post_dao, db_session):
+        p1 = self._create_post(str(uuid.uuid4()), "u1")
+        p2 = self._create_post(str(uuid.uuid4()), "u1")
+        db_session.add_all([p1, p2])
+        db_session.flush()
+
+        post_dao.add_tags(p1.id, ["sea", "hike", "sea"], p1.created_at)
+        post_dao.add_tags(p2.id, ["sea"], p2.created_at)
+        # 同名标签只在字典中存在一行
+        assert db_session.query(TagPO).filter(TagPO.name == "sea").count() == 1
+
+        popular = post_dao.find_popular_tags(limit=10)
+        assert popular[:2] == [{"name": "sea", "post_count": 2}, {"name": "hike", "post_count": 1}]
+
+        post_dao.remove_tags(p1.id, ["sea"])
+        post_dao.remove_tags(p1.id, ["unknown"])
+        post_dao.adjust_tag_counts(["hike"], -1)
+        popular = post_dao.find_popular_tags(limit=10)
+        assert popular == [{"name": "sea", "post_count": 1}]
+
+        post_dao.delete(p2.id)
+        assert post_dao.find_popular_tags(limit=10) == []
+
+    def test_find_comments_keyset(self, post_dao, db_session):
+        post = self._create_post(str(uuid.uuid4()), "u1")
+        same_time = datetime(2024, 1, 1, 12, 0, 0)
+        for i in range(3):
+            post.comments.append(CommentPO(id=f"c-{i}", post_id=post.id, author_id="u2", content=f"c{i}", created_at=same_time))
+        post.comments.append(CommentPO(id="c-del", post_id=post.id, author_id="u2", content="x", created_at=same_time, is_deleted=True))
+        post.comments.append(CommentPO(id="r-0", post_id=post.id, author_id="u3", content="r0", parent_id="c-0", created_at=same_time))
+        db_session.add(post)
+        db_session.flush()
+
+        page1 = post_dao.find_comments(post.id, limit=2)
+        assert [c.id for c in page1] == ["c-0", "c-1"]
+        page2 = post_dao.find_comments(post.id, limit=2, after=(page1[-1].created_at, page1[-1].id))
+        assert [c.id for c in page2] == ["c-2"]
+
+        replies = post_dao.find_comments(post.id, parent_id="c-0")
+        assert [c.id for c in replies] == ["r-0"]
+        assert post_dao.count_replies(["c-0", "c-1"]) == {"c-0": 1}
+
+    def test_add_and_remove_like_counters(self, post_dao, db_session):
+        post = self._create_post(str(uuid.uuid4()), "u1")
+        db_session.add(post)
+        db_session.flush()
+
+        assert post_dao.add_like(post.id, "u2") is True
+        assert post_dao.add_like(post.id, "u2") is False  # 幂等
+        assert post_dao.add_like(post.id, "u3") is True
+        db_session.refresh(post)
+        assert post.like_count == 2
+        assert len(post.likes) == 2
+
+        assert post_dao.remove_like(post.id, "u2") is True
+        assert post_dao.remove_like(post.id, "u2") is False
+        db_session.refresh(post)
+        assert post.like_count == 1
+
+    def test_add_like_race_hits_unique_constraint(self, post_dao, db_session, monkeypatch):
+        from sqlalchemy import exists, false
+        from app_social.infrastructure.database.dao_impl import sqlalchemy_post_dao
+
+        post = self._create_post(str(uuid.uuid4()), "u1")
+        db_session.add(post)
+        db_session.flush()
+        assert post_dao.add_like(post.id, "u2") is True
+
+        # Simulate a concurrent request whose NOT EXISTS check ran before the first insert
+        monkeypatch.setattr(sqlalchemy_post_dao, "exists", lambda: exists().where(false()))
+        assert post_dao.add_like(post.id, "u2") is False
+
+        # the outer transaction is still usable and the counter was not double-counted
+        db_session.refresh(post)
+        assert post.like_count == 1
+        assert len(post.likes) == 1
+
+    def test_like_unique_constraint(self, post_dao, db_session):
+        post = self._create_post(str(uuid.uuid4()), "u1")
+        post.likes.append(LikePO(user_id="u2", post_id=post.id))
+        post.likes.append(LikePO(user_id="u2", post_id=post.id))
+        db_session.add(post)
+        with pytest.raises(IntegrityError):
+            db_session.flush()
+
     def test_find_by_visibility(self, post_dao, db_session):
         p1 = self._create_post(str(uuid.uuid4()), "u1", visibility="friends")
         db_session.add(p1)
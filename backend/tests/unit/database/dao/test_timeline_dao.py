@@ -0,0 +1,41 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../src')))
+from datetime import datetime, timedelta
+
+from app_social.infrastructure.database.dao_impl.sqlalchemy_timeline_dao import SqlAlchemyTimelineDao
+from app_social.infrastructure.database.dao_impl.sqlalchemy_friendship_dao import SqlAlchemyFriendshipDao
+from app_social.infrastructure.database.po.friendship_po import FriendshipPO
+from app_social.domain.value_objects.friendship_value_objects import FriendshipStatus
+
+class TestTimelineDao:
+
+    @pytest.fixture
+    def timeline_dao(self, db_session):
+        return SqlAlchemyTimelineDao(db_session)
+
+    def test_find_entries_keyset(self, timeline_dao, db_session):
+        base = datetime(2024, 1, 1, 12, 0, 0)
+        timeline_dao.add_entries([
+            {"owner_id": "u1", "post_id": f"p{i}", "author_id": "a", "created_at": base + timedelta(minutes=i // 2)}
+            for i in range(5)
+        ])
+        timeline_dao.add_entries([{"owner_id": "u2", "post_id": "p9", "author_id": "a", "created_at": base}])
+        db_session.flush()
+
+        page1 = timeline_dao.find_entries("u1", limit=3)
+        assert [pid for _, pid in page1] == ["p4", "p3", "p2"]
+        page2 = timeline_dao.find_entries("u1", limit=3, before=page1[-1])
+        assert [pid for _, pid in page2] == ["p1", "p0"]
+
+    def test_count_friends(self, db_session):
+        db_session.add_all([
+            FriendshipPO(id="f1", requester_id="a", addressee_id="b", status=FriendshipStatus.ACCEPTED),
+            FriendshipPO(id="f2", requester_id="c", addressee_id="a", status=FriendshipStatus.ACCEPTED),
+            FriendshipPO(id="f3", requester_id="a", addressee_id="d", status=FriendshipStatus.PENDING),
+        ])
+        db_session.flush()
+
+        counts = SqlAlchemyFriendshipDao(db_session).count_friends(["a", "b", "d"])
+        assert counts == {"a": 2, "b": 1}
@@ -2,8 +2,12 @@ import pytest
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../src')))
-from datetime import date, datetime
-from app_travel.infrastructure.database.persistent_model.trip_po import TripPO, TripMemberPO
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import event
+from app_travel.infrastructure.database.persistent_model.trip_po import (
+    TripPO, TripMemberPO, TripDayPO, ActivityPO, TransitPO
+)
 from app_travel.infrastructure.database.dao_impl.sqlalchemy_trip_dao import SqlAlchemyTripDao
 
 class TestTripDao:
@@ -89,3 +93,205 @@ class TestTripDao:
         
         trip_dao.delete("new_trip")
         assert trip_dao.exists("new_trip") is False
+
+
+@contextmanager
+def _count_selects(session):
+    """Count SELECT statements issued inside the block."""
+    engine = session.get_bind().engine
+    selects = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield selects
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestTripDaoEagerLoading:
+    """Trip reads load the whole aggregate (or a summary row) with a fixed number of SELECTs."""
+
+    DAYS = 7
+
+    @pytest.fixture
+    def trip_dao(self, db_session):
+        return SqlAlchemyTripDao(db_session)
+
+    def _seed(self, db_session, count, prefix):
+        start = date(2024, 5, 1)
+        for n in range(count):
+            trip = TripPO(
+                id=f"{prefix}{n}", name=f"Trip {n}", creator_id="creator",
+                start_date=start, end_date=start + timedelta(days=self.DAYS - 1),
+                visibility="public", created_at=datetime(2024, 1, 1) + timedelta(minutes=n)
+            )
+            trip.members = [
+                TripMemberPO(user_id="creator", role="admin"),
+                TripMemberPO(user_id="u_target", role="member"),
+            ]
+            for d in range(self.DAYS):
+                day = TripDayPO(day_number=d + 1, date=start + timedelta(days=d))
+                day.activities = [
+                    ActivityPO(
+                        id=f"{prefix}{n}-{d}-{i}", name="Spot", activity_type="sightseeing",
+                        location_name="Spot", start_time=time(9 + i), end_time=time(10 + i)
+                    )
+                    for i in range(2)
+                ]
+                day.transits = [
+                    TransitPO(
+                        id=f"{prefix}{n}-{d}-t", from_activity_id=f"{prefix}{n}-{d}-0",
+                        to_activity_id=f"{prefix}{n}-{d}-1", transport_mode="walking",
+                        departure_time=time(10), arrival_time=time(10, 30)
+                    )
+                ]
+                trip.days.append(day)
+            db_session.add(trip)
+        db_session.flush()
+        db_session.expunge_all()
+
+    def _list_and_convert(self, db_session, call):
+        db_session.expunge_all()
+        with _count_selects(db_session) as selects:
+            trips = [po.to_domain() for po in call()]
+        return trips, len(selects)
+
+    @pytest.mark.parametrize("method", ["find_public", "find_by_member", "find_by_creator"])
+    def test_list_query_count_is_constant(self, trip_dao, db_session, method):
+        calls = {
+            "find_public": lambda: trip_dao.find_public(limit=50),
+            "find_by_member": lambda: trip_dao.find_by_member("u_target"),
+            "find_by_creator": lambda: trip_dao.find_by_creator("creator"),
+        }
+        self._seed(db_session, 2, "small")
+        small, small_count = self._list_and_convert(db_session, calls[method])
+
+        self._seed(db_session, 18, "big")
+        big, big_count = self._list_and_convert(db_session, calls[method])
+
+        assert len(small) == 2 and len(big) == 20
+        assert all(len(t.days) == self.DAYS and len(t.members) == 2 for t in big)
+        assert all(len(d.activities) == 2 and len(d.transits) == 1 for t in big for d in t.days)
+        # trips + members + days + activities + transits
+        assert small_count == big_count == 5
+
+    def test_find_by_id_loads_aggregate_eagerly(self, trip_dao, db_session):
+        self._seed(db_session, 1, "one")
+
+        trip, count = self._list_and_convert(db_session, lambda: [trip_dao.find_by_id("one0")])
+
+        assert len(trip[0].days) == self.DAYS
+        assert count == 5
+
+    @pytest.mark.parametrize("method", ["find_public_summaries", "find_member_summaries"])
+    def test_summaries_are_one_query_with_counts(self, trip_dao, db_session, method):
+        calls = {
+            "find_public_summaries": lambda: trip_dao.find_public_summaries(limit=50),
+            "find_member_summaries": lambda: trip_dao.find_member_summaries("u_target"),
+        }
+        self._seed(db_session, 20, "sum")
+
+        with _count_selects(db_session) as selects:
+            rows = calls[method]()
+
+        assert len(selects) == 1
+        assert len(rows) == 20
+        assert all(r["member_count"] == 2 for r in rows)
+        assert all(r["activity_count"] == self.DAYS * 2 for r in rows)
+
+    def test_summaries_follow_list_order_and_filters(self, trip_dao, db_session):
+        self._seed(db_session, 3, "ord")
+        db_session.add_all([
+            TripPO(
+                id="private", name="Private", creator_id="creator",
+                start_date=date.today(), end_date=date.today(), visibility="private"
+            ),
+            TripPO(
+                id="bare", name="Bare", creator_id="creator", start_date=date.today(),
+                end_date=date.today(), visibility="public", created_at=datetime(2023, 1, 1)
+            ),
+        ])
+        db_session.flush()
+
+        summaries = trip_dao.find_public_summaries(limit=2, offset=1)
+        trips = trip_dao.find_public(limit=2, offset=1)
+
+        assert [r["id"] for r in summaries] == [t.id for t in trips] == ["ord1", "ord0"]
+        assert trip_dao.find_member_summaries("u_target", status="completed") == []
+        # a trip without members or days still yields a row with zero counts
+        bare = trip_dao.find_public_summaries(limit=50)[-1]
+        assert (bare["id"], bare["member_count"], bare["activity_count"]) == ("bare", 0, 0)
+
+
+class TestTripDaoKeysetAndFilters:
+    """Keyset pagination and status / date-range / destination filters."""
+
+    @pytest.fixture
+    def trip_dao(self, db_session):
+        return SqlAlchemyTripDao(db_session)
+
+    @pytest.fixture
+    def trips(self, db_session):
+        created = datetime(2024, 1, 1, 12, 0)
+        rows = [
+            # id, start, days, status, destination, created_at
+            ("k1", date(2024, 3, 1), 3, "planning", "Beijing", created),
+            ("k2", date(2024, 4, 1), 2, "completed", "Shanghai", created),
+            ("k3", date(2024, 4, 1), 5, "planning", "Chengdu", created + timedelta(hours=1)),
+            ("k4", date(2024, 6, 10), 1, "planning", None, created + timedelta(hours=2)),
+        ]
+        for trip_id, start, days, status, destination, created_at in rows:
+            trip = TripPO(
+                id=trip_id, name=trip_id, creator_id="creator", status=status,
+                start_date=start, end_date=start + timedelta(days=days - 1),
+                visibility="public", created_at=created_at
+            )
+            trip.members = [TripMemberPO(user_id="member", role="member")]
+            if destination:
+                day = TripDayPO(day_number=1, date=start)
+                day.activities = [ActivityPO(
+                    id=f"{trip_id}-a", name="Spot", activity_type="sightseeing",
+                    location_name=f"{destination} Museum", start_time=time(9), end_time=time(10)
+                )]
+                trip.days.append(day)
+            db_session.add(trip)
+        db_session.flush()
+
+    def _pages(self, fetch, key):
+        ids, before = [], None
+        while True:
+            page = fetch(before)
+            ids.extend(t.id for t in page)
+            if len(page) < 2:
+                return ids
+            before = (key(page[-1]), page[-1].id)
+
+    def test_public_keyset_walks_every_trip_once(self, trip_dao, trips):
+        ids = self._pages(lambda before: trip_dao.find_public(limit=2, before=before), lambda t: t.created_at)
+
+        # created_at DESC, ties broken by id DESC
+        assert ids == ["k4", "k3", "k2", "k1"]
+
+    def test_member_keyset_orders_by_start_date(self, trip_dao, trips):
+        ids = self._pages(
+            lambda before: trip_dao.find_by_member("member", limit=2, before=before), lambda t: t.start_date
+        )
+
+        assert ids == ["k4", "k3", "k2", "k1"]
+        assert [r["id"] for r in trip_dao.find_member_summaries("member", limit=1)] == ["k4"]
+
+    def test_filters(self, trip_dao, trips):
+        def public_ids(**filters):
+            return [t.id for t in trip_dao.find_public(limit=10, **filters)]
+
+        assert public_ids(status="planning") == ["k4", "k3", "k1"]
+        # date range overlaps: k1 ends 03-03, k3 runs 04-01..04-05
+        assert public_ids(date_from=date(2024, 3, 3), date_to=date(2024, 4, 1)) == ["k3", "k2", "k1"]
+        assert public_ids(date_from=date(2024, 4, 3)) == ["k4", "k3"]
+        assert public_ids(destination="shanghai") == ["k2"]
+        assert public_ids(destination="Museum", status="planning") == ["k3", "k1"]
+        assert [r["id"] for r in trip_dao.find_member_summaries("member", destination="Chengdu")] == ["k3"]
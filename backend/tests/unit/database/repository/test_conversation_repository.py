@@ -44,7 +44,8 @@ class TestConversationRepository:
         assert isinstance(args[0], ConversationPO)
         assert args[0].id == conversation.id.value
         
-        mock_conv_dao.update_participants.assert_called_once()
+        mock_conv_dao.add_participants.assert_called_once()
+        assert {p["user_id"] for p in mock_conv_dao.add_participants.call_args[0][1]} == {"u1", "u2"}
         
     def test_save_existing_conversation(self, repo, mock_conv_dao, mock_msg_dao, conversation):
         # Setup
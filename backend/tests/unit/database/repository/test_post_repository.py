@@ -3,6 +3,7 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../src')))
 from unittest.mock import Mock, MagicMock, patch
+from datetime import datetime
 
 from app_social.infrastructure.database.repository_impl.post_repository_impl import PostRepositoryImpl
 from app_social.domain.aggregate.post_aggregate import Post
@@ -33,56 +34,113 @@ class TestPostRepository:
         assert isinstance(args[0], PostPO)
         assert args[0].id == post.id.value
 
+    def _persisted(self, post):
+        post.pop_changes()  # 模拟已持久化
+        return post
+
     def test_save_existing_post(self, repo, mock_dao, post):
-        existing_po = Mock(spec=PostPO)
-        existing_po.comments = []
-        existing_po.likes = []
-        mock_dao.find_by_id.return_value = existing_po
+        self._persisted(post)
+        post.update_content(PostContent("New Title", "Text"))
         
         repo.save(post)
         
-        existing_po.update_from_domain.assert_called_once_with(post)
-        mock_dao.update.assert_called_once_with(existing_po)
+        mock_dao.add.assert_not_called()
+        mock_dao.find_by_id.assert_not_called()
+        mock_dao.update_header.assert_called_once()
+        args, kwargs = mock_dao.update_header.call_args
+        assert args[0] == post.id.value
+        assert args[1]["title"] == "New Title"
+        assert kwargs == {"like_delta": 0, "comment_delta": 0}
 
-    def test_sync_comments(self, repo, mock_dao, post):
-        # Setup existing PO with one comment
-        existing_po = Mock(spec=PostPO)
-        c_po = Mock(spec=CommentPO)
-        c_po.id = "old_comment"
-        # Use a list for comments
-        existing_po.comments = [c_po]
-        # Also initialize likes to avoid iteration error in _sync_likes
-        existing_po.likes = []
+    def test_save_comment_changes(self, repo, mock_dao, post):
+        self._persisted(post)
+        new_comment = post.add_comment("u2", "Nice")
         
-        mock_dao.find_by_id.return_value = existing_po
+        repo.save(post)
         
-        # Add new comment to domain post
-        new_comment = post.add_comment("u2", "Nice")
+        rows = mock_dao.add_comments.call_args[0][0]
+        assert [r["id"] for r in rows] == [new_comment.comment_id]
+        mock_dao.update_comments.assert_called_once_with([])
+        assert mock_dao.update_header.call_args[1]["comment_delta"] == 1
+        
+        # 删除已持久化的评论只产生一次按主键的 UPDATE
+        post.remove_comment(new_comment.comment_id, "u2")
+        repo.save(post)
+        
+        mock_dao.add_comments.assert_called_with([])
+        rows = mock_dao.update_comments.call_args[0][0]
+        assert rows == [{"id": new_comment.comment_id, "content": "[评论已删除]", "is_deleted": True}]
+        assert mock_dao.update_header.call_args[1]["comment_delta"] == -1
+
+    def test_save_like_changes(self, repo, mock_dao, post):
+        self._persisted(post)
+        post.like("u2")
+        post.like("u3")
+        post.unlike("u3")
         
         repo.save(post)
         
-        # Verify: 
-        # 1. old_comment should be gone from list (filtered out)
-        # 2. new_comment should be in list (appended)
+        rows = mock_dao.add_likes.call_args[0][0]
+        assert [r["user_id"] for r in rows] == ["u2"]
+        mock_dao.remove_likes.assert_called_once_with(post.id.value, [])
+        assert mock_dao.update_header.call_args[1]["like_delta"] == 1
+
+    def test_save_image_and_tag_changes(self, repo, mock_dao):
+        post = Post.create("u1", PostContent("T", "Text", images=("/a.jpg", "/b.jpg"), tags=("x", "y")))
+        self._persisted(post)
+        post.update_content(PostContent("T", "Text", images=("/a.jpg", "/c.jpg"), tags=("y", "z")))
         
-        # Check the contents of existing_po.comments
-        # Note: CommentPO.from_domain is called.
+        repo.save(post)
         
-        # Check that list contains new comment's PO (or similar)
-        assert len(existing_po.comments) == 1
-        assert existing_po.comments[0].id == new_comment.comment_id
+        mock_dao.remove_images.assert_called_once_with(post.id.value, [(1, "/b.jpg")])
+        mock_dao.add_images.assert_called_once_with(
+            [{"post_id": post.id.value, "image_url": "/c.jpg", "display_order": 1}]
+        )
+        mock_dao.remove_tags.assert_called_once_with(post.id.value, ["x"], count=True)
+        mock_dao.add_tags.assert_called_once_with(post.id.value, ["z"], post.created_at, count=True)
+        mock_dao.adjust_tag_counts.assert_not_called()
+
+    def test_save_new_post_counts_tags(self, repo, mock_dao):
+        post = Post.create("u1", PostContent("T", "Text", tags=("x", "y")))
         
-    def test_sync_likes(self, repo, mock_dao, post):
-        existing_po = Mock(spec=PostPO)
-        existing_po.likes = []
-        existing_po.comments = [] # needed for save
-        mock_dao.find_by_id.return_value = existing_po
+        repo.save(post)
+        
+        mock_dao.add_tags.assert_called_once_with(post.id.value, ["x", "y"], post.created_at, count=True)
+
+    def test_save_new_private_post_does_not_count_tags(self, repo, mock_dao):
+        post = Post.create("u1", PostContent("T", "Text", tags=("x",)), visibility=PostVisibility.PRIVATE)
+        
+        repo.save(post)
+        
+        mock_dao.add_tags.assert_called_once_with(post.id.value, ["x"], post.created_at, count=False)
+
+    def test_save_soft_delete_releases_tag_counts(self, repo, mock_dao):
+        post = Post.create("u1", PostContent("T", "Text", tags=("x",)))
+        self._persisted(post)
+        post.soft_delete()
+        
+        repo.save(post)
+        
+        mock_dao.adjust_tag_counts.assert_called_once_with(["x"], -1)
+
+    def test_save_visibility_change_adjusts_tag_counts(self, repo, mock_dao):
+        post = Post.create("u1", PostContent("T", "Text", tags=("x", "y")))
+        self._persisted(post)
+        post.change_visibility(PostVisibility.FRIENDS)
+        post.update_content(PostContent("T", "Text", tags=("y", "z")))
         
-        post.like("u2")
         repo.save(post)
         
-        # Verify like was added
-        assert len(existing_po.likes) == 1 or existing_po.likes.append.called
+        # removed tag was counted while public; the new tag is not counted for a friends-only post
+        mock_dao.remove_tags.assert_called_once_with(post.id.value, ["x"], count=True)
+        mock_dao.add_tags.assert_called_once_with(post.id.value, ["z"], post.created_at, count=False)
+        mock_dao.adjust_tag_counts.assert_called_once_with(["y"], -1)
+        
+        mock_dao.reset_mock()
+        post.change_visibility(PostVisibility.PUBLIC)
+        repo.save(post)
+        
+        mock_dao.adjust_tag_counts.assert_called_once_with(["y", "z"], 1)
 
     def test_find_by_id(self, repo, mock_dao):
         po = Mock(spec=PostPO)
@@ -108,7 +166,27 @@ class TestPostRepository:
         
         result = repo.find_public_feed(tags=["A"])
         assert result == ["domain_post"]
-        mock_dao.find_public_feed.assert_called_with(limit=20, offset=0, tags=["A"])
+        mock_dao.find_public_feed.assert_called_with(limit=20, offset=0, tags=["A"], search_query=None, before=None)
+
+    def test_find_feed_cards(self, repo, mock_dao):
+        now = datetime.utcnow()
+        mock_dao.find_feed_cards.return_value = [{
+            "id": "p1", "author_id": "u1", "title": "T", "text_head": "a" * 101,
+            "images_json": '["/1.jpg", "/2.jpg"]', "tags_json": '["A"]',
+            "visibility": "public", "trip_id": None, "created_at": now, "updated_at": now,
+            "like_count": 3, "comment_count": 1, "is_liked_by_viewer": 1
+        }]
+        
+        cards = repo.find_feed_cards(viewer_id="u2")
+        assert len(cards) == 1
+        card = cards[0]
+        assert card.post_id == "p1"
+        assert card.summary == "a" * 100 + "..."
+        assert card.cover_image_url == "/1.jpg"
+        assert card.image_count == 2
+        assert card.tags == ("A",)
+        assert card.like_count == 3
+        assert card.is_liked_by_viewer is True
 
     def test_delete(self, repo, mock_dao):
         repo.delete(PostId("p1"))
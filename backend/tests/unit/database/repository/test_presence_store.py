@@ -0,0 +1,75 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../src')))
+
+from app_social.infrastructure.presence.in_memory_presence_store import InMemoryPresenceStore
+from app_social.infrastructure.presence.sqlalchemy_presence_store import SqlAlchemyPresenceStore
+
+
+@pytest.fixture(params=["memory", "sqlalchemy"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryPresenceStore(max_pending=3)
+    return SqlAlchemyPresenceStore.from_url(f"sqlite:///{tmp_path / 'presence.db'}", max_pending=3)
+
+
+class TestPresenceStore:
+
+    def test_connection_counts(self, store):
+        assert store.connect("u1", "sid-a") == 1
+        assert store.connect("u1", "sid-b") == 2
+        # Reconnecting with the same sid is not counted twice
+        assert store.connect("u1", "sid-b") == 2
+
+        presence = store.get_many(["u1", "u2"])
+        assert presence["u1"].is_online and presence["u1"].connections == 2
+        assert presence["u1"].last_seen is not None
+        assert not presence["u2"].is_online and presence["u2"].last_seen is None
+
+        assert store.disconnect("u1", "sid-a") == 1
+        assert store.disconnect("u1", "unknown") == 1
+        assert store.disconnect("u1", "sid-b") == 0
+
+        presence = store.get_many(["u1"])["u1"]
+        assert not presence.is_online
+        assert presence.last_seen is not None
+
+    def test_offline_queue_keeps_latest_in_order(self, store):
+        for i in range(5):
+            store.push_offline("u1", {"message_id": f"m{i}"})
+        store.push_offline("u2", {"message_id": "other"})
+
+        assert store.pop_offline("u1") == [{"message_id": "m2"}, {"message_id": "m3"}, {"message_id": "m4"}]
+        assert store.pop_offline("u1") == []
+        assert store.pop_offline("u2") == [{"message_id": "other"}]
+
+    def test_shared_backend_is_visible_across_instances(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'shared.db'}"
+        worker_a = SqlAlchemyPresenceStore.from_url(url)
+        worker_b = SqlAlchemyPresenceStore.from_url(url)
+
+        worker_a.connect("u1", "sid-a")
+        worker_b.connect("u1", "sid-b")
+        assert worker_a.get_many(["u1"])["u1"].connections == 2
+
+        worker_a.push_offline("u2", {"message_id": "m1"})
+        assert worker_b.pop_offline("u2") == [{"message_id": "m1"}]
+
+    def test_offline_trim_avoids_self_referencing_delete(self, tmp_path):
+        # MySQL rejects LIMIT inside IN subqueries and DELETEs that select from their own table
+        from sqlalchemy import event
+
+        store = SqlAlchemyPresenceStore.from_url(f"sqlite:///{tmp_path / 'trim.db'}", max_pending=2)
+        deletes = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("DELETE"):
+                deletes.append(statement)
+
+        event.listen(store._engine, "before_cursor_execute", _record)
+        for i in range(3):
+            store.push_offline("u1", {"message_id": f"m{i}"})
+
+        assert deletes and not any("SELECT" in statement.upper() for statement in deletes)
+        assert store.pop_offline("u1") == [{"message_id": "m1"}, {"message_id": "m2"}]
@@ -3,12 +3,16 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../src')))
 from unittest.mock import Mock, MagicMock
+from contextlib import contextmanager
+from sqlalchemy import event
 
 from app_travel.infrastructure.database.repository_impl.trip_repository_impl import TripRepositoryImpl
 from app_travel.domain.aggregate.trip_aggregate import Trip
-from app_travel.domain.value_objects.travel_value_objects import TripId, TripName, TripDescription, DateRange, Money, TripVisibility
-from app_travel.infrastructure.database.persistent_model.trip_po import TripPO, TripMemberPO, TripDayPO
-from datetime import date
+from app_travel.domain.entity.activity import Activity
+from app_travel.domain.value_objects.travel_value_objects import TripId, TripName, TripDescription, DateRange, Money, TripVisibility, ActivityType, Location
+from app_travel.infrastructure.database.persistent_model.trip_po import TripPO, TripMemberPO, TripDayPO, ActivityPO
+from app_travel.infrastructure.database.dao_impl.sqlalchemy_trip_dao import SqlAlchemyTripDao
+from datetime import date, time, timedelta
 
 class TestTripRepository:
     
@@ -53,7 +57,7 @@ class TestTripRepository:
         existing_po.update_from_domain.assert_called_once_with(trip)
         mock_dao.update.assert_called_once_with(existing_po)
         
-        # Verify days were cleared and re-added
+        # New days are appended to the existing collection
         # Since we used a real list, we check its content
         assert len(existing_po.days) == 3 # Trip fixture has 3 days
 
@@ -90,3 +94,136 @@ class TestTripRepository:
     def test_exists(self, repo, mock_dao):
         mock_dao.exists.return_value = True
         assert repo.exists(TripId("t1")) is True
+
+
+@contextmanager
+def _count_writes(session):
+    """Collect INSERT/UPDATE/DELETE statements per table issued inside the block."""
+    engine = session.get_bind().engine
+    writes = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if verb in ("INSERT", "UPDATE", "DELETE"):
+            rows = len(parameters) if executemany else 1
+            writes.extend([verb] * rows)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield writes
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _activity(name, hour):
+    return Activity.create(
+        name=name,
+        activity_type=ActivityType.SIGHTSEEING,
+        location=Location(name=name, latitude=39.9, longitude=116.4),
+        start_time=time(hour, 0),
+        end_time=time(hour, 30),
+        cost=Money(10, "CNY"),
+    )
+
+
+class TestTripRepositorySync:
+    """save() against a real session: only the changed child rows are written."""
+
+    DAYS = 30
+    ACTIVITIES_PER_DAY = 10
+
+    @pytest.fixture
+    def repo(self, db_session):
+        return TripRepositoryImpl(SqlAlchemyTripDao(db_session))
+
+    @pytest.fixture
+    def trip_id(self, repo, db_session):
+        start = date(2024, 5, 1)
+        trip = Trip.create(
+            name=TripName("Long Trip"),
+            description=TripDescription(""),
+            creator_id="u1",
+            date_range=DateRange(start, start + timedelta(days=self.DAYS - 1)),
+        )
+        for day_index in range(self.DAYS):
+            for i in range(self.ACTIVITIES_PER_DAY):
+                trip.add_activity(day_index, _activity(f"A{day_index}-{i}", 8 + i), "u1")
+        repo.save(trip)
+        db_session.expire_all()
+        return trip.id
+
+    def _load(self, repo, db_session, trip_id):
+        db_session.expire_all()
+        return repo.find_by_id(trip_id)
+
+    def test_noop_save_writes_nothing(self, repo, db_session, trip_id):
+        trip = self._load(repo, db_session, trip_id)
+        day_ids = {d.id for d in db_session.query(TripDayPO).filter_by(trip_id=trip_id.value)}
+
+        with _count_writes(db_session) as writes:
+            repo.save(trip)
+
+        assert writes == []
+        assert {d.id for d in db_session.query(TripDayPO).filter_by(trip_id=trip_id.value)} == day_ids
+
+    def test_adding_one_activity_inserts_one_row(self, repo, db_session, trip_id):
+        trip = self._load(repo, db_session, trip_id)
+        new_activity = _activity("Night Market", 20)
+        trip.add_activity(3, new_activity, "u1")
+
+        with _count_writes(db_session) as writes:
+            repo.save(trip)
+
+        # one activity row plus the trip's updated_at
+        assert sorted(writes) == ["INSERT", "UPDATE"]
+        reloaded = self._load(repo, db_session, trip_id)
+        assert new_activity.id in {a.id for a in reloaded.days[3].activities}
+        assert sum(len(d.activities) for d in reloaded.days) == self.DAYS * self.ACTIVITIES_PER_DAY + 1
+
+    def test_removing_and_editing_touch_only_those_rows(self, repo, db_session, trip_id):
+        trip = self._load(repo, db_session, trip_id)
+        removed = trip.days[0].activities[0]
+        trip.remove_activity(0, removed.id, "u1")
+        trip.update_day_notes(5, "Rest day")
+
+        with _count_writes(db_session) as writes:
+            repo.save(trip)
+
+        assert sorted(writes) == ["DELETE", "UPDATE", "UPDATE"]
+        assert db_session.get(ActivityPO, removed.id) is None
+        reloaded = self._load(repo, db_session, trip_id)
+        assert reloaded.days[5].notes == "Rest day"
+
+    def test_removed_cost_and_budget_clear_their_currency(self, repo, db_session, trip_id):
+        trip = self._load(repo, db_session, trip_id)
+        activity = trip.days[0].activities[0]
+        activity.update(cost=Money(25, "USD"))
+        trip.update_info(budget=Money(5000, "EUR"))
+        repo.save(trip)
+
+        trip = self._load(repo, db_session, trip_id)
+        trip.days[0].activities[0].cost = None
+        trip._budget = None
+        repo.save(trip)
+
+        db_session.expire_all()
+        # same as the delete-and-reinsert save: the activity row falls back to the
+        # column default, the trip's budget currency is cleared
+        activity_po = db_session.get(ActivityPO, activity.id)
+        assert (activity_po.cost_amount, activity_po.cost_currency) == (None, "CNY")
+        trip_po = db_session.get(TripPO, trip_id.value)
+        assert (trip_po.budget_amount, trip_po.budget_currency) == (None, None)
+
+    def test_activity_moved_between_days_keeps_its_row(self, repo, db_session, trip_id):
+        trip = self._load(repo, db_session, trip_id)
+        moved = trip.days[0].activities[0]
+        trip.days[0].remove_activity(moved.id)
+        trip.days[1].replace_activities(list(trip.days[1].activities[1:]) + [moved])
+
+        repo.save(trip)
+
+        reloaded = self._load(repo, db_session, trip_id)
+        assert moved.id not in {a.id for a in reloaded.days[0].activities}
+        assert moved.id in {a.id for a in reloaded.days[1].activities}
+        day_1 = db_session.query(TripDayPO).filter_by(trip_id=trip_id.value, day_number=2).one()
+        assert db_session.get(ActivityPO, moved.id).trip_day_id == day_1.id
@@ -1,7 +1,9 @@
 import client from './client';
 
-export const getFeed = async (limit = 20, offset = 0, tags = [], search = '') => {
-    let url = `/social/feed?limit=${limit}&offset=${offset}`;
+// cursor: '' 表示第一页；返回 { posts, next_cursor }
+// sort: 'latest' 按发布时间，'hot' 按热度分
+export const getFeed = async (limit = 20, cursor = '', tags = [], search = '', sort = 'latest') => {
+    let url = `/social/feed?limit=${limit}&cursor=${encodeURIComponent(cursor || '')}&sort=${sort}`;
     if (tags && tags.length > 0) {
         tags.forEach(tag => url += `&tags=${encodeURIComponent(tag)}`);
     }
@@ -12,6 +14,18 @@ export const getFeed = async (limit = 20, offset = 0, tags = [], search = '') =>
     return response.data;
 };
 
+// 好友时间线；cursor: '' 表示第一页，返回 { posts, next_cursor }
+export const getTimeline = async (limit = 20, cursor = '') => {
+    const response = await client.get(`/social/timeline?limit=${limit}&cursor=${encodeURIComponent(cursor || '')}`);
+    return response.data;
+};
+
+// 返回 [{ name, post_count }]，按帖子数降序
+export const getPopularTags = async (limit = 10) => {
+    const response = await client.get(`/social/tags/popular?limit=${limit}`);
+    return response.data;
+};
+
 export const getUserPosts = async (userId, limit = 20, offset = 0) => {
     const response = await client.get(`/social/users/${userId}/posts?limit=${limit}&offset=${offset}`);
     return response.data;
@@ -40,13 +54,15 @@ export const deletePost = async (id) => {
     return response.data;
 };
 
-export const getComments = async () => {
-    // Assuming comments are part of post detail or fetched separately? 
-    // The prompt says "GET /posts/:id" returns post details.
-    // And "POST /posts/:id/comments" to add.
-    // If comments are separate, we might need a separate endpoint, but usually included in details.
-    // Let's assume we can also fetch them via a sub-resource if needed, but for now relies on details.
-    // However, for interactions we need endpoints.
+// cursor: '' 表示第一页；返回 { comments, next_cursor }，顶层评论按时间升序
+export const getComments = async (postId, cursor = '', limit = 20) => {
+    const response = await client.get(`/social/posts/${postId}/comments?limit=${limit}&cursor=${encodeURIComponent(cursor || '')}`);
+    return response.data;
+};
+
+export const getCommentReplies = async (postId, commentId, cursor = '', limit = 20) => {
+    const response = await client.get(`/social/posts/${postId}/comments/${commentId}/replies?limit=${limit}&cursor=${encodeURIComponent(cursor || '')}`);
+    return response.data;
 };
 
 export const addComment = async (postId, content) => {
@@ -64,8 +80,20 @@ export const createConversation = async (targetUserId) => {
     return response.data;
 };
 
-export const getMessages = async (conversationId) => {
-    const response = await client.get(`/social/conversations/${conversationId}/messages`);
+// 批量查询在线状态：返回 { user_id: { online, connections, last_seen } }
+export const getPresence = async (userIds) => {
+    const response = await client.get('/social/presence', { params: { ids: userIds.join(',') } });
+    return response.data.presence;
+};
+
+// 传入 before / after（'' 表示最近一页）时按消息游标分页，返回 { messages, prev_cursor, next_cursor }
+export const getMessages = async (conversationId, { before, after, limit } = {}) => {
+    const params = new URLSearchParams();
+    if (before !== undefined) params.set('before', before || '');
+    if (after !== undefined) params.set('after', after || '');
+    if (limit) params.set('limit', limit);
+    const query = params.toString();
+    const response = await client.get(`/social/conversations/${conversationId}/messages${query ? `?${query}` : ''}`);
     return response.data;
 };
 
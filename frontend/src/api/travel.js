@@ -1,18 +1,32 @@
 import client from './client';
 
-export const getUserTrips = async (userId) => {
-    // If userId not provided, maybe use 'me'? Endpoint: /travel/users/:my_id/trips
-    // We can get current user ID from context, but for now let's assume the component passes it.
-    const response = await client.get(`/travel/users/${userId}/trips`);
+// 列表筛选参数：status / date_from / date_to / destination；
+// 传入 cursor（'' 表示第一页）时返回 { trips, next_cursor }，否则返回数组
+const buildTripListParams = ({ cursor, limit, status, dateFrom, dateTo, destination } = {}) => {
+    const params = new URLSearchParams();
+    if (cursor !== undefined && cursor !== null) params.append('cursor', cursor);
+    if (limit) params.append('limit', limit);
+    if (status) params.append('status', status);
+    if (dateFrom) params.append('date_from', dateFrom);
+    if (dateTo) params.append('date_to', dateTo);
+    if (destination) params.append('destination', destination);
+    return params;
+};
+
+export const getUserTrips = async (userId, options = {}) => {
+    const params = buildTripListParams(options);
+    const query = params.toString();
+    const response = await client.get(`/travel/users/${userId}/trips${query ? `?${query}` : ''}`);
     return response.data;
 };
 
-export const getPublicTrips = async (search = '') => {
-    let url = '/travel/trips/public';
+export const getPublicTrips = async (search = '', options = {}) => {
+    const params = buildTripListParams(options);
     if (search) {
-        url += `?search=${encodeURIComponent(search)}`;
+        params.append('search', search);
     }
-    const response = await client.get(url);
+    const query = params.toString();
+    const response = await client.get(`/travel/trips/public${query ? `?${query}` : ''}`);
     return response.data;
 };
 
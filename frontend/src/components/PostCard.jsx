@@ -54,15 +54,17 @@ const PostCard = ({ post, onDelete }) => {
 
     const renderMediaArea = () => {
         const hasMedia = post.media_urls && post.media_urls.length > 0;
+        // 列表接口只返回封面图，总数见 image_count
+        const imageCount = post.image_count ?? (post.media_urls ? post.media_urls.length : 0);
 
         if (hasMedia) {
             return (
                 <div className={styles.mediaArea} onClick={handleImageClick} style={{ cursor: 'pointer' }}>
                     <img src={post.media_urls[0]} alt="Post Cover" className={styles.mediaCover} />
-                    {post.media_urls.length > 1 && (
+                    {imageCount > 1 && (
                         <div className={styles.imageBadge}>
                             <ImageIcon size={12} />
-                            <span>{post.media_urls.length}</span>
+                            <span>{imageCount}</span>
                         </div>
                     )}
                 </div>
@@ -10,7 +10,8 @@ import {
     acceptFriendRequest, 
     rejectFriendRequest,
     getFriends,
-    createConversation
+    createConversation,
+    getPresence
 } from '../../api/social';
 import { useAuth } from '../../context/AuthContext';
 import { Send, User, Check, X, MessageSquare, ArrowLeft, Smile, Plus, Users, UserPlus, Image as ImageIcon } from 'lucide-react';
@@ -34,13 +35,20 @@ const ChatPage = () => {
     const [showDropdown, setShowDropdown] = useState(false);
     const [showEmojiPicker, setShowEmojiPicker] = useState(false);
     const [selectedFile, setSelectedFile] = useState(null);
+    const [olderCursor, setOlderCursor] = useState(null);
+    const [loadingOlder, setLoadingOlder] = useState(false);
+    const [typingUserIds, setTypingUserIds] = useState([]);
+    const [otherPresence, setOtherPresence] = useState(null);
     
     const messagesEndRef = useRef(null);
+    const messagesContainerRef = useRef(null);
+    const prependHeightRef = useRef(null); // 加载更早消息前的滚动高度，用于保持滚动位置
     const dropdownRef = useRef(null);
     const socketRef = useRef(null);
     const activeConvIdRef = useRef(activeConvId);
     const fileInputRef = useRef(null);
     const emojiPickerRef = useRef(null);
+    const typingTimeoutRef = useRef(null); // 停止输入后发送 is_typing: false
 
     useEffect(() => {
         activeConvIdRef.current = activeConvId;
@@ -58,15 +66,18 @@ const ChatPage = () => {
             console.log('Socket connected');
         });
 
-        socket.on('new_message', (msg) => {
-            console.log('New message:', msg);
-            
+        // markRead: 批量帧只对最后一条消息回执已读
+        const handleNewMessage = (msg, markRead = true) => {
             // 1. Update messages if looking at this conversation
             if (activeConvIdRef.current === msg.conversation_id) {
                 setMessages(prev => {
                     if (prev.find(m => m.id === msg.id)) return prev;
                     return [...prev, msg];
                 });
+                if (markRead && msg.sender_id !== user?.id) {
+                    socket.emit('read', { conversation_id: msg.conversation_id, message_id: msg.id });
+                }
+                setTypingUserIds(prev => prev.filter(id => id !== msg.sender_id));
             }
 
             // 2. Update conversation list preview
@@ -82,6 +93,38 @@ const ChatPage = () => {
                 }
                 return c;
             }));
+        };
+
+        const handleTyping = ({ conversation_id, user_id, is_typing }) => {
+            if (activeConvIdRef.current !== conversation_id) return;
+            setTypingUserIds(prev => {
+                const others = prev.filter(id => id !== user_id);
+                return is_typing ? [...others, user_id] : others;
+            });
+        };
+
+        const roomHandlers = { new_message: handleNewMessage, typing: handleTyping };
+        socket.on('new_message', (msg) => handleNewMessage(msg));
+        socket.on('typing', handleTyping);
+
+        // 服务端把短时间内同一房间的多个事件合并为一帧：[{ event, data }, ...]，按顺序处理
+        socket.on('batch', (frame) => {
+            const messages = frame.filter(item => item.event === 'new_message').map(item => item.data);
+            const lastMessage = messages[messages.length - 1];
+            frame.forEach(({ event, data }) => {
+                if (event === 'new_message') {
+                    handleNewMessage(data, data === lastMessage);
+                } else {
+                    roomHandlers[event]?.(data);
+                }
+            });
+        });
+
+        // 离线期间暂存的通知，重连后一次性投递：刷新会话列表
+        socket.on('offline_notifications', (notifications) => {
+            if (notifications.length > 0) {
+                getConversations().then(setConversations).catch(() => {});
+            }
         });
 
         return () => {
@@ -119,10 +162,31 @@ const ChatPage = () => {
             loadMessages(activeConvId);
             setNewMessage('');
             setSelectedFile(null);
+            setTypingUserIds([]);
         }
     }, [activeConvId]);
 
+    // 私聊对方的在线状态，每 30 秒刷新一次
+    const presenceUserId = conversations.find(c => c.id === activeConvId)?.other_user_id;
     useEffect(() => {
+        setOtherPresence(null);
+        if (!presenceUserId) return;
+        const refresh = () => getPresence([presenceUserId])
+            .then(presence => setOtherPresence(presence[presenceUserId] || null))
+            .catch(() => {});
+        refresh();
+        const timer = setInterval(refresh, 30000);
+        return () => clearInterval(timer);
+    }, [presenceUserId]);
+
+    useEffect(() => {
+        // 向上翻历史时保持当前可见位置，其余情况滚动到底部
+        if (prependHeightRef.current !== null && messagesContainerRef.current) {
+            const el = messagesContainerRef.current;
+            el.scrollTop = el.scrollHeight - prependHeightRef.current;
+            prependHeightRef.current = null;
+            return;
+        }
         scrollToBottom();
     }, [messages]);
 
@@ -156,14 +220,42 @@ const ChatPage = () => {
 
     const loadMessages = async (id) => {
         try {
-            const data = await getMessages(id);
-            setMessages(Array.isArray(data) ? data : []);
+            const data = await getMessages(id, { before: '' });
+            setMessages(data.messages || []);
+            setOlderCursor(data.prev_cursor || null);
         } catch (error) {
             console.error("Failed to load messages", error);
             toast.error("加载消息失败");
         }
     };
 
+    const loadOlderMessages = async () => {
+        if (!olderCursor || loadingOlder || !activeConvId) return;
+        const convId = activeConvId;
+        setLoadingOlder(true);
+        try {
+            const data = await getMessages(convId, { before: olderCursor });
+            if (activeConvIdRef.current !== convId) return;
+            prependHeightRef.current = messagesContainerRef.current?.scrollHeight ?? null;
+            setMessages(prev => {
+                const existingIds = new Set(prev.map(m => m.id));
+                return [...(data.messages || []).filter(m => !existingIds.has(m.id)), ...prev];
+            });
+            setOlderCursor(data.prev_cursor || null);
+        } catch (error) {
+            console.error("Failed to load older messages", error);
+            toast.error("加载历史消息失败");
+        } finally {
+            setLoadingOlder(false);
+        }
+    };
+
+    const handleMessagesScroll = (e) => {
+        if (e.currentTarget.scrollTop < 40) {
+            loadOlderMessages();
+        }
+    };
+
     const handleFileSelect = (e) => {
         const file = e.target.files[0];
         if (!file) return;
@@ -202,7 +294,18 @@ const ChatPage = () => {
                 payload = newMessage; // Simple text
             }
 
-            await sendMessage(activeConvId, payload);
+            const socket = socketRef.current;
+            if (!selectedFile && socket?.connected) {
+                // 文本消息走 WebSocket，消息本身通过 new_message 推送回来
+                const ack = await socket.timeout(10000).emitWithAck('send_message', {
+                    conversation_id: activeConvId,
+                    content: newMessage
+                });
+                if (ack.error) throw new Error(ack.error);
+                stopTyping();
+            } else {
+                await sendMessage(activeConvId, payload);
+            }
             setNewMessage('');
             setSelectedFile(null);
             setShowEmojiPicker(false);
@@ -220,8 +323,27 @@ const ChatPage = () => {
         }
     };
     
+    const stopTyping = () => {
+        clearTimeout(typingTimeoutRef.current);
+        if (typingTimeoutRef.current && socketRef.current && activeConvIdRef.current) {
+            socketRef.current.emit('typing', { conversation_id: activeConvIdRef.current, is_typing: false });
+        }
+        typingTimeoutRef.current = null;
+    };
+
+    const notifyTyping = () => {
+        if (!socketRef.current || !activeConvId) return;
+        // 服务端会节流重复的 is_typing: true，这里只在开始输入时发送一次
+        if (!typingTimeoutRef.current) {
+            socketRef.current.emit('typing', { conversation_id: activeConvId, is_typing: true });
+        }
+        clearTimeout(typingTimeoutRef.current);
+        typingTimeoutRef.current = setTimeout(stopTyping, 3000);
+    };
+
     const handleInput = (e) => {
         setNewMessage(e.target.value);
+        notifyTyping();
         e.target.style.height = 'auto';
         e.target.style.height = e.target.scrollHeight + 'px';
     };
@@ -316,6 +438,13 @@ const ChatPage = () => {
     const activeConv = conversations.find(c => c.id === activeConvId);
     const otherUserId = activeConv ? getOtherUserId(activeConv) : null;
 
+    const presenceLabel = () => {
+        if (!otherPresence) return '';
+        if (otherPresence.online) return '在线';
+        if (!otherPresence.last_seen) return '离线';
+        return `最近在线 ${new Date(otherPresence.last_seen + 'Z').toLocaleString()}`;
+    };
+
     return (
         <div className={`${styles.container} ${activeConvId ? styles.viewChat : ''}`}>
             {/* Left Sidebar */}
@@ -432,11 +561,18 @@ const ChatPage = () => {
                                 <span className={styles.headerName}>
                                     {activeConv ? getConvName(activeConv) : '聊天'}
                                 </span>
-                                <span className={styles.headerStatus}>在线</span>
+                                <span className={styles.headerStatus}>
+                                    {typingUserIds.length > 0 ? '正在输入...' : presenceLabel()}
+                                </span>
                             </Link>
                         </div>
 
-                        <div className={styles.messages}>
+                        <div className={styles.messages} ref={messagesContainerRef} onScroll={handleMessagesScroll}>
+                            {olderCursor && (
+                                <button className={styles.loadOlder} onClick={loadOlderMessages} disabled={loadingOlder}>
+                                    {loadingOlder ? '加载中...' : '加载更早的消息'}
+                                </button>
+                            )}
                             {messages.map((msg, index) => {
                                 const isMe = msg.sender_id === user?.id;
                                 const prevMsg = messages[index - 1];
@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { Link, useSearchParams } from 'react-router-dom';
 import { Plus, X, Search } from 'lucide-react';
-import { getFeed } from '../../api/social';
+import { getFeed, getPopularTags, getTimeline } from '../../api/social';
 import PostCard from '../../components/PostCard';
 import Button from '../../components/Button';
 import LoadingSpinner from '../../components/LoadingSpinner';
@@ -15,37 +15,45 @@ const FeedPage = () => {
     const [tempSearch, setTempSearch] = useState(currentSearch);
     
     // New: Filter Tabs State
-    const [activeTab, setActiveTab] = useState('recommend'); // recommend, latest, hot
+    const [activeTab, setActiveTab] = useState('recommend'); // recommend, latest, hot, friends
 
     const [posts, setPosts] = useState([]);
     const [loading, setLoading] = useState(true);
-    const [offset, setOffset] = useState(0);
+    const [cursor, setCursor] = useState(null);
     const [hasMore, setHasMore] = useState(true);
+    const [popularTags, setPopularTags] = useState([]);
     const LIMIT = 10;
 
+    useEffect(() => {
+        getPopularTags(10)
+            .then(setPopularTags)
+            .catch(error => console.error('Failed to fetch popular tags', error));
+    }, []);
+
     useEffect(() => {
         setTempSearch(currentSearch);
     }, [currentSearch]);
 
+    // 好友 tab 读取好友时间线，其余 tab 读取公开流
+    const fetchPage = (pageCursor) => {
+        if (activeTab === 'friends' && !currentTag && !currentSearch) {
+            return getTimeline(LIMIT, pageCursor);
+        }
+        const tags = currentTag ? [currentTag] : [];
+        const sort = activeTab === 'hot' ? 'hot' : 'latest';
+        return getFeed(LIMIT, pageCursor, tags, currentSearch, sort);
+    };
+
     useEffect(() => {
         const loadInitial = async () => {
             setLoading(true);
             try {
-                const tags = currentTag ? [currentTag] : [];
-                // Pass activeTab to API if supported later. For now just reloading.
-                // potentially: getFeed(LIMIT, 0, tags, currentSearch, activeTab)
-                const data = await getFeed(LIMIT, 0, tags, currentSearch);
+                const data = await fetchPage('');
                 const newPosts = Array.isArray(data) ? data : (data.posts || []);
-                
-                // Client-side simple sort for MVP demo if needed, 
-                // but usually better to rely on server. 
-                // Let's just use server order for 'recommend' and 'latest'.
-                // For 'hot', we could try to sort if we had all data, but with pagination it's tricky.
-                // So we just display the data as is, assuming server handles it or will handle it.
-                
+
                 setPosts(newPosts);
-                setOffset(LIMIT);
-                setHasMore(newPosts.length === LIMIT);
+                setCursor(data.next_cursor || null);
+                setHasMore(Boolean(data.next_cursor));
             } catch (error) {
                 console.error('Failed to fetch feed', error);
                 toast.error("获取动态失败");
@@ -57,11 +65,10 @@ const FeedPage = () => {
     }, [currentTag, currentSearch, activeTab]); // Reload when tab changes
 
     const handleLoadMore = async () => {
-        if (loading) return;
+        if (loading || !cursor) return;
         setLoading(true);
         try {
-            const tags = currentTag ? [currentTag] : [];
-            const data = await getFeed(LIMIT, offset, tags, currentSearch);
+            const data = await fetchPage(cursor);
             const newPosts = Array.isArray(data) ? data : (data.posts || []);
 
             setPosts(prev => {
@@ -69,8 +76,8 @@ const FeedPage = () => {
                 const uniqueNewPosts = newPosts.filter(p => !existingIds.has(p.id));
                 return [...prev, ...uniqueNewPosts];
             });
-            setOffset(prev => prev + LIMIT);
-            setHasMore(newPosts.length === LIMIT);
+            setCursor(data.next_cursor || null);
+            setHasMore(Boolean(data.next_cursor));
         } catch (error) {
             console.error('Failed to fetch more posts', error);
             toast.error("加载更多失败");
@@ -89,6 +96,14 @@ const FeedPage = () => {
         });
     };
 
+    const selectTag = (tag) => {
+        setSearchParams(prev => {
+            const newParams = new URLSearchParams(prev);
+            newParams.set('tag', tag);
+            return newParams;
+        });
+    };
+
     const clearTag = () => {
         setSearchParams(prev => {
             const newParams = new URLSearchParams(prev);
@@ -131,6 +146,21 @@ const FeedPage = () => {
                 </form>
             </div>
 
+            {!currentTag && !currentSearch && popularTags.length > 0 && (
+                <div className={styles.popularTags}>
+                    {popularTags.map(tag => (
+                        <button
+                            key={tag.name}
+                            className={styles.tagChip}
+                            onClick={() => selectTag(tag.name)}
+                        >
+                            #{tag.name}
+                            <span className={styles.tagCount}>{tag.post_count}</span>
+                        </button>
+                    ))}
+                </div>
+            )}
+
             {!currentTag && !currentSearch && (
                 <div className={styles.filterTabs}>
                     <button 
@@ -151,6 +181,12 @@ const FeedPage = () => {
                     >
                         热门
                     </button>
+                    <button 
+                        className={`${styles.filterTab} ${activeTab === 'friends' ? styles.activeTab : ''}`}
+                        onClick={() => setActiveTab('friends')}
+                    >
+                        好友
+                    </button>
                 </div>
             )}
         </div>
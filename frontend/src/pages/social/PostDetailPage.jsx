@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { useParams, useNavigate, Link } from 'react-router-dom';
-import { getPost, addComment, getComments } from '../../api/social';
+import { getPost, addComment, getComments, getCommentReplies } from '../../api/social';
 import PostCard from '../../components/PostCard';
 import Input from '../../components/Input';
 import Button from '../../components/Button';
@@ -14,23 +14,26 @@ const PostDetailPage = () => {
     const navigate = useNavigate();
     const [post, setPost] = useState(null);
     const [comments, setComments] = useState([]);
+    const [commentsCursor, setCommentsCursor] = useState(null);
+    const [loadingComments, setLoadingComments] = useState(false);
+    // 按评论ID保存已展开的回复：{ [commentId]: { items, cursor } }
+    const [replies, setReplies] = useState({});
     const [newComment, setNewComment] = useState('');
     const [loading, setLoading] = useState(true);
 
+    // 详情只内联第一页顶层评论，其余通过游标分页加载
+    const applyPostData = (postData) => {
+        setPost(postData);
+        setComments(postData.comments || []);
+        setCommentsCursor(postData.comments_next_cursor || null);
+        setReplies({});
+    };
+
     useEffect(() => {
         const fetchData = async () => {
             try {
                 const postData = await getPost(id);
-                setPost(postData);
-                // If comments are included in postData, use them.
-                // Otherwise fetch separate.
-                if (postData.comments) {
-                    setComments(postData.comments);
-                } else {
-                    // Try fetch if not included
-                    // const commentData = await getComments(id);
-                    // setComments(commentData);
-                }
+                applyPostData(postData);
             } catch (error) {
                 console.error("Failed to load post", error);
                 toast.error("加载帖子失败");
@@ -51,14 +54,83 @@ const PostDetailPage = () => {
             toast.success("评论已发布");
             // Refresh post/comments
             const postData = await getPost(id); // Simple reload
-            setPost(postData);
-            if (postData.comments) setComments(postData.comments);
+            applyPostData(postData);
         } catch (error) {
             console.error("Failed to add comment", error);
             toast.error("评论失败");
         }
     };
 
+    const handleLoadMoreComments = async () => {
+        if (loadingComments || !commentsCursor) return;
+        setLoadingComments(true);
+        try {
+            const data = await getComments(id, commentsCursor);
+            setComments(prev => {
+                const existingIds = new Set(prev.map(c => c.id));
+                return [...prev, ...data.comments.filter(c => !existingIds.has(c.id))];
+            });
+            setCommentsCursor(data.next_cursor || null);
+        } catch (error) {
+            console.error("Failed to load comments", error);
+            toast.error("加载评论失败");
+        } finally {
+            setLoadingComments(false);
+        }
+    };
+
+    const handleLoadReplies = async (commentId) => {
+        const current = replies[commentId];
+        try {
+            const data = await getCommentReplies(id, commentId, current ? current.cursor : '');
+            setReplies(prev => ({
+                ...prev,
+                [commentId]: {
+                    items: [...(prev[commentId]?.items || []), ...data.comments],
+                    cursor: data.next_cursor || null
+                }
+            }));
+        } catch (error) {
+            console.error("Failed to load replies", error);
+            toast.error("加载回复失败");
+        }
+    };
+
+    const renderComment = (comment) => (
+        <div key={comment.id} className={styles.comment}>
+            <Link to={`/users/${comment.author_id}`} className={`${styles.commentAvatar} ${styles.commentAvatarLink}`}>
+                {comment.author_avatar ? (
+                    <img src={comment.author_avatar} alt={comment.author_name} className={styles.avatarImg} />
+                ) : (
+                    (comment.author_name || 'U').charAt(0).toUpperCase()
+                )}
+            </Link>
+            <div className={styles.commentContent}>
+                <Link to={`/users/${comment.author_id}`} className={styles.commentUserLink}>
+                    {comment.author_name || 'User'}
+                </Link>
+                <p className={styles.commentText}>{comment.content}</p>
+                <span className={styles.commentDate}>{new Date(comment.created_at).toLocaleDateString()}</span>
+                {renderReplies(comment)}
+            </div>
+        </div>
+    );
+
+    const renderReplies = (comment) => {
+        const loaded = replies[comment.id];
+        if (!comment.reply_count && !loaded) return null;
+        return (
+            <div className={styles.replies}>
+                {loaded && loaded.items.map(renderComment)}
+                {(!loaded || loaded.cursor) && (
+                    <button className={styles.repliesBtn} onClick={() => handleLoadReplies(comment.id)}>
+                        {loaded ? '查看更多回复' : `查看 ${comment.reply_count} 条回复`}
+                    </button>
+                )}
+            </div>
+        );
+    };
+
     if (loading) return <div className={styles.loading}><LoadingSpinner size="large" /></div>;
     if (!post) return <div className={styles.notFound}>帖子未找到</div>;
 
@@ -77,24 +149,12 @@ const PostDetailPage = () => {
                     {comments.length === 0 ? (
                         <p className={styles.noComments}>暂无评论。</p>
                     ) : (
-                        comments.map((comment, index) => (
-                            <div key={index} className={styles.comment}>
-                                <Link to={`/users/${comment.author_id}`} className={`${styles.commentAvatar} ${styles.commentAvatarLink}`}>
-                                    {comment.author_avatar ? (
-                                        <img src={comment.author_avatar} alt={comment.author_name} className={styles.avatarImg} />
-                                    ) : (
-                                        (comment.author_name || 'U').charAt(0).toUpperCase()
-                                    )}
-                                </Link>
-                                <div className={styles.commentContent}>
-                                    <Link to={`/users/${comment.author_id}`} className={styles.commentUserLink}>
-                                        {comment.author_name || 'User'}
-                                    </Link>
-                                    <p className={styles.commentText}>{comment.content}</p>
-                                    <span className={styles.commentDate}>{new Date(comment.created_at).toLocaleDateString()}</span>
-                                </div>
-                            </div>
-                        ))
+                        comments.map(renderComment)
+                    )}
+                    {commentsCursor && (
+                        <Button variant="secondary" onClick={handleLoadMoreComments} disabled={loadingComments}>
+                            加载更多评论
+                        </Button>
                     )}
                 </div>
 
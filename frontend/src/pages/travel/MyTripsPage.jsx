@@ -8,11 +8,15 @@ import CreateTripModal from './CreateTripModal';
 import { Plus } from 'lucide-react';
 import styles from './TravelList.module.css';
 
+const PAGE_SIZE = 20;
+
 const MyTripsPage = () => {
     const { user } = useAuth();
     const [trips, setTrips] = useState([]);
     const [loading, setLoading] = useState(true);
     const [showModal, setShowModal] = useState(false);
+    const [cursor, setCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         if (user) loadTrips();
@@ -20,8 +24,9 @@ const MyTripsPage = () => {
 
     const loadTrips = async () => {
         try {
-            const data = await getUserTrips(user.id);
+            const data = await getUserTrips(user.id, { cursor: '', limit: PAGE_SIZE });
             setTrips(Array.isArray(data) ? data : (data.trips || []));
+            setCursor(data.next_cursor || null);
         } catch (error) {
             console.error("Failed to load trips", error);
         } finally {
@@ -29,6 +34,24 @@ const MyTripsPage = () => {
         }
     };
 
+    const handleLoadMore = async () => {
+        if (loadingMore || !cursor) return;
+        setLoadingMore(true);
+        try {
+            const data = await getUserTrips(user.id, { cursor, limit: PAGE_SIZE });
+            const newTrips = data.trips || [];
+            setTrips(prev => {
+                const existingIds = new Set(prev.map(t => t.id));
+                return [...prev, ...newTrips.filter(t => !existingIds.has(t.id))];
+            });
+            setCursor(data.next_cursor || null);
+        } catch (error) {
+            console.error("Failed to load more trips", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     return (
         <div>
             <div style={{ marginBottom: '1.5rem', display: 'flex', justifyContent: 'flex-end' }}>
@@ -52,6 +75,14 @@ const MyTripsPage = () => {
                 </div>
             )}
 
+            {!loading && cursor && (
+                <div className={styles.loadMore}>
+                    <Button variant="secondary" onClick={handleLoadMore} disabled={loadingMore}>
+                        {loadingMore ? '加载中...' : '加载更多'}
+                    </Button>
+                </div>
+            )}
+
             {showModal && (
                 <CreateTripModal
                     isOpen={showModal}
@@ -1,18 +1,23 @@
 import { useState, useEffect } from 'react';
 import { getPublicTrips } from '../../api/travel';
 import TripCard from '../../components/TripCard';
+import Button from '../../components/Button';
 import styles from './TravelList.module.css';
 
+const PAGE_SIZE = 20;
+
 const PublicTripsPage = ({ searchQuery }) => {
     const [trips, setTrips] = useState([]);
     const [loading, setLoading] = useState(true);
+    const [cursor, setCursor] = useState(null);
 
     useEffect(() => {
         const fetchTrips = async () => {
             setLoading(true);
             try {
-                const data = await getPublicTrips(searchQuery);
+                const data = await getPublicTrips(searchQuery, { cursor: '', limit: PAGE_SIZE });
                 setTrips(Array.isArray(data) ? data : (data.trips || []));
+                setCursor(data.next_cursor || null);
             } catch (error) {
                 console.error("Failed to fetch public trips", error);
             } finally {
@@ -22,9 +27,27 @@ const PublicTripsPage = ({ searchQuery }) => {
         fetchTrips();
     }, [searchQuery]);
 
+    const handleLoadMore = async () => {
+        if (loading || !cursor) return;
+        setLoading(true);
+        try {
+            const data = await getPublicTrips(searchQuery, { cursor, limit: PAGE_SIZE });
+            const newTrips = data.trips || [];
+            setTrips(prev => {
+                const existingIds = new Set(prev.map(t => t.id));
+                return [...prev, ...newTrips.filter(t => !existingIds.has(t.id))];
+            });
+            setCursor(data.next_cursor || null);
+        } catch (error) {
+            console.error("Failed to fetch more public trips", error);
+        } finally {
+            setLoading(false);
+        }
+    };
+
     return (
         <div>
-            {loading ? (
+            {loading && trips.length === 0 ? (
                 <div className={styles.loading}>加载旅行中...</div>
             ) : (
                 <div className={styles.grid}>
@@ -37,6 +60,14 @@ const PublicTripsPage = ({ searchQuery }) => {
                     )}
                 </div>
             )}
+
+            {cursor && trips.length > 0 && (
+                <div className={styles.loadMore}>
+                    <Button variant="secondary" onClick={handleLoadMore} disabled={loading}>
+                        {loading ? '加载中...' : '加载更多'}
+                    </Button>
+                </div>
+            )}
         </div>
     );
 };